@@ -0,0 +1,7 @@
+from .engine import run_backtest, simulate
+from .data import SharedCandles, load_candles, save_candles
+from .optimizer import run_sweep
+from .robustness import walk_forward, monte_carlo
+
+__all__ = ['run_backtest', 'simulate', 'SharedCandles', 'load_candles', 'save_candles', 'run_sweep',
+           'walk_forward', 'monte_carlo']
@@ -0,0 +1,127 @@
+"""
+백테스트용 과거 캔들 저장/조회 및 공유 메모리 적재
+
+과거 캔들 받기: python -m backtest.data --tickers KRW-BTC,KRW-ETH --count 100000 --out data/candles.npz
+"""
+import argparse
+import logging
+import zipfile
+import numpy as np
+import pyupbit
+from multiprocessing import shared_memory
+from data_analyzer.analyzer import DataAnalyzer, OHLCV_COLUMNS
+from utils.log import setup_logging
+
+def fetch_history(ticker, interval="minute1", count=10000):
+    """과거 캔들 조회 (200개 초과 시 pyupbit가 나눠서 조회) -> (timestamps, ohlcv)"""
+    df = pyupbit.get_ohlcv(ticker, interval=interval, count=count)
+    if df is None or df.empty:
+        raise ValueError(f"{ticker} 캔들 조회 실패")
+    return DataAnalyzer.to_arrays(df)
+
+def save_candles(path, candles):
+    """
+    종목 -> (timestamps, ohlcv) 딕셔너리를 npz 파일로 저장
+    (종목, 캔들) 이터레이터도 받으며, 종목 단위로 압축해 쓰므로 전체를 메모리에 올리지 않는다.
+    """
+    if not str(path).endswith('.npz'):
+        path = f"{path}.npz"
+    items = candles.items() if isinstance(candles, dict) else candles
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for ticker, (timestamps, ohlcv) in items:
+            for name, array in (('timestamps', timestamps), ('ohlcv', ohlcv)):
+                with archive.open(f"{ticker}/{name}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.asanyarray(array), allow_pickle=False)
+
+def load_candles(path, tickers=None):
+    """npz 파일에서 종목 -> (timestamps, ohlcv) 딕셔너리 로드"""
+    with np.load(path) as data:
+        names = sorted({key.split('/')[0] for key in data.files})
+        return {
+            ticker: (
+                data[f"{ticker}/timestamps"].astype('datetime64[ns]'),
+                np.ascontiguousarray(data[f"{ticker}/ohlcv"], dtype=np.float64)
+            )
+            for ticker in names
+            if tickers is None or ticker in tickers
+        }
+
+class SharedCandles:
+    """
+    여러 종목의 캔들을 공유 메모리 블록 하나에 저장
+    워커 프로세스는 이름과 배치 정보(layout)만 받아 복사 없이 배열 뷰로 읽는다.
+    """
+    def __init__(self, shm, layout, owner):
+        self.shm = shm
+        self.layout = layout  # [(종목, 시작 바이트, 캔들 수), ...]
+        self.owner = owner
+
+    @staticmethod
+    def _nbytes(rows):
+        # timestamps(int64) + ohlcv(float64 6행)
+        return rows * 8 * (1 + len(OHLCV_COLUMNS))
+
+    @classmethod
+    def create(cls, candles):
+        """종목 -> (timestamps, ohlcv)를 공유 메모리로 복사"""
+        layout = []
+        offset = 0
+        for ticker, (timestamps, _) in candles.items():
+            layout.append((ticker, offset, len(timestamps)))
+            offset += cls._nbytes(len(timestamps))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm, layout, owner=True)
+        views = shared.arrays()
+        for ticker, (timestamps, ohlcv) in candles.items():
+            shared_timestamps, shared_ohlcv = views[ticker]
+            shared_timestamps[:] = timestamps.astype('datetime64[ns]')
+            shared_ohlcv[:] = ohlcv
+        return shared
+
+    @classmethod
+    def attach(cls, name, layout):
+        """워커에서 기존 공유 메모리 연결"""
+        # 워커는 부모의 resource tracker를 공유하므로 블록 삭제는 생성한 프로세스만 담당
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def arrays(self):
+        """종목 -> (timestamps, ohlcv) 공유 메모리 뷰"""
+        result = {}
+        for ticker, offset, rows in self.layout:
+            timestamps = np.ndarray((rows,), dtype='datetime64[ns]', buffer=self.shm.buf, offset=offset)
+            ohlcv = np.ndarray(
+                (len(OHLCV_COLUMNS), rows), dtype=np.float64,
+                buffer=self.shm.buf, offset=offset + rows * 8
+            )
+            result[ticker] = (timestamps, ohlcv)
+        return result
+
+    def close(self):
+        """공유 메모리 연결 해제 (생성한 프로세스는 블록도 삭제)"""
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def main():
+    parser = argparse.ArgumentParser(description="백테스트용 과거 캔들 저장")
+    parser.add_argument('--tickers', required=True, help="쉼표로 구분한 종목 코드")
+    parser.add_argument('--interval', default="minute1")
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+    setup_logging()
+
+    candles = {}
+    for ticker in args.tickers.split(','):
+        candles[ticker] = fetch_history(ticker, args.interval, args.count)
+        logging.info(f"{ticker} 캔들 {len(candles[ticker][0]):,}개 조회 완료")
+    save_candles(args.out, candles)
+    logging.info(f"캔들 저장 완료: {args.out}")
+
+if __name__ == "__main__":
+    main()
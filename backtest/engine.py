@@ -0,0 +1,192 @@
+"""
+과거 캔들 백테스트 엔진
+
+전략의 신호 배열(Strategy.signals)을 한 번에 계산한 뒤, 봉 단위로 AutoTrade와 같은 순서로
+이익 실현 -> 손절/물타기 -> 신호 매매(쿨다운 적용)를 시뮬레이션한다.
+자금은 시작 자금 1.0 기준 비율로 계산하고, 체결은 해당 봉의 종가로 가정한다.
+성과 지표는 봉별 평가금액 곡선으로 계산한다 (실거래 리포트와 같은 analytics_service.performance_metrics).
+"""
+import numpy as np
+from config import STOP_LOSS, AVERAGING_DOWN_RATIO, MAX_AVERAGING_DOWN, CASH_USAGE_RATIO
+from services.analytics_service import performance_metrics
+
+# 전략 파라미터 외에 스윕 가능한 매매 파라미터 (AutoTrade 설정과 같은 의미)
+DEFAULT_TRADE_PARAMS = {
+    'stop_loss': STOP_LOSS,                        # 손절 라인
+    'profit_taking_ratio': 0.05,                   # 이익 실현 비율
+    'averaging_down_ratio': AVERAGING_DOWN_RATIO,  # 물타기 추가 매수 비율 (보유 금액 대비)
+    'max_averaging_down': MAX_AVERAGING_DOWN,      # 최대 물타기 횟수
+    'cash_usage_ratio': CASH_USAGE_RATIO,          # 매수 1회 최대 투자 비율
+    'fee_rate': 0.0005                             # 업비트 거래 수수료 (0.05%)
+}
+
+RESULT_FIELDS = (
+    'total_return', 'max_drawdown', 'trade_count', 'win_rate', 'exposure',
+    'sharpe', 'sortino', 'drawdown_duration', 'turnover'
+)
+
+def split_params(params, strategy_params):
+    """파라미터 조합을 (전략 파라미터, 매매 파라미터)로 분리"""
+    unknown = set(params) - set(strategy_params) - set(DEFAULT_TRADE_PARAMS)
+    if unknown:
+        raise ValueError(f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+    strategy = {k: v for k, v in params.items() if k in strategy_params}
+    trade = {**DEFAULT_TRADE_PARAMS, **{k: v for k, v in params.items() if k in DEFAULT_TRADE_PARAMS}}
+    return strategy, trade
+
+def simulate(close, timestamps, signals, cooldown, trade_params=None, trades=None):
+    """
+    단일 종목 매매 시뮬레이션
+    :param close: 종가 배열
+    :param timestamps: datetime64 배열
+    :param signals: 신호 배열 (1: BUY, -1: SELL, 0: HOLD)
+    :param cooldown: 신호 재발생 대기시간 (초)
+    :param trade_params: DEFAULT_TRADE_PARAMS를 덮어쓸 값
+    :param trades: 목록을 넘기면 청산된 거래의 수익률(수수료 반영)을 순서대로 추가
+    :return: RESULT_FIELDS 결과 딕셔너리
+    """
+    p = {**DEFAULT_TRADE_PARAMS, **(trade_params or {})}
+    take_profit = p['profit_taking_ratio']
+    stop_loss = p['stop_loss']
+    averaging_ratio = p['averaging_down_ratio']
+    max_averaging = p['max_averaging_down']
+    buy_ratio = p['cash_usage_ratio']
+    fee = p['fee_rate']
+
+    n = len(close)
+    if n == 0:
+        return dict.fromkeys(RESULT_FIELDS, 0.0)
+
+    prices = close.tolist()
+    times = np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64) // 1_000_000_000
+    seconds = times.tolist()
+    signal_list = signals.tolist()
+
+    cash = 1.0
+    quantity = 0.0
+    avg_price = 0.0
+    cost = 0.0
+    averaging_count = 0
+    last_signal_time = None
+
+    # 잔고가 바뀐 봉 위치와 변경 후 (현금, 수량)
+    change_index = []
+    change_cash = []
+    change_quantity = []
+    trade_count = 0
+    wins = 0
+    traded = 0.0  # 매수/매도 거래 금액 합계 (회전율)
+
+    for i in range(n):
+        price = prices[i]
+        signal = signal_list[i]
+
+        if quantity > 0:
+            rate = (price - avg_price) / avg_price
+            exit_position = False
+
+            if rate >= take_profit:
+                exit_position = True
+            elif rate <= -stop_loss:
+                if averaging_count < max_averaging:
+                    amount = min(quantity * price * averaging_ratio, cash)
+                    if amount > 0:
+                        bought = amount * (1 - fee) / price
+                        cost += amount
+                        cash -= amount
+                        traded += amount
+                        avg_price = (avg_price * quantity + price * bought) / (quantity + bought)
+                        quantity += bought
+                        averaging_count += 1
+                        change_index.append(i)
+                        change_cash.append(cash)
+                        change_quantity.append(quantity)
+                        continue
+                exit_position = True
+
+            if exit_position:
+                proceeds = quantity * price * (1 - fee)
+                cash += proceeds
+                traded += proceeds
+                trade_count += 1
+                wins += proceeds > cost
+                if trades is not None:
+                    trades.append(proceeds / cost - 1)
+                quantity = 0.0
+                change_index.append(i)
+                change_cash.append(cash)
+                change_quantity.append(0.0)
+                continue
+
+        if signal == 0:
+            continue
+        if last_signal_time is not None and seconds[i] - last_signal_time < cooldown:
+            continue
+        last_signal_time = seconds[i]
+
+        if signal > 0 and quantity == 0:
+            amount = min(buy_ratio, cash)
+            if amount <= 0:
+                continue
+            quantity = amount * (1 - fee) / price
+            avg_price = price
+            cost = amount
+            cash -= amount
+            traded += amount
+            averaging_count = 0
+        elif signal < 0 and quantity > 0:
+            proceeds = quantity * price * (1 - fee)
+            cash += proceeds
+            traded += proceeds
+            trade_count += 1
+            wins += proceeds > cost
+            if trades is not None:
+                trades.append(proceeds / cost - 1)
+            quantity = 0.0
+        else:
+            continue
+        change_index.append(i)
+        change_cash.append(cash)
+        change_quantity.append(quantity)
+
+    # 잔고 변화 지점으로 봉별 평가금액 곡선을 만들어 성과 지표 계산
+    cash_curve = np.ones(n)
+    quantity_curve = np.zeros(n)
+    if change_index:
+        positions = np.searchsorted(change_index, np.arange(n), side='right') - 1
+        held = positions >= 0
+        cash_curve[held] = np.asarray(change_cash)[positions[held]]
+        quantity_curve[held] = np.asarray(change_quantity)[positions[held]]
+    invested = quantity_curve * close
+    equity = cash_curve + invested
+    metrics = performance_metrics(times, equity, invested, traded)
+
+    return {
+        'total_return': float(equity[-1] - 1.0),
+        'max_drawdown': metrics['max_drawdown'],
+        'trade_count': trade_count,
+        'win_rate': wins / trade_count if trade_count else 0.0,
+        'exposure': float(np.count_nonzero(quantity_curve) / n),
+        'sharpe': metrics['sharpe'],
+        'sortino': metrics['sortino'],
+        'drawdown_duration': metrics['drawdown_duration'],
+        'turnover': metrics['turnover']
+    }
+
+def run_backtest(analyzer, strategy, trade_params=None, start=None, end=None, trades=None):
+    """
+    분석기(캔들 보유)에 대해 전략 하나를 백테스트
+    지표/신호는 전체 구간으로 계산하고 [start, end) 시각 구간만 매매한다. (구간 앞쪽 지표 예열 불필요)
+    :return: RESULT_FIELDS 결과 딕셔너리, 구간에 캔들이 없으면 None
+    """
+    timestamps = analyzer.timestamps
+    lo = 0 if start is None else int(np.searchsorted(timestamps, np.datetime64(start, 'ns')))
+    hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, np.datetime64(end, 'ns')))
+    if hi - lo < 2:
+        return None
+
+    signals = strategy.signals(analyzer)
+    return simulate(
+        analyzer.column('close')[lo:hi], timestamps[lo:hi], signals[lo:hi],
+        strategy.signal_cooldown, trade_params, trades
+    )
@@ -0,0 +1,205 @@
+"""
+전략 파라미터 스윕 (프로세스 풀 병렬 백테스트)
+
+과거 캔들은 공유 메모리에 한 번만 적재하고, 각 워커는 종목별 DataAnalyzer를 한 번 만들어
+작업 간에 피처 캐시를 재사용한다. (임계값만 다른 조합은 지표를 다시 계산하지 않음)
+결과는 완료되는 대로 results.csv에 기록하고, 끝나면 순위를 매긴 ranked.csv를 저장한다.
+
+실행: python -m backtest.optimizer --data data/candles.npz --grid grid.json --out results/
+grid.json 예) {"rsi_buy": [25, 30, 35], "stop_loss": [0.03, 0.05], "signal_cooldown": [60, 300]}
+"""
+import os
+import csv
+import json
+import time
+import logging
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from backtest.data import SharedCandles, load_candles
+from backtest.engine import RESULT_FIELDS, split_params, run_backtest
+from data_analyzer.analyzer import DataAnalyzer
+from data_analyzer.strategies import STRATEGY_TYPES
+from utils.log import setup_logging
+
+# 기본 스윕 범위 (config.py 매매 설정과 IndicatorStrategy 임계값)
+DEFAULT_GRID = {
+    'rsi_buy': [25, 30, 35],
+    'rsi_sell': [65, 70, 75],
+    'volume_ratio': [0.3, 0.5, 0.8],
+    'min_combined_signals': [1, 2],
+    'signal_cooldown': [60, 300, 900],
+    'stop_loss': [0.03, 0.05, 0.08],
+    'profit_taking_ratio': [0.02, 0.05],
+    'averaging_down_ratio': [0.0, 0.5]
+}
+
+# 순위 기준
+SORT_KEYS = {
+    'return': lambda row: row['total_return'],
+    'calmar': lambda row: row['total_return'] / max(row['max_drawdown'], 1e-9),
+    'sharpe': lambda row: row['sharpe'],
+}
+
+# 워커당 보관할 최대 피처 수 (초과 시 캐시 비움)
+MAX_CACHED_FEATURES = 256
+
+# 워커 프로세스 전역 상태
+_worker = {}
+
+def expand_grid(grid):
+    """{파라미터: [값...]} -> 파라미터 조합 딕셔너리 목록"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def _init_worker(shm_name, layout, strategy_type):
+    logging.disable(logging.INFO)  # 워커의 분석기 초기화 로그 생략
+    shared = SharedCandles.attach(shm_name, layout)
+    analyzers = []
+    for ticker, (timestamps, ohlcv) in shared.arrays().items():
+        analyzer = DataAnalyzer(ticker)
+        analyzer.load_candles(timestamps, ohlcv)
+        analyzers.append(analyzer)
+    _worker['shared'] = shared
+    _worker['analyzers'] = analyzers
+    _worker['strategy_cls'] = STRATEGY_TYPES[strategy_type]
+
+def aggregate_results(results):
+    """종목별 결과 -> 평균 수익률/최대 낙폭/총 거래 수 등으로 집계 (비율 지표는 종목 평균, 낙폭 기간은 최대)"""
+    count = len(results)
+    if not count:
+        return dict.fromkeys(RESULT_FIELDS, 0.0)
+    trade_count = sum(r['trade_count'] for r in results)
+    return {
+        'total_return': sum(r['total_return'] for r in results) / count,
+        'max_drawdown': max(r['max_drawdown'] for r in results),
+        'trade_count': trade_count,
+        'win_rate': sum(r['win_rate'] * r['trade_count'] for r in results) / max(trade_count, 1),
+        'exposure': sum(r['exposure'] for r in results) / count,
+        'sharpe': sum(r['sharpe'] for r in results) / count,
+        'sortino': sum(r['sortino'] for r in results) / count,
+        'drawdown_duration': max(r['drawdown_duration'] for r in results),
+        'turnover': sum(r['turnover'] for r in results) / count
+    }
+
+def _evaluate(params, start=None, end=None, trades=None):
+    """조합 하나를 모든 종목의 [start, end) 구간에 백테스트하고 집계"""
+    strategy_cls = _worker['strategy_cls']
+    strategy_params, trade_params = split_params(params, strategy_cls.default_params)
+    strategy = strategy_cls(**strategy_params)
+
+    results = []
+    for analyzer in _worker['analyzers']:
+        if len(analyzer.features) > MAX_CACHED_FEATURES:
+            analyzer.features = {}
+        result = run_backtest(analyzer, strategy, trade_params, start, end, trades)
+        if result is not None:
+            results.append(result)
+    return {**params, **aggregate_results(results)}
+
+def _evaluate_chunk(chunk):
+    return [_evaluate(params) for params in chunk]
+
+def _chunks(combinations, size):
+    for start in range(0, len(combinations), size):
+        yield combinations[start:start + size]
+
+def run_sweep(candles, grid, out_dir, strategy_type='IndicatorStrategy', workers=None,
+              sort='calmar', chunk_size=8):
+    """
+    파라미터 스윕 실행
+    :param candles: 종목 -> (timestamps, ohlcv)
+    :param grid: {파라미터: [값...]} (전략 파라미터 + DEFAULT_TRADE_PARAMS)
+    :param out_dir: 결과 저장 디렉터리 (results.csv, ranked.csv)
+    :param workers: 워커 프로세스 수 (기본값: CPU 수)
+    :param sort: 순위 기준 (SORT_KEYS)
+    :param chunk_size: 워커에 한 번에 보낼 조합 수
+    :return: 순위순 결과 목록
+    """
+    strategy_cls = STRATEGY_TYPES[strategy_type]
+    split_params(grid, strategy_cls.default_params)  # 잘못된 파라미터 이름은 시작 전에 확인
+    combinations = expand_grid(grid)
+    score = SORT_KEYS[sort]
+
+    os.makedirs(out_dir, exist_ok=True)
+    fields = list(grid) + list(RESULT_FIELDS)
+    results = []
+    leader = None  # 현재까지 최고 조합
+    report_every = max(len(combinations) // 10, 1)
+    next_report = report_every
+    started = time.time()
+
+    shared = SharedCandles.create(candles)
+    try:
+        logging.info(
+            f"파라미터 스윕 시작: 조합 {len(combinations):,}개, 종목 {len(candles)}개, "
+            f"워커 {workers or os.cpu_count()}개"
+        )
+        with open(os.path.join(out_dir, 'results.csv'), 'w', newline='') as f, \
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(shared.name, shared.layout, strategy_type)
+                ) as executor:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+
+            for rows in executor.map(_evaluate_chunk, _chunks(combinations, chunk_size)):
+                for row in rows:
+                    writer.writerow(row)
+                    results.append(row)
+                    if leader is None or score(row) > score(leader):
+                        leader = row
+                f.flush()
+
+                done = len(results)
+                if done >= next_report:
+                    next_report += report_every
+                    logging.info(
+                        f"진행 {done:,}/{len(combinations):,} ({time.time() - started:.0f}초) "
+                        f"최고: 수익률 {leader['total_return']:.2%}, 최대 낙폭 {leader['max_drawdown']:.2%}"
+                    )
+    finally:
+        shared.close()
+
+    ranked = sorted(results, key=score, reverse=True)
+    with open(os.path.join(out_dir, 'ranked.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['rank'] + fields)
+        writer.writeheader()
+        for rank, row in enumerate(ranked, 1):
+            writer.writerow({'rank': rank, **row})
+
+    logging.info(f"파라미터 스윕 완료: {len(results):,}개 조합, {time.time() - started:.1f}초")
+    return ranked
+
+def main():
+    parser = argparse.ArgumentParser(description="전략 파라미터 스윕")
+    parser.add_argument('--data', required=True, help="backtest.data로 저장한 npz 파일")
+    parser.add_argument('--grid', help="파라미터 범위 JSON 파일 (기본값: DEFAULT_GRID)")
+    parser.add_argument('--out', default="results")
+    parser.add_argument('--tickers', help="쉼표로 구분한 종목 코드 (기본값: 파일의 전체 종목)")
+    parser.add_argument('--strategy', default='IndicatorStrategy', choices=sorted(STRATEGY_TYPES))
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--sort', default='calmar', choices=sorted(SORT_KEYS))
+    parser.add_argument('--chunk-size', type=int, default=8)
+    args = parser.parse_args()
+    setup_logging()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    candles = load_candles(args.data, args.tickers.split(',') if args.tickers else None)
+    ranked = run_sweep(
+        candles, grid, args.out, args.strategy, args.workers, args.sort, args.chunk_size
+    )
+    for rank, row in enumerate(ranked[:10], 1):
+        params = ', '.join(f"{name}={row[name]}" for name in grid)
+        print(
+            f"{rank:2d}. 수익률 {row['total_return']:7.2%}  최대 낙폭 {row['max_drawdown']:6.2%}  샤프 {row['sharpe']:5.2f}  "
+            f"거래 {row['trade_count']:5d}회  {params}"
+        )
+
+if __name__ == "__main__":
+    main()
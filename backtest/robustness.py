@@ -0,0 +1,275 @@
+"""
+전략 견고성 평가 (워크포워드 / 몬테카를로, 프로세스 풀 병렬)
+
+- 워크포워드: 학습 구간에서 파라미터를 스윕해 최고 조합을 고르고, 바로 다음 검증 구간에서 평가한다.
+  구간을 일정 간격으로 옮기며 반복해 표본 외(out-of-sample) 성과 분포를 만든다.
+- 몬테카를로: 고정 파라미터로 (1) 무작위 시작 시각의 구간 백테스트를 반복하고,
+  (2) 전체 구간 거래 수익률 순서를 복원 추출로 재배열해 수익률/최대 낙폭 분포를 만든다.
+
+모든 시뮬레이션은 서로 독립인 작업으로 나뉘어 공유 메모리 캔들을 읽는 워커들에 분산된다.
+
+실행:
+python -m backtest.robustness walk-forward --data data/candles.npz --grid grid.json --train-days 14 --test-days 3
+python -m backtest.robustness monte-carlo --data data/candles.npz --params params.json --simulations 500
+"""
+import os
+import csv
+import json
+import time
+import logging
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from backtest.data import SharedCandles, load_candles
+from backtest.engine import DEFAULT_TRADE_PARAMS, RESULT_FIELDS, split_params
+from backtest import optimizer
+from data_analyzer.strategies import STRATEGY_TYPES
+from utils.log import setup_logging
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+def summarize(values):
+    """값 목록의 분포 요약 (평균, 표준편차, 백분위수)"""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return {}
+    summary = {
+        'count': int(len(values)),
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'max': float(values.max())
+    }
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{q}"] = float(value)
+    return summary
+
+def time_range(candles):
+    """모든 종목을 포함하는 (시작, 끝) 시각"""
+    starts = [timestamps[0] for timestamps, _ in candles.values() if len(timestamps)]
+    ends = [timestamps[-1] for timestamps, _ in candles.values() if len(timestamps)]
+    return min(starts), max(ends)
+
+def make_windows(start, end, train, test, step=None):
+    """워크포워드 구간 목록 [(학습 시작, 학습 끝=검증 시작, 검증 끝), ...]"""
+    step = step or test
+    windows = []
+    train_start = start
+    while train_start + train + test <= end:
+        windows.append((train_start, train_start + train, train_start + train + test))
+        train_start += step
+    return windows
+
+def _pool(shared, strategy_type, workers):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=optimizer._init_worker,
+        initargs=(shared.name, shared.layout, strategy_type)
+    )
+
+def _train_chunk(task):
+    """학습 구간에서 조합 묶음을 평가하고 (구간 번호, 결과 목록) 반환"""
+    window_index, start, end, chunk = task
+    return window_index, [optimizer._evaluate(params, start, end) for params in chunk]
+
+def _test_window(task):
+    window_index, params, start, end = task
+    return window_index, optimizer._evaluate(params, start, end)
+
+def _random_window(task):
+    sim_index, params, start, end = task
+    return {'simulation': sim_index, 'start': str(start), **optimizer._evaluate(params, start, end)}
+
+def _collect_trades(params):
+    trades = []
+    optimizer._evaluate(params, trades=trades)
+    return trades
+
+def walk_forward(candles, grid, train, test, step=None, strategy_type='IndicatorStrategy',
+                 workers=None, sort='calmar', chunk_size=8):
+    """
+    워크포워드 분석
+    :param train, test, step: 학습/검증 구간 길이와 이동 간격 (np.timedelta64)
+    :return: 구간별 결과 목록 (선택된 파라미터, 학습/검증 성과)
+    """
+    split_params(grid, STRATEGY_TYPES[strategy_type].default_params)
+    start, end = time_range(candles)
+    windows = make_windows(start, end, train, test, step)
+    if not windows:
+        raise ValueError("데이터 기간이 학습+검증 구간보다 짧습니다")
+
+    combinations = optimizer.expand_grid(grid)
+    chunks = list(optimizer._chunks(combinations, chunk_size))
+    score = optimizer.SORT_KEYS[sort]
+    best = {}  # 구간 번호 -> 학습 구간 최고 결과
+    started = time.time()
+    logging.info(
+        f"워크포워드 시작: 구간 {len(windows)}개, 조합 {len(combinations):,}개, "
+        f"백테스트 {len(windows) * len(combinations):,}회"
+    )
+
+    shared = SharedCandles.create(candles)
+    try:
+        with _pool(shared, strategy_type, workers) as executor:
+            # 1단계: 모든 (구간, 조합 묶음)을 한 번에 분산해 구간 수가 코어 수보다 적어도 모두 사용
+            tasks = [
+                (index, train_start, train_end, chunk)
+                for index, (train_start, train_end, _) in enumerate(windows)
+                for chunk in chunks
+            ]
+            for index, rows in executor.map(_train_chunk, tasks):
+                for row in rows:
+                    if index not in best or score(row) > score(best[index]):
+                        best[index] = row
+
+            # 2단계: 구간별 최고 조합을 다음 검증 구간에서 평가
+            tests = [
+                (index, {name: best[index][name] for name in grid}, train_end, test_end)
+                for index, (_, train_end, test_end) in enumerate(windows)
+            ]
+            results = []
+            for index, row in executor.map(_test_window, tests):
+                train_start, train_end, test_end = windows[index]
+                results.append({
+                    'window': index,
+                    'train_start': str(train_start),
+                    'test_start': str(train_end),
+                    'test_end': str(test_end),
+                    **{name: row[name] for name in grid},
+                    **{f"train_{field}": best[index][field] for field in RESULT_FIELDS},
+                    **{f"test_{field}": row[field] for field in RESULT_FIELDS}
+                })
+    finally:
+        shared.close()
+
+    logging.info(f"워크포워드 완료: {time.time() - started:.1f}초")
+    return results
+
+def monte_carlo(candles, params, simulations=500, window=None, strategy_type='IndicatorStrategy',
+                workers=None, seed=0, chunk_size=4):
+    """
+    몬테카를로 분석
+    :param params: 고정 파라미터 (전략 + 매매 파라미터)
+    :param window: 무작위 시작 구간 길이 (np.timedelta64, 기본값: 전체 기간의 절반)
+    :return: (무작위 시작 구간 결과 목록, 거래 재배열 결과 목록)
+    """
+    strategy_params, trade_params = split_params(params, STRATEGY_TYPES[strategy_type].default_params)
+    rng = np.random.default_rng(seed)
+    start, end = time_range(candles)
+    window = window if window is not None else (end - start) // 2
+    span = (end - start - window).astype('timedelta64[s]').astype(np.int64)
+    if span <= 0:
+        raise ValueError("데이터 기간이 시뮬레이션 구간보다 짧습니다")
+
+    offsets = rng.integers(0, span, simulations).astype('timedelta64[s]')
+    tasks = [(i, params, start + offset, start + offset + window) for i, offset in enumerate(offsets)]
+    started = time.time()
+    logging.info(f"몬테카를로 시작: 무작위 구간 {simulations}회, 구간 길이 {window.astype('timedelta64[h]')}")
+
+    shared = SharedCandles.create(candles)
+    try:
+        with _pool(shared, strategy_type, workers) as executor:
+            trades_future = executor.submit(_collect_trades, params)
+            window_results = list(executor.map(_random_window, tasks, chunksize=chunk_size))
+            trades = np.asarray(trades_future.result(), dtype=np.float64)
+    finally:
+        shared.close()
+
+    # 거래 수익률 순서를 복원 추출로 재배열 (거래당 투자 비율만큼 자산에 반영)
+    resampled = []
+    if len(trades):
+        picks = rng.choice(trades, size=(simulations, len(trades)), replace=True)
+        equity = np.cumprod(1 + picks * trade_params['cash_usage_ratio'], axis=1)
+        peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+        drawdown = ((peak - equity) / peak).max(axis=1)
+        resampled = [
+            {'simulation': i, 'total_return': float(equity[i, -1] - 1), 'max_drawdown': float(drawdown[i])}
+            for i in range(simulations)
+        ]
+
+    logging.info(f"몬테카를로 완료: {time.time() - started:.1f}초, 전체 구간 거래 {len(trades):,}회")
+    return window_results, resampled
+
+def _write_csv(path, rows):
+    if not rows:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def _print_summary(title, summary):
+    for name, stats in summary.items():
+        if stats:
+            print(
+                f"[{title}] {name}: 평균 {stats['mean']:.2%}  p5 {stats['p5']:.2%}  "
+                f"중앙값 {stats['p50']:.2%}  p95 {stats['p95']:.2%}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="전략 견고성 평가")
+    parser.add_argument('mode', choices=['walk-forward', 'monte-carlo'])
+    parser.add_argument('--data', required=True, help="backtest.data로 저장한 npz 파일")
+    parser.add_argument('--out', default="results")
+    parser.add_argument('--tickers', help="쉼표로 구분한 종목 코드 (기본값: 파일의 전체 종목)")
+    parser.add_argument('--strategy', default='IndicatorStrategy', choices=sorted(STRATEGY_TYPES))
+    parser.add_argument('--workers', type=int)
+    # 워크포워드
+    parser.add_argument('--grid', help="파라미터 범위 JSON 파일 (기본값: optimizer.DEFAULT_GRID)")
+    parser.add_argument('--train-days', type=float, default=14)
+    parser.add_argument('--test-days', type=float, default=3)
+    parser.add_argument('--step-days', type=float, help="구간 이동 간격 (기본값: 검증 구간 길이)")
+    parser.add_argument('--sort', default='calmar', choices=sorted(optimizer.SORT_KEYS))
+    # 몬테카를로
+    parser.add_argument('--params', help="고정 파라미터 JSON 파일 (기본값: 전략/매매 기본값)")
+    parser.add_argument('--simulations', type=int, default=500)
+    parser.add_argument('--window-days', type=float, help="무작위 구간 길이 (기본값: 전체 기간의 절반)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    setup_logging()
+
+    def days(value):
+        return None if value is None else np.timedelta64(int(value * 86400), 's')
+
+    candles = load_candles(args.data, args.tickers.split(',') if args.tickers else None)
+    os.makedirs(args.out, exist_ok=True)
+
+    if args.mode == 'walk-forward':
+        grid = optimizer.DEFAULT_GRID
+        if args.grid:
+            with open(args.grid) as f:
+                grid = json.load(f)
+        results = walk_forward(
+            candles, grid, days(args.train_days), days(args.test_days), days(args.step_days),
+            args.strategy, args.workers, args.sort
+        )
+        _write_csv(os.path.join(args.out, 'walk_forward.csv'), results)
+        summary = {
+            'test_return': summarize([r['test_total_return'] for r in results]),
+            'test_drawdown': summarize([r['test_max_drawdown'] for r in results])
+        }
+        _print_summary("워크포워드", summary)
+    else:
+        params = dict(DEFAULT_TRADE_PARAMS)
+        if args.params:
+            with open(args.params) as f:
+                params.update(json.load(f))
+        window_results, resampled = monte_carlo(
+            candles, params, args.simulations, days(args.window_days),
+            args.strategy, args.workers, args.seed
+        )
+        _write_csv(os.path.join(args.out, 'monte_carlo_windows.csv'), window_results)
+        _write_csv(os.path.join(args.out, 'monte_carlo_trades.csv'), resampled)
+        summary = {
+            'window_return': summarize([r['total_return'] for r in window_results]),
+            'window_drawdown': summarize([r['max_drawdown'] for r in window_results]),
+            'resampled_return': summarize([r['total_return'] for r in resampled]),
+            'resampled_drawdown': summarize([r['max_drawdown'] for r in resampled])
+        }
+        _print_summary("몬테카를로", summary)
+
+    with open(os.path.join(args.out, f"{args.mode}_summary.json"), 'w') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
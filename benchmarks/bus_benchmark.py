@@ -0,0 +1,108 @@
+"""
+시세 버스 동시성/처리량 벤치마크
+
+퍼블리셔 프로세스 하나가 최대 속도로 틱과 캔들을 쓰는 동안 여러 독자 프로세스가 동시에 읽으며
+찢어진 읽기(한 행 안에 서로 다른 쓰기의 값이 섞임)와 순서 오류가 없는지 검사한다.
+각 틱은 모든 필드에 같은 일련번호를 쓰므로, 행 안의 값이 모두 같고 일련번호가 1씩 증가해야 한다.
+(추월당해 놓친 틱은 dropped로 따로 센다)
+
+실행: python -m benchmarks.bus_benchmark --messages 1000000 --readers 4 --tickers 200
+"""
+import time
+import argparse
+import multiprocessing as mp
+import numpy as np
+from market_data.bus import MarketDataBus, MarketDataReader, TICK_FIELDS, CANDLE_WIDTH
+
+def publish(name, ready, messages, tickers, candle_every):
+    bus = MarketDataBus(name, max_tickers=max(tickers, 1), ring_size=1 << 14, candle_capacity=64)
+    names = [f"KRW-T{i}" for i in range(tickers)]
+    for ticker in names:
+        bus.slot(ticker)
+    ready.set()
+    time.sleep(0.2)  # 독자 연결 대기
+
+    started = time.perf_counter()
+    for n in range(1, messages + 1):
+        ticker = names[n % tickers]
+        bus.publish_tick(ticker, dict.fromkeys(TICK_FIELDS, n))
+        if n % candle_every == 0:
+            bus.publish_candles(ticker, np.full(CANDLE_WIDTH, n, dtype=np.float64))
+    elapsed = time.perf_counter() - started
+    print(f"퍼블리셔: {messages:,}개 틱, {messages / elapsed:,.0f}개/초")
+    time.sleep(0.5)  # 독자가 마지막 틱을 읽을 시간
+    bus.close()
+
+def consume(name, reader_id, messages, tickers, results):
+    reader = MarketDataReader(name)
+    reader.cursor = 0
+    received = torn = out_of_order = latest_reads = candle_reads = 0
+    last = 0
+    started = time.perf_counter()
+
+    while last < messages and time.perf_counter() - started < 60:
+        slots, values = reader.poll_arrays()
+        if len(slots):
+            # 행 안의 값이 모두 같아야 함
+            torn += int(np.count_nonzero((values != values[:, :1]).any(axis=1)))
+            numbers = values[:, 0].astype(np.int64)
+            expected_steps = np.diff(np.concatenate(([last], numbers)))
+            out_of_order += int(np.count_nonzero(expected_steps <= 0))
+            received += len(numbers)
+            last = int(numbers[-1])
+
+        # 최신 틱 슬롯과 캔들도 쓰기 중에 읽어 봄
+        ticker = f"KRW-T{received % tickers}"
+        tick = reader.latest(ticker)
+        if tick is not None:
+            latest_reads += 1
+            torn += len({tick[field] for field in TICK_FIELDS}) != 1
+        candles = reader.candles(ticker, 8)
+        if candles is not None:
+            candle_reads += 1
+            timestamps, ohlcv = candles
+            torn += int(np.count_nonzero((ohlcv != ohlcv[:1]).any(axis=0)))
+
+    elapsed = time.perf_counter() - started
+    results.put((reader_id, received, reader.dropped, torn, out_of_order, latest_reads, candle_reads, elapsed))
+    reader.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="시세 버스 동시성/처리량 벤치마크")
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--candle-every', type=int, default=50, help="틱 N개마다 캔들 1개 기록")
+    args = parser.parse_args()
+
+    name = f"bus-bench-{mp.current_process().pid}"
+    ready = mp.Event()
+    results = mp.Queue()
+    publisher = mp.Process(
+        target=publish, args=(name, ready, args.messages, args.tickers, args.candle_every)
+    )
+    publisher.start()
+    ready.wait()
+
+    readers = [
+        mp.Process(target=consume, args=(name, i, args.messages, args.tickers, results))
+        for i in range(args.readers)
+    ]
+    for reader in readers:
+        reader.start()
+    outcomes = [results.get() for _ in readers]
+    for reader in readers:
+        reader.join()
+    publisher.join()
+
+    failed = False
+    for reader_id, received, dropped, torn, out_of_order, latest_reads, candle_reads, elapsed in sorted(outcomes):
+        print(
+            f"독자 {reader_id}: 수신 {received:,}개 ({received / elapsed:,.0f}개/초), 추월 {dropped:,}개, "
+            f"찢어진 읽기 {torn}, 순서 오류 {out_of_order}, 최신 틱 {latest_reads:,}회, 캔들 {candle_reads:,}회"
+        )
+        failed |= bool(torn or out_of_order or received + dropped < args.messages)
+    print("결과: " + ("실패" if failed else "이상 없음"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+지표 계산 마이크로벤치마크 (pandas vs NumPy 커널)
+
+NumPy 커널 결과가 pandas 결과와 일치하는지 먼저 확인한 뒤 호출당 소요 시간을 비교한다.
+실행: python -m benchmarks.indicator_benchmark --rows 200 --repeat 2000
+"""
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+from data_analyzer import indicators
+from benchmarks.memory_benchmark import make_candles
+
+def pandas_rsi(close, period=14):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+def pandas_macd(close, fast=12, slow=26, signal=9):
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    return line, line.ewm(span=signal, adjust=False).mean()
+
+def build_cases(close_series):
+    """(이름, pandas 함수, numpy 함수) 목록"""
+    close = close_series.to_numpy()
+    return [
+        ('SMA(20)',
+         lambda: close_series.rolling(window=20).mean(),
+         lambda: indicators.sma(close, 20)),
+        ('STD(20)',
+         lambda: close_series.rolling(window=20).std(),
+         lambda: indicators.rolling_std(close, 20)),
+        ('EMA(12)',
+         lambda: close_series.ewm(span=12, adjust=False).mean(),
+         lambda: indicators.ema(close, 12)),
+        ('RSI(14)',
+         lambda: pandas_rsi(close_series),
+         lambda: indicators.rsi(close)),
+        ('MACD(12,26,9)',
+         lambda: pandas_macd(close_series),
+         lambda: indicators.macd(close)),
+        ('bfill+ffill',
+         lambda: close_series.rolling(window=20).mean().bfill().ffill(),
+         lambda: indicators.fill_nan(indicators.sma(close, 20))),
+    ]
+
+def check_parity(expected, actual, name):
+    """pandas 결과와 NumPy 결과 비교 (NaN 위치 포함, 긴 배열에서는 pandas 누적 오차를 감안)"""
+    if isinstance(expected, tuple):
+        for e, a in zip(expected, actual):
+            check_parity(e, a, name)
+        return
+    expected = np.asarray(expected, dtype=np.float64)
+    if not np.allclose(expected, actual, rtol=1e-6, atol=1e-9, equal_nan=True):
+        max_error = np.nanmax(np.abs(expected - actual))
+        raise AssertionError(f"{name} 결과 불일치 (최대 오차: {max_error})")
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 계산 마이크로벤치마크")
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+    
+    close_series = make_candles(args.rows)['close'].reset_index(drop=True)
+    cases = build_cases(close_series)
+    
+    for name, pandas_func, numpy_func in cases:
+        check_parity(pandas_func(), numpy_func(), name)
+    print(f"결과 일치 확인 완료 ({len(cases)}개 지표, 캔들 {args.rows}개)")
+    
+    print(f"{'지표':<16}{'pandas(us)':>12}{'numpy(us)':>12}{'배속':>8}")
+    for name, pandas_func, numpy_func in cases:
+        pandas_time = min(timeit.repeat(pandas_func, number=args.repeat, repeat=3)) / args.repeat
+        numpy_time = min(timeit.repeat(numpy_func, number=args.repeat, repeat=3)) / args.repeat
+        print(
+            f"{name:<16}{pandas_time * 1e6:>12.1f}{numpy_time * 1e6:>12.1f}"
+            f"{pandas_time / numpy_time:>7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
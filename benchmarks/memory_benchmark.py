@@ -0,0 +1,80 @@
+"""
+분석기 메모리 벤치마크 (종목당 바이트)
+
+실행: python -m benchmarks.memory_benchmark --tickers 200 --rows 200
+"""
+import argparse
+import logging
+import tracemalloc
+import numpy as np
+import pandas as pd
+from data_analyzer.analyzer import DataAnalyzer, OHLCV_COLUMNS, INDICATOR_COLUMNS
+
+def make_candles(rows, seed=0):
+    """벤치마크용 랜덤워크 캔들 DataFrame"""
+    rng = np.random.default_rng(seed)
+    close = 50_000_000 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    spread = close * rng.uniform(0, 0.002, rows)
+    volume = rng.gamma(2.0, 1.0, rows)
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 1, rows) * spread,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': volume,
+        'value': volume * close
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='min'))
+
+def measure(build, count):
+    """count개 객체 생성 후 남아 있는 메모리(바이트)와 최대 사용량 측정"""
+    tracemalloc.start()
+    objects = [build(i) for i in range(count)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current, peak
+
+def build_legacy(df):
+    """기존 구조: 12컬럼 float64 DataFrame + 사용되지 않는 중복 분석기"""
+    def build(i):
+        frame = df.copy()
+        for name in INDICATOR_COLUMNS:
+            frame[name] = frame['close'].to_numpy()
+        duplicate = pd.DataFrame()  # candle_analyzers 중복 인스턴스
+        return frame, duplicate
+    return build
+
+def build_compact(df, indicator_dtype):
+    candles = DataAnalyzer.to_arrays(df)
+    def build(i):
+        analyzer = DataAnalyzer(f"KRW-T{i}", indicator_dtype=indicator_dtype)
+        analyzer.calculate_indicators((candles[0].copy(), candles[1].copy()))
+        return analyzer
+    return build
+
+def main():
+    parser = argparse.ArgumentParser(description="분석기 메모리 벤치마크")
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=200)
+    args = parser.parse_args()
+    
+    logging.getLogger().setLevel(logging.WARNING)
+    df = make_candles(args.rows)
+    
+    cases = [
+        ('legacy (DataFrame x2)', build_legacy(df)),
+        ('compact float64', build_compact(df, 'float64')),
+        ('compact float32', build_compact(df, 'float32')),
+    ]
+    
+    print(f"종목 수: {args.tickers}, 캔들 수: {args.rows}, "
+          f"컬럼: {len(OHLCV_COLUMNS)} OHLCV + {len(INDICATOR_COLUMNS)} 지표")
+    for name, build in cases:
+        current, peak = measure(build, args.tickers)
+        print(
+            f"{name:<24} 종목당 {current / args.tickers:>10,.0f} bytes "
+            f"(최대 {peak / args.tickers:>10,.0f} bytes)"
+        )
+
+if __name__ == "__main__":
+    main()
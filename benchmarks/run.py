@@ -0,0 +1,363 @@
+"""
+매매 핵심 경로 벤치마크 모음
+
+고정 시드 합성 데이터(market_data.synthetic)로 여러 규모(종목 수 x 캔들 수)에서 다음 경로를 측정한다.
+- calculate_indicators: 종목 하나의 지표 계산
+- analyze: 종목 하나의 전략 신호 분석 (모든 전략)
+- tick_loop: AutoTrade.handle_feed_message 한 번 (틱 하나 처리, 주기 작업 포함)
+- orderbook_update: 15단계 호가 메시지 하나를 OrderBook에 반영 (미시구조 피처 포함)
+- trade_update: 체결 메시지 하나를 TradeFlow에 반영 (구간 VWAP, 매수/매도 주도 거래량, 가격대별 거래량)
+- correlation_roll: 1분 구간이 바뀌는 틱 하나 (전체 종목 수익률 공분산 rank-1 갱신, 종목 수^2에 비례)
+- log_status: 상태 메시지 생성
+- daily_report: PerformanceAnalyzer.generate_daily_report (JOURNAL_DAYS일치 거래 기록 저널에서 조회)
+- weekly_report: PerformanceAnalyzer.generate_weekly_report
+- equity_metrics: 1분 간격 1년치 평가금액 곡선의 성과 지표 (analytics_service.performance_metrics, 규모와 무관)
+
+연산마다 시간을 재서 지연 백분위수와 처리량을 구하고, 측정 전 한 번 돌리는 동안 tracemalloc으로
+최대 메모리 증가량을 잰다. 결과는 JSON으로 저장하므로 커밋 사이에 비교할 수 있다.
+(로그 출력 비용을 빼기 위해 측정 중에는 ERROR 미만 로그를 끔)
+
+실행:
+python -m benchmarks.run                                  # benchmarks/results/<커밋>.json 저장
+python -m benchmarks.run --scales 10x200,100x10000 --cases analyze,tick_loop --min-time 0.5
+python -m benchmarks.run compare benchmarks/results/a1b2c3d4.json benchmarks/results/e5f6a7b8.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timedelta
+import numpy as np
+
+from market_data.synthetic import SyntheticMarket
+
+BENCH_SEED = 20240101
+DEFAULT_SCALES = ((10, 200), (100, 200), (500, 200), (10, 10_000), (100, 10_000), (500, 10_000))
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+TICKS_PER_SCALE = 20_000
+TRADES_PER_TICKER = 20     # 종목당 하루 거래 수
+JOURNAL_DAYS = 30
+EQUITY_POINTS = 365 * 24 * 60  # 1분 간격 1년
+
+class Dataset:
+    """규모별 고정 합성 데이터 (캔들 + 이어지는 틱)"""
+
+    def __init__(self, tickers, bars):
+        self.market = SyntheticMarket(tickers, seed=BENCH_SEED)
+        start = self.market.start + np.timedelta64(bars, 'm')
+        self.candles = self.market.candles(bars)
+        self.ticks = list(self.market.ticks(
+            TICKS_PER_SCALE, rate=200, start=start,
+            start_prices=[ohlcv[3, -1] for _, ohlcv in self.candles.values()]
+        ))
+
+class _SyntheticSession:
+    """ReplayAutoTrade에 넘길 재생기 대신 쓰는 세션 (시각은 처리 중인 틱의 거래소 시각)"""
+
+    def __init__(self, tickers):
+        self.tickers = tickers
+        self.current = None
+
+    def session(self):
+        return {'tickers': self.tickers}
+
+    def now(self):
+        return self.current if self.current is not None else time.time()
+
+def build_trader(dataset):
+    """합성 캔들로 워밍업을 마친 테스트 모드 AutoTrade (알림/기록/거래소 조회 없음)"""
+    from trading.replay import ReplayAutoTrade
+
+    session = _SyntheticSession(dataset.market.tickers)
+    trader = ReplayAutoTrade(session)
+    for ticker, candles in dataset.candles.items():
+        trader.apply_candles(ticker, candles)
+    # 주기 작업 기준 시각을 첫 틱 시각으로 맞춤
+    session.current = dataset.ticks[0]['timestamp'] / 1000
+    trader.last_status_time = trader.last_data_update = trader.last_report_check = trader.last_mark_time = session.now()
+    return trader, session
+
+def case_calculate_indicators(dataset):
+    from data_analyzer.analyzer import DataAnalyzer
+    from data_analyzer.strategies import build_strategies
+    from config import STRATEGIES
+
+    strategies = build_strategies(STRATEGIES)
+    analyzers = [(DataAnalyzer(ticker, strategies=strategies), candles) for ticker, candles in dataset.candles.items()]
+    return [lambda analyzer=analyzer, candles=candles: analyzer.calculate_indicators(candles)
+            for analyzer, candles in analyzers]
+
+def case_analyze(dataset):
+    trader, _ = build_trader(dataset)
+
+    def analyze(analyzer):
+        for strategy in trader.strategies:
+            strategy.last_signal_time.clear()  # 쿨다운 없이 매번 전체 판단
+            strategy.analyze(analyzer)
+    return [lambda analyzer=analyzer: analyze(analyzer) for analyzer in trader.analyzers.values()]
+
+def case_tick_loop(dataset):
+    trader, session = build_trader(dataset)
+
+    def handle(message):
+        session.current = message['timestamp'] / 1000
+        trader.handle_feed_message(message)
+    return [lambda message=message: handle(message) for message in dataset.ticks]
+
+def case_orderbook_update(dataset):
+    from market_data.orderbook import OrderBook
+
+    rng = np.random.default_rng(BENCH_SEED)
+    book = OrderBook(dataset.market.tickers)
+    messages = []
+    for message in dataset.ticks[:2000]:  # 틱 가격 주변 15단계 호가 (업비트 orderbook 메시지 형식)
+        price = message['trade_price']
+        step = price * 1e-4
+        sizes = rng.exponential(1e6 / price, (15, 2))
+        messages.append({
+            'type': 'orderbook', 'code': message['code'], 'timestamp': message['timestamp'],
+            'orderbook_units': [
+                {'ask_price': price + step * (i + 1), 'bid_price': price - step * i,
+                 'ask_size': float(sizes[i, 0]), 'bid_size': float(sizes[i, 1])}
+                for i in range(15)
+            ]
+        })
+    return [lambda message=message: book.update(message) for message in messages]
+
+def case_trade_update(dataset):
+    from market_data.trades import TradeFlow
+
+    flow = TradeFlow(dataset.market.tickers)
+    messages = [{**message, 'type': 'trade'} for message in dataset.ticks]
+    return [lambda message=message: flow.update(message) for message in messages]
+
+def case_correlation_roll(dataset):
+    from data_analyzer.correlation import ReturnCorrelation
+
+    correlation = ReturnCorrelation(dataset.market.tickers)
+    correlation.seed({ticker: (timestamps, ohlcv[3]) for ticker, (timestamps, ohlcv) in dataset.candles.items()})
+    minute = [0]
+
+    def roll(message):  # 매번 다음 1분 구간의 틱
+        minute[0] += 1
+        correlation.observe(message['code'], message['trade_price'], minute[0] * 60_000)
+    return [lambda message=message: roll(message) for message in dataset.ticks[:2000]]
+
+def case_log_status(dataset):
+    trader, session = build_trader(dataset)
+    for message in dataset.ticks:  # 현재가 캐시와 보유 상태 채우기
+        session.current = message['timestamp'] / 1000
+        trader.handle_feed_message(message)
+    return [trader.log_status]
+
+def build_journal_analyzer(dataset):
+    """오늘까지 JOURNAL_DAYS일 동안 종목마다 하루 TRADES_PER_TICKER번 매도한 기록이 있는 분석기"""
+    from services.performance_service import PerformanceAnalyzer
+    from services.trade_journal import TradeJournal, to_row
+
+    analyzer = PerformanceAnalyzer(dataset.market.tickers, journal=TradeJournal(':memory:'))
+    rng = np.random.default_rng(BENCH_SEED)
+    now = datetime.now()
+    for days_ago in range(JOURNAL_DAYS):
+        day_start = (now - timedelta(days=days_ago)).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        rows = [
+            to_row(day_start + float(offset), ticker, {'type': 'sell', 'profit': float(profit)})
+            for ticker in dataset.market.tickers
+            for offset, profit in zip(
+                rng.uniform(0, 86_400, TRADES_PER_TICKER), rng.normal(0.2, 2.0, TRADES_PER_TICKER)
+            )
+        ]
+        analyzer.journal._write_rows(rows)
+    analyzer.load_aggregates()
+    return analyzer
+
+def case_daily_report(dataset):
+    return [build_journal_analyzer(dataset).generate_daily_report]
+
+def case_weekly_report(dataset):
+    return [build_journal_analyzer(dataset).generate_weekly_report]
+
+def case_equity_metrics(dataset):
+    from services.analytics_service import performance_metrics
+
+    rng = np.random.default_rng(BENCH_SEED)
+    times = 1_700_000_000.0 + np.arange(EQUITY_POINTS) * 60.0
+    equity = 1_000_000 * np.cumprod(1 + rng.normal(0, 1e-4, EQUITY_POINTS))
+    invested = equity * (rng.random(EQUITY_POINTS) < 0.5)
+    return [lambda: performance_metrics(times, equity, invested, 5_000_000)]
+
+CASES = {
+    'calculate_indicators': case_calculate_indicators,
+    'analyze': case_analyze,
+    'tick_loop': case_tick_loop,
+    'orderbook_update': case_orderbook_update,
+    'trade_update': case_trade_update,
+    'correlation_roll': case_correlation_roll,
+    'log_status': case_log_status,
+    'daily_report': case_daily_report,
+    'weekly_report': case_weekly_report,
+    'equity_metrics': case_equity_metrics,
+}
+
+def measure(operations, min_time, max_ops):
+    """
+    연산 목록을 한 번 돌려 최대 메모리를 재고, min_time 초 이상 반복하며 연산별 시간 측정
+    :return: (연산별 시간 ns 배열, 최대 메모리 증가량 bytes)
+    """
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for operation in operations:
+        operation()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    timings = []
+    clock = time.perf_counter_ns
+    started = clock()
+    while not timings or (clock() - started < min_time * 1e9 and len(timings) < max_ops):
+        for operation in operations:
+            begin = clock()
+            operation()
+            timings.append(clock() - begin)
+    return np.array(timings, dtype=np.int64), peak
+
+def summarize(timings, peak):
+    p50, p90, p99 = np.percentile(timings, (50, 90, 99)) / 1e3
+    return {
+        'ops': int(len(timings)),
+        'mean_us': float(timings.mean() / 1e3),
+        'p50_us': float(p50),
+        'p90_us': float(p90),
+        'p99_us': float(p99),
+        'max_us': float(timings.max() / 1e3),
+        'ops_per_sec': float(len(timings) / (timings.sum() / 1e9)),
+        'peak_memory_bytes': int(peak)
+    }
+
+def git_revision():
+    """(커밋 해시, 작업 트리 변경 여부) (git이 없으면 (None, None))"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+def run(scales, cases, min_time, max_ops):
+    commit, dirty = git_revision()
+    results = []
+    logging.getLogger().setLevel(logging.ERROR)
+    for tickers, bars in scales:
+        dataset = Dataset(tickers, bars)
+        for name in cases:
+            timings, peak = measure(CASES[name](dataset), min_time, max_ops)
+            result = {'case': name, 'tickers': tickers, 'bars': bars, **summarize(timings, peak)}
+            results.append(result)
+            print(
+                f"{name:<22} {tickers:>4}종목 x {bars:>6,}봉  "
+                f"p50 {result['p50_us']:>10,.1f}us  p99 {result['p99_us']:>10,.1f}us  "
+                f"{result['ops_per_sec']:>12,.0f}회/초  메모리 {peak / 1e6:>8.2f}MB"
+            )
+    return {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'min_time': min_time
+        },
+        'results': results
+    }
+
+def compare(old, new, threshold):
+    """
+    두 결과 비교 (p50 지연이 threshold 비율 이상 늘면 성능 저하)
+    :return: 성능 저하 항목 목록
+    """
+    previous = {(r['case'], r['tickers'], r['bars']): r for r in old['results']}
+    regressions = []
+    print(f"기준: {old['meta'].get('commit')} -> 비교: {new['meta'].get('commit')}")
+    for result in new['results']:
+        key = (result['case'], result['tickers'], result['bars'])
+        before = previous.get(key)
+        if before is None:
+            continue
+        p50 = result['p50_us'] / before['p50_us'] - 1
+        p99 = result['p99_us'] / before['p99_us'] - 1
+        memory = result['peak_memory_bytes'] - before['peak_memory_bytes']
+        flag = ''
+        if p50 > threshold:
+            flag = '  << 저하'
+            regressions.append(key)
+        elif p50 < -threshold:
+            flag = '  >> 개선'
+        print(
+            f"{key[0]:<22} {key[1]:>4}종목 x {key[2]:>6,}봉  "
+            f"p50 {before['p50_us']:>10,.1f} -> {result['p50_us']:>10,.1f}us ({p50:+.1%})  "
+            f"p99 ({p99:+.1%})  메모리 {memory / 1e6:+.2f}MB{flag}"
+        )
+    return regressions
+
+def parse_scales(text):
+    """'10x200,100x10000' -> ((10, 200), (100, 10000))"""
+    return tuple(tuple(int(part) for part in item.split('x')) for item in text.split(','))
+
+def main():
+    parser = argparse.ArgumentParser(description="매매 핵심 경로 벤치마크")
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help="벤치마크 실행 (기본 명령)")
+    compare_parser = subparsers.add_parser('compare', help="두 결과 파일 비교")
+    compare_parser.add_argument('old', help="기준 결과 JSON")
+    compare_parser.add_argument('new', help="비교할 결과 JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="성능 저하로 볼 p50 증가 비율")
+
+    for target in (parser, run_parser):
+        target.add_argument('--scales', type=parse_scales, default=DEFAULT_SCALES,
+                            help="종목 수x캔들 수 목록 (예: 10x200,100x10000)")
+        target.add_argument('--cases', default=','.join(CASES), help="측정할 경로 (쉼표 구분)")
+        target.add_argument('--min-time', type=float, default=1.0, help="경로별 최소 측정 시간 (초)")
+        target.add_argument('--max-ops', type=int, default=200_000, help="경로별 최대 측정 횟수")
+        target.add_argument('--out', help="결과 JSON 경로 (기본값: benchmarks/results/<커밋>.json)")
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            print(f"성능 저하 {len(regressions)}건 (p50 {args.threshold:.0%} 이상 증가)")
+            sys.exit(1)
+        return
+
+    cases = args.cases.split(',')
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"알 수 없는 경로: {', '.join(sorted(unknown))}")
+
+    report = run(args.scales, cases, args.min_time, args.max_ops)
+    path = args.out
+    if not path:
+        commit = report['meta']['commit']
+        name = f"{commit[:8]}{'-dirty' if report['meta']['dirty'] else ''}" if commit else datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,6 @@ import logging
 from dotenv import load_dotenv
 import pyupbit
 
-# 로그 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("trading_bot.log"),
-        logging.StreamHandler()
-    ]
-)
-
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -22,6 +12,13 @@ UPBIT_SECRET_KEY = os.getenv("SEC_KEY")
 SLACK_APP_TOKEN = os.getenv("APP_TOKEN")
 SLACK_CHANNEL = os.getenv("CHANNEL")
 
+# 로컬 모의 거래소 (설정 시 모든 업비트 REST/웹소켓 호출을 python -m mock_exchange.server로 보냄)
+# 종목 조회보다 먼저 적용해야 하므로 환경 변수로 설정 (예: MOCK_EXCHANGE_URL=http://127.0.0.1:8765)
+MOCK_EXCHANGE_URL = os.getenv("MOCK_EXCHANGE_URL")
+if MOCK_EXCHANGE_URL:
+    from mock_exchange.client import use_mock_exchange
+    use_mock_exchange(MOCK_EXCHANGE_URL, os.getenv("MOCK_EXCHANGE_WS_URL"))
+
 # Slack 채널 설정
 SLACK_CHANNELS = {
     'status': 'trading-status',     # 주기적 상태 업데이트
@@ -79,10 +76,25 @@ REAL_TRADING = False  # True: 실제 거래, False: 테스트 거래
 # 거래 설정
 START_CASH = 1_000_000          # 시작 자금 (테스트 모드)
 MIN_TRADING_AMOUNT = 5000       # 최소 거래금액
+TRADING_FEE_RATE = 0.0005       # 거래 수수료율 (업비트 원화 마켓 0.05%, 테스트 모드 현금/거래 기록에 적용)
 MAX_COINS_AT_ONCE = 2          # 동시 보유 가능한 최대 코인 수 (2개로 수정)
+MAX_CORRELATION = 0.8          # 보유 종목과 1분 수익률 상관계수가 이 값 이상이면 신규 매수 보류 (None이면 사용 안 함)
+CORRELATION_HALFLIFE = 60      # 상관계수 지수 가중 반감기 (1분봉 수)
+CORRELATION_MIN_PERIODS = 30   # 상관계수를 사용하기 위한 종목별 최소 1분 수익률 수
 CASH_USAGE_RATIO = 0.4         # 코인당 최대 투자 비율 (40%)
 STOP_LOSS = 0.05              # 손절 라인 (5%)
 
+# 전략 설정 (한 프로세스에서 같은 피드/지표를 공유하며 실행)
+# allocation: 시작 자금 중 전략에 배분할 비율 (합계 1 이하)
+STRATEGIES = [
+    {
+        'type': 'IndicatorStrategy',
+        'name': 'indicator',
+        'allocation': 1.0,
+        'params': {}
+    }
+]
+
 # 물타기 설정 추가
 AVERAGING_DOWN_RATIO = 0.5     # 물타기 시 추가 매수 비율 (기존 보유 금액의 50%)
 MAX_AVERAGING_DOWN = 1         # 코인당 최대 물타기 횟수
@@ -90,4 +102,65 @@ MAX_AVERAGING_DOWN = 1         # 코인당 최대 물타기 횟수
 # 시간 간격 설정
 REPORT_CHECK_INTERVAL = 30  # 리포트 체크 간격 (30초)
 DATA_UPDATE_INTERVAL = 300  # 데이터 업데이트 간격 (5분)
-STATUS_INTERVAL = 300      # 상태 체크 간격 (5분)
\ No newline at end of file
+STATUS_INTERVAL = 300      # 상태 체크 간격 (5분)
+MARK_INTERVAL = 60         # 보유 종목 평가 가격 기록 간격 (1분, 리포트의 평가금액 곡선용)
+
+# 워밍업 설정
+WARMUP_WORKERS = 4          # 초기 데이터 병렬 조회 스레드 수
+QUOTATION_RATE_LIMIT = 8    # 시세 조회 API 초당 호출 제한 (업비트 기준 10회/초)
+
+# 분산 실행 설정 (종목을 여러 프로세스에 나눠 매매, 리스크 코디네이터가 전역 한도 관리)
+SHARD_WORKERS = 0           # 종목 샤드 프로세스 수 (0이면 단일 프로세스 실행)
+SHARD_ALL_MARKETS = False   # True: 모든 원화 마켓 감시, False: TICKERS만 감시
+
+# 공유 메모리 시세 버스 (python -m market_data.bus로 실행한 퍼블리셔 이름, None이면 직접 연결)
+MARKET_DATA_BUS = None
+
+# 시세 피드 기록 (설정한 디렉터리에 원본 웹소켓 메시지를 압축 저장, None이면 기록 안 함)
+FEED_RECORD_DIR = None
+
+# 거래 기록 저널 (SQLite, 재시작 후에도 유지되며 python -m services.trade_journal로 조회)
+TRADE_JOURNAL_PATH = "data/trades.db"
+
+# 재시작용 상태 스냅숏 (보유 포지션, 신호 쿨다운, 캔들/지표, None이면 사용 안 함)
+SNAPSHOT_PATH = "data/auto_trade.snapshot"
+SNAPSHOT_INTERVAL = 60       # 주기 저장 간격 (초, 매매 직후와 종료 시에도 저장)
+SNAPSHOT_MAX_AGE = 600       # 이보다 오래된 스냅숏의 캔들/지표는 사용하지 않고 새로 워밍업 (초)
+
+# 메트릭 내보내기 (Prometheus 텍스트 형식, 둘 다 None이면 내보내지 않음)
+METRICS_PORT = None          # 예: 9108 -> http://127.0.0.1:9108/metrics (샤드는 포트 + 1 + 샤드 번호)
+METRICS_FILE = None          # 예: "metrics/auto_trade.prom" (node_exporter textfile collector용)
+METRICS_INTERVAL = 15        # 메트릭 파일 갱신 간격 (초)
+
+# 시세 지연 감시 (거래소 메시지 시각 대비 처리 시각)
+FEED_LAG_WINDOW = 1000       # 종목별 백분위수 계산에 쓰는 최근 메시지 수
+FEED_LAG_MAX_ENTRY = 3.0     # 마지막 시세 지연이 이 값(초)을 넘는 종목은 신규 매수 보류 (None이면 사용 안 함)
+
+# 로그 설정 (진입점에서 utils.log.setup_logging()으로 적용)
+LOG_FILE = "trading_bot.log"
+LOG_LEVEL = "INFO"
+LOG_MAX_BYTES = 50 * 1024 * 1024    # 이 크기를 넘으면 파일 교체 (0이면 교체 안 함)
+LOG_BACKUP_COUNT = 5                # 보관할 이전 로그 파일 수 (trading_bot.log.1 ~ .5)
+LOG_THROTTLE_INTERVAL = 60          # 반복 경고(매수 불가 등)를 같은 종목당 다시 기록하기까지의 간격 (초)
+
+# 실행 중 프로파일링 (SIGUSR1: CPU 프로파일 시작/중지, SIGUSR2: 메모리 스냅샷)
+PROFILE_DIR = "profiles"     # 프로파일 결과 저장 디렉터리
+PROFILE_INTERVAL = 0.005     # CPU 샘플링 간격 (초)
+CONTROL_SOCKET = None        # 제어 소켓 경로 (예: "auto_trade.sock", 샤드는 뒤에 .shard번호)
+
+# 분석기 메모리 설정
+INDICATOR_DTYPE = 'float64'  # 지표 배열 자료형 ('float32'로 설정 시 지표 메모리 절반)
+# 상위 시간 프레임 (전략이 사용하는 5분/15분/60분 등의 캔들은 1분봉으로 만들어 유지)
+TIMEFRAME_BARS = 50          # 시간 프레임별로 유지하는 완성 봉 수 (첫 워밍업은 이만큼의 1분봉을 조회)
+
+# 호가 구독 (전략이 'liquidity' 규칙을 쓰면 자동으로 구독, True면 항상 구독)
+ORDERBOOK_STREAM = False
+ORDERBOOK_LEVELS = 15        # 종목별로 보관하는 호가 단계 수
+ORDERBOOK_DEPTH = 5          # 잔량/불균형 계산에 쓰는 상위 호가 수
+
+# 체결 구독 (전략이 'flow' 규칙이나 volume_source='trades'를 쓰면 자동으로 구독, True면 항상 구독)
+TRADE_STREAM = False
+TRADE_WINDOW = 60            # 체결 누적 구간 (초)
+TRADE_BUFFER = 2048          # 종목별로 보관하는 최근 체결 수 (구간 안 체결이 더 많으면 오래된 체결부터 제외)
+PROFILE_BUCKETS = 64         # 가격대별 거래량 칸 수
+PROFILE_BUCKET_BPS = 10      # 가격대 간격 (첫 체결가 대비 bp)
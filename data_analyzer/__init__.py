@@ -1,3 +1,3 @@
 from .analyzer import DataAnalyzer
 
-__all__ = ['DataAnalyzer', 'CandleAnalyzer']
\ No newline at end of file
+__all__ = ['DataAnalyzer']
\ No newline at end of file
@@ -5,102 +5,264 @@ import pandas as pd
 import traceback
 import time
 from utils.decorators import send_error_alert
+from utils.rate_limiter import quotation_limiter
+from utils.log import log_event
+from data_analyzer import feature_graph
+from data_analyzer.strategies import IndicatorStrategy, collect_required_features, collect_required_timeframes
+from data_analyzer.timeframes import TimeframeSeries, closed_index
+from config import INDICATOR_DTYPE, TIMEFRAME_BARS
 
-# 로그 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("trading_bot.log"),  # 로그를 파일에 기록
-        logging.StreamHandler()  # 로그를 콘솔에 출력
-    ]
-)
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'value')
+
+# 컬럼명 -> 배열 행 번호
+OHLCV_INDEX = {name: i for i, name in enumerate(OHLCV_COLUMNS)}
+
+# 호환용 지표 컬럼 이름 -> 피처 키 (기본 전략 파라미터 기준)
+INDICATOR_COLUMNS = {
+    'rsi': ('rsi', 14),
+    'macd': ('macd', 12, 26),
+    'macd_signal': ('macd_signal', 12, 26, 9),
+    'bb_middle': ('bb_middle', 20),
+    'bb_upper': ('bb_upper', 20, 2),
+    'bb_lower': ('bb_lower', 20, 2)
+}
+
+# 앞뒤 값으로 채워지므로 NaN이 남으면 안 되는 피처 종류
+FILLED_FEATURE_KINDS = ('rsi', 'macd', 'macd_signal', 'bb_middle', 'bb_upper', 'bb_lower')
 
 class DataAnalyzer:
-    def __init__(self, ticker):
+    # 종목 수만큼 생성되므로 인스턴스 __dict__ 없이 고정 슬롯만 사용
+    __slots__ = (
+        'ticker', 'timestamps', 'ohlcv', 'features', 'strategies', 'required_features',
+        'indicator_dtype', 'timeframes', 'orderbook', 'trades'
+    )
+
+    def __init__(self, ticker, indicator_dtype=INDICATOR_DTYPE, strategies=None):
+        """
+        종목별 캔들/지표 공유 상태
+        :param ticker: 종목 코드
+        :param indicator_dtype: 지표 배열 자료형 ('float32' 사용 시 메모리 절반)
+        :param strategies: 이 상태를 공유하는 전략 목록 (기본값: IndicatorStrategy 하나)
+
+        보유 캔들은 1분봉이며, 전략이 사용하는 상위 시간 프레임 캔들/지표는 1분봉으로 만들어 유지한다.
+        """
         self.ticker = ticker
         logging.info("DataAnalyzer 초기화 시작")
-        self.df = pd.DataFrame()
-        self.last_signal = None
-        self.last_signal_time = None
-        self.signal_cooldown = 300  # 신호 재발생 대기시간 (5분)
+        self.indicator_dtype = np.dtype(indicator_dtype)
+        self.timestamps = np.empty(0, dtype='datetime64[ns]')
+        self.ohlcv = np.empty((len(OHLCV_COLUMNS), 0), dtype=np.float64)  # 행: OHLCV_COLUMNS
+        self.features = {}  # 피처 키 -> 지표 배열
+        self.strategies = tuple(strategies) if strategies else (IndicatorStrategy(),)
+        # 모든 전략이 사용하는 피처만 갱신 시 계산
+        self.required_features = collect_required_features(self.strategies)
+        # 시간 프레임 이름 -> (상위 봉 시리즈, 상위 봉 캔들/지표 분석기)
+        self.timeframes = {}
+        for name, keys in collect_required_timeframes(self.strategies).items():
+            self.add_timeframe(name, keys)
+        # 실시간 호가 피처 (market_data.orderbook.OrderBook, 호가를 구독할 때 AutoTrade가 연결)
+        self.orderbook = None
+        # 실시간 체결 누적값 (market_data.trades.TradeFlow, 체결을 구독할 때 AutoTrade가 연결)
+        self.trades = None
         logging.info("DataAnalyzer 초기화 완료")
 
+    @classmethod
+    def frame(cls, ticker, indicator_dtype, required_features=()):
+        """상위 시간 프레임 캔들/지표 보관용 분석기 (전략/로그 없음, feature()로 지표 조회)"""
+        frame = object.__new__(cls)
+        frame.ticker = ticker
+        frame.indicator_dtype = indicator_dtype
+        frame.timestamps = np.empty(0, dtype='datetime64[ns]')
+        frame.ohlcv = np.empty((len(OHLCV_COLUMNS), 0), dtype=np.float64)
+        frame.features = {}
+        frame.strategies = ()
+        frame.required_features = tuple(required_features)
+        frame.timeframes = {}
+        frame.orderbook = None
+        frame.trades = None
+        return frame
+
+    def add_timeframe(self, name, required_features=(), bars=TIMEFRAME_BARS):
+        """
+        상위 시간 프레임 추가 (보유 1분봉으로 바로 채움)
+        :param required_features: 상위 봉 갱신 시 미리 계산할 피처 키 (그 외 피처는 조회 시 계산)
+        :param bars: 유지할 완성 봉 수
+        """
+        series = TimeframeSeries(name, bars, len(OHLCV_COLUMNS))
+        self.timeframes[name] = (series, self.frame(self.ticker, self.indicator_dtype, required_features))
+        self.extend_timeframes(names=(name,))
+
+    def timeframe(self, name):
+        """
+        상위 시간 프레임 캔들/지표 분석기 (column()/feature()로 조회, 추가 조회 없음)
+        선언되지 않은 시간 프레임은 이때 보유 1분봉으로 만든다 (백테스트용).
+        """
+        if name not in self.timeframes:
+            self.add_timeframe(name)
+        return self.timeframes[name][1]
+
+    def timeframe_index(self, name, index=-1):
+        """
+        1분봉 위치(정수 또는 slice) -> 그 시점에 완성되어 있던 마지막 상위 봉 위치 (없으면 -1)
+        진행 중인 상위 봉은 백테스트와 결과가 달라지지 않도록 사용하지 않는다.
+        """
+        frame = self.timeframe(name)
+        return closed_index(self.timestamps[index], frame.timestamps, self.timeframes[name][0].minutes)
+
+    def extend_timeframes(self, candles=None, names=None):
+        """
+        새 1분봉을 상위 시간 프레임에 반영 (이미 반영한 1분봉은 건너뜀, 1분봉 하나당 O(1))
+        :param candles: (timestamps, ohlcv) 1분봉 (기본값: 현재 보유 캔들)
+        :param names: 갱신할 시간 프레임 (기본값: 전체)
+        """
+        timestamps, ohlcv = candles if candles is not None else (self.timestamps, self.ohlcv)
+        for name in names or tuple(self.timeframes):
+            series, frame = self.timeframes[name]
+            if series.extend(timestamps, ohlcv):
+                self._load_frame(series, frame)
+
+    def restore_timeframe(self, name, timestamps, ohlcv):
+        """
+        저장해 둔 상위 봉(마지막은 진행 중인 봉)으로 시간 프레임 복원 (스냅숏용)
+        진행 중인 봉은 보유 1분봉으로 다시 만든다 (load_candles 이후 호출).
+        """
+        if name not in self.timeframes:
+            return
+        series, frame = self.timeframes[name]
+        series.restore(timestamps, ohlcv)
+        series.extend(self.timestamps, self.ohlcv)
+        self._load_frame(series, frame)
+
+    @staticmethod
+    def _load_frame(series, frame):
+        """상위 봉 시리즈 -> 분석기 캔들 교체 후 필요한 피처 계산 (계산이 끝난 뒤 한 번에 교체)"""
+        timestamps, ohlcv = series.arrays()
+        computed = feature_graph.evaluate(frame.required_features, lambda name: ohlcv[OHLCV_INDEX[name]])
+        features = {
+            key: np.asarray(computed[key], dtype=frame.indicator_dtype)
+            for key in frame.required_features if key[0] not in OHLCV_INDEX
+        }
+        frame.timestamps, frame.ohlcv, frame.features = timestamps, ohlcv, features
+
+    def orderbook_features(self):
+        """최신 호가 피처 {이름: 값} (호가를 구독하지 않거나 아직 받지 못했으면 None)"""
+        if self.orderbook is None:
+            return None
+        return self.orderbook.features(self.ticker)
+
+    def trade_features(self):
+        """최근 체결 구간 누적값 {이름: 값} (체결을 구독하지 않거나 아직 받지 못했으면 None)"""
+        if self.trades is None:
+            return None
+        return self.trades.features(self.ticker)
+
+    @property
+    def empty(self):
+        """캔들 데이터 보유 여부"""
+        return self.ohlcv.shape[1] == 0
+
+    def column(self, name):
+        """캔들/지표 컬럼 배열 반환 (복사 없는 뷰)"""
+        if name in OHLCV_INDEX:
+            return self.ohlcv[OHLCV_INDEX[name]]
+        return self.feature(INDICATOR_COLUMNS[name])
+
+    def feature(self, key):
+        """피처 값 반환 (아직 계산되지 않은 피처는 이때 계산해 보관)"""
+        features = self.features
+        if key not in features:
+            if key[0] in OHLCV_INDEX:
+                return self.column(key[0])
+            computed = feature_graph.evaluate([key], self.column, dict(features))
+            features[key] = np.asarray(computed[key], dtype=self.indicator_dtype)
+        return features[key]
+
+    @property
+    def df(self):
+        """디버깅/호환용 DataFrame (호출할 때마다 새로 생성)"""
+        data = {name: self.ohlcv[i] for i, name in enumerate(OHLCV_COLUMNS)}
+        for name, key in INDICATOR_COLUMNS.items():
+            if key in self.features:
+                data[name] = self.features[key]
+        return pd.DataFrame(data, index=pd.DatetimeIndex(self.timestamps))
+
+    @staticmethod
+    def to_arrays(df):
+        """pyupbit 캔들 DataFrame -> (timestamps, ohlcv) 연속 배열"""
+        timestamps = df.index.values.astype('datetime64[ns]')
+        ohlcv = np.ascontiguousarray(df[list(OHLCV_COLUMNS)].to_numpy(dtype=np.float64).T)
+        return timestamps, ohlcv
+
+    def load_candles(self, timestamps, ohlcv):
+        """캔들 배열 저장 (이전 캔들로 계산된 피처와 상위 시간 프레임은 새 캔들로 다시 만듦)"""
+        self.features = {}
+        self.timestamps = timestamps
+        self.ohlcv = ohlcv
+        for series, _ in self.timeframes.values():
+            series.reset()
+        self.extend_timeframes()
+
     @send_error_alert
-    def fetch_data(self, interval="minute1", count=200):
-        """데이터 조회"""
+    def fetch_data(self, interval="minute1", count=200, store=True):
+        """
+        데이터 조회
+        :param store: False면 분석기 상태를 바꾸지 않고 조회 결과만 반환 (백그라운드 조회용)
+        :return: (timestamps, ohlcv) 또는 조회 실패 시 None
+        """
         try:
-            logging.info("데이터 조회 시작")
+            quotation_limiter.acquire()
             df = pyupbit.get_ohlcv(self.ticker, interval=interval, count=count)
-            logging.info(f"데이터 조회 결과: {type(df)}")
             
             if df is None or df.empty:
-                logging.error("데이터 조회 실패")
+                log_event(logging.ERROR, "데이터 조회 실패", ticker=self.ticker, interval=interval)
                 return
                 
-            logging.info("데이터 형변환 시작")
-            df = df.astype({
-                'open': 'float64',
-                'high': 'float64',
-                'low': 'float64',
-                'close': 'float64',
-                'volume': 'float64',
-                'value': 'float64'
-            })
+            candles = self.to_arrays(df)
             
-            self.df = df
-            logging.info("데이터 조회 및 형변환 완료")
+            if store:
+                self.load_candles(*candles)
+            log_event(logging.DEBUG, "데이터 조회 완료", ticker=self.ticker, interval=interval, rows=len(df))
+            return candles
             
         except Exception as e:
             logging.error(f"데이터 조회 중 오류 발생: {str(e)}")
             raise
 
     @send_error_alert
-    def calculate_indicators(self):
-        """기술적 지표 계산"""
+    def calculate_indicators(self, candles=None):
+        """
+        기술적 지표 계산 (전략들이 사용하는 피처만 계산)
+        :param candles: fetch_data(store=False) 결과 (기본값: 현재 보유 캔들)
+        """
         try:
-            df = self.df.copy()
-            
-            # RSI 계산 (14일)
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
-            
-            # MACD 계산 (12,26,9)
-            exp1 = df['close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['close'].ewm(span=26, adjust=False).mean()
-            df['macd'] = exp1 - exp2
-            df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-            
-            # 볼린저 밴드 (20일, 2표준편차)
-            df['bb_middle'] = df['close'].rolling(window=20).mean()
-            bb_std = df['close'].rolling(window=20).std()
-            df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-            df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-            
-            # NaN 값을 앞뒤 값으로 채우기
-            df = df.bfill()  # 뒤의 값으로 채우기
-            df = df.ffill()  # 앞의 값으로 채우기
+            # 새 캔들은 지역 변수로만 계산하고 마지막에 피처와 함께 교체
+            # (매매 스레드가 새 캔들과 이전 피처를 섞어 보지 않도록)
+            timestamps, ohlcv = candles if candles is not None else (self.timestamps, self.ohlcv)
+            if candles is not None:
+                # 상위 봉은 시각으로 조회하므로 1분봉보다 먼저 갱신되어도 결과가 같음
+                self.extend_timeframes(candles)
+            
+            # 공통 의존 피처(EMA, 이동평균 등)는 한 번만 계산됨
+            computed = feature_graph.evaluate(self.required_features, lambda name: ohlcv[OHLCV_INDEX[name]])
+            features = {
+                key: np.asarray(computed[key], dtype=self.indicator_dtype)
+                for key in self.required_features
+                if key[0] not in OHLCV_INDEX
+            }
             
             # 모든 지표가 계산되었는지 확인
-            required_columns = ['rsi', 'macd', 'macd_signal', 'bb_upper', 'bb_lower', 'bb_middle']
-            for col in required_columns:
-                if df[col].isna().any():
-                    logging.warning(f"{self.ticker}의 {col} 지표에 NaN 값이 있습니다")
-            
-            self.df = df
-            
-            # 현재 지표값 로깅
-            last_idx = -1
-            logging.info(
-                f"{self.ticker} 지표 계산 완료\n"
-                f"- RSI: {df['rsi'].iloc[last_idx]:.1f}\n"
-                f"- MACD: {df['macd'].iloc[last_idx]:.1f}\n"
-                f"- Signal: {df['macd_signal'].iloc[last_idx]:.1f}\n"
-                f"- BB 위치: {((df['close'].iloc[last_idx] - df['bb_middle'].iloc[last_idx]) / df['bb_middle'].iloc[last_idx] * 100):.1f}%"
-            )
+            for key, values in features.items():
+                if key[0] in FILLED_FEATURE_KINDS and np.isnan(values).any():
+                    logging.warning(f"{self.ticker}의 {feature_graph.describe(key)} 지표에 NaN 값이 있습니다")
+            
+            # 계산이 끝난 뒤 캔들과 피처를 한 번에 교체 (분석 중인 스레드는 이전 캔들/피처를 계속 사용)
+            self.timestamps, self.ohlcv, self.features = timestamps, ohlcv, features
+            
+            # 현재 지표값 로깅 (INFO가 꺼져 있으면 필드도 만들지 않음)
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                log_event(
+                    logging.INFO, "%s 지표 계산 완료", self.ticker,
+                    **{feature_graph.describe(key): round(float(values[-1]), 4) for key, values in features.items()}
+                )
             
         except Exception as e:
             logging.error(f"지표 계산 중 오류 발생: {str(e)}")
@@ -116,220 +278,10 @@ class DataAnalyzer:
             logging.error(f"데이터 업데이트 중 오류 발생: {str(e)}")
             raise 
 
-    @send_error_alert
     def analyze(self, index=-1):
-        """매매 신호 분석"""
-        try:
-            # 거래량 확인
-            volume = self.df['volume'].iloc[index]
-            avg_volume = self.df['volume'].rolling(window=20).mean().iloc[index]
-            
-            # 거래량이 평균 거래량의 50% 미만이면 거래 제한
-            if volume < avg_volume * 0.5:
-                return {
-                    'action': 'HOLD',
-                    'reason': '거래량 부족',
-                    'target_price': None,
-                    'strategy_status': self.get_strategy_status(index)
-                }            
-            current_time = time.time()
-            
-            # 이전 신호와 동일한 신호가 쿨다운 시간 내에 발생하면 HOLD 반환
-            if (self.last_signal and 
-                self.last_signal_time and 
-                current_time - self.last_signal_time < self.signal_cooldown):
-                return {
-                    'action': 'HOLD',
-                    'reason': None,
-                    'target_price': None,
-                    'strategy_status': self.get_strategy_status(index)
-                }
-
-            # 데이터가 없으면 데이터 가져오기 시도
-            if self.df.empty:
-                self.fetch_data()
-                self.calculate_indicators()
-            
-            if self.df.empty:
-                return {
-                    'action': 'HOLD',
-                    'reason': None,
-                    'target_price': None,
-                    'strategy_status': {
-                        'RSI': 'N/A',
-                        'MACD': 'N/A',
-                        'BB': 'N/A'
-                    }
-                }
-
-            current_price = self.df['close'].iloc[index]
-            
-            # 전략별 상태 확인
-            strategy_status = {}
-            
-            # RSI 상태
-            rsi = self.df['rsi'].iloc[index]
-            rsi_status = '과매수' if rsi > 70 else '과매도' if rsi < 30 else '중립'
-            strategy_status['RSI'] = f"{rsi:.1f} ({rsi_status})"
-            
-            # MACD 상태
-            macd = self.df['macd'].iloc[index]
-            macd_signal = self.df['macd_signal'].iloc[index]
-            macd_diff = macd - macd_signal
-            macd_status = '골든크로스' if macd_diff > 0 else '데드크로스' if macd_diff < 0 else '중립'
-            strategy_status['MACD'] = f"{macd_diff:.1f} ({macd_status})"
-            
-            # BB 상태
-            bb_upper = self.df['bb_upper'].iloc[index]
-            bb_lower = self.df['bb_lower'].iloc[index]
-            bb_middle = self.df['bb_middle'].iloc[index]
-            bb_position = ((current_price - bb_middle) / bb_middle) * 100
-            bb_status = "상단돌파" if current_price > bb_upper else "하단돌파" if current_price < bb_lower else "밴드내"
-            strategy_status['BB'] = f"{bb_position:.1f}% ({bb_status})"
-            
-            # 매매 신호 및 이유 결정
-            action = "HOLD"
-            reasons = []
-            target_price = None
-            
-            # RSI 기반 매매 신호
-            if rsi < 30 and self.df['rsi'].diff().iloc[-1] > 0:  # RSI가 30 이하이면서 상승추세
-                action = "BUY"
-                reasons.append(f"RSI 과매도 반등({rsi:.1f})")
-                target_price = current_price * 1.05
-            elif rsi > 70 and self.df['rsi'].diff().iloc[-1] < 0:  # RSI가 70 이상이면서 하락추세
-                action = "SELL"
-                reasons.append(f"RSI 과매수 하락({rsi:.1f})")
-            
-            # MACD 기반 매매 신호
-            # MACD 방향성 확인
-            macd_trend = self.df['macd'].diff().iloc[-1]
-            signal_trend = self.df['macd_signal'].diff().iloc[-1]
-
-            if macd > macd_signal and macd < 0 and macd_trend > 0:  # 골든크로스 + 상승추세
-                action = "BUY"
-                reasons.append(f"MACD 골든크로스 상승({macd_diff:.1f})")
-                target_price = current_price * 1.03
-            elif macd < macd_signal and macd > 0 and macd_trend < 0:  # 데드크로스 + 하락추세
-                action = "SELL"
-                reasons.append(f"MACD 데드크로스 하락({macd_diff:.1f})")
-            
-            # 볼린저 밴드 기반 매매 신호
-            if current_price < bb_lower:  # 하단밴드 하향 돌파
-                # 추가 조건 확인: RSI가 상승 추세이거나 MACD가 반등 신호를 보일 때
-                if (self.df['rsi'].diff().iloc[-1] > 0 or  # RSI 상승 추세
-                    (self.df['macd'].iloc[-1] > self.df['macd'].iloc[-2])):  # MACD 반등
-                    action = "BUY"
-                    reasons.append(f"BB 하단 반등({bb_position:.1f}%)")
-                    target_price = bb_middle
-            elif current_price > bb_upper:
-                action = "SELL"
-                reasons.append(f"BB 상단 돌파({bb_position:.1f}%)")
-            
-            # 여러 지표가 동시에 매수/매도 신호를 보낼 때 신뢰도 증가
-            buy_signals = 0
-            sell_signals = 0
-
-            # RSI 신호
-            if rsi < 30 and self.df['rsi'].diff().iloc[-1] > 0:
-                buy_signals += 1
-            elif rsi > 70 and self.df['rsi'].diff().iloc[-1] < 0:
-                sell_signals += 1
-
-            # MACD 신호
-            if macd > macd_signal and macd < 0 and macd_trend > 0:
-                buy_signals += 1
-            elif macd < macd_signal and macd > 0 and macd_trend < 0:
-                sell_signals += 1
-
-            # BB 신호
-            if current_price < bb_lower and (self.df['rsi'].diff().iloc[-1] > 0 or self.df['macd'].iloc[-1] > self.df['macd'].iloc[-2]):
-                buy_signals += 1
-            elif current_price > bb_upper:
-                sell_signals += 1
-
-            # 최종 신호 결정
-            if buy_signals >= 2:  # 2개 이상의 지표가 매수 신호
-                action = "BUY"
-                target_price = current_price * 1.05
-                reasons.append(f"복합 매수 신호({buy_signals}개)")
-            elif sell_signals >= 2:  # 2개 이상의 지표가 매도 신호
-                action = "SELL"
-                reasons.append(f"복합 매도 신호({sell_signals}개)")
-            
-            # 매매 신호가 있을 때만 로깅
-            if action != "HOLD":
-                target_price_str = f"{target_price:,}" if target_price else "없음"
-                logging.info(
-                    f"[{self.ticker}] {action} 신호 발생\n"
-                    f"이유: {' & '.join(reasons)}\n"
-                    f"현재가: {current_price:,} → 목표가: {target_price_str}"
-                )
-            
-            # 매수/매도 신호가 발생하면 시간 기록
-            if action in ['BUY', 'SELL']:
-                self.last_signal = action
-                self.last_signal_time = current_time
-            
-            return {
-                'action': action,
-                'reason': ' & '.join(reasons) if reasons else None,
-                'target_price': target_price,
-                'strategy_status': strategy_status
-            }
-            
-        except Exception as e:
-            logging.error(f"분석 중 오류 발생: {str(e)}")
-            return {
-                'action': 'HOLD',
-                'reason': None,
-                'target_price': None,
-                'strategy_status': {
-                    'RSI': 'N/A',
-                    'MACD': 'N/A',
-                    'BB': 'N/A'
-                }
-            }
+        """첫 번째(기본) 전략으로 매매 신호 분석"""
+        return self.strategies[0].analyze(self, index)
 
     def get_strategy_status(self, index=-1):
-        """현재 전략 상태 반환"""
-        try:
-            if self.df.empty:
-                return {
-                    'RSI': 'N/A',
-                    'MACD': 'N/A',
-                    'BB': 'N/A'
-                }
-
-            current_price = self.df['close'].iloc[index]
-            
-            # RSI 상태
-            rsi = self.df['rsi'].iloc[index]
-            rsi_status = '과매수' if rsi > 70 else '과매도' if rsi < 30 else '중립'
-            
-            # MACD 상태
-            macd = self.df['macd'].iloc[index]
-            macd_signal = self.df['macd_signal'].iloc[index]
-            macd_diff = macd - macd_signal
-            macd_status = '골든크로스' if macd_diff > 0 else '데드크로스' if macd_diff < 0 else '중립'
-            
-            # BB 상태
-            bb_upper = self.df['bb_upper'].iloc[index]
-            bb_lower = self.df['bb_lower'].iloc[index]
-            bb_middle = self.df['bb_middle'].iloc[index]
-            bb_position = ((current_price - bb_middle) / bb_middle) * 100
-            bb_status = "상단돌파" if current_price > bb_upper else "하단돌파" if current_price < bb_lower else "밴드내"
-            
-            return {
-                'RSI': f"{rsi:.1f} ({rsi_status})",
-                'MACD': f"{macd_diff:.1f} ({macd_status})",
-                'BB': f"{bb_position:.1f}% ({bb_status})"
-            }
-            
-        except Exception as e:
-            logging.error(f"전략 상태 조회 중 오류 발생: {str(e)}")
-            return {
-                'RSI': 'N/A',
-                'MACD': 'N/A',
-                'BB': 'N/A'
-            }
\ No newline at end of file
+        """첫 번째(기본) 전략의 현재 상태 반환"""
+        return self.strategies[0].get_status(self, index)
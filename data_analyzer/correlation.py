@@ -0,0 +1,183 @@
+"""
+종목 간 수익률 상관관계 (지수 가중 이동 공분산, 실시간 갱신)
+
+실시간 시세의 거래소 시각으로 1분 구간을 나누고, 구간이 바뀔 때 모든 종목의 1분 로그 수익률 벡터 r로
+지수 가중 평균/공분산을 한 번씩 갱신한다 (rank-1 갱신, 1분봉 하나당 O(종목 수^2), 이력 재계산 없음).
+    d = r - mean
+    mean += alpha * d
+    cov = (1 - alpha) * (cov + alpha * d d^T)
+틱 하나는 종목의 마지막 가격만 바꾸므로 O(1)이다. 해당 분에 체결이 없던 종목은 수익률 0으로,
+아직 가격을 받지 못한 종목은 평균 수익률로(편차 0) 본다.
+
+워밍업 후 반영한 수익률이 부족한 종목이 있으면 조회한 1분봉 종가로 그 종목의 평균/공분산 행만 채운다
+(seed, O(부족한 종목 수 x 종목 수 x 봉 수), 이미 반영한 종목의 실시간 값은 유지).
+"""
+import threading
+import numpy as np
+
+class ReturnCorrelation:
+    """감시 종목 전체의 1분 수익률 지수 가중 공분산 (쓰기는 매매 루프, 초기값 채우기는 워밍업 스레드)"""
+
+    def __init__(self, tickers=(), halflife=60, min_periods=30):
+        """
+        :param tickers: 미리 슬롯을 잡을 종목 목록 (그 외 종목은 처음 받을 때 추가)
+        :param halflife: 가중치 반감기 (1분봉 수)
+        :param min_periods: 상관계수를 내기 위한 종목별 최소 수익률 수 (부족한 종목은 상관계수 조회에서 제외)
+        """
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.min_periods = min_periods
+        self.slots = {}  # 종목 -> 슬롯 번호
+        self.minute = None  # 진행 중인 1분 구간 (거래소 시각 ms // 60000)
+        self.lock = threading.Lock()
+        capacity = max(len(tickers), 8)
+        self.prices = np.full(capacity, np.nan)  # 종목별 마지막 가격
+        self.closes = np.full(capacity, np.nan)  # 종목별 직전 1분 구간 종가
+        self.mean = np.zeros(capacity)
+        self.cov = np.zeros((capacity, capacity))
+        self.counts = np.zeros(capacity, dtype=np.int64)  # 종목별 반영한 수익률 수
+        self.outer = np.empty((capacity, capacity))  # 갱신용 작업 배열
+        for ticker in tickers:
+            self.slot(ticker)
+
+    def slot(self, ticker):
+        """종목 슬롯 번호 (처음 보는 종목은 등록, 가득 차면 배열을 2배로 확장)"""
+        slot = self.slots.get(ticker)
+        if slot is None:
+            with self.lock:
+                slot = self.slots.get(ticker)
+                if slot is None:
+                    slot = len(self.slots)
+                    if slot == len(self.mean):
+                        self._grow(slot * 2)
+                    self.slots[ticker] = slot
+        return slot
+
+    def _grow(self, capacity):
+        """슬롯 배열 확장 (기존 값 복사, lock 안에서 호출)"""
+        used = len(self.mean)
+        prices, closes = np.full(capacity, np.nan), np.full(capacity, np.nan)
+        mean, counts = np.zeros(capacity), np.zeros(capacity, dtype=np.int64)
+        cov = np.zeros((capacity, capacity))
+        prices[:used], closes[:used], mean[:used], counts[:used] = self.prices, self.closes, self.mean, self.counts
+        cov[:used, :used] = self.cov
+        self.prices, self.closes, self.mean, self.counts, self.cov = prices, closes, mean, counts, cov
+        self.outer = np.empty((capacity, capacity))
+
+    def observe(self, ticker, price, timestamp):
+        """
+        실시간 가격 하나 반영 (1분 구간이 바뀌면 직전 구간 수익률로 공분산 갱신)
+        :param timestamp: 거래소 시각 (ms)
+        """
+        slot = self.slot(ticker)
+        minute = int(timestamp // 60_000)
+        # 워밍업 스레드의 seed()가 슬롯을 늘리며 배열을 교체할 수 있으므로 가격 배열도 lock 안에서 사용
+        with self.lock:
+            if self.minute is None:
+                self.minute = minute
+            elif minute > self.minute:
+                self.minute = minute
+                self._roll()
+            self.prices[slot] = price
+
+    def _roll(self):
+        """직전 1분 구간 종가로 수익률 계산 후 공분산 갱신 (lock 안에서 호출)"""
+        used = len(self.slots)
+        prices = self.prices[:used]
+        closes = self.closes[:used]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = np.log(prices / closes)
+        closes[:] = prices
+        self._update(returns)
+
+    def _update(self, returns):
+        """수익률 벡터 하나로 평균/공분산 rank-1 갱신 (NaN은 편차 0)"""
+        used = len(returns)
+        valid = ~np.isnan(returns)
+        mean = self.mean[:used]
+        deviation = np.where(valid, returns - mean, 0.0)
+        mean += self.alpha * deviation
+        cov = self.cov[:used, :used]
+        outer = self.outer[:used, :used]
+        np.multiply.outer(deviation, deviation, out=outer)
+        outer *= self.alpha
+        cov += outer
+        cov *= 1 - self.alpha
+        self.counts[:used] += valid
+
+    def seed(self, candles, bars=None):
+        """
+        조회한 1분봉 종가로 반영한 수익률이 부족한 종목만 초기값 채우기
+        모든 종목 캔들 시각의 합집합을 1분 격자로 쓰고, 캔들이 없는 분은 직전 종가로 채운다 (체결 없음 = 수익률 0).
+        부족한 종목의 평균과 공분산 행/열(다른 모든 종목과의 공분산)만 격자 수익률로 계산해 덮어쓰고,
+        이미 충분히 반영한 종목끼리의 공분산은 그대로 둔다 (O(부족한 종목 수 x 종목 수 x 봉 수)).
+        :param candles: {종목: (timestamps, close 배열)}
+        :param bars: 사용할 최근 격자 수 (기본값: 전체)
+        """
+        candles = {ticker: value for ticker, value in candles.items() if len(value[0])}
+        slots = [self.slot(ticker) for ticker in candles]
+        missing = [slot for slot in slots if self.counts[slot] < self.min_periods]
+        if not missing:
+            return
+        grid = np.unique(np.concatenate([timestamps for timestamps, _ in candles.values()]))
+        if bars:
+            grid = grid[-bars:]
+        used = len(self.slots)
+        matrix = np.full((len(grid), used), np.nan)
+        for slot, (timestamps, close) in zip(slots, candles.values()):
+            position = np.searchsorted(timestamps, grid, side='right') - 1
+            matrix[:, slot] = np.where(position >= 0, close[np.maximum(position, 0)], np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = np.log(matrix[1:] / matrix[:-1])
+
+        # _update()와 같은 평균 갱신으로 시점별 편차를 구한 뒤, 공분산은 가중치를 곱한 행렬곱 한 번으로 계산
+        # (cov = sum_t alpha * (1 - alpha)^(T - t + 1) * d_t d_t^T)
+        mean = np.zeros(used)
+        deviations = np.zeros_like(returns)
+        for row, deviation in zip(returns, deviations):
+            np.subtract(row, mean, out=deviation, where=~np.isnan(row))
+            mean += self.alpha * deviation
+        weights = self.alpha * (1 - self.alpha) ** np.arange(len(returns), 0, -1)
+        cov = (deviations[:, missing] * weights[:, None]).T @ deviations
+        counts = (~np.isnan(returns[:, missing])).sum(axis=0)
+
+        with self.lock:
+            self.mean[missing] = mean[missing]
+            self.cov[missing, :used] = cov
+            self.cov[:used, missing] = cov.T
+            self.counts[missing] = counts
+
+    @property
+    def ready(self):
+        """모든 종목 수익률이 min_periods개 이상 반영되었는지 여부"""
+        used = len(self.slots)
+        return bool(used) and int(self.counts[:used].min()) >= self.min_periods
+
+    def correlation(self, ticker, others):
+        """
+        종목과 다른 종목들의 상관계수 {종목: 값} (O(종목 수), 반영한 수익률이 부족한 종목은 제외)
+        """
+        slot = self.slots.get(ticker)
+        if slot is None or self.counts[slot] < self.min_periods:
+            return {}
+        result = {}
+        with self.lock:
+            variance = self.cov[slot, slot]
+            for other in others:
+                other_slot = self.slots.get(other)
+                if other_slot is None or other_slot == slot or self.counts[other_slot] < self.min_periods:
+                    continue
+                scale = np.sqrt(variance * self.cov[other_slot, other_slot])
+                if scale > 0:
+                    result[other] = float(self.cov[slot, other_slot] / scale)
+        return result
+
+    def matrix(self):
+        """(종목 목록, 상관계수 행렬) 전체 조회 (리포트/점검용, O(종목 수^2))"""
+        tickers = list(self.slots)
+        used = len(tickers)
+        with self.lock:
+            cov = self.cov[:used, :used].copy()
+        scale = np.sqrt(np.diag(cov))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(scale, scale)
+        return tickers, corr
@@ -0,0 +1,143 @@
+"""
+지표(피처) 의존성 그래프
+
+피처는 ('종류', 인자...) 형태의 튜플 키로 표현한다. 예) ('rsi', 14), ('slope', ('rsi', 14))
+매매 규칙은 필요한 피처 키만 선언하고, evaluate()는 요청된 피처와 그 의존 피처만
+한 번씩 계산한다. 같은 키는 같은 결과를 공유하므로 MACD와 MACD 기울기처럼
+공통 부분식이 있는 피처도 중복 계산되지 않는다.
+"""
+import numpy as np
+from data_analyzer import indicators
+
+# 캔들 원본 컬럼 (그래프의 입력 노드)
+SOURCE_KINDS = ('open', 'high', 'low', 'close', 'volume', 'value')
+
+# 종류 -> FeatureNode
+FEATURES = {}
+
+class FeatureNode:
+    __slots__ = ('kind', 'deps', 'compute')
+
+    def __init__(self, kind, deps, compute):
+        """
+        :param kind: 피처 종류 이름
+        :param deps: 인자 -> 의존 피처 키 목록을 반환하는 함수
+        :param compute: (의존 피처 값..., 인자...) -> 배열
+        """
+        self.kind = kind
+        self.deps = deps
+        self.compute = compute
+
+def register_feature(kind, deps):
+    """피처 계산 함수 등록 데코레이터"""
+    def decorator(compute):
+        FEATURES[kind] = FeatureNode(kind, deps, compute)
+        return compute
+    return decorator
+
+def source(kind):
+    """원본 컬럼 피처 키"""
+    return (kind,)
+
+def dependencies(key):
+    """피처의 직접 의존 피처 키 목록"""
+    if key[0] in SOURCE_KINDS:
+        return []
+    return list(FEATURES[key[0]].deps(*key[1:]))
+
+def resolve_order(keys):
+    """요청 피처 계산에 필요한 모든 노드를 의존 순서대로 반환 (사용되지 않는 노드는 제외)"""
+    order = []
+    visited = set()
+
+    def visit(key):
+        if key in visited:
+            return
+        visited.add(key)
+        for dep in dependencies(key):
+            visit(dep)
+        order.append(key)
+
+    for key in keys:
+        visit(key)
+    return order
+
+def evaluate(keys, columns, cache=None):
+    """
+    피처 계산
+    :param keys: 계산할 피처 키 목록
+    :param columns: 원본 컬럼 이름 -> 배열 함수 (DataAnalyzer.column 등)
+    :param cache: 이미 계산된 피처 (키 -> 배열), 계산 결과도 여기에 추가됨
+    :return: cache
+    """
+    cache = {} if cache is None else cache
+    for key in resolve_order(keys):
+        if key in cache:
+            continue
+        if key[0] in SOURCE_KINDS:
+            cache[key] = columns(key[0])
+            continue
+        node = FEATURES[key[0]]
+        inputs = [cache[dep] for dep in node.deps(*key[1:])]
+        cache[key] = node.compute(*inputs, *key[1:])
+    return cache
+
+def describe(key):
+    """로그용 피처 이름 (예: slope(rsi(14)))"""
+    if key[0] in SOURCE_KINDS:
+        return key[0]
+    args = ','.join(describe(arg) if isinstance(arg, tuple) else str(arg) for arg in key[1:])
+    return f"{key[0]}({args})"
+
+# ---- 기본 피처 정의 ----
+
+@register_feature('sma', deps=lambda src, window: [src])
+def _sma(values, src, window):
+    return indicators.sma(values, window)
+
+@register_feature('std', deps=lambda src, window: [src])
+def _std(values, src, window):
+    return indicators.rolling_std(values, window)
+
+@register_feature('ema', deps=lambda src, span: [src])
+def _ema(values, src, span):
+    return indicators.ema(values, span)
+
+@register_feature('slope', deps=lambda src: [src])
+def _slope(values, src):
+    """직전 값 대비 변화량 (pandas diff()와 동일)"""
+    out = np.empty(len(values))
+    if len(values):
+        out[0] = np.nan
+        np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+@register_feature('rsi', deps=lambda period: [source('close')])
+def _rsi(close, period):
+    return indicators.fill_nan(indicators.rsi(close, period))
+
+@register_feature('macd', deps=lambda fast, slow: [
+    ('ema', source('close'), fast), ('ema', source('close'), slow)
+])
+def _macd(fast_ema, slow_ema, fast, slow):
+    return fast_ema - slow_ema
+
+@register_feature('macd_signal', deps=lambda fast, slow, signal: [('macd', fast, slow)])
+def _macd_signal(macd, fast, slow, signal):
+    return indicators.ema(macd, signal)
+
+@register_feature('bb_middle', deps=lambda window: [('sma', source('close'), window)])
+def _bb_middle(middle, window):
+    return indicators.fill_nan(middle)
+
+@register_feature('bb_upper', deps=lambda window, num_std: [
+    ('sma', source('close'), window), ('std', source('close'), window)
+])
+def _bb_upper(middle, std, window, num_std):
+    return indicators.fill_nan(middle + std * num_std)
+
+@register_feature('bb_lower', deps=lambda window, num_std: [
+    ('sma', source('close'), window), ('std', source('close'), window)
+])
+def _bb_lower(middle, std, window, num_std):
+    return indicators.fill_nan(middle - std * num_std)
@@ -0,0 +1,127 @@
+"""
+NumPy 기반 기술적 지표 계산 함수
+
+200개 내외의 짧은 캔들 배열에서는 pandas rolling/ewm의 객체/인덱스 처리 비용이
+연산 자체보다 크기 때문에, 원시 배열을 바로 받아 계산한다.
+결과는 pandas 구현과 같은 위치에 NaN이 생기도록 맞춰져 있다. (입력에는 NaN이 없다고 가정)
+"""
+import numpy as np
+
+def sma(values, window):
+    """단순 이동평균 (pandas rolling(window).mean()과 동일, 앞쪽 window-1개는 NaN)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+
+    # 누적합 오차를 줄이기 위해 첫 값을 기준으로 이동 후 계산
+    base = values[0]
+    csum = np.cumsum(values - base)
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    out[window - 1:] = out[window - 1:] / window + base
+    return out
+
+def rolling_std(values, window, ddof=1):
+    """이동 표준편차 (pandas rolling(window).std()와 동일, 누적합 기반)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if window <= ddof or len(values) < window:
+        return out
+
+    # 긴 배열에서 누적합이 커지며 생기는 오차를 막기 위해 구간마다 평균을 빼고 계산
+    block = 1024
+    for start in range(0, len(values) - window + 1, block):
+        segment = values[start:start + block + window - 1]
+        centered = segment - segment.mean()
+        csum = np.concatenate(([0.0], np.cumsum(centered)))
+        csum_sq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        window_sum = csum[window:] - csum[:-window]
+        window_sum_sq = csum_sq[window:] - csum_sq[:-window]
+
+        variance = (window_sum_sq - window_sum * window_sum / window) / (window - ddof)
+        np.maximum(variance, 0.0, out=variance)  # 부동소수점 오차로 인한 음수 방지
+        out[start + window - 1:start + window - 1 + len(variance)] = np.sqrt(variance)
+    return out
+
+def ema(values, span):
+    """
+    지수 이동평균 (pandas ewm(span=span, adjust=False).mean()과 동일)
+    y[0] = x[0], y[t] = a * x[t] + (1 - a) * y[t-1], a = 2 / (span + 1)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return out
+
+    # 재귀식을 구간별 닫힌 형태로 풀어 벡터화한다.
+    # 구간 길이는 decay^block이 1e-100 이상이 되도록 제한해 오버플로를 막는다.
+    # (누적합은 마지막 항이 지배하므로 다시 곱해도 상대 오차는 기계 정밀도 수준)
+    block = int(min(n, max(1, np.log(1e-100) / np.log(decay))))
+    powers = decay ** np.arange(block + 1)
+    prev = values[0]  # a*x0 + decay*x0 = x0 이므로 y[-1] = x[0]로 두면 y[0] = x[0]
+
+    for start in range(0, n, block):
+        segment = values[start:start + block]
+        m = len(segment)
+        scaled = np.cumsum(segment / powers[:m]) * powers[:m] * alpha
+        out[start:start + m] = scaled + powers[1:m + 1] * prev
+        prev = out[start + m - 1]
+    return out
+
+def rsi(close, period=14):
+    """RSI (단순 이동평균 방식, 기존 pandas 구현과 동일)"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.empty(len(close))
+    if len(close) == 0:
+        return delta
+    delta[0] = 0.0  # pandas에서는 NaN이지만 where(delta > 0, 0) 결과가 0
+    delta[1:] = np.diff(close)
+
+    gain = sma(np.where(delta > 0, delta, 0.0), period)
+    loss = sma(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD와 시그널선 반환 (macd, macd_signal)"""
+    line = ema(close, fast) - ema(close, slow)
+    return line, ema(line, signal)
+
+def bollinger(close, window=20, num_std=2):
+    """볼린저 밴드 반환 (middle, upper, lower)"""
+    middle = sma(close, window)
+    band = rolling_std(close, window) * num_std
+    return middle, middle + band, middle - band
+
+def fill_nan(values):
+    """NaN을 뒤의 값으로 채운 뒤 남은 NaN을 앞의 값으로 채운 복사본 반환 (bfill().ffill())"""
+    out = np.array(values, dtype=np.float64)
+    mask = np.isnan(out)
+    if not mask.any():
+        return out
+
+    n = len(out)
+    positions = np.arange(n)
+
+    # 뒤의 유효값 위치로 채우기
+    next_valid = np.where(mask, n, positions)
+    next_valid = np.minimum.accumulate(next_valid[::-1])[::-1]
+    fillable = mask & (next_valid < n)
+    out[fillable] = out[next_valid[fillable]]
+
+    # 끝부분에 남은 NaN은 앞의 유효값으로 채우기
+    mask = np.isnan(out)
+    if mask.any():
+        prev_valid = np.where(mask, 0, positions)
+        np.maximum.accumulate(prev_valid, out=prev_valid)
+        out[mask] = out[prev_valid[mask]]
+    return out
@@ -0,0 +1,486 @@
+"""
+매매 전략 인터페이스
+
+여러 전략이 한 프로세스에서 같은 웹소켓 피드와 같은 DataAnalyzer(캔들/지표 상태)를 공유한다.
+각 전략은 필요한 피처 키만 선언하고(required_features), 공유 상태를 읽어 신호만 결정한다(decide).
+DataAnalyzer는 모든 전략이 선언한 피처의 합집합을 갱신 시 한 번만 계산한다.
+상위 시간 프레임 지표가 필요한 전략은 required_timeframes로 선언하고 analyzer.timeframe(name)으로 읽는다.
+호가/체결 등 보조 웹소켓 구독이 필요한 전략은 required_streams로 선언하고
+analyzer.orderbook_features() / analyzer.trade_features()로 읽는다.
+"""
+import time
+import logging
+import numpy as np
+from data_analyzer.feature_graph import source
+from data_analyzer.timeframes import timeframe_minutes
+from utils.log import log_event
+
+EMPTY_STATUS = {
+    'RSI': 'N/A',
+    'MACD': 'N/A',
+    'BB': 'N/A'
+}
+
+class Strategy:
+    name = 'strategy'
+    default_params = {}
+
+    def __init__(self, name=None, allocation=1.0, **params):
+        """
+        :param name: 전략 이름 (여러 전략 실행 시 구분용, 중복 불가)
+        :param allocation: 포트폴리오 배분 비율 (시작 자금 대비)
+        :param params: default_params를 덮어쓸 전략 파라미터
+        """
+        unknown = set(params) - set(self.default_params)
+        if unknown:
+            raise ValueError(f"{type(self).__name__} 알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+
+        self.name = name or self.name
+        self.allocation = allocation
+        self.params = {**self.default_params, **params}
+        self.signal_cooldown = self.params.get('signal_cooldown', 300)  # 신호 재발생 대기시간
+        self.clock = time.time  # 쿨다운 기준 시각 (기록 재생 시 기록된 수신 시각으로 교체)
+        self.last_signal_time = {}  # 종목 -> 마지막 신호 시각
+
+    def required_features(self):
+        """전략이 사용하는 피처 키 목록"""
+        raise NotImplementedError
+
+    def required_timeframes(self):
+        """전략이 사용하는 상위 시간 프레임 -> 피처 키 목록 (1분봉에서 만들어 유지)"""
+        return {}
+
+    def required_streams(self):
+        """전략이 사용하는 보조 웹소켓 구독 종류 ('orderbook', 'trade')"""
+        return ()
+
+    def check_filters(self, analyzer, index=-1):
+        """매매 제한 조건 확인 (제한 시 사유 문자열 반환)"""
+        return None
+
+    def decide(self, analyzer, index=-1):
+        """매매 신호 결정 -> (action, reasons, target_price)"""
+        raise NotImplementedError
+
+    def signals(self, analyzer):
+        """
+        전체 캔들 구간의 신호 배열 (1: BUY, -1: SELL, 0: HOLD, 백테스트용)
+        제한 조건은 반영하고 쿨다운은 반영하지 않는다. decide()와 같은 결과를 내야 한다.
+        """
+        raise NotImplementedError
+
+    def get_status(self, analyzer, index=-1):
+        """현재 전략 상태 반환"""
+        return dict(EMPTY_STATUS)
+
+    def hold(self, reason=None, strategy_status=None):
+        """HOLD 결과"""
+        return {
+            'action': 'HOLD',
+            'reason': reason,
+            'target_price': None,
+            'strategy': self.name,
+            'strategy_status': strategy_status or dict(EMPTY_STATUS)
+        }
+
+    def analyze(self, analyzer, index=-1):
+        """공유 상태로 매매 신호 분석 (제한 조건, 쿨다운 공통 처리)"""
+        try:
+            # 데이터가 없으면 HOLD (데이터 조회는 워밍업/주기적 갱신에서 처리)
+            if analyzer.empty:
+                return self.hold()
+
+            filter_reason = self.check_filters(analyzer, index)
+            if filter_reason:
+                return self.hold(filter_reason, self.get_status(analyzer, index))
+
+            # 이전 신호가 쿨다운 시간 내에 발생했으면 HOLD 반환
+            current_time = self.clock()
+            last_signal_time = self.last_signal_time.get(analyzer.ticker)
+            if last_signal_time and current_time - last_signal_time < self.signal_cooldown:
+                return self.hold(strategy_status=self.get_status(analyzer, index))
+
+            action, reasons, target_price = self.decide(analyzer, index)
+            current_price = analyzer.column('close')[index]
+
+            # 매매 신호가 있을 때만 로깅하고 시간 기록
+            if action in ['BUY', 'SELL']:
+                log_event(
+                    logging.INFO, "%s 신호 발생", action, ticker=analyzer.ticker, strategy=self.name,
+                    reason=' & '.join(reasons), price=float(current_price), target=target_price
+                )
+                self.last_signal_time[analyzer.ticker] = current_time
+
+            return {
+                'action': action,
+                'reason': ' & '.join(reasons) if reasons else None,
+                'target_price': target_price,
+                'strategy': self.name,
+                'strategy_status': self.get_status(analyzer, index)
+            }
+
+        except Exception as e:
+            logging.error(f"{self.name} 분석 중 오류 발생: {str(e)}")
+            return self.hold()
+
+class IndicatorStrategy(Strategy):
+    """RSI / MACD / 볼린저 밴드 복합 전략 (기존 DataAnalyzer.analyze 로직)"""
+    name = 'indicator'
+    default_params = {
+        'rules': ('volume', 'rsi', 'macd', 'bb'),  # 사용할 매매 규칙 ('trend', 'liquidity', 'flow' 추가 가능)
+        'rsi_period': 14,
+        'rsi_buy': 30,               # 과매도 기준
+        'rsi_sell': 70,              # 과매수 기준
+        'rsi_target': 1.05,          # RSI 매수 시 목표가 배율
+        'macd_fast': 12,
+        'macd_slow': 26,
+        'macd_signal': 9,
+        'macd_target': 1.03,         # MACD 매수 시 목표가 배율
+        'bb_window': 20,
+        'bb_std': 2,
+        'volume_window': 20,
+        'volume_ratio': 0.5,         # 평균 거래량 대비 최소 거래량 비율
+        'volume_source': 'candle',   # 거래량 필터 기준 ('candle': 현재 1분봉, 'trades': 최근 체결 구간)
+        'combined_target': 1.05,     # 복합 매수 시 목표가 배율
+        'min_combined_signals': 2,   # 복합 신호로 인정할 최소 지표 수
+        'trend_timeframe': 'minute15',  # 추세 필터 시간 프레임
+        'trend_window': 20,          # 추세 필터 EMA 기간 (완성된 상위 봉 종가가 EMA 위일 때만 매수)
+        'max_spread_bps': 20,        # 호가 필터: 최우선 호가 스프레드 상한 (중간가 대비 bp)
+        'min_imbalance': -0.5,       # 호가 필터: 상위 호가 잔량 불균형 하한 (-1: 매도 잔량만 있음)
+        'min_buy_ratio': 0.5,        # 체결 필터: 최근 체결 구간 매수 주도 거래량 비율 하한
+        'signal_cooldown': 300       # 신호 재발생 대기시간 (5분)
+    }
+
+    def __init__(self, name=None, allocation=1.0, **params):
+        super().__init__(name, allocation, **params)
+        p = self.params
+
+        # 파라미터로 피처 키 구성
+        self.rsi = ('rsi', p['rsi_period'])
+        self.rsi_slope = ('slope', self.rsi)
+        self.macd = ('macd', p['macd_fast'], p['macd_slow'])
+        self.macd_signal = ('macd_signal', p['macd_fast'], p['macd_slow'], p['macd_signal'])
+        self.macd_slope = ('slope', self.macd)
+        self.bb_middle = ('bb_middle', p['bb_window'])
+        self.bb_upper = ('bb_upper', p['bb_window'], p['bb_std'])
+        self.bb_lower = ('bb_lower', p['bb_window'], p['bb_std'])
+        self.volume_mean = ('sma', source('volume'), p['volume_window'])
+        self.trend_timeframe = p['trend_timeframe']
+        self.trend_ema = ('ema', source('close'), p['trend_window'])
+        timeframe_minutes(self.trend_timeframe)  # 알 수 없는 시간 프레임이면 생성 시 오류
+        if p['volume_source'] not in ('candle', 'trades'):
+            raise ValueError(f"알 수 없는 거래량 기준: {p['volume_source']}")
+
+        # 매매 규칙별 필요 피처
+        self.rule_features = {
+            'volume': (self.volume_mean,),
+            'rsi': (self.rsi, self.rsi_slope),
+            'macd': (self.macd, self.macd_signal, self.macd_slope),
+            'bb': (self.bb_middle, self.bb_upper, self.bb_lower, self.rsi_slope, self.macd_slope),
+            'trend': (),  # 상위 시간 프레임 피처만 사용
+            'liquidity': (),  # 실시간 호가 피처만 사용
+            'flow': ()  # 실시간 체결 누적값만 사용
+        }
+        self.rules = tuple(p['rules'])
+
+    def required_features(self):
+        return tuple(dict.fromkeys(
+            key for rule in self.rules for key in self.rule_features[rule]
+        ))
+
+    def required_timeframes(self):
+        if 'trend' not in self.rules:
+            return {}
+        return {self.trend_timeframe: (self.trend_ema,)}
+
+    def required_streams(self):
+        streams = []
+        if 'liquidity' in self.rules:
+            streams.append('orderbook')
+        if 'flow' in self.rules or ('volume' in self.rules and self.params['volume_source'] == 'trades'):
+            streams.append('trade')
+        return tuple(streams)
+
+    def liquidity_block(self, analyzer):
+        """최신 호가 기준 매수 제한 사유 (제한 없으면 None, 호가를 아직 받지 못했으면 제한)"""
+        book = analyzer.orderbook_features()
+        if book is None:
+            return '호가 없음'
+        if book['spread_bps'] > self.params['max_spread_bps']:
+            return f"호가 스프레드 과다({book['spread_bps']:.1f}bp)"
+        if book['imbalance'] < self.params['min_imbalance']:
+            return f"매도 잔량 우위({book['imbalance']:.2f})"
+        return None
+
+    def flow_block(self, analyzer):
+        """최근 체결 구간 기준 매수 제한 사유 (제한 없으면 None, 체결을 아직 받지 못했으면 제한)"""
+        flow = analyzer.trade_features()
+        if flow is None or not flow['trades']:
+            return '체결 없음'
+        if flow['buy_ratio'] < self.params['min_buy_ratio']:
+            return f"매도 주도 체결({flow['buy_ratio']:.2f})"
+        return None
+
+    def trend_up(self, analyzer, index=-1):
+        """마지막으로 완성된 상위 봉 종가가 EMA 위인지 (상위 봉이 없으면 False)"""
+        frame = analyzer.timeframe(self.trend_timeframe)
+        position = analyzer.timeframe_index(self.trend_timeframe, index)
+        if position < 0:
+            return False
+        return bool(frame.column('close')[position] > frame.feature(self.trend_ema)[position])
+
+    def check_filters(self, analyzer, index=-1):
+        # 거래량이 평균 거래량의 일정 비율 미만이면 거래 제한
+        if 'volume' in self.rules:
+            volume = analyzer.column('volume')[index]
+            avg_volume = analyzer.feature(self.volume_mean)[index]
+            # 최신 시점은 최근 체결 구간 거래량을 분당으로 환산해 비교 (구간이 다 차기 전에는 1분봉 기준)
+            flow = analyzer.trade_features() if self.params['volume_source'] == 'trades' and index == -1 else None
+            if flow is not None and flow['warm']:
+                volume = flow['volume'] * 60 / flow['window']
+            if volume < avg_volume * self.params['volume_ratio']:
+                return '거래량 부족'
+        return None
+
+    def decide(self, analyzer, index=-1):
+        p = self.params
+        rules = self.rules
+        current_price = analyzer.column('close')[index]
+
+        # 매매 신호 및 이유 결정
+        action = "HOLD"
+        reasons = []
+        target_price = None
+
+        # 여러 지표가 동시에 매수/매도 신호를 보낼 때 신뢰도 증가
+        buy_signals = 0
+        sell_signals = 0
+
+        # RSI 기반 매매 신호
+        if 'rsi' in rules:
+            rsi = analyzer.feature(self.rsi)[index]
+            rsi_trend = analyzer.feature(self.rsi_slope)[index]
+            if rsi < p['rsi_buy'] and rsi_trend > 0:  # 과매도이면서 상승추세
+                action = "BUY"
+                reasons.append(f"RSI 과매도 반등({rsi:.1f})")
+                target_price = current_price * p['rsi_target']
+                buy_signals += 1
+            elif rsi > p['rsi_sell'] and rsi_trend < 0:  # 과매수이면서 하락추세
+                action = "SELL"
+                reasons.append(f"RSI 과매수 하락({rsi:.1f})")
+                sell_signals += 1
+
+        # MACD 기반 매매 신호
+        if 'macd' in rules:
+            macd = analyzer.feature(self.macd)[index]
+            macd_signal = analyzer.feature(self.macd_signal)[index]
+            macd_diff = macd - macd_signal
+            macd_trend = analyzer.feature(self.macd_slope)[index]
+            if macd > macd_signal and macd < 0 and macd_trend > 0:  # 골든크로스 + 상승추세
+                action = "BUY"
+                reasons.append(f"MACD 골든크로스 상승({macd_diff:.1f})")
+                target_price = current_price * p['macd_target']
+                buy_signals += 1
+            elif macd < macd_signal and macd > 0 and macd_trend < 0:  # 데드크로스 + 하락추세
+                action = "SELL"
+                reasons.append(f"MACD 데드크로스 하락({macd_diff:.1f})")
+                sell_signals += 1
+
+        # 볼린저 밴드 기반 매매 신호
+        if 'bb' in rules:
+            bb_upper = analyzer.feature(self.bb_upper)[index]
+            bb_lower = analyzer.feature(self.bb_lower)[index]
+            bb_middle = analyzer.feature(self.bb_middle)[index]
+            bb_position = ((current_price - bb_middle) / bb_middle) * 100
+            if current_price < bb_lower:  # 하단밴드 하향 돌파
+                # 추가 조건 확인: RSI가 상승 추세이거나 MACD가 반등 신호를 보일 때
+                if (analyzer.feature(self.rsi_slope)[index] > 0 or  # RSI 상승 추세
+                    analyzer.feature(self.macd_slope)[index] > 0):  # MACD 반등
+                    action = "BUY"
+                    reasons.append(f"BB 하단 반등({bb_position:.1f}%)")
+                    target_price = bb_middle
+                    buy_signals += 1
+            elif current_price > bb_upper:
+                action = "SELL"
+                reasons.append(f"BB 상단 돌파({bb_position:.1f}%)")
+                sell_signals += 1
+
+        # 최종 신호 결정
+        if buy_signals >= p['min_combined_signals']:
+            action = "BUY"
+            target_price = current_price * p['combined_target']
+            reasons.append(f"복합 매수 신호({buy_signals}개)")
+        elif sell_signals >= p['min_combined_signals']:
+            action = "SELL"
+            reasons.append(f"복합 매도 신호({sell_signals}개)")
+
+        # 상위 시간 프레임이 하락 추세면 매수하지 않음 (매도는 그대로)
+        if action == "BUY" and 'trend' in rules and not self.trend_up(analyzer, index):
+            return "HOLD", [f"{self.trend_timeframe} 추세 하락"], None
+
+        # 호가가 얇거나 매도 잔량이 우세하면 매수하지 않음 (최신 호가 기준이므로 index와 무관)
+        if action == "BUY" and 'liquidity' in rules:
+            block = self.liquidity_block(analyzer)
+            if block:
+                return "HOLD", [block], None
+
+        # 최근 체결이 매도 주도면 매수하지 않음 (최신 체결 기준이므로 index와 무관)
+        if action == "BUY" and 'flow' in rules:
+            block = self.flow_block(analyzer)
+            if block:
+                return "HOLD", [block], None
+
+        return action, reasons, target_price
+
+    def signals(self, analyzer):
+        p = self.params
+        rules = self.rules
+        close = analyzer.column('close')
+        n = len(close)
+        action = np.zeros(n, dtype=np.int8)
+        buy_signals = np.zeros(n, dtype=np.int8)
+        sell_signals = np.zeros(n, dtype=np.int8)
+
+        # decide()와 같은 순서로 규칙별 신호를 덮어씀 (NaN 비교는 False)
+        with np.errstate(invalid='ignore'):
+            if 'rsi' in rules:
+                rsi = analyzer.feature(self.rsi)
+                rsi_trend = analyzer.feature(self.rsi_slope)
+                buy = (rsi < p['rsi_buy']) & (rsi_trend > 0)
+                sell = ~buy & (rsi > p['rsi_sell']) & (rsi_trend < 0)
+                action[buy] = 1
+                action[sell] = -1
+                buy_signals += buy
+                sell_signals += sell
+
+            if 'macd' in rules:
+                macd = analyzer.feature(self.macd)
+                macd_signal = analyzer.feature(self.macd_signal)
+                macd_trend = analyzer.feature(self.macd_slope)
+                buy = (macd > macd_signal) & (macd < 0) & (macd_trend > 0)
+                sell = ~buy & (macd < macd_signal) & (macd > 0) & (macd_trend < 0)
+                action[buy] = 1
+                action[sell] = -1
+                buy_signals += buy
+                sell_signals += sell
+
+            if 'bb' in rules:
+                bb_lower = analyzer.feature(self.bb_lower)
+                below = close < bb_lower
+                buy = below & (
+                    (analyzer.feature(self.rsi_slope) > 0) | (analyzer.feature(self.macd_slope) > 0)
+                )
+                sell = ~below & (close > analyzer.feature(self.bb_upper))
+                action[buy] = 1
+                action[sell] = -1
+                buy_signals += buy
+                sell_signals += sell
+
+            combined_buy = buy_signals >= p['min_combined_signals']
+            action[combined_buy] = 1
+            action[~combined_buy & (sell_signals >= p['min_combined_signals'])] = -1
+
+            # 거래량 제한
+            if 'volume' in rules:
+                volume = analyzer.column('volume')
+                avg_volume = analyzer.feature(self.volume_mean)
+                action[volume < avg_volume * p['volume_ratio']] = 0
+
+            # 상위 시간 프레임 추세 필터 (각 1분봉 시점에 완성되어 있던 상위 봉 기준)
+            if 'trend' in rules:
+                frame = analyzer.timeframe(self.trend_timeframe)
+                position = analyzer.timeframe_index(self.trend_timeframe, slice(None))
+                frame_up = frame.column('close') > frame.feature(self.trend_ema)
+                trend_up = np.zeros(n, dtype=bool)
+                known = position >= 0
+                trend_up[known] = frame_up[position[known]]
+                action[(action == 1) & ~trend_up] = 0
+
+            # 'liquidity' 호가 필터와 'flow' 체결 필터, 'trades' 거래량 기준은
+            # 과거 호가/체결 기록이 없어 백테스트 신호에는 반영하지 않음 (1분봉 거래량 기준)
+
+        return action
+
+    def get_status(self, analyzer, index=-1):
+        """현재 전략 상태 반환 (사용 중인 규칙만, 나머지는 N/A)"""
+        try:
+            status = dict(EMPTY_STATUS)
+            if analyzer.empty:
+                return status
+
+            p = self.params
+            current_price = analyzer.column('close')[index]
+
+            # RSI 상태
+            if 'rsi' in self.rules:
+                rsi = analyzer.feature(self.rsi)[index]
+                rsi_status = '과매수' if rsi > p['rsi_sell'] else '과매도' if rsi < p['rsi_buy'] else '중립'
+                status['RSI'] = f"{rsi:.1f} ({rsi_status})"
+
+            # MACD 상태
+            if 'macd' in self.rules:
+                macd_diff = analyzer.feature(self.macd)[index] - analyzer.feature(self.macd_signal)[index]
+                macd_status = '골든크로스' if macd_diff > 0 else '데드크로스' if macd_diff < 0 else '중립'
+                status['MACD'] = f"{macd_diff:.1f} ({macd_status})"
+
+            # BB 상태
+            if 'bb' in self.rules:
+                bb_upper = analyzer.feature(self.bb_upper)[index]
+                bb_lower = analyzer.feature(self.bb_lower)[index]
+                bb_middle = analyzer.feature(self.bb_middle)[index]
+                bb_position = ((current_price - bb_middle) / bb_middle) * 100
+                bb_status = "상단돌파" if current_price > bb_upper else "하단돌파" if current_price < bb_lower else "밴드내"
+                status['BB'] = f"{bb_position:.1f}% ({bb_status})"
+
+            return status
+
+        except Exception as e:
+            logging.error(f"전략 상태 조회 중 오류 발생: {str(e)}")
+            return dict(EMPTY_STATUS)
+
+# 설정 파일에서 사용할 전략 클래스 이름 -> 클래스
+STRATEGY_TYPES = {
+    'IndicatorStrategy': IndicatorStrategy
+}
+
+def build_strategies(configs):
+    """
+    설정으로 전략 목록 생성
+    :param configs: [{'type': 'IndicatorStrategy', 'name': ..., 'allocation': ..., 'params': {...}}, ...]
+    """
+    strategies = []
+    for config in configs:
+        strategy_type = STRATEGY_TYPES[config.get('type', 'IndicatorStrategy')]
+        strategies.append(strategy_type(
+            name=config.get('name'),
+            allocation=config.get('allocation', 1.0),
+            **config.get('params', {})
+        ))
+
+    names = [strategy.name for strategy in strategies]
+    if len(set(names)) != len(names):
+        raise ValueError(f"전략 이름이 중복되었습니다: {', '.join(names)}")
+    total_allocation = sum(strategy.allocation for strategy in strategies)
+    if total_allocation > 1.0 + 1e-9:
+        raise ValueError(f"전략 배분 비율 합계가 1을 넘습니다: {total_allocation:.2f}")
+    return strategies
+
+def collect_required_features(strategies):
+    """여러 전략이 사용하는 피처의 합집합 (순서 유지, 중복 제거)"""
+    return tuple(dict.fromkeys(
+        key for strategy in strategies for key in strategy.required_features()
+    ))
+
+def collect_required_streams(strategies):
+    """여러 전략이 사용하는 보조 웹소켓 구독 종류의 합집합 (순서 유지)"""
+    return tuple(dict.fromkeys(
+        kind for strategy in strategies for kind in strategy.required_streams()
+    ))
+
+def collect_required_timeframes(strategies):
+    """여러 전략이 사용하는 시간 프레임별 피처의 합집합 {시간 프레임: 피처 키 튜플}"""
+    timeframes = {}
+    for strategy in strategies:
+        for name, keys in strategy.required_timeframes().items():
+            timeframes[name] = tuple(dict.fromkeys(timeframes.get(name, ()) + tuple(keys)))
+    return timeframes
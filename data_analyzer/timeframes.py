@@ -0,0 +1,184 @@
+"""
+상위 시간 프레임 캔들 (1분봉에서 로컬 리샘플링)
+
+5분/15분/60분 등의 캔들을 거래소에서 따로 조회하지 않고 분석기가 보유한 1분봉으로 만든다.
+- 처음에는 보유한 1분봉 전체를 한 번에 리샘플링(NumPy)하고
+- 이후 들어오는 1분봉은 하나당 O(1)로 진행 중인 상위 봉에 합친다.
+  (진행 중인 1분봉이 다시 들어오면 그 1분봉을 제외한 누적값에 새 값을 합쳐 교체)
+
+시각은 pyupbit 캔들과 같은 한국 시간(KST) 기준이며, 봉 구간은 업비트와 같이 UTC 0시 기준으로 나눈다.
+(60분 이하는 정시 기준, 240분봉은 09/13/17/21/01/05시 시작)
+"""
+import numpy as np
+
+# pyupbit interval 이름 -> 분
+TIMEFRAME_MINUTES = {
+    'minute1': 1, 'minute3': 3, 'minute5': 5, 'minute10': 10, 'minute15': 15,
+    'minute30': 30, 'minute60': 60, 'minute240': 240
+}
+
+MINUTE_NS = 60 * 1_000_000_000
+KST_OFFSET_NS = 9 * 60 * MINUTE_NS  # 캔들 시각(KST) - UTC
+
+def timeframe_minutes(name):
+    """시간 프레임 이름 -> 분 (알 수 없는 이름이면 ValueError)"""
+    if name not in TIMEFRAME_MINUTES:
+        raise ValueError(f"지원하지 않는 시간 프레임: {name} ({', '.join(TIMEFRAME_MINUTES)})")
+    return TIMEFRAME_MINUTES[name]
+
+def bucket_starts(timestamps, minutes):
+    """캔들 시각(ns 정수 배열) -> 상위 봉 시작 시각 (ns 정수)"""
+    size = minutes * MINUTE_NS
+    return (timestamps - KST_OFFSET_NS) // size * size + KST_OFFSET_NS
+
+def resample(timestamps, ohlcv, minutes):
+    """
+    1분봉 전체 -> 상위 봉 (벡터 연산, 거래가 없던 구간의 봉은 만들지 않음)
+    :param timestamps: datetime64 배열 (정렬됨)
+    :param ohlcv: (OHLCV_COLUMNS 행 x 캔들) 배열
+    :return: (봉 시작 시각 datetime64[ns], 봉 ohlcv)
+    """
+    if not len(timestamps):
+        return timestamps.astype('datetime64[ns]'), ohlcv[:, :0]
+    buckets = bucket_starts(timestamps.astype('datetime64[ns]').view(np.int64), minutes)
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+    bars = np.empty((ohlcv.shape[0], len(starts)), dtype=np.float64)
+    bars[0] = ohlcv[0, starts]
+    bars[1] = np.maximum.reduceat(ohlcv[1], starts)
+    bars[2] = np.minimum.reduceat(ohlcv[2], starts)
+    bars[3] = ohlcv[3, ends]
+    bars[4:] = np.add.reduceat(ohlcv[4:], starts, axis=1)
+    return buckets[starts].view('datetime64[ns]'), bars
+
+def closed_index(base_timestamps, frame_timestamps, minutes):
+    """
+    1분봉 위치마다 그 1분봉이 끝난 시점에 완성되어 있던 마지막 상위 봉 위치 (없으면 -1)
+    백테스트와 실시간 판단이 같은 봉을 보도록 진행 중인 상위 봉은 사용하지 않는다.
+    """
+    base = np.asarray(base_timestamps).astype('datetime64[ns]').view(np.int64)
+    frame_ends = np.asarray(frame_timestamps).astype('datetime64[ns]').view(np.int64) + minutes * MINUTE_NS
+    return np.searchsorted(frame_ends, base + MINUTE_NS, side='right') - 1
+
+def _combine(bar, row):
+    """상위 봉 누적값 + 1분봉 한 개 (값 목록)"""
+    return [
+        bar[0], max(bar[1], row[1]), min(bar[2], row[2]), row[3],
+        *(total + value for total, value in zip(bar[4:], row[4:]))
+    ]
+
+class TimeframeSeries:
+    """
+    1분봉으로 갱신하는 상위 시간 프레임 캔들 (완성된 봉 최대 bars개 + 진행 중인 봉)
+    완성된 봉은 2배 크기 버퍼에 추가하고 가득 차면 뒤쪽 bars개만 앞으로 옮긴다 (분할 상환 O(1)).
+    """
+    __slots__ = (
+        'name', 'minutes', 'bars', 'columns', 'closed_times', 'closed_ohlcv', 'length',
+        'open_time', 'open_bar', 'prefix', 'last_base'
+    )
+
+    def __init__(self, name, bars, columns=6):
+        """
+        :param name: 시간 프레임 이름 (TIMEFRAME_MINUTES)
+        :param bars: 유지할 완성 봉 수 (보유 1분봉에서 더 많이 만들어지면 그만큼 유지)
+        :param columns: 캔들 값 종류 수 (OHLCV_COLUMNS)
+        """
+        self.name = name
+        self.minutes = timeframe_minutes(name)
+        self.bars = bars
+        self.columns = columns
+        self.reset()
+
+    def reset(self, timestamps=None, ohlcv=None):
+        """
+        완성 봉 목록 교체 (진행 중인 봉과 처리한 1분봉 위치는 초기화)
+        :param timestamps: 완성 봉 시작 시각 datetime64 배열 (기본값: 없음)
+        """
+        count = 0 if timestamps is None else len(timestamps)
+        self.bars = max(self.bars, count)
+        self.closed_times = np.empty(self.bars * 2, dtype=np.int64)
+        self.closed_ohlcv = np.empty((self.columns, self.bars * 2), dtype=np.float64)
+        if count:
+            self.closed_times[:count] = timestamps.astype('datetime64[ns]').view(np.int64)
+            self.closed_ohlcv[:, :count] = ohlcv
+        self.length = count
+        self.open_time = None
+        self.open_bar = None
+        self.prefix = None  # 진행 중인 봉에서 마지막 1분봉을 뺀 누적값
+        self.last_base = np.iinfo(np.int64).min
+
+    def restore(self, timestamps, ohlcv):
+        """
+        저장해 둔 봉으로 복원 (마지막 봉은 진행 중인 봉으로 보고 이후 extend하는 1분봉으로 다시 만듦)
+        1분봉 보유 구간이 진행 중인 봉 시작보다 늦으면 그 봉은 보유 구간의 1분봉만으로 만들어진다.
+        """
+        self.reset(timestamps[:-1], ohlcv[:, :-1])
+        if len(timestamps):
+            self.last_base = int(timestamps[-1:].astype('datetime64[ns]').view(np.int64)[0]) - 1
+
+    def _close_bar(self):
+        if self.length == len(self.closed_times):
+            keep = self.bars - 1
+            self.closed_times[:keep] = self.closed_times[self.length - keep:self.length]
+            self.closed_ohlcv[:, :keep] = self.closed_ohlcv[:, self.length - keep:self.length]
+            self.length = keep
+        self.closed_times[self.length] = self.open_time
+        self.closed_ohlcv[:, self.length] = self.open_bar
+        self.length += 1
+
+    def update(self, timestamp, row):
+        """
+        1분봉 하나 반영 (O(1))
+        :param timestamp: 1분봉 시작 시각 (ns 정수)
+        :param row: 1분봉 값 목록 (OHLCV_COLUMNS 순서)
+        :return: 반영했으면 True (이미 처리한 이전 1분봉이면 False)
+        """
+        if timestamp < self.last_base:
+            return False
+        if timestamp == self.last_base:  # 진행 중이던 1분봉 갱신
+            self.open_bar = _combine(self.prefix, row) if self.prefix is not None else list(row)
+            return True
+        size = self.minutes * MINUTE_NS
+        bucket = (timestamp - KST_OFFSET_NS) // size * size + KST_OFFSET_NS
+        if bucket == self.open_time:
+            self.prefix = self.open_bar
+            self.open_bar = _combine(self.prefix, row)
+        else:
+            if self.open_time is not None:
+                self._close_bar()
+            self.open_time = bucket
+            self.prefix = None
+            self.open_bar = list(row)
+        self.last_base = timestamp
+        return True
+
+    def extend(self, timestamps, ohlcv):
+        """
+        1분봉 배열 반영 (이미 처리한 1분봉은 건너뜀, 처음이면 전체를 한 번에 리샘플링)
+        :return: 반영한 1분봉 수
+        """
+        times = timestamps.astype('datetime64[ns]').view(np.int64)
+        start = int(np.searchsorted(times, self.last_base))  # 진행 중이던 마지막 1분봉부터 다시 반영
+        if start >= len(times):
+            return 0
+        if self.open_time is None and self.length == 0 and len(times) - start > self.minutes:
+            # 마지막 상위 봉 구간 전까지는 벡터 연산으로 완성 봉을 만듦
+            buckets = bucket_starts(times[start:], self.minutes)
+            split = start + int(np.searchsorted(buckets, buckets[-1]))
+            bar_times, bars = resample(timestamps[start:split], ohlcv[:, start:split], self.minutes)
+            self.reset(bar_times, bars)
+            start = split
+        rows = ohlcv[:, start:].T.tolist()
+        for timestamp, row in zip(times[start:].tolist(), rows):
+            self.update(timestamp, row)
+        return len(rows)
+
+    def arrays(self):
+        """(봉 시작 시각 datetime64[ns], ohlcv) - 완성 봉 최근 bars개 + 진행 중인 봉"""
+        first = max(0, self.length - self.bars)
+        times = self.closed_times[first:self.length]
+        ohlcv = self.closed_ohlcv[:, first:self.length]
+        if self.open_time is not None:
+            times = np.append(times, self.open_time)
+            ohlcv = np.column_stack((ohlcv, self.open_bar))
+        return times.view('datetime64[ns]'), np.ascontiguousarray(ohlcv)
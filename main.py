@@ -4,21 +4,17 @@ import asyncio
 import logging
 import traceback
 from trading.auto_trade import AutoTrade
+from trading.sharded import RiskCoordinator
 from services.api_service import verify_api_keys
 from services.notification_service import NotificationService
+from utils.profiler import ProfilerControl
+from utils.log import setup_logging
 from config import (
     REAL_TRADING, START_CASH, UPBIT_ACCESS_KEY, 
-    UPBIT_SECRET_KEY, SLACK_APP_TOKEN, TICKERS, MIN_TRADING_AMOUNT
+    UPBIT_SECRET_KEY, SLACK_APP_TOKEN, TICKERS, MIN_TRADING_AMOUNT, SHARD_WORKERS,
+    PROFILE_DIR, PROFILE_INTERVAL, CONTROL_SOCKET
 )
 
-def setup_logging():
-    """로깅 설정"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
 def system_check():
     """시스템 전체 점검"""
     checks = {
@@ -89,12 +85,15 @@ def system_check():
 class TradingBot:
     def __init__(self):
         self.auto_trader = None
+        self.profiler = None
         self.running = False
         
     def signal_handler(self, signum, frame):
         """시그널 핸들러"""
         logging.info("종료 신호 감지, 프로그램을 안전하게 종료합니다...")
         self.running = False
+        if self.profiler:  # 실행 중인 프로파일 저장 (stop()은 프로세스를 바로 종료함)
+            self.profiler.close()
         if self.auto_trader:
             self.auto_trader.stop()
     
@@ -105,6 +104,9 @@ class TradingBot:
             signal.signal(signal.SIGINT, self.signal_handler)
             signal.signal(signal.SIGTERM, self.signal_handler)
             
+            # 실행 중 프로파일링 (SIGUSR1: CPU 프로파일 시작/중지, SIGUSR2: 메모리 스냅샷, 제어 소켓 명령)
+            self.profiler = ProfilerControl(PROFILE_DIR, PROFILE_INTERVAL, CONTROL_SOCKET).install()
+            
             logging.info("프로그램 시작")
             
             # 시스템 점검
@@ -112,8 +114,11 @@ class TradingBot:
                 logging.error("시스템 점검 실패. 프로그램을 종료합니다.")
                 return
             
-            # AutoTrade 인스턴스 생성 및 실행
-            self.auto_trader = AutoTrade(start_cash=START_CASH)
+            # AutoTrade 인스턴스 생성 및 실행 (샤드 설정 시 종목을 여러 프로세스에 분산)
+            if SHARD_WORKERS > 0:
+                self.auto_trader = RiskCoordinator(start_cash=START_CASH, workers=SHARD_WORKERS)
+            else:
+                self.auto_trader = AutoTrade(start_cash=START_CASH)
             self.running = True
             
             # 트레이딩 시작
@@ -134,6 +139,8 @@ class TradingBot:
     def cleanup(self):
         """리소스 정리"""
         try:
+            if self.profiler:
+                self.profiler.close()
             if self.auto_trader:
                 self.auto_trader.stop()
             logging.info("프로그램이 안전하게 종료되었습니다.")
@@ -0,0 +1,11 @@
+from .bus import MarketDataBus, MarketDataReader
+from .recorder import FeedRecorder, FeedReplayer
+from .synthetic import SyntheticMarket, TickStream
+from .orderbook import OrderBook
+from .stream import WebSocketStream
+from .trades import TradeFlow
+
+__all__ = [
+    'MarketDataBus', 'MarketDataReader', 'FeedRecorder', 'FeedReplayer', 'SyntheticMarket', 'TickStream',
+    'OrderBook', 'WebSocketStream', 'TradeFlow'
+]
@@ -0,0 +1,417 @@
+"""
+공유 메모리 시세 버스
+
+퍼블리셔 프로세스 하나가 거래소 웹소켓에 연결해 모든 종목의 최신 체결(틱)과 마감된 1분봉을
+공유 메모리에 기록하고, 같은 머신의 다른 프로세스(봇, 노트북, 대시보드)는 소켓 없이 읽는다.
+
+구조 (쓰기는 퍼블리셔 하나만, 읽기는 여러 프로세스)
+- 종목 슬롯: 종목별 최신 틱. 슬롯마다 seqlock(쓰는 중 홀수, 완료 시 짝수)으로 찢어진 읽기를 감지한다.
+- 틱 링 버퍼: 모든 틱을 순서대로 기록. n번째 틱 칸의 버전은 쓰는 중 2n+1, 완료 시 2n+2이므로
+  독자는 자기 위치(cursor)의 버전만 보고 아직 안 쓰인 칸과 덮어쓰인 칸(추월)을 구분한다.
+- 캔들 링: 종목별 마감 캔들 (timestamp, OHLCV). 종목 단위 seqlock.
+
+퍼블리셔 실행: python -m market_data.bus --name upbit-bus
+봇에서 사용: config.py의 MARKET_DATA_BUS = "upbit-bus"
+"""
+import time
+import logging
+import argparse
+import threading
+import numpy as np
+import pyupbit
+from multiprocessing import shared_memory, resource_tracker
+from data_analyzer.analyzer import OHLCV_COLUMNS
+from utils.rate_limiter import quotation_limiter
+from utils.log import setup_logging
+
+# 틱 필드 (업비트 ticker 메시지 키, timestamp는 ms)
+TICK_FIELDS = (
+    'trade_price', 'trade_volume', 'acc_trade_volume_24h', 'acc_trade_price_24h',
+    'signed_change_rate', 'high_price', 'low_price', 'timestamp'
+)
+TICK_INDEX = {name: i for i, name in enumerate(TICK_FIELDS)}
+
+# 캔들 행: 시작 시각(초, pyupbit 캔들 인덱스와 같은 KST 기준) + OHLCV_COLUMNS
+CANDLE_WIDTH = 1 + len(OHLCV_COLUMNS)
+
+MAGIC = 0x55504249  # 'UPBI'
+LAYOUT_VERSION = 1
+NAME_SIZE = 16
+KST_OFFSET = 9 * 3600
+
+# 쓰는 중인 칸을 다시 읽는 최대 횟수 (퍼블리셔가 쓰는 도중 죽은 경우 무한 대기 방지)
+MAX_READ_RETRIES = 10000
+
+# 헤더 칸
+H_MAGIC, H_VERSION, H_MAX_TICKERS, H_RING_SIZE, H_CANDLE_CAPACITY, H_TICKER_COUNT, H_WRITE_INDEX = range(7)
+HEADER_SIZE = 8
+
+def _layout(max_tickers, ring_size, candle_capacity):
+    """(이름, 자료형, 모양) 목록과 전체 크기 -> 각 배열의 바이트 위치"""
+    fields = [
+        ('header', np.int64, (HEADER_SIZE,)),
+        ('names', f'S{NAME_SIZE}', (max_tickers,)),
+        ('tick_seq', np.uint64, (max_tickers,)),
+        ('ticks', np.float64, (max_tickers, len(TICK_FIELDS))),
+        ('ring_version', np.uint64, (ring_size,)),
+        ('ring_slot', np.int64, (ring_size,)),
+        ('ring_values', np.float64, (ring_size, len(TICK_FIELDS))),
+        ('candle_seq', np.uint64, (max_tickers,)),
+        ('candle_count', np.int64, (max_tickers,)),
+        ('candle_rows', np.float64, (max_tickers, candle_capacity, CANDLE_WIDTH)),
+    ]
+    offsets = {}
+    offset = 0
+    for name, dtype, shape in fields:
+        dtype = np.dtype(dtype)
+        offset = (offset + 63) // 64 * 64  # 캐시 라인 정렬
+        offsets[name] = (offset, dtype, shape)
+        offset += dtype.itemsize * int(np.prod(shape))
+    return offsets, offset
+
+def _attach(name):
+    """
+    다른 프로세스가 만든 공유 메모리에 연결
+    독자 프로세스가 종료될 때 resource tracker가 버스를 지우지 않도록 추적하지 않는다.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+class _SharedBus:
+    """버스 공유 메모리 배열 뷰"""
+
+    def __init__(self, shm, max_tickers, ring_size, candle_capacity, owner):
+        self.shm = shm
+        self.owner = owner
+        self.max_tickers = max_tickers
+        self.ring_size = ring_size
+        self.candle_capacity = candle_capacity
+        offsets, _ = _layout(max_tickers, ring_size, candle_capacity)
+        for name, (offset, dtype, shape) in offsets.items():
+            setattr(self, name, np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset))
+
+    def close(self):
+        # 공유 메모리를 가리키는 뷰를 먼저 해제해야 close 가능
+        for name in _layout(1, 1, 1)[0]:
+            setattr(self, name, None)
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+class MarketDataBus(_SharedBus):
+    """버스 쓰기 쪽 (프로세스 하나만 사용)"""
+
+    def __init__(self, name=None, max_tickers=256, ring_size=1 << 16, candle_capacity=512):
+        """
+        :param name: 공유 메모리 이름 (다른 프로세스가 이 이름으로 연결)
+        :param max_tickers: 최대 종목 수
+        :param ring_size: 틱 링 버퍼 크기 (독자가 이만큼 뒤처지면 추월됨)
+        :param candle_capacity: 종목별 보관 캔들 수
+        """
+        _, size = _layout(max_tickers, ring_size, candle_capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        super().__init__(shm, max_tickers, ring_size, candle_capacity, owner=True)
+        self.slots = {}  # 종목 -> 슬롯 번호
+        self.header[:] = 0
+        self.header[H_MAX_TICKERS] = max_tickers
+        self.header[H_RING_SIZE] = ring_size
+        self.header[H_CANDLE_CAPACITY] = candle_capacity
+        self.header[H_VERSION] = LAYOUT_VERSION
+        self.header[H_MAGIC] = MAGIC  # 마지막에 기록 (독자는 MAGIC으로 초기화 완료 확인)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def slot(self, ticker):
+        """종목 슬롯 번호 (처음 보는 종목은 등록)"""
+        slot = self.slots.get(ticker)
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= self.max_tickers:
+                raise ValueError(f"버스 종목 수 초과 (최대 {self.max_tickers}개)")
+            self.names[slot] = ticker.encode()
+            self.slots[ticker] = slot
+            self.header[H_TICKER_COUNT] = slot + 1  # 이름을 쓴 뒤 공개
+        return slot
+
+    def publish_tick(self, ticker, message):
+        """틱 기록 (웹소켓 ticker 메시지 딕셔너리)"""
+        values = [float(message.get(name) or 0.0) for name in TICK_FIELDS]
+        slot = self.slot(ticker)
+
+        # 최신 틱 슬롯
+        self.tick_seq[slot] += 1
+        self.ticks[slot] = values
+        self.tick_seq[slot] += 1
+
+        # 링 버퍼
+        n = int(self.header[H_WRITE_INDEX])
+        pos = n % self.ring_size
+        self.ring_version[pos] = 2 * n + 1
+        self.ring_slot[pos] = slot
+        self.ring_values[pos] = values
+        self.ring_version[pos] = 2 * n + 2
+        self.header[H_WRITE_INDEX] = n + 1
+
+    def publish_candles(self, ticker, rows):
+        """
+        마감 캔들 추가
+        :param rows: (k, CANDLE_WIDTH) 배열 [시작 시각(초), open, high, low, close, volume, value]
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, CANDLE_WIDTH)[-self.candle_capacity:]
+        slot = self.slot(ticker)
+        count = int(self.candle_count[slot])
+        positions = (count + np.arange(len(rows))) % self.candle_capacity
+
+        self.candle_seq[slot] += 1
+        self.candle_rows[slot, positions] = rows
+        self.candle_count[slot] = count + len(rows)
+        self.candle_seq[slot] += 1
+
+class MarketDataReader(_SharedBus):
+    """버스 읽기 쪽 (여러 프로세스에서 동시에 사용 가능, 읽기 중 쓰기가 겹치면 다시 읽음)"""
+
+    def __init__(self, name, from_start=False):
+        """
+        :param name: MarketDataBus 공유 메모리 이름
+        :param from_start: True면 링 버퍼에 남아 있는 가장 오래된 틱부터 읽기 (기본값: 연결 이후 틱만)
+        """
+        shm = _attach(name)
+        header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=shm.buf)
+        if header[H_MAGIC] != MAGIC or header[H_VERSION] != LAYOUT_VERSION:
+            shm.close()
+            raise ValueError(f"시세 버스 형식이 맞지 않습니다: {name}")
+        max_tickers, ring_size, candle_capacity = (
+            int(header[H_MAX_TICKERS]), int(header[H_RING_SIZE]), int(header[H_CANDLE_CAPACITY])
+        )
+        del header
+        super().__init__(shm, max_tickers, ring_size, candle_capacity, owner=False)
+
+        self.ticker_slots = {}
+        self.slot_tickers = []
+        self.tickers_lock = threading.Lock()  # 워밍업 스레드들이 같은 독자를 공유할 수 있음
+        write_index = int(self.header[H_WRITE_INDEX])
+        self.cursor = max(0, write_index - ring_size + 1) if from_start else write_index
+        self.dropped = 0  # 추월당해 놓친 틱 수
+        self.pending = []  # get()용 버퍼
+
+    def refresh_tickers(self):
+        count = int(self.header[H_TICKER_COUNT])
+        with self.tickers_lock:
+            for slot in range(len(self.slot_tickers), count):
+                ticker = self.names[slot].decode()
+                self.slot_tickers.append(ticker)
+                self.ticker_slots[ticker] = slot
+
+    def tickers(self):
+        """버스에 등록된 종목 목록"""
+        self.refresh_tickers()
+        return list(self.slot_tickers)
+
+    def _slot(self, ticker):
+        if ticker not in self.ticker_slots:
+            self.refresh_tickers()
+        return self.ticker_slots.get(ticker)
+
+    def latest(self, ticker):
+        """종목 최신 틱 (없으면 None)"""
+        slot = self._slot(ticker)
+        if slot is None:
+            return None
+        for _ in range(MAX_READ_RETRIES):
+            seq = int(self.tick_seq[slot])
+            if seq == 0:
+                return None
+            if seq & 1:
+                continue
+            values = self.ticks[slot].tolist()
+            if int(self.tick_seq[slot]) == seq:
+                return {'code': ticker, **dict(zip(TICK_FIELDS, values))}
+        return None
+
+    def candles(self, ticker, count=None):
+        """
+        종목 마감 캔들 (오래된 순)
+        :return: (timestamps(datetime64[ns]), ohlcv(6 x N)) 또는 캔들이 없으면 None
+        """
+        slot = self._slot(ticker)
+        if slot is None:
+            return None
+        for _ in range(MAX_READ_RETRIES):
+            seq = int(self.candle_seq[slot])
+            if seq & 1:
+                continue
+            total = int(self.candle_count[slot])
+            available = min(total, self.candle_capacity, count or self.candle_capacity)
+            if available == 0:
+                return None
+            positions = (total - available + np.arange(available)) % self.candle_capacity
+            rows = self.candle_rows[slot, positions]  # 팬시 인덱싱이므로 복사본
+            if int(self.candle_seq[slot]) == seq:
+                break
+        else:
+            return None
+
+        timestamps = (rows[:, 0] * 1e9).astype(np.int64).astype('datetime64[ns]')
+        return timestamps, np.ascontiguousarray(rows[:, 1:].T)
+
+    def poll_arrays(self, max_items=4096):
+        """
+        cursor 이후의 틱을 배열로 읽기
+        :return: (슬롯 번호 배열, 값 배열 (k x TICK_FIELDS))
+        """
+        write_index = int(self.header[H_WRITE_INDEX])
+        if write_index - self.cursor > self.ring_size:
+            # 링 버퍼 크기보다 뒤처진 경우 남아 있는 가장 오래된 틱부터
+            skipped = write_index - self.ring_size - self.cursor
+            self.dropped += skipped
+            self.cursor += skipped
+        count = min(write_index - self.cursor, max_items)
+        if count <= 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, len(TICK_FIELDS)))
+
+        numbers = self.cursor + np.arange(count, dtype=np.int64)
+        positions = numbers % self.ring_size
+        slots = self.ring_slot[positions]
+        values = self.ring_values[positions]
+        # 복사 후 버전 확인: 복사 도중 덮어쓰인 칸 이후는 버림
+        valid = self.ring_version[positions] == (2 * numbers + 2).astype(np.uint64)
+        if not valid.all():
+            first_invalid = int(np.argmin(valid))
+            slots, values = slots[:first_invalid], values[:first_invalid]
+            if first_invalid == 0:
+                # 첫 칸부터 덮어쓰였으면 추월당한 것이므로 다음 호출에서 위치 보정
+                self.dropped += 1
+                self.cursor += 1
+                return slots, values
+            count = first_invalid
+        self.cursor += count
+        return slots, values
+
+    def poll(self, max_items=4096):
+        """cursor 이후의 틱을 웹소켓 메시지와 같은 형태의 딕셔너리 목록으로 읽기"""
+        slots, values = self.poll_arrays(max_items)
+        if not len(slots):
+            return []
+        if slots.max() >= len(self.slot_tickers):
+            self.refresh_tickers()
+        tickers = self.slot_tickers
+        return [
+            {'code': tickers[slot], **dict(zip(TICK_FIELDS, row))}
+            for slot, row in zip(slots.tolist(), values.tolist())
+        ]
+
+    def get(self, timeout=None):
+        """
+        다음 틱 하나 반환 (pyupbit.WebSocketManager.get()과 같은 사용법)
+        :param timeout: 최대 대기 시간(초), 시간 초과 시 None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.pending:
+            self.pending = self.poll()
+            if self.pending:
+                self.pending.reverse()
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(0.0005)
+        return self.pending.pop()
+
+    def terminate(self):
+        """WebSocketManager와 같은 종료 인터페이스"""
+        self.pending = []
+        self.close()
+
+class CandleBuilder:
+    """틱으로 1분봉을 만들고, 분이 바뀌면 마감된 캔들을 반환"""
+
+    def __init__(self):
+        self.current = {}  # 종목 -> [분 시작(초), open, high, low, close, volume, value]
+        self.last_acc_volume = {}
+
+    def update(self, ticker, message):
+        """틱 반영 -> 마감된 캔들 행 또는 None"""
+        price = float(message['trade_price'])
+        minute = int(message.get('timestamp') or time.time() * 1000) // 60000 * 60 + KST_OFFSET
+
+        # 24시간 누적 거래량 차이로 틱 사이의 거래량 계산 (누적값이 초기화되면 이번 체결량 사용)
+        acc_volume = float(message.get('acc_trade_volume_24h') or 0.0)
+        previous = self.last_acc_volume.get(ticker)
+        volume = acc_volume - previous if previous is not None and acc_volume >= previous \
+            else float(message.get('trade_volume') or 0.0)
+        self.last_acc_volume[ticker] = acc_volume
+
+        candle = self.current.get(ticker)
+        closed = None
+        if candle is not None and candle[0] != minute:
+            closed = candle
+            candle = None
+        if candle is None:
+            self.current[ticker] = [minute, price, price, price, price, volume, volume * price]
+        else:
+            candle[2] = max(candle[2], price)
+            candle[3] = min(candle[3], price)
+            candle[4] = price
+            candle[5] += volume
+            candle[6] += volume * price
+        return closed
+
+def seed_candles(bus, ticker, count):
+    """REST로 과거 1분봉을 받아 버스에 미리 채움 (마지막 진행 중 캔들은 제외)"""
+    quotation_limiter.acquire()
+    df = pyupbit.get_ohlcv(ticker, interval="minute1", count=count + 1)
+    if df is None or df.empty:
+        logging.warning(f"{ticker} 초기 캔들 조회 실패")
+        return
+    df = df.iloc[:-1]
+    seconds = df.index.values.astype('datetime64[s]').astype(np.int64).astype(np.float64)
+    rows = np.column_stack([seconds, df[list(OHLCV_COLUMNS)].to_numpy(dtype=np.float64)])
+    bus.publish_candles(ticker, rows)
+
+def run_publisher(name, tickers, candle_count=200):
+    """웹소켓 틱을 버스에 기록하는 퍼블리셔 루프"""
+    bus = MarketDataBus(name)
+    builder = CandleBuilder()
+    logging.info(f"시세 버스 시작: {bus.name}, 종목 {len(tickers)}개")
+    try:
+        for ticker in tickers:
+            seed_candles(bus, ticker, candle_count)
+
+        while True:
+            wm = pyupbit.WebSocketManager("ticker", tickers)
+            try:
+                while True:
+                    message = wm.get()
+                    ticker = message.get('code')
+                    if not ticker or not message.get('trade_price'):
+                        continue
+                    bus.publish_tick(ticker, message)
+                    closed = builder.update(ticker, message)
+                    if closed is not None:
+                        bus.publish_candles(ticker, closed)
+            except Exception as e:
+                logging.error(f"시세 버스 웹소켓 오류: {str(e)}")
+                time.sleep(1)
+            finally:
+                wm.terminate()
+    finally:
+        bus.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 메모리 시세 버스 퍼블리셔")
+    parser.add_argument('--name', default="upbit-bus")
+    parser.add_argument('--tickers', help="쉼표로 구분한 종목 코드 (기본값: 모든 원화 마켓)")
+    parser.add_argument('--candles', type=int, default=200, help="시작 시 채울 과거 1분봉 수")
+    args = parser.parse_args()
+    setup_logging()
+
+    tickers = args.tickers.split(',') if args.tickers else pyupbit.get_tickers(fiat="KRW")
+    run_publisher(args.name, tickers, args.candles)
+
+if __name__ == "__main__":
+    main()
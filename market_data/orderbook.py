@@ -0,0 +1,112 @@
+"""
+호가(orderbook) 스트림과 미시구조 피처
+
+업비트 orderbook 메시지는 매번 상위 호가 전체(기본 15단계)를 보내므로, 메시지 하나마다
+종목 슬롯의 호가 배열을 덮어쓰고 상위 N호가 피처를 O(N)으로 다시 계산한다 (이력 재계산 없음).
+
+배열 구성 (미리 할당, 종목이 늘면 2배로 확장)
+- levels: (종목, LEVEL_FIELDS, 호가 단계) 최신 호가
+- values: (종목, ORDERBOOK_FEATURES) 최신 피처
+쓰기는 수집 스레드 하나만 하고, 피처 행은 한 번의 배열 대입으로 교체하므로
+매매 스레드가 읽는 행이 중간에 섞이지 않는다 (GIL).
+
+피처
+- spread / spread_bps: 최우선 매도호가 - 매수호가 (원 / 중간가 대비 bp)
+- microprice: 최우선 잔량 가중 가격 (매수 잔량이 많을수록 매도호가 쪽)
+- bid_depth / ask_depth: 상위 depth호가 잔량 금액 (원)
+- imbalance: (bid_depth - ask_depth) / (bid_depth + ask_depth), -1(매도 우위) ~ 1(매수 우위)
+"""
+import numpy as np
+
+LEVEL_FIELDS = ('ask_price', 'bid_price', 'ask_size', 'bid_size')
+
+ORDERBOOK_FEATURES = (
+    'timestamp', 'best_bid', 'best_ask', 'mid', 'spread', 'spread_bps', 'microprice',
+    'bid_depth', 'ask_depth', 'imbalance'
+)
+ORDERBOOK_INDEX = {name: i for i, name in enumerate(ORDERBOOK_FEATURES)}
+
+class OrderBook:
+    """종목별 최신 호가와 미시구조 피처 (쓰기는 수집 스레드 하나)"""
+
+    def __init__(self, tickers=(), levels=15, depth=5):
+        """
+        :param tickers: 미리 슬롯을 잡을 종목 목록 (그 외 종목은 처음 받을 때 추가)
+        :param levels: 보관할 호가 단계 수
+        :param depth: 잔량/불균형 계산에 쓰는 상위 호가 수
+        """
+        self.level_count = levels
+        self.depth = min(depth, levels)
+        self.slots = {}  # 종목 -> 슬롯 번호
+        capacity = max(len(tickers), 8)
+        self.levels = np.full((capacity, len(LEVEL_FIELDS), levels), np.nan)
+        self.values = np.full((capacity, len(ORDERBOOK_FEATURES)), np.nan)
+        self.updates = np.zeros(capacity, dtype=np.int64)  # 종목별 반영한 메시지 수
+        for ticker in tickers:
+            self.slot(ticker)
+
+    def slot(self, ticker):
+        """종목 슬롯 번호 (처음 보는 종목은 등록, 가득 차면 배열을 2배로 확장)"""
+        slot = self.slots.get(ticker)
+        if slot is None:
+            slot = len(self.slots)
+            if slot == len(self.values):
+                capacity = slot * 2
+                levels = np.full((capacity, len(LEVEL_FIELDS), self.level_count), np.nan)
+                values = np.full((capacity, len(ORDERBOOK_FEATURES)), np.nan)
+                updates = np.zeros(capacity, dtype=np.int64)
+                levels[:slot], values[:slot], updates[:slot] = self.levels, self.values, self.updates
+                self.levels, self.values, self.updates = levels, values, updates
+            self.slots[ticker] = slot
+        return slot
+
+    def update(self, message):
+        """
+        orderbook 메시지 하나 반영 (상위 호가 수에 비례, 이전 메시지와 무관)
+        :return: 반영했으면 True
+        """
+        units = message.get('orderbook_units')
+        ticker = message.get('code')
+        if not units or not ticker:
+            return False
+        rows = [
+            (unit['ask_price'], unit['bid_price'], unit['ask_size'], unit['bid_size'])
+            for unit in units[:self.level_count]
+        ]
+        ask, bid, ask_size, bid_size = rows[0]
+        if ask <= 0 or bid <= 0:
+            return False
+
+        mid = (ask + bid) / 2
+        spread = ask - bid
+        top = ask_size + bid_size
+        microprice = (ask * bid_size + bid * ask_size) / top if top > 0 else mid
+        bid_depth = sum(row[1] * row[3] for row in rows[:self.depth])
+        ask_depth = sum(row[0] * row[2] for row in rows[:self.depth])
+        depth = bid_depth + ask_depth
+
+        slot = self.slot(ticker)
+        levels = self.levels[slot].T  # (호가 단계, LEVEL_FIELDS) 뷰
+        levels[:len(rows)] = rows
+        levels[len(rows):] = np.nan
+        self.values[slot] = (
+            message.get('timestamp') or 0, bid, ask, mid, spread, spread / mid * 10_000, microprice,
+            bid_depth, ask_depth, (bid_depth - ask_depth) / depth if depth > 0 else 0.0
+        )
+        self.updates[slot] += 1
+        return True
+
+    def features(self, ticker):
+        """종목의 최신 피처 {이름: 값} (받은 호가가 없으면 None)"""
+        slot = self.slots.get(ticker)
+        if slot is None or not self.updates[slot]:
+            return None
+        return dict(zip(ORDERBOOK_FEATURES, self.values[slot].tolist()))
+
+    def book(self, ticker):
+        """종목의 최신 호가 {LEVEL_FIELDS: 배열} (받은 호가가 없으면 None)"""
+        slot = self.slots.get(ticker)
+        if slot is None or not self.updates[slot]:
+            return None
+        levels = self.levels[slot].copy()
+        return dict(zip(LEVEL_FIELDS, levels))
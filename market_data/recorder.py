@@ -0,0 +1,293 @@
+"""
+시세 피드 기록/재생
+
+기록: 수신한 원본 웹소켓 메시지를 수신 시각(ns)과 함께 메모리 버퍼에 추가만 하고,
+청크가 차거나 일정 시간이 지나면 별도 스레드가 JSON 배열로 묶어 zlib 압축 후 파일 끝에 덧붙인다.
+매매 루프에서는 리스트 추가 한 번의 비용만 든다.
+
+파일 형식 (feed-YYYYmmdd-HHMMSS.feed): 청크의 연속
+- 헤더: CHUNK_HEADER (매직, 레코드 수, 압축 길이, 첫/마지막 수신 시각 ns)
+- 본문: zlib 압축한 JSON 배열 [[수신 시각, 종류, 내용], ...]
+  종류: 'm' 웹소켓 메시지, 'c' 분석기에 적용한 캔들 스냅샷, 's' 세션 정보
+비정상 종료로 마지막 청크가 잘려도 앞의 청크는 그대로 읽을 수 있다.
+
+재생: FeedReplayer가 기록 순서대로 레코드를 내보내며, 기록된 수신 간격을 speed배로 줄여 대기한다.
+(speed=0이면 대기 없이 최대 속도) 재생 중 now()는 기록된 수신 시각을 반환하므로
+전략 쿨다운과 주기 작업의 기준 시각으로 쓰면 재생 속도와 무관하게 같은 결과가 나온다.
+
+실행: python -m market_data.recorder info recordings/
+(봇에 재생하기: python -m trading.replay recordings/ --speed 0)
+"""
+import os
+import glob
+import json
+import time
+import zlib
+import queue
+import struct
+import logging
+import argparse
+import threading
+import numpy as np
+
+CHUNK_MAGIC = b'FEED'
+CHUNK_HEADER = struct.Struct('<4sIIqq')  # 매직, 레코드 수, 압축 길이, 첫 수신 시각, 마지막 수신 시각
+FILE_PATTERN = "feed-*.feed"
+
+def _encode_candles(ticker, candles):
+    timestamps, ohlcv = candles
+    return {
+        'code': ticker,
+        'timestamps': np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64).tolist(),
+        'ohlcv': np.asarray(ohlcv, dtype=np.float64).tolist()
+    }
+
+def decode_candles(record):
+    """캔들 스냅샷 레코드 -> (종목, (timestamps, ohlcv))"""
+    timestamps = np.asarray(record['timestamps'], dtype=np.int64).astype('datetime64[ns]')
+    ohlcv = np.ascontiguousarray(record['ohlcv'], dtype=np.float64)
+    return record['code'], (timestamps, ohlcv)
+
+class FeedRecorder:
+    """원본 시세 메시지 기록기 (압축/쓰기는 백그라운드 스레드)"""
+
+    def __init__(self, directory, chunk_size=2000, flush_interval=1.0, rotate_seconds=3600, level=6):
+        """
+        :param directory: 기록 파일 저장 디렉터리
+        :param chunk_size: 압축 단위 레코드 수
+        :param flush_interval: 청크가 덜 차도 이 시간(초)이 지나면 저장
+        :param rotate_seconds: 새 파일로 넘어가는 간격 (초)
+        :param level: zlib 압축 수준
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.rotate_seconds = rotate_seconds
+        self.level = level
+        os.makedirs(directory, exist_ok=True)
+
+        self.buffer = []
+        self.buffer_lock = threading.Lock()  # 웹소켓 루프와 워밍업 스레드가 함께 기록
+        self.chunks = queue.Queue()
+        self.file = None
+        self.file_opened = 0
+        self.records = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name="feed-recorder", daemon=True)
+        self.writer.start()
+        logging.info(f"시세 피드 기록 시작: {directory}")
+
+    def _append(self, record):
+        with self.buffer_lock:
+            self.buffer.append(record)
+            if len(self.buffer) >= self.chunk_size:
+                self.chunks.put(self.buffer)
+                self.buffer = []
+
+    def record(self, message, received=None):
+        """
+        웹소켓 메시지 하나 기록 (버퍼에 추가만 함)
+        :param received: 수신 시각 ns (기본값: 현재 시각, 합성 피드는 생성한 시각을 지정)
+        """
+        self._append((received or time.time_ns(), 'm', message))
+
+    def record_candles(self, ticker, candles, received=None):
+        """분석기에 적용한 캔들 조회 결과 기록 (재생 시 같은 캔들로 지표 계산)"""
+        self._append((received or time.time_ns(), 'c', _encode_candles(ticker, candles)))
+
+    def record_session(self, info, received=None):
+        """세션 정보 기록 (감시 종목, 전략 설정 등)"""
+        self._append((received or time.time_ns(), 's', info))
+
+    def flush(self):
+        """버퍼에 남은 레코드를 저장 대기열로 넘김"""
+        with self.buffer_lock:
+            if self.buffer:
+                self.chunks.put(self.buffer)
+                self.buffer = []
+
+    def _write_loop(self):
+        while True:
+            try:
+                chunk = self.chunks.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush()
+                continue
+            if chunk is None:
+                break
+            try:
+                self._write_chunk(chunk)
+            except Exception as e:
+                logging.error(f"시세 피드 기록 실패: {str(e)}")
+
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def _write_chunk(self, chunk):
+        raw = json.dumps(chunk, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        payload = zlib.compress(raw, self.level)
+
+        now = time.time()
+        if self.file is None or now - self.file_opened > self.rotate_seconds:
+            if self.file:
+                self.file.close()
+            path = os.path.join(self.directory, time.strftime("feed-%Y%m%d-%H%M%S.feed", time.localtime(now)))
+            self.file = open(path, 'ab')
+            self.file_opened = now
+
+        self.file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, len(chunk), len(payload), chunk[0][0], chunk[-1][0]))
+        self.file.write(payload)
+        self.file.flush()
+        self.records += len(chunk)
+        self.raw_bytes += len(raw)
+        self.written_bytes += CHUNK_HEADER.size + len(payload)
+
+    def close(self):
+        """남은 레코드 저장 후 기록 종료"""
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+        self.chunks.put(None)
+        self.writer.join(timeout=10)
+        logging.info(
+            f"시세 피드 기록 종료: {self.records:,}개 레코드, "
+            f"{self.raw_bytes / 1e6:.1f}MB -> {self.written_bytes / 1e6:.1f}MB"
+        )
+
+def feed_files(paths):
+    """파일/디렉터리 목록 -> 기록 파일 경로 목록 (시간순)"""
+    files = []
+    for path in [paths] if isinstance(paths, str) else paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, FILE_PATTERN)))
+        else:
+            files.append(path)
+    return sorted(files, key=os.path.basename)
+
+def read_chunks(path):
+    """파일의 청크를 순서대로 읽음 -> (헤더 튜플, 레코드 목록)"""
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if not header:
+                return
+            if len(header) < CHUNK_HEADER.size:
+                logging.warning(f"{path}: 마지막 청크 헤더가 잘려 있어 무시합니다")
+                return
+            magic, count, length, first, last = CHUNK_HEADER.unpack(header)
+            if magic != CHUNK_MAGIC:
+                raise ValueError(f"{path}: 기록 파일 형식이 아닙니다")
+            payload = f.read(length)
+            if len(payload) < length:
+                logging.warning(f"{path}: 마지막 청크가 잘려 있어 무시합니다")
+                return
+            yield (magic, count, length, first, last), json.loads(zlib.decompress(payload))
+
+def read_records(paths):
+    """기록 파일들의 레코드를 순서대로 반환 -> (수신 시각 ns, 종류('m', 'c', 's'), 내용)"""
+    for path in feed_files(paths):
+        for _, records in read_chunks(path):
+            for received, kind, payload in records:
+                yield received, kind, payload
+
+class FeedReplayer:
+    """기록된 세션을 원래 간격(의 1/speed)으로 다시 내보냄"""
+
+    def __init__(self, paths, speed=1.0):
+        """
+        :param paths: 기록 파일 또는 디렉터리 (여러 개 가능)
+        :param speed: 재생 배속 (1: 실시간, 10: 10배속, 0: 대기 없이 최대 속도)
+        """
+        self.files = feed_files(paths)
+        if not self.files:
+            raise FileNotFoundError(f"기록 파일이 없습니다: {paths}")
+        self.speed = speed
+        self.current = None  # 마지막으로 내보낸 레코드의 수신 시각 (초)
+        self.running = True
+
+    def now(self):
+        """재생 중인 세션의 현재 시각 (time.time() 대신 사용)"""
+        return self.current if self.current is not None else time.time()
+
+    def session(self):
+        """첫 세션 정보 레코드 (없으면 None)"""
+        for _, kind, payload in read_records(self.files[:1]):
+            if kind == 's':
+                return payload
+            if kind == 'm':
+                return None
+        return None
+
+    def __iter__(self):
+        """(종류, 내용) 레코드를 기록 간격에 맞춰 반환"""
+        base_recorded = base_wall = None
+        for received, kind, payload in read_records(self.files):
+            if not self.running:
+                return
+            if self.speed > 0:
+                if base_recorded is None:
+                    base_recorded, base_wall = received, time.perf_counter()
+                delay = (received - base_recorded) / 1e9 / self.speed - (time.perf_counter() - base_wall)
+                if delay > 0:
+                    time.sleep(delay)
+            self.current = received / 1e9
+            yield kind, payload
+
+    def messages(self):
+        """웹소켓 메시지만 반환 (WebSocketManager 대신 사용할 때)"""
+        for kind, payload in self:
+            if kind == 'm':
+                yield payload
+
+    def terminate(self):
+        self.running = False
+
+def summarize_files(paths):
+    """기록 파일 요약 (레코드 수, 기간, 압축률, 종목별 메시지 수)"""
+    summary = {'files': 0, 'chunks': 0, 'messages': 0, 'candles': 0, 'compressed_bytes': 0,
+               'raw_bytes': 0, 'first': None, 'last': None, 'tickers': {}}
+    for path in feed_files(paths):
+        summary['files'] += 1
+        for (_, count, length, first, last), records in read_chunks(path):
+            summary['chunks'] += 1
+            summary['compressed_bytes'] += CHUNK_HEADER.size + length
+            summary['raw_bytes'] += len(json.dumps(records, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+            summary['first'] = first if summary['first'] is None else min(summary['first'], first)
+            summary['last'] = last if summary['last'] is None else max(summary['last'], last)
+            for _, kind, payload in records:
+                if kind == 'm':
+                    summary['messages'] += 1
+                    code = payload.get('code')
+                    summary['tickers'][code] = summary['tickers'].get(code, 0) + 1
+                elif kind == 'c':
+                    summary['candles'] += 1
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="시세 피드 기록 파일 정보")
+    parser.add_argument('command', choices=['info'])
+    parser.add_argument('paths', nargs='+', help="기록 파일 또는 디렉터리")
+    args = parser.parse_args()
+
+    summary = summarize_files(args.paths)
+    if not summary['files']:
+        print("기록 파일이 없습니다")
+        return
+    duration = (summary['last'] - summary['first']) / 1e9 if summary['first'] is not None else 0
+    print(
+        f"파일 {summary['files']}개, 청크 {summary['chunks']:,}개\n"
+        f"메시지 {summary['messages']:,}개, 캔들 스냅샷 {summary['candles']:,}개\n"
+        f"기간: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime((summary['first'] or 0) / 1e9))} "
+        f"부터 {duration / 60:,.1f}분 (평균 {summary['messages'] / max(duration, 1e-9):,.1f}개/초)\n"
+        f"크기: {summary['raw_bytes'] / 1e6:.1f}MB -> {summary['compressed_bytes'] / 1e6:.1f}MB "
+        f"(압축률 {summary['raw_bytes'] / max(summary['compressed_bytes'], 1):.1f}배)"
+    )
+    for code, count in sorted(summary['tickers'].items(), key=lambda item: -item[1]):
+        print(f"- {code}: {count:,}개")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+보조 웹소켓 구독 (호가/체결 등)
+
+매매 루프가 읽는 ticker 구독과 별도의 pyupbit.WebSocketManager 프로세스로 구독하고,
+수신 메시지는 전용 스레드가 받아 처리기(handler)에 넘긴다.
+소켓 수신과 JSON 해석은 WebSocketManager 프로세스에서 처리되므로 매매 루프는 처리기 비용만 나눠 쓴다.
+"""
+import time
+import queue
+import logging
+import threading
+import pyupbit
+
+# 종목 변경/종료를 확인하는 간격 (초)
+POLL_TIMEOUT = 1.0
+
+class WebSocketStream:
+    """보조 구독 스레드 (연결이 끊기면 1초 뒤 다시 연결)"""
+
+    def __init__(self, kind, tickers, handler, recorder=None):
+        """
+        :param kind: 업비트 웹소켓 구독 종류 ('orderbook', 'trade')
+        :param tickers: 구독 종목 목록
+        :param handler: 메시지 하나를 받는 함수
+        :param recorder: FeedRecorder (설정 시 원본 메시지 기록, 재생 시 같은 처리기로 전달)
+        """
+        self.kind = kind
+        self.tickers = list(tickers)
+        self.handler = handler
+        self.recorder = recorder
+        self.running = False
+        self.wm = None
+        self.messages = 0
+        self.errors = 0
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"{self.kind}-stream", daemon=True)
+        self.thread.start()
+        return self
+
+    def set_tickers(self, tickers):
+        """구독 종목 변경 (현재 연결을 끊고 새 종목으로 다시 연결)"""
+        self.tickers = list(tickers)
+        self._terminate()
+
+    def stop(self):
+        self.running = False
+        self._terminate()
+
+    def _terminate(self):
+        wm, self.wm = self.wm, None
+        if wm is not None:
+            try:
+                wm.terminate()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _get(wm):
+        """다음 메시지 (없으면 POLL_TIMEOUT초 뒤 queue.Empty 반환)"""
+        q = getattr(wm, '_WebSocketManager__q', None)  # pyupbit 내부 multiprocessing.Queue
+        if not wm.alive or q is None:
+            return wm.get()  # 첫 호출에서 구독 프로세스 시작
+        try:
+            return q.get(timeout=POLL_TIMEOUT)
+        except queue.Empty:
+            return queue.Empty
+
+    def _run(self):
+        while self.running:
+            try:
+                self.wm = wm = pyupbit.WebSocketManager(self.kind, self.tickers)
+                while self.running and self.wm is wm:
+                    data = self._get(wm)
+                    if data is queue.Empty:
+                        continue
+                    if data is None or data == 'ConnectionClosedError':
+                        raise Exception("WebSocket 연결 끊김")
+                    if self.recorder:
+                        self.recorder.record(data)
+                    try:
+                        self.handler(data)
+                        self.messages += 1
+                    except Exception as e:  # 메시지 하나의 오류로 구독을 끊지 않음
+                        self.errors += 1
+                        logging.debug(f"{self.kind} 메시지 처리 실패: {str(e)}")
+            except Exception as e:
+                if self.running:
+                    logging.error(f"{self.kind} 구독 오류: {str(e)}")
+                    time.sleep(1)
+            finally:
+                self._terminate()
@@ -0,0 +1,414 @@
+"""
+벤치마크/부하 테스트용 합성 시세 생성기
+
+모든 계산을 NumPy 배열 단위로 처리하므로 수백 종목의 1년치 1분봉을 몇 초 안에 만든다.
+- 변동성 국면: 평온/보통/급변 국면이 기하분포 길이로 번갈아 나타나며 모든 종목이 공유
+- 종목 간 상관: 공통 시장 요인 + 종목 고유 요인 (correlation은 평균 쌍별 상관계수)
+- 급등락: 종목별/시장 전체 점프 (포아송 도착)
+- 거래량 군집: AR(1) 로그 거래량 + 국면/시간대/수익률 크기에 비례
+- 재현성: 같은 seed면 종목 수나 생성 순서와 무관하게 종목별로 같은 결과
+
+출력 형식은 봇이 쓰는 그대로다.
+- 캔들: 종목 -> (timestamps datetime64[ns], ohlcv 6xN) (DataAnalyzer.fetch_data, backtest.data와 동일)
+- 틱: 업비트 웹소켓 ticker 메시지 딕셔너리 (TickStream은 WebSocketManager처럼 get()/terminate() 제공)
+
+실행:
+python -m market_data.synthetic bench --tickers 200 --days 365
+python -m market_data.synthetic candles --tickers 200 --days 30 --out data/synthetic.npz
+python -m market_data.synthetic feed --tickers 200 --ticks 1000000 --rate 2000 --out recordings/synthetic
+(기록 형식으로 저장한 피드는 python -m trading.replay recordings/synthetic --speed 0 으로 봇에 흘릴 수 있다)
+"""
+import os
+import time
+import argparse
+import numpy as np
+
+MINUTES_PER_DAY = 1440
+KST_OFFSET = np.timedelta64(9, 'h')  # 캔들 시각은 pyupbit와 같이 KST 기준
+DEFAULT_START = np.datetime64('2024-01-01T09:00', 'm')
+
+# 변동성 국면: (변동성 배수, 평균 지속 시간(분))
+REGIMES = ((0.6, 720), (1.0, 1440), (2.5, 240))
+
+# 시간대별 변동성/거래량 배수의 진폭과 최고점 (KST 22시 전후가 가장 활발)
+SEASONAL_AMPLITUDE = 0.3
+SEASONAL_PEAK_MINUTE = 22 * 60
+
+# 거래량 군집: CLUSTER_STEP분마다 갱신되는 AR(1) 계수 (로그 거래대금)
+CLUSTER_STEP = 15
+CLUSTER_PHI = 0.9
+
+def ticker_names(count):
+    """합성 종목 코드 목록"""
+    return [f"KRW-S{i:03d}" for i in range(count)]
+
+def ar1(noise, phi, block=256):
+    """
+    x[t] = phi * x[t-1] + noise[t] (x[-1] = 0)
+    블록 안은 누적합으로 계산하고 블록 경계의 이월값만 반복문으로 처리한다.
+    """
+    n = len(noise)
+    padded = np.zeros(-(-n // block) * block)
+    padded[:n] = noise
+    padded = padded.reshape(-1, block)
+    powers = phi ** np.arange(block)
+    local = np.cumsum(padded / powers, axis=1) * powers  # 블록 시작값이 0일 때의 해
+
+    carry = np.empty(len(local))
+    value = 0.0
+    decay = phi ** block
+    for b, end in enumerate(local[:, -1].tolist()):
+        carry[b] = value
+        value = value * decay + end
+    return (local + carry[:, None] * (phi * powers)).ravel()[:n]
+
+def seasonality(minute_of_day):
+    """분(0~1439) -> 시간대별 변동성/거래량 배수"""
+    phase = 2 * np.pi * (minute_of_day - SEASONAL_PEAK_MINUTE) / MINUTES_PER_DAY
+    return 1.0 + SEASONAL_AMPLITUDE * np.cos(phase)
+
+class SyntheticMarket:
+    """상관된 여러 종목의 합성 시세"""
+
+    def __init__(self, tickers=100, seed=0, start=DEFAULT_START, volatility=0.0015, correlation=0.3,
+                 jump_rate=2.0, jump_scale=0.01, market_jump_rate=0.2, regimes=REGIMES):
+        """
+        :param tickers: 종목 수 또는 종목 코드 목록
+        :param seed: 난수 시드
+        :param start: 캔들/틱 기본 시작 시각 (KST, datetime64 또는 문자열)
+        :param volatility: 평균 1분 수익률 표준편차
+        :param correlation: 종목 간 평균 상관계수 (점프 제외)
+        :param jump_rate: 종목별 점프 횟수 (하루 평균)
+        :param jump_scale: 점프 크기 표준편차 (로그 수익률)
+        :param market_jump_rate: 시장 전체 점프 횟수 (하루 평균)
+        :param regimes: ((변동성 배수, 평균 지속 시간(분)), ...)
+        """
+        self.tickers = ticker_names(tickers) if isinstance(tickers, int) else list(tickers)
+        self.seed = seed
+        self.start = np.datetime64(start, 'm')
+        self.jump_rate = jump_rate / MINUTES_PER_DAY
+        self.jump_scale = jump_scale
+        self.market_jump_rate = market_jump_rate / MINUTES_PER_DAY
+        self.regime_scale = np.array([scale for scale, _ in regimes], dtype=np.float64)
+        self.regime_duration = np.array([duration for _, duration in regimes], dtype=np.float64)
+
+        # 종목별 고정 특성 (종목 순번별 난수로 정해 종목 수와 무관하게 같음)
+        count = len(self.tickers)
+        self.price = np.empty(count)
+        self.sigma = np.empty(count)
+        self.beta = np.empty(count)
+        self.turnover = np.empty(count)  # 하루 평균 거래대금 (원)
+        for i in range(count):
+            rng = self._rng(0, i)
+            self.price[i] = 10 ** rng.uniform(1, 7.5)
+            self.sigma[i] = volatility * rng.lognormal(0, 0.3)
+            self.beta[i] = min(np.sqrt(correlation) * rng.uniform(0.8, 1.2), 0.99)
+            self.turnover[i] = 10 ** rng.uniform(9, 11.5)
+
+    def _rng(self, *key):
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=key))
+
+    def _regimes(self, rng, minutes):
+        """분별 국면 번호 (국면 길이는 기하분포, 다음 국면은 나머지 중 무작위)"""
+        states = len(self.regime_scale)
+        if states == 1:
+            return np.zeros(minutes, dtype=np.intp)
+        runs = int(minutes / self.regime_duration.min() * 2) + 16
+        while True:
+            sequence = (rng.integers(states) + np.cumsum(rng.integers(1, states, runs))) % states
+            lengths = rng.geometric(1 / self.regime_duration[sequence])
+            if lengths.sum() >= minutes:
+                return np.repeat(sequence, lengths)[:minutes]
+            runs *= 2
+
+    def _market(self, key, start, minutes):
+        """시장 공통 요인: (분별 변동성 배수, 시장 요인 충격, 시장 점프)"""
+        rng = self._rng(*key)
+        minute_of_day = (np.arange(minutes) + (start - start.astype('datetime64[D]')).astype(np.int64)) % MINUTES_PER_DAY
+        scale = self.regime_scale[self._regimes(rng, minutes)] * seasonality(minute_of_day)
+        factor = rng.standard_normal(minutes)
+        jumps = np.zeros(minutes)
+        count = rng.binomial(minutes, min(self.market_jump_rate, 1.0))
+        jumps[rng.integers(0, minutes, count)] = rng.normal(0, self.jump_scale * 2, count)
+        return scale, factor, jumps
+
+    def iter_candles(self, count, start=None, start_prices=None):
+        """
+        종목별 1분봉을 하나씩 생성 (전체를 메모리에 올리지 않을 때)
+        :param count: 종목당 캔들 수
+        :param start: 첫 캔들 시각 (기본값: 생성자의 start)
+        :param start_prices: 종목별 시작 가격 (기본값: 종목 고유 가격)
+        :return: (종목, (timestamps, ohlcv)) 이터레이터
+        """
+        start = self.start if start is None else np.datetime64(start, 'm')
+        key = int(start.astype(np.int64))  # 시작 시각(분)마다 다른 난수
+        scale, factor, market_jumps = self._market((1, key), start, count)
+        timestamps = (start + np.arange(count, dtype=np.int64).astype('timedelta64[m]')).astype('datetime64[ns]')
+        prices = self.price if start_prices is None else np.asarray(start_prices, dtype=np.float64)
+        volume_scale = scale ** 1.5 / MINUTES_PER_DAY
+
+        for i, ticker in enumerate(self.tickers):
+            rng = self._rng(2, key, i)
+            sigma, beta = self.sigma[i], self.beta[i]
+            volatility = sigma * scale
+            returns = rng.standard_normal(count)
+            returns *= np.sqrt(1 - beta * beta)
+            returns += beta * factor
+            returns *= volatility
+            returns += beta * market_jumps
+            jumps = rng.binomial(count, min(self.jump_rate, 1.0))
+            returns[rng.integers(0, count, jumps)] += rng.normal(0, self.jump_scale, jumps)
+
+            ohlcv = np.empty((6, count))
+            close = ohlcv[3]
+            np.cumsum(returns, out=close)
+            np.exp(close, out=close)
+            close *= prices[i]
+            ohlcv[0, 0] = prices[i]
+            ohlcv[0, 1:] = close[:-1]
+            # 꼬리 길이는 지수분포 (정규분포보다 생성이 빠름)
+            wicks = rng.standard_exponential((2, count), dtype=np.float32)
+            wicks *= (volatility * 0.3).astype(np.float32)
+            wicks[1] *= -1
+            np.exp(wicks, out=wicks)
+            np.maximum(ohlcv[0], close, out=ohlcv[1])
+            ohlcv[1] *= wicks[0]
+            np.minimum(ohlcv[0], close, out=ohlcv[2])
+            ohlcv[2] *= wicks[1]
+
+            # 거래대금: 기본값 x 국면/시간대 x 군집(CLUSTER_STEP분 간격 AR(1)) x 수익률 크기
+            steps = -(-count // CLUSTER_STEP)
+            clustering = ar1(rng.standard_normal(steps) * np.sqrt(1 - CLUSTER_PHI ** 2), CLUSTER_PHI)
+            clustering = np.exp(np.repeat(0.5 * clustering - 0.125, CLUSTER_STEP)[:count])
+            value = ohlcv[5]
+            np.abs(returns, out=value)
+            value /= volatility
+            value *= 0.3
+            value += 1
+            value *= clustering
+            value *= volume_scale * self.turnover[i]
+            np.add(ohlcv[1], ohlcv[2], out=ohlcv[4])
+            ohlcv[4] += close
+            np.divide(value, ohlcv[4], out=ohlcv[4])
+            ohlcv[4] *= 3
+            yield ticker, (timestamps, ohlcv)
+
+    def candles(self, count, start=None, start_prices=None):
+        """종목 -> (timestamps, ohlcv) 딕셔너리 (종목 수 x 캔들 수 x 56바이트 메모리 사용)"""
+        return dict(self.iter_candles(count, start, start_prices))
+
+    def ticks(self, count, rate=1000.0, start=None, start_prices=None, concentration=1.0):
+        """
+        체결 틱 생성
+        :param count: 전체 틱 수
+        :param rate: 초당 평균 틱 수 (도착 간격은 지수분포)
+        :param start: 첫 틱 시각 (KST, 기본값: 생성자의 start)
+        :param start_prices: 종목별 시작 가격 (기본값: 종목 고유 가격)
+        :param concentration: 종목별 거래 빈도 편중 (지프 지수, 앞 종목일수록 활발)
+        :return: TickStream
+        """
+        start = self.start if start is None else np.datetime64(start, 'm')
+        key = int(start.astype(np.int64))
+        rng = self._rng(3, key)
+        n_tickers = len(self.tickers)
+        prices = self.price if start_prices is None else np.asarray(start_prices, dtype=np.float64)
+
+        seconds = np.cumsum(rng.exponential(1 / rate, count))
+        minutes = int(seconds[-1] // 60) + 1 if count else 1
+        scale, _, _ = self._market((4, key), start, minutes)
+        minute = (seconds // 60).astype(np.intp)
+        weights = 1 / np.arange(1, n_tickers + 1) ** concentration
+        weights /= weights.sum()
+        codes = rng.choice(n_tickers, size=count, p=weights)
+
+        # 시장 요인은 모든 틱이 공유하는 브라운 운동 (경과 시간에 비례하는 분산)
+        elapsed = np.diff(seconds, prepend=0.0) / 60
+        market = np.cumsum(np.sqrt(elapsed) * scale[minute] * rng.standard_normal(count))
+
+        # 종목별로 모아 직전 틱 이후의 변화량 계산
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        first = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+        starts = np.flatnonzero(first)
+        lengths = np.diff(np.r_[starts, count])
+
+        since = np.diff(seconds[order], prepend=0.0) / 60
+        since[first] = seconds[order][first] / 60
+        market_change = np.diff(market[order], prepend=0.0)
+        market_change[first] = market[order][first]
+
+        beta = self.beta[sorted_codes]
+        returns = self.sigma[sorted_codes] * (
+            beta * market_change
+            + np.sqrt(1 - beta * beta) * np.sqrt(since) * scale[minute[order]] * rng.standard_normal(count)
+        )
+        jumped = rng.random(count) < np.minimum(self.jump_rate * since, 1.0)
+        returns[jumped] += rng.normal(0, self.jump_scale, int(jumped.sum()))
+
+        # 종목별 누적합 (전체 누적합에서 종목 시작 전까지의 합을 뺌)
+        log_price = np.cumsum(returns)
+        log_price -= np.repeat(log_price[starts] - returns[starts], lengths)
+
+        # 체결 금액: 종목 평균 체결당 금액 x 국면 x 로그정규 잡음
+        per_tick = self.turnover / (rate * 86400 * weights)
+        value = per_tick[sorted_codes] * scale[minute[order]] * rng.lognormal(-0.5, 1.0, count)
+        acc_value = np.cumsum(value)
+        acc_value -= np.repeat(acc_value[starts] - value[starts], lengths)
+
+        sorted_prices = prices[sorted_codes] * np.exp(log_price)
+        volume = value / sorted_prices
+        acc_volume = np.cumsum(volume)
+        acc_volume -= np.repeat(acc_volume[starts] - volume[starts], lengths)
+
+        def unsort(values):
+            result = np.empty_like(values)
+            result[order] = values
+            return result
+
+        epoch_ms = int((start - KST_OFFSET).astype('datetime64[ms]').astype(np.int64))
+        return TickStream(
+            tickers=self.tickers,
+            timestamps=epoch_ms + (seconds * 1000).astype(np.int64),
+            codes=codes,
+            prices=unsort(sorted_prices),
+            volumes=unsort(volume),
+            acc_volumes=unsort(acc_volume),
+            acc_values=unsort(acc_value),
+            bid=unsort(returns >= 0),
+            prev_closes=prices
+        )
+
+class TickStream:
+    """생성된 틱 배열과 웹소켓 메시지 변환 (WebSocketManager 대신 사용 가능)"""
+
+    def __init__(self, tickers, timestamps, codes, prices, volumes, acc_volumes, acc_values, bid, prev_closes):
+        """
+        :param timestamps: 체결 시각 (epoch ms)
+        :param codes: 종목 번호 (tickers 인덱스)
+        :param bid: 매수 체결 여부
+        :param prev_closes: 종목별 전일 종가 (등락률 기준)
+        """
+        self.tickers = tickers
+        self.timestamps = timestamps
+        self.codes = codes
+        self.prices = prices
+        self.volumes = volumes
+        self.acc_volumes = acc_volumes
+        self.acc_values = acc_values
+        self.bid = bid
+        self.prev_closes = prev_closes
+        self.iterator = None
+        self.running = True
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        """업비트 ticker 메시지 형식으로 순서대로 반환"""
+        tickers = self.tickers
+        prev_closes = self.prev_closes.tolist()
+        for timestamp, code, price, volume, acc_volume, acc_value, bid in zip(
+            self.timestamps.tolist(), self.codes.tolist(), self.prices.tolist(), self.volumes.tolist(),
+            self.acc_volumes.tolist(), self.acc_values.tolist(), self.bid.tolist()
+        ):
+            prev = prev_closes[code]
+            change = price - prev
+            yield {
+                'type': 'ticker',
+                'code': tickers[code],
+                'trade_price': price,
+                'trade_volume': volume,
+                'prev_closing_price': prev,
+                'change': 'RISE' if change > 0 else 'FALL' if change < 0 else 'EVEN',
+                'signed_change_price': change,
+                'signed_change_rate': change / prev,
+                'acc_trade_volume_24h': acc_volume,
+                'acc_trade_price_24h': acc_value,
+                'ask_bid': 'BID' if bid else 'ASK',
+                'trade_timestamp': timestamp,
+                'timestamp': timestamp,
+                'stream_type': 'REALTIME'
+            }
+
+    def get(self):
+        """다음 메시지 (끝나거나 종료되면 None)"""
+        if self.iterator is None:
+            self.iterator = iter(self)
+        if not self.running:
+            return None
+        return next(self.iterator, None)
+
+    def terminate(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        """WebSocketManager 호환용 (별도 프로세스 없음)"""
+
+def write_feed(directory, market, ticks, rate=1000.0, history=200, start=None):
+    """
+    합성 세션을 시세 피드 기록 형식으로 저장 (trading.replay로 봇에 재생)
+    시작 시각 직전까지의 캔들 스냅샷을 먼저 기록하고, 그 종가에서 이어지는 틱을 기록한다.
+    :param history: 종목별 캔들 스냅샷 길이
+    :return: 기록한 틱 수
+    """
+    from market_data.recorder import FeedRecorder
+
+    start = market.start if start is None else np.datetime64(start, 'm')
+    candles = market.candles(history, start=start - np.timedelta64(history, 'm'))
+    stream = market.ticks(ticks, rate=rate, start=start,
+                          start_prices=[ohlcv[3, -1] for _, ohlcv in candles.values()])
+
+    recorder = FeedRecorder(directory, chunk_size=5000)
+    first = int(stream.timestamps[0]) * 1_000_000 if len(stream) else 0
+    recorder.record_session({'tickers': market.tickers, 'synthetic': {'seed': market.seed}}, received=first - 2)
+    for ticker, values in candles.items():
+        recorder.record_candles(ticker, values, received=first - 1)
+    for timestamp, message in zip(stream.timestamps.tolist(), stream):
+        recorder.record(message, received=timestamp * 1_000_000)
+    recorder.close()
+    return len(stream)
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 시세 생성")
+    parser.add_argument('command', choices=['bench', 'candles', 'feed'])
+    parser.add_argument('--tickers', type=int, default=200, help="종목 수")
+    parser.add_argument('--days', type=float, default=30, help="캔들 기간 (일, 1분봉)")
+    parser.add_argument('--ticks', type=int, default=1_000_000, help="틱 수 (feed, bench)")
+    parser.add_argument('--rate', type=float, default=1000, help="초당 평균 틱 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--volatility', type=float, default=0.0015, help="평균 1분 수익률 표준편차")
+    parser.add_argument('--correlation', type=float, default=0.3, help="종목 간 평균 상관계수")
+    parser.add_argument('--out', help="저장 경로 (candles: npz 파일, feed: 디렉터리)")
+    args = parser.parse_args()
+
+    market = SyntheticMarket(args.tickers, seed=args.seed, volatility=args.volatility, correlation=args.correlation)
+    count = int(args.days * MINUTES_PER_DAY)
+
+    if args.command == 'bench':
+        started = time.perf_counter()
+        rows = sum(len(timestamps) for _, (timestamps, _) in market.iter_candles(count))
+        elapsed = time.perf_counter() - started
+        print(f"캔들: {args.tickers}종목 x {count:,}개 = {rows:,}개, {elapsed:.2f}초 ({rows / elapsed:,.0f}개/초)")
+
+        started = time.perf_counter()
+        stream = market.ticks(args.ticks, rate=args.rate)
+        generated = time.perf_counter() - started
+        messages = sum(1 for _ in stream)
+        elapsed = time.perf_counter() - started
+        print(f"틱: {messages:,}개, 배열 생성 {generated:.2f}초, 메시지 변환 포함 {elapsed:.2f}초 "
+              f"({messages / elapsed:,.0f}개/초)")
+    elif args.command == 'candles':
+        from backtest.data import save_candles
+        if not args.out:
+            parser.error("--out 경로가 필요합니다")
+        os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+        save_candles(args.out, market.iter_candles(count))
+        print(f"{args.tickers}종목 x {count:,}개 캔들 저장: {args.out}")
+    else:
+        if not args.out:
+            parser.error("--out 경로가 필요합니다")
+        written = write_feed(args.out, market, args.ticks, rate=args.rate)
+        print(f"{written:,}개 틱 기록: {args.out}")
+
+if __name__ == "__main__":
+    main()
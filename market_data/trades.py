@@ -0,0 +1,190 @@
+"""
+체결(trade) 스트림 누적값 (구간 VWAP, 매수/매도 주도 거래량, 가격대별 거래량)
+
+종목마다 최근 window초 체결을 고정 크기 링 버퍼에 보관하고, 체결이 들어올 때
+누적합(가격x수량, 수량, 매수 주도, 매도 주도)과 가격대별 거래량에 더한 뒤
+구간을 벗어난 체결을 빼는 방식으로 체결 하나당 분할 상환 O(1)로 갱신한다.
+(버퍼가 가득 차면 가장 오래된 체결부터 구간에서 뺀다)
+
+가격대별 거래량(volume profile)은 종목의 첫 체결가 기준 bucket_bps 간격 가격대를
+buckets칸 배열에 (가격대 번호 % buckets) 위치로 담는다. 같은 칸에 먼 가격대가 들어오면
+이전 가격대는 구간에서 벗어난 것으로 보고 덮어쓴다.
+
+체결 시각은 거래소 체결 시각(trade_timestamp)을 사용하므로 기록 재생 시에도 같은 값이 나온다.
+쓰기는 수집 스레드 하나만 하고, 읽기는 누적합 행을 한 번에 복사한다 (GIL).
+"""
+import numpy as np
+
+# 누적합 열
+SUM_VALUE, SUM_VOLUME, SUM_BUY, SUM_SELL = range(4)
+
+TRADE_FEATURES = (
+    'vwap', 'volume', 'value', 'buy_volume', 'sell_volume', 'buy_ratio', 'trades',
+    'last_price', 'last_time', 'poc', 'window', 'warm'
+)
+
+class TradeFlow:
+    """종목별 최근 체결 구간 누적값 (쓰기는 수집 스레드 하나)"""
+
+    def __init__(self, tickers=(), window=60, capacity=2048, buckets=64, bucket_bps=10):
+        """
+        :param tickers: 미리 슬롯을 잡을 종목 목록 (그 외 종목은 처음 받을 때 추가)
+        :param window: 누적 구간 (초)
+        :param capacity: 종목별 보관 체결 수 (구간 안 체결이 더 많으면 오래된 체결부터 제외)
+        :param buckets: 가격대별 거래량 칸 수
+        :param bucket_bps: 가격대 간격 (종목 첫 체결가 대비 bp)
+        """
+        self.window = window
+        self.capacity = capacity
+        self.bucket_count = buckets
+        self.bucket_bps = bucket_bps
+        self.slots = {}  # 종목 -> 슬롯 번호
+        self.heads = []  # 종목별 가장 오래된 체결 위치
+        self.counts = []  # 종목별 구간 안 체결 수
+        self.first_times = []  # 종목별 첫 체결 시각 (구간이 다 찼는지 판단)
+        self._allocate(max(len(tickers), 8))
+        for ticker in tickers:
+            self.slot(ticker)
+
+    def _allocate(self, size):
+        """슬롯 배열 할당 (기존 슬롯 값은 복사)"""
+        arrays = {
+            'times': np.zeros((size, self.capacity)),
+            'prices': np.zeros((size, self.capacity)),
+            'volumes': np.zeros((size, self.capacity)),
+            'buys': np.zeros((size, self.capacity), dtype=bool),
+            'trade_buckets': np.zeros((size, self.capacity), dtype=np.int64),
+            'sums': np.zeros((size, 4)),
+            'last': np.zeros((size, 2)),  # 마지막 체결가, 체결 시각
+            'widths': np.zeros(size),  # 가격대 간격 (원)
+            'bucket_keys': np.full((size, self.bucket_count), np.iinfo(np.int64).min, dtype=np.int64),
+            'bucket_volumes': np.zeros((size, self.bucket_count))
+        }
+        used = len(self.slots)
+        for name, array in arrays.items():
+            if used:
+                array[:used] = getattr(self, name)[:used]
+            setattr(self, name, array)
+
+    def slot(self, ticker):
+        """종목 슬롯 번호 (처음 보는 종목은 등록, 가득 차면 배열을 2배로 확장)"""
+        slot = self.slots.get(ticker)
+        if slot is None:
+            slot = len(self.slots)
+            if slot == len(self.sums):
+                self._allocate(slot * 2)
+            self.heads.append(0)
+            self.counts.append(0)
+            self.first_times.append(None)
+            self.slots[ticker] = slot
+        return slot
+
+    def _evict(self, slot):
+        """가장 오래된 체결 하나를 구간에서 제외"""
+        head = self.heads[slot]
+        price = self.prices[slot, head]
+        volume = self.volumes[slot, head]
+        sums = self.sums[slot]
+        sums[SUM_VALUE] -= price * volume
+        sums[SUM_VOLUME] -= volume
+        sums[SUM_BUY if self.buys[slot, head] else SUM_SELL] -= volume
+        key = self.trade_buckets[slot, head]
+        cell = key % self.bucket_count
+        if self.bucket_keys[slot, cell] == key:
+            self.bucket_volumes[slot, cell] -= volume
+        self.heads[slot] = (head + 1) % self.capacity
+        self.counts[slot] -= 1
+        if not self.counts[slot]:  # 빈 구간은 0에서 다시 시작 (뺄셈 누적 오차 제거)
+            sums[:] = 0.0
+            self.bucket_volumes[slot] = 0.0
+
+    def update(self, message):
+        """
+        trade 메시지 하나 반영 (분할 상환 O(1))
+        :return: 반영했으면 True
+        """
+        ticker = message.get('code')
+        price = message.get('trade_price')
+        volume = message.get('trade_volume')
+        if not ticker or not price or volume is None:
+            return False
+        timestamp = (message.get('trade_timestamp') or message.get('timestamp') or 0) / 1000
+        buy = message.get('ask_bid') == 'BID'  # 매수 주문이 매도 호가를 체결 (매수 주도)
+
+        slot = self.slot(ticker)
+        if self.first_times[slot] is None:
+            self.first_times[slot] = timestamp
+            self.widths[slot] = price * self.bucket_bps / 10_000
+
+        # 구간을 벗어났거나 버퍼가 가득 찼으면 오래된 체결부터 제외
+        cutoff = timestamp - self.window
+        times = self.times[slot]
+        while self.counts[slot] and (
+            self.counts[slot] == self.capacity or times[self.heads[slot]] <= cutoff
+        ):
+            self._evict(slot)
+
+        key = int(price // self.widths[slot])
+        cell = key % self.bucket_count
+        if self.bucket_keys[slot, cell] != key:
+            self.bucket_keys[slot, cell] = key
+            self.bucket_volumes[slot, cell] = 0.0
+        self.bucket_volumes[slot, cell] += volume
+
+        position = (self.heads[slot] + self.counts[slot]) % self.capacity
+        times[position] = timestamp
+        self.prices[slot, position] = price
+        self.volumes[slot, position] = volume
+        self.buys[slot, position] = buy
+        self.trade_buckets[slot, position] = key
+        self.counts[slot] += 1
+
+        sums = self.sums[slot]
+        sums[SUM_VALUE] += price * volume
+        sums[SUM_VOLUME] += volume
+        sums[SUM_BUY if buy else SUM_SELL] += volume
+        self.last[slot] = (price, timestamp)
+        return True
+
+    def features(self, ticker):
+        """
+        종목의 최근 window초 체결 누적값 {TRADE_FEATURES: 값} (받은 체결이 없으면 None)
+        - poc: 거래량이 가장 많은 가격대의 중간 가격
+        - warm: 첫 체결 이후 window초가 지나 구간이 다 찼는지 여부
+        """
+        slot = self.slots.get(ticker)
+        if slot is None or self.first_times[slot] is None:
+            return None
+        value, volume, buy, sell = self.sums[slot].tolist()
+        last_price, last_time = self.last[slot].tolist()
+        bucket_volumes = self.bucket_volumes[slot]
+        top = int(np.argmax(bucket_volumes))
+        width = float(self.widths[slot])
+        return {
+            'vwap': value / volume if volume > 0 else last_price,
+            'volume': volume,
+            'value': value,
+            'buy_volume': buy,
+            'sell_volume': sell,
+            'buy_ratio': buy / (buy + sell) if buy + sell > 0 else 0.5,
+            'trades': self.counts[slot],
+            'last_price': last_price,
+            'last_time': last_time,
+            'poc': (int(self.bucket_keys[slot, top]) + 0.5) * width if bucket_volumes[top] > 0 else last_price,
+            'window': self.window,
+            'warm': last_time - self.first_times[slot] >= self.window
+        }
+
+    def profile(self, ticker):
+        """
+        가격대별 거래량 (가격대 중간 가격 오름차순)
+        :return: (가격 배열, 거래량 배열), 받은 체결이 없으면 None
+        """
+        slot = self.slots.get(ticker)
+        if slot is None or self.first_times[slot] is None:
+            return None
+        keys = self.bucket_keys[slot].copy()
+        volumes = self.bucket_volumes[slot].copy()
+        used = volumes > 1e-12
+        order = np.argsort(keys[used])
+        return (keys[used][order] + 0.5) * self.widths[slot], volumes[used][order]
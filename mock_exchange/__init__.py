@@ -0,0 +1,4 @@
+from .client import use_mock_exchange
+from .server import MockExchange, MockMarket
+
+__all__ = ['use_mock_exchange', 'MockExchange', 'MockMarket']
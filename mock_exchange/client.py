@@ -0,0 +1,54 @@
+"""
+pyupbit 호출을 로컬 모의 거래소로 보내기
+
+pyupbit는 REST/웹소켓 주소가 코드에 고정되어 있으므로, 모든 REST 요청이 지나가는
+request_api의 _call_get/_call_post/_call_delete와 웹소켓 연결 함수를 감싸 주소만 바꾼다.
+config.py가 MOCK_EXCHANGE_URL 환경 변수를 보고 다른 모듈보다 먼저 호출한다.
+(WebSocketManager는 fork로 시작되는 프로세스라 부모에서 바꾼 연결 함수를 그대로 사용)
+"""
+import types
+import logging
+from urllib.parse import urlsplit
+import websockets
+from pyupbit import request_api, websocket_api
+
+UPBIT_REST_URL = "https://api.upbit.com"
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+
+_installed = {}
+
+def default_ws_url(rest_url):
+    """REST 주소 -> 웹소켓 주소 (모의 거래소 기본값: 같은 호스트의 다음 포트)"""
+    parts = urlsplit(rest_url)
+    port = (parts.port or 80) + 1
+    return f"ws://{parts.hostname}:{port}/websocket/v1"
+
+def _redirect(call, rest_url):
+    def wrapper(url, **kwargs):
+        return call(url.replace(UPBIT_REST_URL, rest_url, 1), **kwargs)
+    return wrapper
+
+def use_mock_exchange(rest_url, ws_url=None):
+    """
+    이후의 모든 pyupbit 호출을 모의 거래소로 보냄 (여러 번 호출해도 한 번만 적용)
+    :param rest_url: 모의 거래소 REST 주소 (예: http://127.0.0.1:8765)
+    :param ws_url: 웹소켓 주소 (기본값: 같은 호스트의 REST 포트 + 1)
+    """
+    if _installed:
+        return _installed['rest_url'], _installed['ws_url']
+
+    rest_url = rest_url.rstrip('/')
+    ws_url = ws_url or default_ws_url(rest_url)
+    request_api._call_get = _redirect(request_api._call_get, rest_url)
+    request_api._call_post = _redirect(request_api._call_post, rest_url)
+    request_api._call_delete = _redirect(request_api._call_delete, rest_url)
+
+    # websocket_api는 모듈 전역 websockets.connect(고정 주소)를 사용
+    websocket_api.websockets = types.SimpleNamespace(
+        connect=lambda uri, **kwargs: websockets.connect(ws_url if uri == UPBIT_WEBSOCKET_URL else uri, **kwargs),
+        ConnectionClosed=websockets.ConnectionClosed
+    )
+
+    _installed.update(rest_url=rest_url, ws_url=ws_url)
+    logging.warning(f"모의 거래소 사용: REST {rest_url}, 웹소켓 {ws_url}")
+    return rest_url, ws_url
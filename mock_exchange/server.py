@@ -0,0 +1,829 @@
+"""
+로컬 모의 거래소 (업비트 REST + 웹소켓 호환)
+
+실제 주문/잔고/웹소켓 코드 경로를 거래소 없이 실행하기 위한 서버.
+- REST: 마켓 목록, 분/일 캔들, 현재가, 호가, 계좌, 주문(시장가/지정가), 주문 조회/취소
+- 웹소켓: ticker/trade/orderbook 구독 (pyupbit.WebSocketManager와 같은 바이너리 JSON 메시지)
+- 시세: 무작위 보행(기본) 또는 market_data.recorder로 기록한 세션 재생
+- 응답 지연, 무작위 서버 오류, 그룹별 초당 요청 제한(429), 주기적 웹소켓 연결 끊김을 설정 가능
+
+REST는 스레드 HTTP 서버, 웹소켓과 시세 생성은 asyncio 루프에서 실행하며 시장 상태는 lock으로 보호한다.
+
+실행: python -m mock_exchange.server --port 8765 --tickers KRW-BTC,KRW-ETH --rate 500
+봇 연결: MOCK_EXCHANGE_URL=http://127.0.0.1:8765 python main.py (웹소켓은 포트 + 1)
+"""
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+from collections import deque, defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+from websockets.asyncio.server import serve, broadcast
+
+FEE_RATE = 0.0005           # 업비트 원화 마켓 수수료
+MIN_ORDER_AMOUNT = 5000     # 최소 주문 금액
+MAX_CANDLES = 60 * 24 * 7   # 종목별 보관할 1분봉 수
+KST_OFFSET = 9 * 3600
+
+# 그룹별 초당 요청 제한 (업비트 기준)
+RATE_LIMITS = {'market': 10, 'order': 8, 'default': 30}
+
+# 분 캔들 단위 (업비트가 지원하는 값)
+MINUTE_UNITS = (1, 3, 5, 10, 15, 30, 60, 240)
+
+# 무작위 보행 시작 가격 (목록에 없는 종목은 시드로 정한 임의 가격)
+DEFAULT_PRICES = {
+    'KRW-BTC': 95_000_000, 'KRW-ETH': 4_500_000, 'KRW-XRP': 800, 'KRW-DOGE': 200,
+    'KRW-SOL': 200_000, 'KRW-ADA': 600
+}
+
+def tick_size(price):
+    """업비트 원화 마켓 호가 단위"""
+    for bound, size in ((2_000_000, 1000), (1_000_000, 500), (500_000, 100), (100_000, 50),
+                        (10_000, 10), (1_000, 1), (100, 0.1), (10, 0.01), (1, 0.001)):
+        if price >= bound:
+            return size
+    return 0.0001
+
+def round_price(price):
+    size = tick_size(price)
+    return round(round(price / size) * size, 4)
+
+def _time_strings(seconds):
+    """UTC 초 -> (UTC 문자열, KST 문자열) 업비트 캔들 형식"""
+    utc = datetime.fromtimestamp(seconds, timezone.utc)
+    kst = datetime.fromtimestamp(seconds + KST_OFFSET, timezone.utc)
+    return utc.strftime("%Y-%m-%dT%H:%M:%S"), kst.strftime("%Y-%m-%dT%H:%M:%S")
+
+class ApiError(Exception):
+    """업비트 오류 응답 ({"error": {"name", "message"}})"""
+
+    def __init__(self, status, name, message):
+        super().__init__(message)
+        self.status = status
+        self.name = name
+        self.message = message
+
+class MockMarket:
+    """모의 거래소 상태 (시세, 1분봉, 계좌, 주문)"""
+
+    def __init__(self, tickers, cash=10_000_000, history=600, volatility=0.002, seed=0):
+        """
+        :param tickers: 상장 종목
+        :param cash: 계좌 시작 원화 잔고
+        :param history: 시작 시 만들어 둘 과거 1분봉 수
+        :param volatility: 무작위 보행의 1분 수익률 표준편차
+        """
+        self.lock = threading.Lock()
+        self.rng = np.random.default_rng(seed)
+        self.tickers = list(tickers)
+        self.volatility = volatility
+        self.prices = {}        # 종목 -> 내부 가격 (호가 단위로 반올림하기 전)
+        self.prev_close = {}
+        self.day = {}           # 종목 -> [시가, 고가, 저가, 누적 거래량, 누적 거래대금, 매도 누적, 매수 누적]
+        self.candles = {ticker: deque(maxlen=MAX_CANDLES) for ticker in self.tickers}  # [시작(UTC 초), o, h, l, c, v, value]
+        self.last_trade = {}    # 종목 -> (가격, 수량, 시각 ms, 매수/매도)
+        self.sequence = 0
+
+        self.accounts = {'KRW': {'balance': float(cash), 'locked': 0.0, 'avg_buy_price': 0.0}}
+        self.orders = {}                    # uuid -> 주문
+        self.open_orders = defaultdict(list)  # 종목 -> 미체결 지정가 주문 uuid
+
+        for ticker in self.tickers:
+            price = DEFAULT_PRICES.get(ticker) or float(10 ** self.rng.uniform(2, 5))
+            self.seed_history(ticker, price, history)
+
+    # ---------------------------------------------------------------- 시세
+
+    def seed_history(self, ticker, price, count):
+        """현재 가격으로 끝나는 과거 1분봉 생성"""
+        now = int(time.time()) // 60 * 60
+        returns = self.rng.normal(0, self.volatility, count)
+        closes = price * np.exp(returns.cumsum() - returns.sum())
+        opens = np.concatenate(([closes[0] / np.exp(returns[0])], closes[:-1]))
+        spread = np.abs(self.rng.normal(0, self.volatility / 2, (2, count)))
+        highs = np.maximum(opens, closes) * (1 + spread[0])
+        lows = np.minimum(opens, closes) * (1 - spread[1])
+        volumes = self.rng.lognormal(0, 1, count) * 1e6 / price
+        starts = now - 60 * np.arange(count, 0, -1)
+        self.load_candles(ticker, np.column_stack([starts, opens, highs, lows, closes, volumes, volumes * closes]))
+
+    def load_candles(self, ticker, rows):
+        """1분봉 행 [시작(UTC 초), o, h, l, c, v, value]으로 과거 시세를 교체"""
+        rows = np.asarray(rows, dtype=np.float64)
+        candles = self.candles.setdefault(ticker, deque(maxlen=MAX_CANDLES))
+        candles.clear()
+        candles.extend(row.tolist() for row in rows)
+        price = float(rows[-1, 4])
+        self.prices[ticker] = price
+        self.prev_close[ticker] = float(rows[max(len(rows) - 1440, 0), 1])
+        day = rows[-1440:]
+        self.day[ticker] = [float(day[0, 1]), float(day[:, 2].max()), float(day[:, 3].min()),
+                            float(day[:, 5].sum()), float(day[:, 6].sum()), 0.0, 0.0]
+        self.last_trade[ticker] = (round_price(price), 0.0, int(rows[-1, 0]) * 1000, 'BID')
+
+    def random_ticks(self, count):
+        """무작위 보행 틱 count개 생성 -> 반영된 틱 목록"""
+        if not count:
+            return []
+        picks = self.rng.integers(0, len(self.tickers), count)
+        returns = self.rng.normal(0, self.volatility / 8, count)  # 1분에 약 64틱 기준
+        volumes = self.rng.exponential(1.0, count)
+        sides = self.rng.random(count) < 0.5
+        now_ms = int(time.time() * 1000)
+        ticks = []
+        with self.lock:
+            for pick, ret, volume, bid in zip(picks.tolist(), returns.tolist(), volumes.tolist(), sides.tolist()):
+                ticker = self.tickers[pick]
+                price = self.prices[ticker] * np.exp(ret)
+                ticks.append(self.apply_trade(
+                    ticker, price, volume * 2e5 / price, now_ms, 'BID' if bid else 'ASK'
+                ))
+        return ticks
+
+    def apply_trade(self, ticker, price, volume, timestamp, ask_bid):
+        """체결 하나 반영 (가격, 1분봉, 당일 누적, 지정가 주문 체결). lock을 잡은 상태에서 호출"""
+        self.prices[ticker] = price
+        trade_price = round_price(price)
+        self.sequence += 1
+        self.last_trade[ticker] = (trade_price, volume, timestamp, ask_bid)
+
+        minute = timestamp // 60000 * 60
+        candles = self.candles[ticker]
+        if candles and candles[-1][0] == minute:
+            candle = candles[-1]
+            candle[2] = max(candle[2], trade_price)
+            candle[3] = min(candle[3], trade_price)
+            candle[4] = trade_price
+            candle[5] += volume
+            candle[6] += volume * trade_price
+        else:
+            candles.append([minute, trade_price, trade_price, trade_price, trade_price, volume, volume * trade_price])
+
+        day = self.day[ticker]
+        day[1] = max(day[1], trade_price)
+        day[2] = min(day[2], trade_price)
+        day[3] += volume
+        day[4] += volume * trade_price
+        day[5 if ask_bid == 'ASK' else 6] += volume
+
+        if self.open_orders.get(ticker):
+            self.fill_limit_orders(ticker, trade_price)
+        return ticker, self.sequence
+
+    # ---------------------------------------------------------------- 메시지
+
+    def ticker_snapshot(self, ticker):
+        """현재가 (REST /v1/ticker 형식)"""
+        price, volume, timestamp, ask_bid = self.last_trade[ticker]
+        prev = self.prev_close[ticker]
+        change = price - prev
+        day = self.day[ticker]
+        when = datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+        return {
+            'market': ticker,
+            'trade_date': when.strftime("%Y%m%d"),
+            'trade_time': when.strftime("%H%M%S"),
+            'trade_timestamp': timestamp,
+            'opening_price': day[0],
+            'high_price': day[1],
+            'low_price': day[2],
+            'trade_price': price,
+            'prev_closing_price': prev,
+            'change': 'RISE' if change > 0 else 'FALL' if change < 0 else 'EVEN',
+            'change_price': abs(change),
+            'change_rate': abs(change) / prev,
+            'signed_change_price': change,
+            'signed_change_rate': change / prev,
+            'trade_volume': volume,
+            'acc_trade_price': day[4],
+            'acc_trade_price_24h': day[4],
+            'acc_trade_volume': day[3],
+            'acc_trade_volume_24h': day[3],
+            'timestamp': timestamp
+        }
+
+    def ticker_message(self, ticker):
+        snapshot = self.ticker_snapshot(ticker)
+        price, volume, timestamp, ask_bid = self.last_trade[ticker]
+        day = self.day[ticker]
+        message = {'type': 'ticker', 'code': snapshot.pop('market'), **snapshot}
+        message.update(
+            ask_bid=ask_bid, acc_ask_volume=day[5], acc_bid_volume=day[6],
+            market_state='ACTIVE', is_trading_suspended=False, market_warning='NONE',
+            stream_type='REALTIME'
+        )
+        return message
+
+    def trade_message(self, ticker, sequence):
+        price, volume, timestamp, ask_bid = self.last_trade[ticker]
+        prev = self.prev_close[ticker]
+        when = datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+        return {
+            'type': 'trade', 'code': ticker, 'timestamp': timestamp,
+            'trade_date': when.strftime("%Y-%m-%d"), 'trade_time': when.strftime("%H:%M:%S"),
+            'trade_timestamp': timestamp, 'trade_price': price, 'trade_volume': volume,
+            'ask_bid': ask_bid, 'prev_closing_price': prev,
+            'change': 'RISE' if price > prev else 'FALL' if price < prev else 'EVEN',
+            'change_price': abs(price - prev), 'sequential_id': sequence, 'stream_type': 'REALTIME'
+        }
+
+    def orderbook(self, ticker, levels=15):
+        """현재가 주변 호가 (REST /v1/orderbook 형식)"""
+        price = self.last_trade[ticker][0]
+        size = tick_size(price)
+        sizes = self.rng.exponential(2e6 / price, (2, levels))
+        units = [
+            {'ask_price': round_price(price + size * (i + 1)), 'bid_price': round_price(price - size * i),
+             'ask_size': float(sizes[0, i]), 'bid_size': float(sizes[1, i])}
+            for i in range(levels)
+        ]
+        return {
+            'market': ticker, 'timestamp': int(time.time() * 1000),
+            'total_ask_size': float(sizes[0].sum()), 'total_bid_size': float(sizes[1].sum()),
+            'orderbook_units': units
+        }
+
+    def orderbook_message(self, ticker):
+        book = self.orderbook(ticker)
+        return {'type': 'orderbook', 'code': book.pop('market'), **book, 'stream_type': 'REALTIME'}
+
+    def candles_page(self, ticker, unit_seconds, count, to=None, unit_name=None):
+        """캔들 조회 (최신순, to 이전 캔들만)"""
+        rows = np.array(self.candles[ticker], dtype=np.float64)
+        if to is not None:
+            rows = rows[rows[:, 0] < to]
+        if not len(rows):
+            return []
+        groups = rows[:, 0] // unit_seconds * unit_seconds
+        starts, first = np.unique(groups, return_index=True)
+        last = np.append(first[1:], len(rows)) - 1
+        opens, closes = rows[first, 1], rows[last, 4]
+        highs = np.maximum.reduceat(rows[:, 2], first)
+        lows = np.minimum.reduceat(rows[:, 3], first)
+        volumes = np.add.reduceat(rows[:, 5], first)
+        values = np.add.reduceat(rows[:, 6], first)
+
+        result = []
+        for i in range(len(starts) - 1, max(len(starts) - count, 0) - 1, -1):
+            utc, kst = _time_strings(int(starts[i]))
+            candle = {
+                'market': ticker, 'candle_date_time_utc': utc, 'candle_date_time_kst': kst,
+                'opening_price': float(opens[i]), 'high_price': float(highs[i]),
+                'low_price': float(lows[i]), 'trade_price': float(closes[i]),
+                'timestamp': int(rows[last[i], 0]) * 1000 + 59_999,
+                'candle_acc_trade_price': float(values[i]), 'candle_acc_trade_volume': float(volumes[i])
+            }
+            if unit_name:
+                candle['unit'] = unit_name
+            result.append(candle)
+        return result
+
+    # ---------------------------------------------------------------- 계좌/주문
+
+    def account(self, currency):
+        return self.accounts.setdefault(currency, {'balance': 0.0, 'locked': 0.0, 'avg_buy_price': 0.0})
+
+    def accounts_list(self):
+        return [
+            {
+                'currency': currency, 'balance': f"{account['balance']:.8f}",
+                'locked': f"{account['locked']:.8f}", 'avg_buy_price': f"{account['avg_buy_price']:.8f}",
+                'avg_buy_price_modified': False, 'unit_currency': 'KRW'
+            }
+            for currency, account in self.accounts.items()
+            if currency == 'KRW' or account['balance'] > 0 or account['locked'] > 0
+        ]
+
+    def place_order(self, params):
+        """주문 생성 (시장가는 현재가로 즉시 체결, 지정가는 가격 도달 시 체결)"""
+        market = params.get('market')
+        side = params.get('side')
+        ord_type = params.get('ord_type')
+        if market not in self.prices or side not in ('bid', 'ask'):
+            raise ApiError(400, 'validation_error', "잘못된 API 요청입니다.")
+        currency = market.split('-')[1]
+        price = float(params['price']) if params.get('price') else None
+        volume = float(params['volume']) if params.get('volume') else None
+
+        order = {
+            'uuid': str(uuid.uuid4()), 'side': side, 'ord_type': ord_type, 'price': price,
+            'state': 'wait', 'market': market, 'created_at': datetime.now(timezone.utc).isoformat(),
+            'volume': volume, 'remaining_volume': volume, 'reserved_fee': 0.0, 'remaining_fee': 0.0,
+            'paid_fee': 0.0, 'locked': 0.0, 'executed_volume': 0.0, 'trades': []
+        }
+        krw = self.account('KRW')
+        coin = self.account(currency)
+
+        if side == 'bid':
+            total = price if ord_type == 'price' else (price or 0) * (volume or 0)
+            if ord_type not in ('price', 'limit') or total <= 0:
+                raise ApiError(400, 'create_bid_error', "주문 요청 정보가 올바르지 않습니다.")
+            if total < MIN_ORDER_AMOUNT:
+                raise ApiError(400, 'under_min_total_bid', "최소주문금액 이상으로 주문해주세요")
+            if krw['balance'] < total * (1 + FEE_RATE):
+                raise ApiError(400, 'insufficient_funds_bid', "주문가능한 금액(KRW)이 부족합니다.")
+            order['locked'] = total * (1 + FEE_RATE)
+            order['reserved_fee'] = order['remaining_fee'] = total * FEE_RATE
+            krw['balance'] -= order['locked']
+            krw['locked'] += order['locked']
+        else:
+            if ord_type not in ('market', 'limit') or not volume:
+                raise ApiError(400, 'create_ask_error', "주문 요청 정보가 올바르지 않습니다.")
+            if coin['balance'] < volume - 1e-12:
+                raise ApiError(400, 'insufficient_funds_ask', f"주문가능한 금액({currency})이 부족합니다.")
+            if ord_type == 'limit' and price * volume < MIN_ORDER_AMOUNT:
+                raise ApiError(400, 'under_min_total_ask', "최소주문금액 이상으로 주문해주세요")
+            order['locked'] = volume
+            coin['balance'] -= volume
+            coin['locked'] += volume
+
+        self.orders[order['uuid']] = order
+        if ord_type == 'limit':
+            self.open_orders[market].append(order['uuid'])
+            self.fill_limit_orders(market, self.last_trade[market][0])
+        else:
+            self.fill(order, self.last_trade[market][0])
+        return self.order_json(order, trades=False)
+
+    def fill(self, order, fill_price):
+        """주문 전량 체결"""
+        currency = order['market'].split('-')[1]
+        krw = self.account('KRW')
+        coin = self.account(currency)
+        if order['side'] == 'bid':
+            funds = order['price'] if order['ord_type'] == 'price' else order['price'] * order['volume']
+            # 업비트와 같이 수량은 소수점 8자리까지
+            volume = math.floor(funds / fill_price * 1e8) / 1e8 if order['ord_type'] == 'price' else order['volume']
+            funds = volume * fill_price
+            fee = funds * FEE_RATE
+            krw['locked'] -= order['locked']
+            krw['balance'] += order['locked'] - funds - fee  # 지정가보다 싸게 체결된 차액 반환
+            held = coin['balance'] + coin['locked']
+            coin['avg_buy_price'] = (coin['avg_buy_price'] * held + funds) / (held + volume)
+            coin['balance'] += volume
+        else:
+            volume = order['volume']
+            funds = volume * fill_price
+            fee = funds * FEE_RATE
+            coin['locked'] -= volume
+            krw['balance'] += funds - fee
+            if coin['balance'] + coin['locked'] <= 1e-12:
+                coin['avg_buy_price'] = 0.0
+
+        order.update(
+            state='done' if order['ord_type'] != 'price' else 'cancel',  # 업비트 시장가 매수는 잔량 취소로 종료
+            executed_volume=volume, remaining_volume=0.0, paid_fee=fee, remaining_fee=0.0, locked=0.0
+        )
+        order['trades'].append({
+            'market': order['market'], 'uuid': str(uuid.uuid4()), 'price': fill_price, 'volume': volume,
+            'funds': funds, 'side': order['side'], 'created_at': datetime.now(timezone.utc).isoformat()
+        })
+
+    def fill_limit_orders(self, ticker, price):
+        remaining = []
+        for order_id in self.open_orders[ticker]:
+            order = self.orders[order_id]
+            if (order['side'] == 'bid' and price <= order['price']) or \
+                    (order['side'] == 'ask' and price >= order['price']):
+                self.fill(order, order['price'])
+            else:
+                remaining.append(order_id)
+        self.open_orders[ticker] = remaining
+
+    def cancel_order(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None:
+            raise ApiError(404, 'order_not_found', "주문을 찾지 못했습니다.")
+        if order['state'] != 'wait':
+            raise ApiError(400, 'validation_error', "취소할 수 없는 주문입니다.")
+        currency = 'KRW' if order['side'] == 'bid' else order['market'].split('-')[1]
+        account = self.account(currency)
+        account['locked'] -= order['locked']
+        account['balance'] += order['locked']
+        order.update(state='cancel', locked=0.0, remaining_fee=0.0)
+        self.open_orders[order['market']].remove(order_id)
+        return self.order_json(order, trades=False)
+
+    @staticmethod
+    def order_json(order, trades=True):
+        def text(value):
+            return None if value is None else f"{value:.8f}".rstrip('0').rstrip('.')
+        result = {
+            key: text(order[key]) if key in ('price', 'volume', 'remaining_volume', 'reserved_fee',
+                                             'remaining_fee', 'paid_fee', 'locked', 'executed_volume')
+            else order[key]
+            for key in order if key != 'trades'
+        }
+        result['trades_count'] = len(order['trades'])
+        if trades:
+            result['trades'] = [
+                {**trade, 'price': text(trade['price']), 'volume': text(trade['volume']), 'funds': text(trade['funds'])}
+                for trade in order['trades']
+            ]
+        return result
+
+class RequestCounter:
+    """그룹별 최근 1초 요청 수 (초과 시 429)"""
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.calls = defaultdict(deque)
+        self.lock = threading.Lock()
+
+    def hit(self, group):
+        """요청 기록 -> (허용 여부, 남은 요청 수)"""
+        limit = self.limits.get(group)
+        if limit is None:
+            return True, 0
+        now = time.monotonic()
+        with self.lock:
+            calls = self.calls[group]
+            while calls and now - calls[0] >= 1.0:
+                calls.popleft()
+            if len(calls) >= limit:
+                return False, 0
+            calls.append(now)
+            return True, limit - len(calls)
+
+class MockExchange:
+    """REST/웹소켓 서버와 시세 생성 루프"""
+
+    def __init__(self, market, latency=0.0, jitter=0.0, error_rate=0.0, rate_limits=RATE_LIMITS,
+                 tick_rate=100.0, ws_drop_every=0.0, replay=None, replay_speed=1.0, loop_replay=False):
+        """
+        :param latency, jitter: REST 응답과 웹소켓 메시지 지연 (초, 지연 + 0~jitter 무작위)
+        :param error_rate: REST 요청이 500 오류로 실패할 확률
+        :param rate_limits: 그룹별 초당 요청 제한 (None이면 제한 없음)
+        :param tick_rate: 무작위 보행 모드의 초당 전체 체결 수
+        :param ws_drop_every: 이 간격(초)마다 웹소켓 연결을 끊음 (0이면 끊지 않음)
+        :param replay: 기록 파일/디렉터리 (지정 시 무작위 보행 대신 기록된 체결 재생)
+        """
+        self.market = market
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.counter = RequestCounter(rate_limits or {})
+        self.tick_rate = tick_rate
+        self.ws_drop_every = ws_drop_every
+        self.replay = replay
+        self.replay_speed = replay_speed
+        self.loop_replay = loop_replay
+        self.clients = {}  # 웹소켓 연결 -> {구독 종류: 종목 집합}
+        self.stats = defaultdict(int)
+
+    # ---------------------------------------------------------------- REST
+
+    def route(self, method, path):
+        """(메서드, 경로) -> (요청 그룹, 처리 함수)"""
+        if method == 'GET':
+            if path == '/v1/market/all':
+                return 'market', self.get_markets
+            if path == '/v1/ticker':
+                return 'market', self.get_ticker
+            if path == '/v1/orderbook':
+                return 'market', self.get_orderbook
+            if path.startswith('/v1/candles/'):
+                return 'market', self.get_candles
+            if path == '/v1/accounts':
+                return 'default', self.get_accounts
+            if path == '/v1/order':
+                return 'default', self.get_order
+            if path == '/v1/orders':
+                return 'default', self.get_orders
+            if path == '/v1/orders/chance':
+                return 'default', self.get_chance
+        elif method == 'POST' and path == '/v1/orders':
+            return 'order', self.post_order
+        elif method == 'DELETE' and path == '/v1/order':
+            return 'default', self.delete_order
+        return None, None
+
+    def handle(self, method, url, headers, body):
+        """REST 요청 처리 -> (상태 코드, 본문, 남은 요청 수 헤더)"""
+        parts = urlsplit(url)
+        params = {key: ','.join(values) for key, values in parse_qs(parts.query).items()}  # markets=A&markets=B
+        if body:
+            try:
+                params.update(json.loads(body))
+            except ValueError:
+                params.update({key: values[-1] for key, values in parse_qs(body.decode()).items()})
+
+        group, handler = self.route(method, parts.path)
+        if handler is None:
+            return 404, {'error': {'name': 'not_found', 'message': f"{parts.path}"}}, None
+        self.stats['requests'] += 1
+
+        allowed, remaining = self.counter.hit(group)
+        remaining_header = f"group={group}; min=600; sec={remaining}"
+        if not allowed:
+            self.stats['rate_limited'] += 1
+            return 429, "Too many API requests.", remaining_header
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.random() * self.jitter)
+        if self.error_rate and random.random() < self.error_rate:
+            self.stats['errors'] += 1
+            return 500, {'error': {'name': 'server_error', 'message': "모의 서버 오류"}}, remaining_header
+        if group != 'market' and not headers.get('Authorization', '').startswith('Bearer '):
+            return 401, {'error': {'name': 'jwt_verification', 'message': "JWT 토큰 검증에 실패했습니다."}}, \
+                remaining_header
+
+        try:
+            with self.market.lock:
+                return 200 if method != 'POST' else 201, handler(parts.path, params), remaining_header
+        except ApiError as e:
+            return e.status, {'error': {'name': e.name, 'message': e.message}}, remaining_header
+        except (KeyError, ValueError, TypeError) as e:
+            return 400, {'error': {'name': 'validation_error', 'message': str(e)}}, remaining_header
+
+    def _markets(self, params, key='markets'):
+        codes = [code.strip() for code in params.get(key, '').split(',') if code.strip()]
+        unknown = [code for code in codes if code not in self.market.prices]
+        if not codes or unknown:
+            raise ApiError(404, 'not_found', "Code not found")
+        return codes
+
+    def get_markets(self, path, params):
+        return [{'market': ticker, 'korean_name': ticker, 'english_name': ticker} for ticker in self.market.tickers]
+
+    def get_ticker(self, path, params):
+        return [self.market.ticker_snapshot(code) for code in self._markets(params)]
+
+    def get_orderbook(self, path, params):
+        return [self.market.orderbook(code) for code in self._markets(params)]
+
+    def get_candles(self, path, params):
+        kind = path.split('/')[3]
+        if kind == 'minutes':
+            unit = int(path.split('/')[4])
+            if unit not in MINUTE_UNITS:
+                raise ApiError(400, 'validation_error', "잘못된 캔들 단위입니다.")
+            unit_seconds, unit_name = unit * 60, unit
+        elif kind == 'days':
+            unit_seconds, unit_name = 86400, None
+        else:
+            raise ApiError(404, 'not_found', f"{kind} 캔들은 지원하지 않습니다.")
+        ticker = self._markets(params, 'market')[0]
+        count = min(int(params.get('count', 1)), 200)
+        to = None
+        if params.get('to'):
+            when = datetime.fromisoformat(params['to'].replace('Z', '+00:00'))
+            to = (when if when.tzinfo else when.replace(tzinfo=timezone.utc)).timestamp()
+        return self.market.candles_page(ticker, unit_seconds, count, to, unit_name)
+
+    def get_accounts(self, path, params):
+        return self.market.accounts_list()
+
+    def get_order(self, path, params):
+        order = self.market.orders.get(params.get('uuid'))
+        if order is None:
+            raise ApiError(404, 'order_not_found', "주문을 찾지 못했습니다.")
+        return self.market.order_json(order)
+
+    def get_orders(self, path, params):
+        state = params.get('state', 'wait')
+        return [
+            self.market.order_json(order, trades=False) for order in self.market.orders.values()
+            if order['state'] == state and order['market'] == params.get('market', order['market'])
+        ]
+
+    def get_chance(self, path, params):
+        market = self._markets(params, 'market')[0]
+        return {
+            'bid_fee': str(FEE_RATE), 'ask_fee': str(FEE_RATE),
+            'market': {'id': market, 'bid': {'currency': 'KRW', 'min_total': MIN_ORDER_AMOUNT},
+                       'ask': {'currency': market.split('-')[1], 'min_total': MIN_ORDER_AMOUNT}},
+            'bid_account': self.market.accounts_list()[0]
+        }
+
+    def post_order(self, path, params):
+        self.stats['orders'] += 1
+        return self.market.place_order(params)
+
+    def delete_order(self, path, params):
+        return self.market.cancel_order(params.get('uuid'))
+
+    def http_handler(self):
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                status, payload, remaining = exchange.handle(self.command, self.path, self.headers, body)
+                data = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain' if isinstance(payload, str) else 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if remaining:
+                    self.send_header('Remaining-Req', remaining)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    # ---------------------------------------------------------------- 웹소켓
+
+    async def ws_handler(self, connection):
+        """구독 메시지([{ticket}, {type, codes}, ...])를 받고 연결이 끊길 때까지 유지"""
+        try:
+            request = json.loads(await connection.recv())
+        except Exception:
+            return
+        subscriptions = {
+            item['type']: set(item.get('codes', []))
+            for item in (request if isinstance(request, list) else [request])
+            if isinstance(item, dict) and item.get('type') in ('ticker', 'trade', 'orderbook')
+        }
+        self.clients[connection] = subscriptions
+        self.stats['connections'] += 1
+        try:
+            await connection.wait_closed()
+        finally:
+            self.clients.pop(connection, None)
+
+    def publish(self, ticks):
+        """반영된 틱을 구독자에게 전송 (메시지는 종류별로 한 번만 만듦)"""
+        if not self.clients or not ticks:
+            return
+        cache = {}
+        with self.market.lock:
+            for connection, subscriptions in list(self.clients.items()):
+                for kind, codes in subscriptions.items():
+                    for ticker, sequence in ticks:
+                        if ticker not in codes:
+                            continue
+                        key = (kind, sequence)
+                        if key not in cache:
+                            if kind == 'ticker':
+                                message = self.market.ticker_message(ticker)
+                            elif kind == 'trade':
+                                message = self.market.trade_message(ticker, sequence)
+                            else:
+                                message = self.market.orderbook_message(ticker)
+                            cache[key] = json.dumps(message).encode()
+                        broadcast([connection], cache[key])
+                        self.stats['messages'] += 1
+
+    def dispatch(self, ticks):
+        if self.latency or self.jitter:
+            asyncio.get_running_loop().call_later(self.latency + random.random() * self.jitter, self.publish, ticks)
+        else:
+            self.publish(ticks)
+
+    async def random_feed(self, interval=0.01):
+        """초당 tick_rate개의 무작위 보행 체결 생성"""
+        carry = 0.0
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            carry += (now - last) * self.tick_rate
+            last = now
+            count = int(carry)
+            carry -= count
+            self.dispatch(self.market.random_ticks(count))
+
+    async def replay_feed(self):
+        """기록된 체결을 기록 간격(의 1/speed)으로 다시 내보냄 (캔들 스냅샷은 과거 시세로 적용)"""
+        from market_data.recorder import read_records
+
+        while True:
+            base_recorded = base_wall = None
+            batch = []
+            for received, kind, payload in read_records(self.replay):
+                if kind == 'c':
+                    seconds = np.asarray(payload['timestamps'], dtype=np.int64) // 10**9 - KST_OFFSET
+                    rows = np.column_stack([seconds, np.asarray(payload['ohlcv'], dtype=np.float64).T])
+                    with self.market.lock:
+                        if payload['code'] in self.market.candles:
+                            self.market.load_candles(payload['code'], rows)
+                    continue
+                if kind != 'm' or payload.get('code') not in self.market.candles or not payload.get('trade_price'):
+                    continue
+
+                if self.replay_speed > 0:
+                    if base_recorded is None:
+                        base_recorded, base_wall = received, time.perf_counter()
+                    delay = (received - base_recorded) / 1e9 / self.replay_speed - (time.perf_counter() - base_wall)
+                    if delay > 0.001:
+                        self.dispatch(batch)
+                        batch = []
+                        await asyncio.sleep(delay)
+                with self.market.lock:
+                    batch.append(self.market.apply_trade(
+                        payload['code'], float(payload['trade_price']), float(payload.get('trade_volume') or 0),
+                        int(time.time() * 1000), payload.get('ask_bid', 'BID')
+                    ))
+                if len(batch) >= 1000:
+                    self.dispatch(batch)
+                    batch = []
+                    await asyncio.sleep(0)
+            self.dispatch(batch)
+            if not self.loop_replay:
+                logging.info("기록 재생 완료")
+                return
+
+    async def drop_connections(self):
+        while True:
+            await asyncio.sleep(self.ws_drop_every)
+            for connection in list(self.clients):
+                await connection.close(1011, "모의 연결 끊김")
+            self.stats['drops'] += 1
+
+    async def report(self, interval=10.0):
+        last = dict(self.stats)
+        while True:
+            await asyncio.sleep(interval)
+            now = dict(self.stats)
+            delta = {key: now.get(key, 0) - last.get(key, 0) for key in now}
+            last = now
+            logging.info(
+                f"모의 거래소: 웹소켓 {len(self.clients)}개 연결, 메시지 {delta.get('messages', 0) / interval:,.0f}개/초, "
+                f"REST {delta.get('requests', 0)}회 (제한 {delta.get('rate_limited', 0)}, "
+                f"오류 {delta.get('errors', 0)}, 주문 {delta.get('orders', 0)})"
+            )
+
+    async def serve(self, host, port, ws_port):
+        http = ThreadingHTTPServer((host, port), self.http_handler())
+        http.daemon_threads = True
+        threading.Thread(target=http.serve_forever, name="mock-rest", daemon=True).start()
+
+        tasks = [asyncio.create_task(self.report())]
+        tasks.append(asyncio.create_task(self.replay_feed() if self.replay else self.random_feed()))
+        if self.ws_drop_every > 0:
+            tasks.append(asyncio.create_task(self.drop_connections()))
+
+        logging.info(
+            f"모의 거래소 시작: REST http://{host}:{port}, 웹소켓 ws://{host}:{ws_port}/websocket/v1, "
+            f"종목 {len(self.market.tickers)}개"
+        )
+        try:
+            async with serve(self.ws_handler, host, ws_port, compression=None, max_queue=None):
+                await asyncio.Future()
+        finally:
+            for task in tasks:
+                task.cancel()
+            http.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모의 거래소 (업비트 호환)")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765, help="REST 포트 (웹소켓은 포트 + 1)")
+    parser.add_argument('--tickers', help="쉼표로 구분한 종목 코드")
+    parser.add_argument('--ticker-count', type=int, default=10, help="--tickers 생략 시 만들 종목 수")
+    parser.add_argument('--cash', type=float, default=10_000_000, help="계좌 시작 원화 잔고")
+    parser.add_argument('--rate', type=float, default=100, help="초당 전체 체결 수 (무작위 보행)")
+    parser.add_argument('--volatility', type=float, default=0.002, help="1분 수익률 표준편차")
+    parser.add_argument('--history', type=int, default=600, help="시작 시 만들 과거 1분봉 수")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--no-rate-limit', action='store_true', help="요청 수 제한 끄기 (부하 테스트용)")
+    parser.add_argument('--ws-drop-every', type=float, default=0, help="웹소켓 연결을 끊는 간격 (초)")
+    parser.add_argument('--replay', nargs='+', help="재생할 기록 파일 또는 디렉터리")
+    parser.add_argument('--speed', type=float, default=1.0, help="기록 재생 배속 (0: 최대 속도)")
+    parser.add_argument('--loop', action='store_true', help="기록을 반복 재생")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    logging.getLogger('websockets').setLevel(logging.WARNING)  # 연결마다 남는 접속 로그 생략
+    tickers = args.tickers.split(',') if args.tickers else None
+    if tickers is None and args.replay:
+        from market_data.recorder import FeedReplayer
+        tickers = (FeedReplayer(args.replay).session() or {}).get('tickers')
+    if tickers is None:
+        known = list(DEFAULT_PRICES)
+        tickers = known[:args.ticker_count] + [f"KRW-MOCK{i}" for i in range(max(args.ticker_count - len(known), 0))]
+
+    market = MockMarket(tickers, args.cash, args.history, args.volatility, args.seed)
+    exchange = MockExchange(
+        market,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+        rate_limits=None if args.no_rate_limit else RATE_LIMITS,
+        tick_rate=args.rate, ws_drop_every=args.ws_drop_every,
+        replay=args.replay, replay_speed=args.speed, loop_replay=args.loop
+    )
+    try:
+        asyncio.run(exchange.serve(args.host, args.port, args.port + 1))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 from .api_service import verify_api_keys
 from .notification_service import NotificationService
-from .performance_service import PerformanceMonitor, PerformanceAnalyzer
+from .performance_service import PerformanceMonitor, PerformanceAnalyzer, MetricsExporter
+from .trade_journal import TradeJournal
 
-__all__ = ['verify_api_keys', 'NotificationService', 'PerformanceMonitor', 'PerformanceAnalyzer']
\ No newline at end of file
+__all__ = [
+    'verify_api_keys', 'NotificationService', 'PerformanceMonitor', 'PerformanceAnalyzer', 'MetricsExporter',
+    'TradeJournal'
+]
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+평가금액 곡선 기반 성과 분석 (NumPy 벡터 연산)
+
+거래 기록 저널의 거래와 보유 종목 평가 가격으로 일정 간격 평가금액 곡선을 만들고
+샤프/소르티노 비율, 최대 낙폭과 지속 기간, 투자 비중, 회전율, 종목별 손익 기여를 계산합니다.
+백테스트 엔진도 봉별 평가금액 곡선에 같은 지표 함수(performance_metrics)를 사용합니다.
+
+    analytics = journal_analytics(journal, start, end, start_cash=1_000_000)
+    print(format_analytics(analytics))
+
+- 모든 계산은 배열 단위 (1분 간격 1년치 약 52만 개 지점도 1초 안에 계산)
+- 시각은 유닉스 초, 수익률은 비율 (0.01 = 1%)
+"""
+import numpy as np
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60  # 암호화폐 시장은 휴장이 없으므로 365일 기준
+
+# 평가금액 곡선 간격 (초)
+DEFAULT_STEP = 60
+
+METRIC_FIELDS = (
+    'total_return', 'sharpe', 'sortino', 'volatility', 'max_drawdown', 'drawdown_duration',
+    'exposure', 'gross_exposure', 'turnover'
+)
+
+def last_values(event_times, values, grid, initial=0.0):
+    """
+    시각 순 이벤트 값 -> grid 각 시각의 마지막 값 (이벤트가 없으면 initial)
+    :param event_times: 정렬된 이벤트 시각 배열
+    :param values: 이벤트 시점의 값 배열
+    """
+    index = np.searchsorted(event_times, grid, side='right') - 1
+    result = np.full(len(grid), initial, dtype=np.float64)
+    known = index >= 0
+    result[known] = np.asarray(values, dtype=np.float64)[index[known]]
+    return result
+
+def time_grid(start, end, step=DEFAULT_STEP):
+    """start부터 step 간격, 마지막은 end인 시각 배열"""
+    grid = np.arange(start, end, step, dtype=np.float64)
+    return np.append(grid, float(end))
+
+def _groups(index, count):
+    """종목 번호 배열 -> 종목별 원소 위치 배열 목록 (각 목록은 원래 순서 유지, 음수 번호는 제외)"""
+    order = np.argsort(index, kind='stable')
+    bounds = np.searchsorted(index[order], np.arange(count + 1))
+    return [order[bounds[i]:bounds[i + 1]] for i in range(count)]
+
+def equity_curve(history, start_cash, start, end, step=DEFAULT_STEP):
+    """
+    거래/평가 가격 기록 -> 일정 간격 평가금액 곡선
+    :param history: TradeJournal.history 결과
+    :param start_cash: 저널 첫 거래 이전 현금
+    :return: {
+        'times': 시각 배열, 'equity': 평가금액, 'cash': 현금,
+        'invested': 보유 종목 평가금액 합계, 'tickers': 종목 목록,
+        'start_values'/'end_values': 종목별 구간 시작/끝 보유 평가금액,
+        'cash_flows': 종목별 구간 현금 증감, 'traded': 구간 거래 금액 합계
+    }
+    (종목 x 시각 행렬은 만들지 않으므로 메모리는 종목 수와 관계없이 시각 수에 비례)
+    """
+    grid = time_grid(start, end, step)
+    trades = history['trades']
+    marks = history['marks']
+    trade_times = trades['time']
+    side = trades['side']
+    cash_flow = -side * trades['amount'] - trades['fee']
+
+    opening_cash = start_cash + history['opening_cash_flow']
+    cash = opening_cash + last_values(trade_times, np.cumsum(cash_flow), grid)
+
+    opening_positions = history['opening_positions']
+    opening_prices = history['opening_prices']
+    tickers = sorted(set(opening_positions) | set(trades['ticker'].tolist()))
+    names = np.array(tickers, dtype=object)
+    trade_index = np.searchsorted(names, trades['ticker'])
+    mark_index = np.minimum(np.searchsorted(names, marks['ticker']), max(len(tickers) - 1, 0))
+    if len(tickers):
+        mark_index[names[mark_index] != marks['ticker']] = -1  # 거래도 보유도 없던 종목의 평가 가격은 무시
+    trade_groups = _groups(trade_index, len(tickers))
+    mark_groups = _groups(mark_index, len(tickers))
+
+    # 종목별 보유 평가금액은 거래/평가 가격 시점에만 바뀌므로 변화량을 시각순으로 누적한 뒤 grid에서 한 번만 조회
+    change_times = []
+    changes = []
+    opening_total = 0.0
+    start_values = np.zeros(len(tickers))
+    end_values = np.zeros(len(tickers))
+    for i, ticker in enumerate(tickers):
+        own = trade_groups[i]
+        own_marks = mark_groups[i]
+        times = np.concatenate((trade_times[own], marks['time'][own_marks]))
+        prices = np.concatenate((trades['price'][own], marks['price'][own_marks]))
+        quantities = np.concatenate((side[own] * trades['quantity'][own], np.zeros(len(own_marks))))
+        order = np.argsort(times, kind='stable')
+        times, prices = times[order], prices[order]
+        opening = opening_positions.get(ticker, 0.0)
+        # 가격은 거래가와 평가 가격 중 가장 최근 값 (시작 전 가격이 없으면 첫 가격으로 채움)
+        opening_value = opening * opening_prices.get(ticker, prices[0] if len(prices) else 0.0)
+        value = (opening + np.cumsum(quantities[order])) * prices
+        change_times.append(times)
+        changes.append(np.diff(value, prepend=opening_value))
+        opening_total += opening_value
+        start_values[i], end_values[i] = last_values(times, value, (start, end), opening_value)
+
+    times = np.concatenate(change_times) if change_times else np.zeros(0)
+    order = np.argsort(times, kind='stable')
+    changes = np.concatenate(changes)[order] if changes else np.zeros(0)
+    invested = last_values(times[order], opening_total + np.cumsum(changes), grid, opening_total)
+
+    return {
+        'times': grid,
+        'equity': cash + invested,
+        'cash': cash,
+        'invested': invested,
+        'tickers': tickers,
+        'start_values': start_values,
+        'end_values': end_values,
+        'cash_flows': np.bincount(trade_index, weights=cash_flow, minlength=len(tickers)),
+        'traded': float(trades['amount'].sum())
+    }
+
+def drawdown_stats(times, equity):
+    """
+    최대 낙폭과 가장 긴 낙폭 지속 시간
+    :return: (최대 낙폭 비율, 지속 시간(초))
+    """
+    peak = np.maximum.accumulate(equity)
+    drawdown = (peak - equity) / np.where(peak > 0, peak, 1.0)
+    # 각 지점에서 마지막으로 고점을 갱신한 위치 -> 고점 이후 경과 시간
+    at_peak = equity >= peak
+    last_peak = np.maximum.accumulate(np.where(at_peak, np.arange(len(equity)), 0))
+    duration = times - times[last_peak]
+    return float(drawdown.max()), float(duration.max())
+
+def performance_metrics(times, equity, invested=None, traded=0.0):
+    """
+    평가금액 곡선 -> METRIC_FIELDS 지표 딕셔너리
+    :param times: 유닉스 초 배열 (연율화는 시각 간격의 중앙값 기준)
+    :param equity: 평가금액 배열
+    :param invested: 보유 종목 평가금액 배열 (투자 비중 계산용, 없으면 0)
+    :param traded: 구간 거래 금액 합계 (회전율 = 거래 금액 / 평균 평가금액)
+    """
+    times = np.asarray(times, dtype=np.float64)
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) < 2 or equity[0] <= 0:
+        return dict.fromkeys(METRIC_FIELDS, 0.0)
+
+    returns = np.diff(equity) / equity[:-1]
+    step = float(np.median(np.diff(times)))
+    periods = SECONDS_PER_YEAR / step if step > 0 else 0.0
+    mean = returns.mean()
+    std = returns.std()
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    max_drawdown, duration = drawdown_stats(times, equity)
+
+    if invested is None:
+        exposure = gross_exposure = 0.0
+    else:
+        invested = np.asarray(invested, dtype=np.float64)
+        exposure = float(np.count_nonzero(invested > equity * 1e-9) / len(invested))  # 누적 오차로 남은 값은 무시
+        gross_exposure = float(np.mean(invested / equity))
+
+    return {
+        'total_return': float(equity[-1] / equity[0] - 1.0),
+        'sharpe': float(mean / std * np.sqrt(periods)) if std > 0 else 0.0,
+        'sortino': float(mean / downside * np.sqrt(periods)) if downside > 0 else 0.0,
+        'volatility': float(std * np.sqrt(periods)),
+        'max_drawdown': max_drawdown,
+        'drawdown_duration': duration,
+        'exposure': exposure,
+        'gross_exposure': gross_exposure,
+        'turnover': float(traded / equity.mean())
+    }
+
+def attribution(curve):
+    """
+    종목별 구간 손익 기여 (구간 끝 평가금액 - 시작 평가금액 + 구간 현금 증감)
+    :param curve: equity_curve 결과
+    :return: {ticker: {'pnl': 손익, 'contribution': 시작 평가금액 대비 비율}} (손익 내림차순)
+    """
+    pnl = curve['end_values'] - curve['start_values'] + curve['cash_flows']
+    start_equity = curve['equity'][0]
+    result = {}
+    for i in np.argsort(-pnl, kind='stable'):
+        result[curve['tickers'][i]] = {
+            'pnl': float(pnl[i]),
+            'contribution': float(pnl[i] / start_equity) if start_equity > 0 else 0.0
+        }
+    return result
+
+def journal_analytics(journal, start, end, start_cash, step=DEFAULT_STEP):
+    """
+    저널 기록 구간 [start, end] 성과 분석
+    :param journal: TradeJournal
+    :param start_cash: 저널 첫 거래 이전 현금 (AutoTrade 시작 자금)
+    :return: performance_metrics 결과 + 'start_equity', 'end_equity', 'attribution'
+    """
+    curve = equity_curve(journal.history(start, end), start_cash, start, end, step)
+    metrics = performance_metrics(curve['times'], curve['equity'], curve['invested'], curve['traded'])
+    metrics['start_equity'] = float(curve['equity'][0])
+    metrics['end_equity'] = float(curve['equity'][-1])
+    metrics['attribution'] = attribution(curve)
+    return metrics
+
+def _duration_text(seconds):
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    days, hours = divmod(hours, 24)
+    return f"{days}일 {hours}시간 {minutes}분" if days else f"{hours}시간 {minutes}분"
+
+def format_analytics(analytics, top=5):
+    """journal_analytics 결과 -> 리포트 문자열 (손익 기여는 상위/하위 top개)"""
+    report = (
+        f"\n=== 평가금액 분석 ===\n"
+        f"평가금액: {analytics['start_equity']:,.0f}원 -> {analytics['end_equity']:,.0f}원 "
+        f"({analytics['total_return']:.2%})\n"
+        f"샤프/소르티노 (연율): {analytics['sharpe']:.2f} / {analytics['sortino']:.2f}\n"
+        f"변동성 (연율): {analytics['volatility']:.2%}\n"
+        f"최대 낙폭: {analytics['max_drawdown']:.2%} (최장 {_duration_text(analytics['drawdown_duration'])})\n"
+        f"투자 시간 비중: {analytics['exposure']:.1%}, 평균 투자 비중: {analytics['gross_exposure']:.1%}\n"
+        f"회전율: {analytics['turnover']:.2f}회\n"
+    )
+    contributions = list(analytics['attribution'].items())
+    if contributions:
+        if len(contributions) > top * 2:
+            contributions = contributions[:top] + contributions[-top:]
+        report += "종목별 손익 기여:\n" + "".join(
+            f"  {ticker}: {item['pnl']:+,.0f}원 ({item['contribution']:+.2%})\n" for ticker, item in contributions
+        )
+    return report
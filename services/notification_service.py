@@ -2,6 +2,7 @@ import logging
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from config import SLACK_APP_TOKEN, SLACK_CHANNELS
+from services.performance_service import performance_monitor
 
 class NotificationService:
     def __init__(self):
@@ -18,10 +19,11 @@ class NotificationService:
             channel = SLACK_CHANNELS[channel_type]
             logging.info(f"메시지 전송 시도 - 채널: {channel}, 메시지: {message}")
             
-            response = self.client.chat_postMessage(
-                channel=channel,
-                text=message
-            )
+            with performance_monitor.timer('notification', channel=channel_type):
+                response = self.client.chat_postMessage(
+                    channel=channel,
+                    text=message
+                )
             
             if not response['ok']:
                 logging.error(f"메시지 전송 실패 - 응답: {response}")
@@ -1,7 +1,129 @@
+import os
 import time
+import bisect
+import threading
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, time as dt_time, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
 import logging
+import numpy as np
 from utils.decorators import send_error_alert
+from services.trade_journal import TradeJournal, TradeAggregate, day_key
+from services.analytics_service import journal_analytics, format_analytics
+from config import FEED_LAG_WINDOW, FEED_LAG_MAX_ENTRY
+
+# 지연 히스토그램 구간 상한 (초, Prometheus 'le' 값)
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# 리포트에 표시할 단계 이름
+STAGE_NAMES = {
+    'feed_to_decision': '수신->판단',
+    'analyze': '전략 분석',
+    'order': '주문 제출',
+    'rest': 'REST 호출',
+    'notification': '알림 전송',
+    'feed_lag': '시세 지연'
+}
+
+class LatencyHistogram:
+    """고정 구간 지연 히스토그램 (관측 한 번에 이진 탐색 + 정수 증가만 수행)"""
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """구간 안을 선형 보간한 백분위수 추정 (초, 관측이 없으면 None)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                if i == len(self.bounds):  # +Inf 구간은 하한으로 표시
+                    return lower
+                return lower + (self.bounds[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+def _label_text(labels):
+    """라벨 튜플 -> Prometheus 라벨 문자열"""
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels)
+
+def resident_memory_bytes():
+    """현재 프로세스 상주 메모리 (Linux가 아니면 최대 사용량으로 대체)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class FeedLagMonitor:
+    """
+    거래소 메시지 시각(timestamp) 대비 처리 시각 지연을 종목별로 추적
+    종목별 최근 window개를 보관해 백분위수를 계산하고, 지연이 max_lag를 넘는 종목의 신규 진입을 막는다.
+    (로컬 시계와 거래소 시계 차이만큼 오차가 있으며, 시계가 앞서 있으면 음수가 될 수 있다)
+    """
+
+    def __init__(self, window=FEED_LAG_WINDOW, max_lag=FEED_LAG_MAX_ENTRY):
+        """
+        :param window: 종목별로 보관할 최근 지연 수
+        :param max_lag: 신규 진입을 막는 지연 기준 (초, None이면 막지 않음)
+        """
+        self.window = window
+        self.max_lag = max_lag
+        self.samples = {}  # 종목 -> 최근 지연 (초)
+        self.latest = {}  # 종목 -> 마지막 메시지 지연 (초)
+        self.blocked_entries = 0
+
+    def record(self, ticker, lag):
+        samples = self.samples.get(ticker)
+        if samples is None:
+            samples = self.samples[ticker] = deque(maxlen=self.window)
+        samples.append(lag)
+        self.latest[ticker] = lag
+
+    def percentiles(self, ticker=None, q=(50, 90, 99)):
+        """최근 지연 백분위수 (초, ticker가 None이면 전체 종목, 기록이 없으면 None)"""
+        if ticker is not None:
+            values = list(self.samples.get(ticker, ()))
+        else:
+            values = [lag for samples in list(self.samples.values()) for lag in list(samples)]
+        if not values:
+            return None
+        return tuple(np.percentile(values, q).tolist())
+
+    def entry_allowed(self, ticker):
+        """마지막 시세 지연이 기준 이하인지 (기준이 없거나 기록이 없으면 허용)"""
+        if self.max_lag is None:
+            return True
+        lag = self.latest.get(ticker)
+        if lag is None or lag <= self.max_lag:
+            return True
+        self.blocked_entries += 1
+        return False
+
+    def slowest(self, count=5):
+        """p90 지연이 큰 종목 목록 -> [(종목, p90), ...]"""
+        ranked = [(ticker, self.percentiles(ticker, (90,))[0]) for ticker in list(self.samples) if self.samples[ticker]]
+        return sorted(ranked, key=lambda item: -item[1])[:count]
 
 class PerformanceMonitor:
     def __init__(self):
@@ -11,6 +133,21 @@ class PerformanceMonitor:
         self.websocket_disconnects = 0
         self.last_report_time = time.time()
         self.report_interval = 3600  # 1시간마다 리포트
+        
+        # 단계별 지연 히스토그램과 게이지 (웹소켓 루프, 워밍업, 알림 스레드에서 함께 기록)
+        self.lock = threading.Lock()  # 히스토그램 추가/조회용
+        self.histograms = {}  # (단계, 라벨 튜플) -> LatencyHistogram
+        self.gauges = {'memory_resident_bytes': resident_memory_bytes}  # 이름 -> 값 또는 값을 반환하는 함수
+        self.feed_lag = FeedLagMonitor()
+        self.lag_histogram = LatencyHistogram()  # 전체 종목 시세 지연 (종목별 라벨 없이 내보냄)
+
+    def record_feed_lag(self, ticker, lag):
+        """
+        시세 메시지 지연 기록 (웹소켓 루프에서 메시지마다 호출)
+        :param lag: 처리 시각 - 거래소 메시지 시각 (초)
+        """
+        self.feed_lag.record(ticker, lag)
+        self.lag_histogram.observe(lag)
 
     def log_api_call(self):
         """API 호출 기록"""
@@ -28,6 +165,95 @@ class PerformanceMonitor:
     def should_report(self):
         return time.time() - self.last_report_time > self.report_interval
 
+    def observe(self, stage, seconds, **labels):
+        """
+        단계별 지연 기록
+        :param stage: 단계 이름 (feed_to_decision, analyze, order, rest, notification 등)
+        :param seconds: 소요 시간 (초)
+        :param labels: 추가 구분 라벨 (예: strategy='indicator', endpoint='/v1/orders', 호출 위치마다 같은 순서로 전달)
+        """
+        key = (stage, tuple(labels.items()))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        # 틱마다 호출되므로 증가는 잠그지 않음 (단계/라벨별 히스토그램은 대부분 한 스레드만 기록)
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        """with 블록 소요 시간을 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **labels)
+
+    def set_gauge(self, name, value):
+        """게이지 설정 (함수를 넘기면 내보낼 때마다 호출해 현재 값 사용)"""
+        self.gauges[name] = value
+
+    def gauge_values(self):
+        """게이지 이름 -> 현재 값 (값을 읽지 못한 게이지는 제외)"""
+        values = {}
+        for name, value in list(self.gauges.items()):
+            try:
+                values[name] = float(value() if callable(value) else value)
+            except Exception:
+                continue
+        return values
+
+    def stage_histograms(self):
+        """단계 -> 라벨을 합친 히스토그램"""
+        merged = {}
+        with self.lock:
+            for (stage, _), histogram in self.histograms.items():
+                total = merged.setdefault(stage, LatencyHistogram(histogram.bounds))
+                total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+                total.total += histogram.total
+                total.count += histogram.count
+        return merged
+
+    def export_prometheus(self):
+        """Prometheus 텍스트 형식 메트릭"""
+        lines = [
+            "# HELP trading_uptime_seconds 봇 작동 시간",
+            "# TYPE trading_uptime_seconds gauge",
+            f"trading_uptime_seconds {time.time() - self.start_time:.3f}",
+            "# HELP trading_api_calls_total REST API 호출 수",
+            "# TYPE trading_api_calls_total counter",
+            f"trading_api_calls_total {self.api_calls}",
+            "# HELP trading_api_errors_total REST API 오류 수",
+            "# TYPE trading_api_errors_total counter",
+            f"trading_api_errors_total {self.api_errors}",
+            "# HELP trading_websocket_disconnects_total 웹소켓 연결 끊김 수",
+            "# TYPE trading_websocket_disconnects_total counter",
+            f"trading_websocket_disconnects_total {self.websocket_disconnects}",
+            "# HELP trading_lag_blocked_entries_total 시세 지연으로 보류한 신규 진입 수",
+            "# TYPE trading_lag_blocked_entries_total counter",
+            f"trading_lag_blocked_entries_total {self.feed_lag.blocked_entries}",
+            "# HELP trading_latency_seconds 단계별 지연",
+            "# TYPE trading_latency_seconds histogram",
+        ]
+        with self.lock:
+            histograms = [(key, list(h.counts), h.total, h.count, h.bounds) for key, h in self.histograms.items()]
+        lag = self.lag_histogram
+        if lag.count:
+            histograms.append((('feed_lag', ()), list(lag.counts), lag.total, lag.count, lag.bounds))
+        for (stage, labels), counts, total, count, bounds in sorted(histograms):
+            base = _label_text((('stage', stage),) + labels)
+            cumulative = 0
+            for bound, bucket in zip(bounds + (float('inf'),), counts):
+                cumulative += bucket
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'trading_latency_seconds_bucket{{{base},le="{le}"}} {cumulative}')
+            lines.append(f"trading_latency_seconds_sum{{{base}}} {total:.9f}")
+            lines.append(f"trading_latency_seconds_count{{{base}}} {count}")
+        for name, value in sorted(self.gauge_values().items()):
+            lines.append(f"# TYPE trading_{name} gauge")
+            lines.append(f"trading_{name} {value:.15g}")
+        return "\n".join(lines) + "\n"
+
     def generate_report(self):
         uptime = time.time() - self.start_time
         report = (
@@ -38,12 +264,200 @@ class PerformanceMonitor:
             f"웹소켓 재연결 수: {self.websocket_disconnects}\n"
             f"시간당 API 호출: {self.api_calls/(uptime/3600):.1f}회\n"
         )
+        
+        # 단계별 지연 (히스토그램 구간 보간 추정치)
+        histograms = self.stage_histograms()
+        if histograms:
+            report += "\n단계별 지연 (p50 / p99):\n"
+            for stage, histogram in sorted(histograms.items()):
+                report += (
+                    f"- {STAGE_NAMES.get(stage, stage)}: {histogram.count:,}회, "
+                    f"{histogram.quantile(0.5) * 1000:.3f}ms / {histogram.quantile(0.99) * 1000:.3f}ms\n"
+                )
+        # 시세 지연 (거래소 메시지 시각 -> 처리 시각, 종목별 최근 기록 기준)
+        lag = self.feed_lag.percentiles()
+        if lag is not None:
+            p50, p90, p99 = lag
+            report += (
+                f"\n시세 지연 (p50 / p90 / p99): {p50 * 1000:,.0f}ms / {p90 * 1000:,.0f}ms / {p99 * 1000:,.0f}ms\n"
+                f"느린 종목 (p90): "
+                + ", ".join(f"{ticker} {value * 1000:,.0f}ms" for ticker, value in self.feed_lag.slowest()) + "\n"
+            )
+            if self.feed_lag.max_lag is not None:
+                report += f"지연으로 보류한 신규 진입: {self.feed_lag.blocked_entries}회 (기준 {self.feed_lag.max_lag}초)\n"
+        
+        gauges = self.gauge_values()
+        if gauges:
+            report += "\n" + "\n".join(f"{name}: {value:,.0f}" for name, value in sorted(gauges.items())) + "\n"
+        
         self.last_report_time = time.time()
         return report
 
+class MetricsExporter:
+    """
+    PerformanceMonitor 메트릭을 로컬 HTTP(/metrics) 또는 텍스트 파일로 내보냄
+    파일은 임시 파일에 쓴 뒤 교체하므로 node_exporter textfile collector가 그대로 읽을 수 있다.
+    """
+
+    def __init__(self, monitor, port=None, path=None, interval=15, host='127.0.0.1'):
+        """
+        :param port: HTTP 포트 (None이면 HTTP 사용 안 함)
+        :param path: 메트릭 파일 경로 (None이면 파일 사용 안 함)
+        :param interval: 파일 갱신 간격 (초)
+        """
+        self.monitor = monitor
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.host = host
+        self.server = None
+        self.stopped = threading.Event()
+        self.threads = []
+
+    def start(self):
+        if self.port:
+            monitor = self.monitor
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] not in ('/metrics', '/'):
+                        self.send_error(404)
+                        return
+                    body = monitor.export_prometheus().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):  # 요청마다 로그를 남기지 않음
+                    pass
+
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.server.daemon_threads = True
+            self.threads.append(threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True))
+            logging.info(f"메트릭 내보내기: http://{self.host}:{self.port}/metrics")
+        if self.path:
+            self.threads.append(threading.Thread(target=self._write_loop, name="metrics-file", daemon=True))
+            logging.info(f"메트릭 파일 내보내기: {self.path} ({self.interval}초 간격)")
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def write(self):
+        """메트릭 파일 한 번 갱신"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp, 'w') as f:
+            f.write(self.monitor.export_prometheus())
+        os.replace(temp, self.path)
+
+    def _write_loop(self):
+        while not self.stopped.is_set():
+            try:
+                self.write()
+            except Exception as e:
+                logging.error(f"메트릭 파일 쓰기 실패: {str(e)}")
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+def instrument_rest_api(monitor):
+    """
+    pyupbit REST 호출(request_api._call_get/_call_post/_call_delete)의 지연과 호출/오류 수를 기록
+    (여러 번 호출해도 한 번만 적용)
+    """
+    from pyupbit import request_api
+    if getattr(request_api, '_performance_monitor', None) is not None:
+        return
+    request_api._performance_monitor = monitor
+
+    def wrap(call, method):
+        def wrapper(url, **kwargs):
+            endpoint = urlsplit(url).path
+            started = time.perf_counter()
+            try:
+                return call(url, **kwargs)
+            except Exception:
+                monitor.log_api_error()
+                raise
+            finally:
+                monitor.log_api_call()
+                monitor.observe('rest', time.perf_counter() - started, method=method, endpoint=endpoint)
+        return wrapper
+
+    request_api._call_get = wrap(request_api._call_get, 'GET')
+    request_api._call_post = wrap(request_api._call_post, 'POST')
+    request_api._call_delete = wrap(request_api._call_delete, 'DELETE')
+
+# 메모리에 누적 집계를 유지하는 기간 (주간 리포트의 7일 + 오늘)
+AGGREGATE_DAYS = 8
+
+def format_period_report(aggregates, title, tickers=(), now=None, total=None):
+    """
+    종목별 누적 집계 -> 거래 리포트 문자열 (거래 수와 관계없이 종목 수에만 비례)
+    :param aggregates: {ticker: TradeAggregate}
+    :param tickers: 먼저 표시할 종목 순서 (나머지는 이름순)
+    :param total: 전체 합계 (기본값: 종목별 집계를 더함)
+    """
+    now = now or datetime.now()
+    report = f"\n=== {title} 거래 리포트 ===\n"
+    report += f"생성 시각: {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
+    if not aggregates:
+        return report + "거래 기록 없음\n"
+
+    order = {ticker: i for i, ticker in enumerate(tickers)}
+    for ticker in sorted(aggregates, key=lambda ticker: (order.get(ticker, len(order)), ticker)):
+        aggregate = aggregates[ticker]
+        count = aggregate.count
+        report += (
+            f"\n{ticker}:\n"
+            f"거래 횟수: {count}\n"
+            f"승률: {(aggregate.wins/count)*100:.1f}%\n"
+            f"수익률: {aggregate.profit:.2f}%\n"
+            f"평균 수익률: {aggregate.profit/count:.2f}%\n"
+        )
+        if aggregate.sells:
+            report += (
+                f"최고/최저: {aggregate.best:.2f}% / {aggregate.worst:.2f}%\n"
+                f"수익률 표준편차: {aggregate.std:.2f}%p\n"
+            )
+
+    if total is None:
+        total = TradeAggregate()
+        for aggregate in aggregates.values():
+            total.merge(aggregate)
+    report += (
+        f"\n=== 종합 정보 ===\n"
+        f"총 거래 횟수: {total.count}\n"
+        f"총 수익률: {total.profit:.2f}%\n"
+        f"거래당 평균 수익률: {total.profit/total.count:.2f}%\n"
+    )
+    if total.sells:
+        report += (
+            f"매도 {total.sells}회 평균 수익률: {total.mean:.2f}% (표준편차 {total.std:.2f}%p)\n"
+            f"총 실현 손익: {total.profit_amount:,.0f}원\n"
+        )
+    if total.fee:
+        report += f"총 수수료: {total.fee:,.0f}원\n"
+    return report
+
 class PerformanceAnalyzer:
-    def __init__(self, tickers):
-        self.daily_trades = {}
+    def __init__(self, tickers, journal=None, clock=time.time, start_cash=None):
+        """
+        :param journal: 거래 기록 저널 (기본값: config.TRADE_JOURNAL_PATH 파일)
+        :param clock: 거래 시각 함수 (기록 재생은 기록된 수신 시각)
+        :param start_cash: 저널 첫 거래 이전 현금 (None이면 리포트에 평가금액 분석 생략)
+        """
+        self.journal = journal or TradeJournal()
+        self.clock = clock
+        self.start_cash = start_cash
         self.last_report_date = None
         self.last_report_time = None
         self.tickers = tickers
@@ -51,12 +465,70 @@ class PerformanceAnalyzer:
             dt_time(9, 0),   # 오전 9시
             dt_time(18, 0)   # 오후 6시
         ]
+        # 일별/종목별 누적 집계와 일별 전체 합계 (add_trade마다 O(1) 갱신, 리포트는 이 값만 읽음)
+        self.aggregates = {}
+        self.daily_totals = {}
+        self.load_aggregates()
 
-    def add_trade(self, ticker, trade_info):
-        date = datetime.now().date()
-        if date not in self.daily_trades:
-            self.daily_trades[date] = {t: [] for t in self.tickers}
-        self.daily_trades[date][ticker].append(trade_info)
+    def load_aggregates(self):
+        """최근 AGGREGATE_DAYS일 누적 집계를 저널의 일별 합계에서 복원 (재시작 시)"""
+        today = datetime.fromtimestamp(self.clock()).date()
+        self.aggregates = self.journal.daily_aggregates(today - timedelta(days=AGGREGATE_DAYS - 1), today)
+        self.daily_totals = {}
+        for day, tickers in self.aggregates.items():
+            total = self.daily_totals[day] = TradeAggregate()
+            for aggregate in tickers.values():
+                total.merge(aggregate)
+
+    def add_trade(self, ticker, trade_info, timestamp=None):
+        """
+        거래 기록 (저장은 저널의 백그라운드 스레드가 처리하고 누적 집계만 바로 갱신)
+        :param timestamp: 거래 시각 (기본값: clock(), 샤드가 보낸 거래는 샤드의 체결 시각)
+        """
+        if timestamp is None:
+            timestamp = self.clock()
+        self.journal.record(ticker, trade_info, timestamp)
+
+        day = day_key(timestamp)
+        tickers = self.aggregates.get(day)
+        if tickers is None:
+            tickers = self.aggregates[day] = {}
+            self.daily_totals[day] = TradeAggregate()
+            self.drop_old_aggregates(timestamp)
+        aggregate = tickers.get(ticker)
+        if aggregate is None:
+            aggregate = tickers[ticker] = TradeAggregate()
+        aggregate.add_trade(trade_info)
+        self.daily_totals[day].add_trade(trade_info)
+
+    def record_marks(self, prices, timestamp=None):
+        """보유 종목 현재가 기록 (평가금액 곡선용, 저장은 저널의 백그라운드 스레드가 처리)"""
+        if prices:
+            self.journal.record_marks(prices, self.clock() if timestamp is None else timestamp)
+
+    def analytics_report(self, start, end):
+        """
+        [start, end) 구간 평가금액 분석 리포트 (시작 자금을 모르면 빈 문자열)
+        :param start: 시작 시각 (datetime)
+        :param end: 끝 시각 (datetime, 현재 이후면 현재까지)
+        """
+        if self.start_cash is None:
+            return ""
+        end = min(end.timestamp(), self.clock())
+        if end <= start.timestamp():
+            return ""
+        try:
+            return format_analytics(journal_analytics(self.journal, start.timestamp(), end, self.start_cash))
+        except Exception as e:  # 분석 실패로 거래 리포트까지 빠지지 않도록
+            logging.error(f"평가금액 분석 중 오류 발생: {str(e)}")
+            return ""
+
+    def drop_old_aggregates(self, timestamp):
+        """AGGREGATE_DAYS일보다 오래된 누적 집계 제거 (저널에는 남음)"""
+        oldest = day_key(datetime.fromtimestamp(timestamp).date() - timedelta(days=AGGREGATE_DAYS - 1))
+        for day in [day for day in self.aggregates if day < oldest]:
+            del self.aggregates[day]
+            del self.daily_totals[day]
 
     def check_daily_report_time(self):
         """리포트 시간 체크 (오전 9시, 오후 6시)"""
@@ -101,50 +573,43 @@ class PerformanceAnalyzer:
             target_date = today
             report_prefix = f"금일({target_date})"
         
-        report = f"\n=== {report_prefix} 거래 리포트 ===\n"
-        report += f"생성 시각: {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        
-        if target_date in self.daily_trades:
-            total_profit = 0
-            trade_count = 0
-            
-            for ticker in self.tickers:
-                ticker_trades = self.daily_trades[target_date][ticker]
-                if ticker_trades:
-                    profit = sum(trade.get('profit', 0) for trade in ticker_trades)
-                    count = len(ticker_trades)
-                    win_trades = len([t for t in ticker_trades if t.get('profit', 0) > 0])
-                    
-                    report += (
-                        f"\n{ticker}:\n"
-                        f"거래 횟수: {count}\n"
-                        f"승률: {(win_trades/count)*100:.1f}%\n"
-                        f"수익률: {profit:.2f}%\n"
-                        f"평균 수익률: {profit/count:.2f}%\n"
-                    )
-                    
-                    total_profit += profit
-                    trade_count += count
-            
-            if trade_count > 0:
-                report += (
-                    f"\n=== 종합 정보 ===\n"
-                    f"총 거래 횟수: {trade_count}\n"
-                    f"총 수익률: {total_profit:.2f}%\n"
-                    f"거래당 평균 수익률: {total_profit/trade_count:.2f}%\n"
-                )
-            else:
-                report += "\n해당 기간 거래 없음\n"
-        else:
-            report += "거래 기록 없음\n"
-            
-        return report
+        day = day_key(target_date)
+        start = datetime.combine(target_date, dt_time())
+        return format_period_report(
+            self.aggregates.get(day, {}), report_prefix, self.tickers, now, self.daily_totals.get(day)
+        ) + self.analytics_report(start, start + timedelta(days=1))
+
+    @send_error_alert
+    def generate_weekly_report(self, days=7):
+        """최근 days일(어제까지) 거래 리포트 생성 (AGGREGATE_DAYS일을 넘으면 저널에서 조회)"""
+        now = datetime.now()
+        end = now.date() - timedelta(days=1)
+        start = end - timedelta(days=days - 1)
+        title = f"주간({start} ~ {end})"
+        analytics = self.analytics_report(datetime.combine(start, dt_time()), datetime.combine(now.date(), dt_time()))
+        if days >= AGGREGATE_DAYS:
+            return format_period_report(self.journal.summary(start, end), title, self.tickers, now) + analytics
+
+        aggregates = {}
+        total = TradeAggregate()
+        for offset in range(days):
+            day = day_key(start + timedelta(days=offset))
+            for ticker, aggregate in self.aggregates.get(day, {}).items():
+                aggregates.setdefault(ticker, TradeAggregate()).merge(aggregate)
+            if day in self.daily_totals:
+                total.merge(self.daily_totals[day])
+        return format_period_report(aggregates, title, self.tickers, now, total) + analytics
 
     def clear_old_data(self, days_to_keep=7):
-        """오래된 거래 데이터 정리"""
-        today = datetime.now().date()
-        delete_before = today - timedelta(days=days_to_keep)
-        
-        for date in list(self.daily_trades.keys()):
-            if date < delete_before:
-                del self.daily_trades[date]
+        """days_to_keep일보다 오래된 거래 기록 삭제 (봇이 자동으로 호출하지 않으므로 저널은 전체 기록을 보관)"""
+        delete_before = datetime.now().date() - timedelta(days=days_to_keep)
+        deleted = self.journal.prune(delete_before)
+        self.load_aggregates()
+        return deleted
+
+    def close(self):
+        """저장 대기 중인 거래를 기록하고 저널 닫기"""
+        self.journal.close()
+
+# 프로세스 공용 모니터 (매매 루프, REST 호출, 알림 전송이 함께 기록)
+performance_monitor = PerformanceMonitor()
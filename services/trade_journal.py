@@ -0,0 +1,526 @@
+"""
+거래 기록 저널 (SQLite WAL)
+
+체결된 거래를 고정 스키마 레코드로 추가만 하며, 날짜/종목 인덱스로 리포트와 임의 조회를 처리합니다.
+매매 스레드는 대기열에 넣기만 하고 저장은 백그라운드 스레드가 묶어서 처리합니다.
+재시작해도 기록이 남고, 봇이 실행 중일 때도 다른 프로세스에서 조회할 수 있습니다.
+
+사용 예:
+    python -m services.trade_journal report --days 7
+    python -m services.trade_journal report --start 2024-01-01 --end 2024-03-31 --ticker KRW-BTC
+    python -m services.trade_journal query "SELECT strategy, COUNT(*), SUM(profit_amount) FROM trades GROUP BY strategy"
+"""
+import os
+import sys
+import time
+import queue
+import sqlite3
+import logging
+import argparse
+import threading
+import math
+from datetime import date, datetime, timedelta
+import numpy as np
+from config import TRADE_JOURNAL_PATH
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,           -- 체결 시각 (유닉스 초)
+    day INTEGER NOT NULL,         -- 로컬 날짜 YYYYMMDD
+    ticker TEXT NOT NULL,
+    side INTEGER NOT NULL,        -- 1: 매수, -1: 매도
+    price REAL NOT NULL,
+    amount REAL NOT NULL,         -- 거래 금액 (원)
+    quantity REAL NOT NULL,
+    profit REAL,                  -- 수익률 % (매도만)
+    profit_amount REAL,           -- 수익금 (매도만)
+    fee REAL NOT NULL DEFAULT 0,
+    stop_loss INTEGER NOT NULL DEFAULT 0,
+    strategy TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_day_ticker ON trades (day, ticker);
+CREATE INDEX IF NOT EXISTS trades_ticker_day ON trades (ticker, day);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+
+-- 보유 종목 시가 평가 가격 (거래와 함께 평가금액 곡선을 만들 때 사용)
+CREATE TABLE IF NOT EXISTS marks (
+    time REAL NOT NULL,
+    ticker TEXT NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS marks_time ON marks (time);
+CREATE INDEX IF NOT EXISTS marks_ticker_time ON marks (ticker, time);
+
+-- 일별/종목별 합계 (거래와 같은 트랜잭션에서 갱신, 리포트는 이 표만 읽음)
+CREATE TABLE IF NOT EXISTS daily_summary (
+    day INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    count INTEGER NOT NULL,       -- 매수/매도 모두
+    sells INTEGER NOT NULL,
+    wins INTEGER NOT NULL,        -- 수익률 > 0인 매도
+    profit REAL NOT NULL,         -- 매도 수익률 합계 (%)
+    profit_sq REAL NOT NULL,      -- 매도 수익률 제곱합 (분산 계산용)
+    profit_amount REAL NOT NULL,
+    best REAL,                    -- 최고/최저 매도 수익률 (매도가 없으면 NULL)
+    worst REAL,
+    fee REAL NOT NULL,
+    PRIMARY KEY (day, ticker)
+) WITHOUT ROWID;
+"""
+
+COLUMNS = (
+    'time', 'day', 'ticker', 'side', 'price', 'amount', 'quantity',
+    'profit', 'profit_amount', 'fee', 'stop_loss', 'strategy', 'reason'
+)
+
+INSERT = f"INSERT INTO trades ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+INSERT_MARK = "INSERT INTO marks (time, ticker, price) VALUES (?, ?, ?)"
+
+AGGREGATE_FIELDS = ('count', 'sells', 'wins', 'profit', 'profit_sq', 'profit_amount', 'best', 'worst', 'fee')
+SUM_FIELDS = tuple(field for field in AGGREGATE_FIELDS if field not in ('best', 'worst'))
+
+UPSERT_SUMMARY = f"""
+INSERT INTO daily_summary (day, ticker, {', '.join(AGGREGATE_FIELDS)})
+VALUES ({', '.join('?' * (len(AGGREGATE_FIELDS) + 2))})
+ON CONFLICT (day, ticker) DO UPDATE SET
+{', '.join(f"{field} = {field} + excluded.{field}" for field in SUM_FIELDS)},
+best = MAX(COALESCE(best, excluded.best), COALESCE(excluded.best, best)),
+worst = MIN(COALESCE(worst, excluded.worst), COALESCE(excluded.worst, worst))
+"""
+
+# 이전 버전 저널의 합계 표를 거래 기록에서 다시 만듦
+REBUILD_SUMMARY = f"""
+INSERT INTO daily_summary (day, ticker, {', '.join(AGGREGATE_FIELDS)})
+SELECT day, ticker, COUNT(*), SUM(side = -1), SUM(side = -1 AND profit > 0),
+       TOTAL(CASE WHEN side = -1 THEN profit END),
+       TOTAL(CASE WHEN side = -1 THEN profit * profit END),
+       TOTAL(CASE WHEN side = -1 THEN profit_amount END),
+       MAX(CASE WHEN side = -1 THEN COALESCE(profit, 0) END),
+       MIN(CASE WHEN side = -1 THEN COALESCE(profit, 0) END),
+       TOTAL(fee)
+FROM trades
+GROUP BY day, ticker
+"""
+
+SIDES = {'buy': 1, 'sell': -1}
+SIDE_NAMES = {value: key for key, value in SIDES.items()}
+
+# 기간 종목별 집계 (일별 합계를 더함)
+SUMMARY = f"""
+SELECT ticker, {', '.join(f"SUM({field}) AS {field}" for field in SUM_FIELDS)}, MAX(best) AS best, MIN(worst) AS worst
+FROM daily_summary
+WHERE day BETWEEN ? AND ? {{ticker_filter}}
+GROUP BY ticker
+"""
+
+DAILY_SUMMARY = f"SELECT day, ticker, {', '.join(AGGREGATE_FIELDS)} FROM daily_summary WHERE day BETWEEN ? AND ?"
+
+def day_key(value):
+    """date 또는 유닉스 초 -> YYYYMMDD 정수"""
+    if not isinstance(value, date):
+        value = datetime.fromtimestamp(value).date()
+    return value.year * 10000 + value.month * 100 + value.day
+
+def to_row(timestamp, ticker, trade_info):
+    """AutoTrade 거래 정보 dict -> trades 행"""
+    return (
+        timestamp,
+        day_key(timestamp),
+        ticker,
+        SIDES[trade_info['type']],
+        float(trade_info.get('price', 0)),
+        float(trade_info.get('amount', 0)),
+        float(trade_info.get('quantity', 0)),
+        trade_info.get('profit'),
+        trade_info.get('profit_amount'),
+        float(trade_info.get('fee', 0)),
+        int(bool(trade_info.get('stop_loss'))),
+        trade_info.get('strategy'),
+        trade_info.get('reason')
+    )
+
+class TradeAggregate:
+    """
+    거래 누적 집계 (거래 하나를 O(1)로 더함)
+    거래 횟수와 수수료는 매수/매도 모두, 수익 관련 값은 매도만 반영
+    """
+    __slots__ = AGGREGATE_FIELDS
+
+    def __init__(self):
+        self.count = self.sells = self.wins = 0
+        self.profit = self.profit_sq = self.profit_amount = self.fee = 0.0
+        self.best = self.worst = None
+
+    def add(self, side, profit=None, profit_amount=None, fee=0.0):
+        """
+        :param side: 1: 매수, -1: 매도
+        :param profit: 매도 수익률 (%)
+        """
+        self.count += 1
+        self.fee += fee
+        if side != -1:
+            return
+        profit = profit or 0.0
+        self.sells += 1
+        self.wins += profit > 0
+        self.profit += profit
+        self.profit_sq += profit * profit
+        self.profit_amount += profit_amount or 0.0
+        if self.best is None or profit > self.best:
+            self.best = profit
+        if self.worst is None or profit < self.worst:
+            self.worst = profit
+
+    def add_trade(self, trade_info):
+        """AutoTrade 거래 정보 dict 하나 반영"""
+        self.add(
+            SIDES[trade_info['type']], trade_info.get('profit'),
+            trade_info.get('profit_amount'), float(trade_info.get('fee', 0))
+        )
+
+    def merge(self, other):
+        """다른 집계를 더함 (기간/전체 합계용) -> self"""
+        self.count += other.count
+        self.sells += other.sells
+        self.wins += other.wins
+        self.profit += other.profit
+        self.profit_sq += other.profit_sq
+        self.profit_amount += other.profit_amount
+        self.fee += other.fee
+        if other.best is not None and (self.best is None or other.best > self.best):
+            self.best = other.best
+        if other.worst is not None and (self.worst is None or other.worst < self.worst):
+            self.worst = other.worst
+        return self
+
+    @property
+    def mean(self):
+        """매도 한 번의 평균 수익률 (%)"""
+        return self.profit / self.sells if self.sells else 0.0
+
+    @property
+    def std(self):
+        """매도 수익률 표준편차 (%p, 모표준편차)"""
+        if not self.sells:
+            return 0.0
+        return math.sqrt(max(self.profit_sq / self.sells - self.mean ** 2, 0.0))
+
+    def values(self):
+        return tuple(getattr(self, field) for field in AGGREGATE_FIELDS)
+
+    @classmethod
+    def from_values(cls, values):
+        aggregate = cls()
+        for field, value in zip(AGGREGATE_FIELDS, values):
+            setattr(aggregate, field, value)
+        return aggregate
+
+def summarize_rows(rows):
+    """trades 행 목록 -> daily_summary 증가분 행 목록"""
+    totals = {}
+    for row in rows:
+        key = (row[1], row[2])
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = TradeAggregate()
+        total.add(row[3], row[7], row[8], row[9])
+    return [(*key, *total.values()) for key, total in totals.items()]
+
+def _columns(rows, names):
+    """조회 행 목록 -> {열 이름: NumPy 배열} (ticker는 object 배열)"""
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return {
+        name: np.asarray(values, dtype=object if name == 'ticker' else np.float64)
+        for name, values in zip(names, columns)
+    }
+
+def connect(path, timeout=30.0):
+    """WAL 모드 연결 (스키마가 없으면 생성)"""
+    if path != ':memory:':
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 전원 장애 시 마지막 커밋만 잃을 수 있음
+    if connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return connection
+    # 새 파일이거나 이전 버전이면 스키마를 만들고 합계 표를 거래 기록에서 다시 계산
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        if connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:  # 다른 프로세스가 먼저 처리
+            connection.execute("COMMIT")
+            return connection
+        connection.execute("DROP TABLE IF EXISTS daily_summary")
+        for statement in SCHEMA.split(';'):
+            if statement.strip():
+                connection.execute(statement)
+        connection.execute(REBUILD_SUMMARY)
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        connection.execute("COMMIT")
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+    return connection
+
+class TradeJournal:
+    """거래 기록 저널 (쓰기는 백그라운드 스레드에서 묶어서 처리)"""
+
+    def __init__(self, path=TRADE_JOURNAL_PATH, batch_size=500, flush_interval=1.0):
+        """
+        :param path: SQLite 파일 경로 (':memory:'면 프로세스 안에서만 유지, 재생/벤치마크용)
+        :param batch_size: 한 트랜잭션에 저장할 최대 거래 수
+        :param flush_interval: 대기열을 확인하는 간격 (초)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.connection = connect(path)
+        self.lock = threading.Lock()  # 쓰기 스레드와 조회가 같은 연결을 사용
+        self.pending = queue.Queue()
+        self.written = 0
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name="trade-journal", daemon=True)
+        self.writer.start()
+
+    def record(self, ticker, trade_info, timestamp=None):
+        """
+        거래 하나 기록 (대기열에 추가만 하고 행 변환은 쓰기 스레드에서 처리)
+        :param trade_info: AutoTrade 거래 정보 dict (기록 후 수정하지 않아야 함)
+        :param timestamp: 체결 시각 (기본값: 현재 시각)
+        """
+        self.pending.put(('trade', timestamp or time.time(), ticker, trade_info))
+
+    def record_marks(self, prices, timestamp=None):
+        """
+        보유 종목 시가 평가 가격 기록 (대기열에 추가만 함)
+        :param prices: {ticker: 현재가}
+        """
+        timestamp = timestamp or time.time()
+        for ticker, price in prices.items():
+            self.pending.put(('mark', timestamp, ticker, float(price)))
+
+    def flush(self, timeout=None):
+        """대기열에 있던 거래가 모두 저장될 때까지 대기"""
+        if self.closed:
+            return
+        done = threading.Event()
+        self.pending.put(done)
+        done.wait(timeout)
+
+    def _write_loop(self):
+        while True:
+            try:
+                item = self.pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            rows, marks, events, stop = [], [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                elif item[0] == 'trade':
+                    rows.append(to_row(*item[1:]))
+                else:
+                    marks.append(item[1:])
+                if stop or len(rows) + len(marks) >= self.batch_size:
+                    break
+                try:
+                    item = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+            if rows or marks:
+                try:
+                    self._write_rows(rows, marks)
+                except Exception as e:
+                    logging.error(f"거래 기록 저장 실패 (거래 {len(rows)}건, 평가 가격 {len(marks)}건): {str(e)}")
+            for event in events:
+                event.set()
+            if stop:
+                break
+
+    def _write_rows(self, rows, marks=()):
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.executemany(INSERT, rows)
+                self.connection.executemany(UPSERT_SUMMARY, summarize_rows(rows))
+                self.connection.executemany(INSERT_MARK, marks)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        self.written += len(rows)
+
+    def query(self, sql, params=()):
+        """임의 조회 -> 행(dict) 목록 (저장 대기 중인 거래까지 반영)"""
+        self.flush()
+        with self.lock:
+            cursor = self.connection.execute(sql, params)
+            names = [column[0] for column in cursor.description or ()]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def trades(self, start=None, end=None, ticker=None, limit=None):
+        """
+        거래 목록 (시각 순)
+        :param start: 시작 날짜 (date, 포함)
+        :param end: 끝 날짜 (date, 포함)
+        :param ticker: 종목 코드 (기본값: 전체)
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("day >= ?")
+            params.append(day_key(start))
+        if end is not None:
+            conditions.append("day <= ?")
+            params.append(day_key(end))
+        if ticker:
+            conditions.append("ticker = ?")
+            params.append(ticker)
+        sql = "SELECT * FROM trades"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY time, id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.query(sql, params)
+        for row in rows:
+            row['type'] = SIDE_NAMES[row.pop('side')]
+            row['stop_loss'] = bool(row['stop_loss'])
+        return rows
+
+    def summary(self, start, end=None, ticker=None):
+        """
+        기간 종목별 집계
+        :param start: 시작 날짜 (date, 포함)
+        :param end: 끝 날짜 (date, 포함, 기본값: start)
+        :return: {ticker: TradeAggregate}
+        """
+        params = [day_key(start), day_key(end or start)]
+        ticker_filter = ""
+        if ticker:
+            ticker_filter = "AND ticker = ?"
+            params.append(ticker)
+        rows = self.query(SUMMARY.format(ticker_filter=ticker_filter), params)
+        return {row['ticker']: TradeAggregate.from_values(row[field] for field in AGGREGATE_FIELDS) for row in rows}
+
+    def daily_aggregates(self, start, end):
+        """
+        기간 일별/종목별 집계 (분석기 재시작 시 누적 집계 복원용)
+        :return: {day_key: {ticker: TradeAggregate}}
+        """
+        days = {}
+        for row in self.query(DAILY_SUMMARY, (day_key(start), day_key(end))):
+            days.setdefault(row['day'], {})[row['ticker']] = TradeAggregate.from_values(
+                row[field] for field in AGGREGATE_FIELDS
+            )
+        return days
+
+    def history(self, start, end):
+        """
+        평가금액 곡선 입력 (유닉스 초 [start, end] 구간)
+        :return: {
+            'opening_cash_flow': start 이전 현금 증감 합계,
+            'opening_positions': {ticker: start 시점 보유 수량},
+            'opening_prices': {ticker: start 이전 마지막 가격 (거래가 또는 평가 가격)},
+            'trades': 구간 거래 {'time', 'ticker', 'side', 'price', 'quantity', 'amount', 'fee'} 배열,
+            'marks': 구간 평가 가격 {'time', 'ticker', 'price'} 배열
+        }
+        """
+        self.flush()
+        with self.lock:
+            execute = self.connection.execute
+            opening_cash_flow = execute(
+                "SELECT TOTAL(-side * amount - fee) FROM trades WHERE time < ?", (start,)
+            ).fetchone()[0]
+            opening_positions = dict(execute(
+                "SELECT ticker, TOTAL(side * quantity) FROM trades WHERE time < ? GROUP BY ticker", (start,)
+            ).fetchall())
+            opening_prices = dict(execute(
+                "SELECT ticker, price FROM ("
+                " SELECT ticker, price, MAX(time) AS last FROM trades WHERE time < ? GROUP BY ticker"
+                " UNION ALL"
+                " SELECT ticker, price, MAX(time) AS last FROM marks WHERE time < ? GROUP BY ticker"
+                ") ORDER BY last", (start, start)
+            ).fetchall())  # 뒤(최근) 값이 앞 값을 덮어씀
+            trades = execute(
+                "SELECT time, ticker, side, price, quantity, amount, fee FROM trades"
+                " WHERE time BETWEEN ? AND ? ORDER BY time, id", (start, end)
+            ).fetchall()
+            marks = execute(
+                "SELECT time, ticker, price FROM marks WHERE time BETWEEN ? AND ? ORDER BY time", (start, end)
+            ).fetchall()
+        return {
+            'opening_cash_flow': opening_cash_flow,
+            'opening_positions': {ticker: quantity for ticker, quantity in opening_positions.items() if quantity > 1e-12},
+            'opening_prices': opening_prices,
+            'trades': _columns(trades, ('time', 'ticker', 'side', 'price', 'quantity', 'amount', 'fee')),
+            'marks': _columns(marks, ('time', 'ticker', 'price'))
+        }
+
+    def prune(self, before):
+        """before(date) 이전 거래 삭제 -> 삭제한 거래 수"""
+        self.flush()
+        with self.lock:
+            self.connection.execute("BEGIN")
+            self.connection.execute("DELETE FROM daily_summary WHERE day < ?", (day_key(before),))
+            cutoff = datetime.combine(before, datetime.min.time()).timestamp()
+            self.connection.execute("DELETE FROM marks WHERE time < ?", (cutoff,))
+            deleted = self.connection.execute("DELETE FROM trades WHERE day < ?", (day_key(before),)).rowcount
+            self.connection.execute("COMMIT")
+        return deleted
+
+    def close(self):
+        """남은 거래를 저장하고 연결 종료"""
+        if self.closed:
+            return
+        self.pending.put(None)
+        self.writer.join()
+        self.closed = True
+        with self.lock:
+            self.connection.close()
+
+def _parse_date(text):
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+def main():
+    parser = argparse.ArgumentParser(description="거래 기록 저널 조회")
+    parser.add_argument('--db', default=TRADE_JOURNAL_PATH, help="저널 파일")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report = commands.add_parser('report', help="기간 거래 리포트")
+    report.add_argument('--days', type=int, default=1, help="오늘까지 최근 N일 (--start가 없을 때)")
+    report.add_argument('--start', type=_parse_date, help="시작 날짜 (YYYY-MM-DD)")
+    report.add_argument('--end', type=_parse_date, help="끝 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    report.add_argument('--ticker')
+
+    query = commands.add_parser('query', help="SQL 조회 (테이블: trades)")
+    query.add_argument('sql')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"저널 파일이 없습니다: {args.db}")
+        sys.exit(1)
+    journal = TradeJournal(args.db)
+    started = time.perf_counter()
+    if args.command == 'report':
+        from services.performance_service import format_period_report
+        end = args.end or date.today()
+        start = args.start or end - timedelta(days=args.days - 1)
+        print(format_period_report(journal.summary(start, end, args.ticker), f"{start} ~ {end}"))
+    else:
+        rows = journal.query(args.sql)
+        if rows:
+            print("\t".join(rows[0]))
+            for row in rows:
+                print("\t".join(str(value) for value in row.values()))
+    print(f"({(time.perf_counter() - started) * 1000:.1f}ms)", file=sys.stderr)
+    journal.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+공유 메모리 시세 버스 동시 읽기 검사
+
+쓰기 한 곳과 독자 프로세스 여러 개가 동시에 동작할 때 찢어진 읽기, 순서 오류, 보고되지 않은 추월이 없어야 한다.
+각 틱은 모든 필드에 같은 일련번호를 쓰므로, 행 안의 값이 모두 같고 일련번호가 1씩 증가해야 하며
+건너뛴 번호 수는 독자가 보고한 dropped와 같아야 한다.
+"""
+import os
+import time
+import uuid
+import multiprocessing as mp
+import numpy as np
+import pytest
+from market_data.bus import MarketDataBus, MarketDataReader, TICK_FIELDS, CANDLE_WIDTH
+
+TICKERS = [f"KRW-T{i}" for i in range(16)]
+
+def bus_name():
+    return f"bus-test-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+def publish(bus, first, last, candle_every=0):
+    """일련번호 first..last 틱 기록 (모든 필드 = 일련번호)"""
+    for n in range(first, last + 1):
+        ticker = TICKERS[n % len(TICKERS)]
+        bus.publish_tick(ticker, dict.fromkeys(TICK_FIELDS, n))
+        if candle_every and n % candle_every == 0:
+            bus.publish_candles(ticker, np.full(CANDLE_WIDTH, n, dtype=np.float64))
+
+def check_ticks(values, last):
+    """
+    poll_arrays() 결과 검사
+    :return: (마지막 일련번호, 찢어진 행 수, 순서 오류 수, 건너뛴 번호 수)
+    """
+    torn = int(np.count_nonzero((values != values[:, :1]).any(axis=1)))
+    numbers = values[:, 0].astype(np.int64)
+    steps = np.diff(np.concatenate(([last], numbers)))
+    out_of_order = int(np.count_nonzero(steps <= 0))
+    gaps = int((steps[steps > 1] - 1).sum())
+    return int(numbers[-1]), torn, out_of_order, gaps
+
+def consume(name, reader_id, start, done, results, delay, max_items):
+    """독자 프로세스: 쓰기가 끝날 때까지 틱/최신 틱/캔들을 읽으며 검사"""
+    reader = MarketDataReader(name, from_start=True)
+    received = torn = out_of_order = gaps = 0
+    last = 0
+    start.wait()
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        finished = done.is_set()  # 쓰기 완료를 먼저 확인한 뒤 읽어야 마지막 틱을 놓치지 않음
+        slots, values = reader.poll_arrays(max_items)
+        if len(slots):
+            last, *counts = check_ticks(values, last)
+            torn, out_of_order, gaps = (a + b for a, b in zip((torn, out_of_order, gaps), counts))
+            received += len(slots)
+        elif finished:
+            break
+
+        ticker = TICKERS[received % len(TICKERS)]
+        tick = reader.latest(ticker)
+        if tick is not None:
+            torn += len({tick[field] for field in TICK_FIELDS}) != 1
+        candles = reader.candles(ticker, 8)
+        if candles is not None:
+            timestamps, ohlcv = candles
+            torn += int(np.count_nonzero((ohlcv != ohlcv[:1]).any(axis=0)))
+        if delay:
+            time.sleep(delay)
+    results.put((reader_id, received, reader.dropped, torn, out_of_order, gaps, last))
+    reader.close()
+
+@pytest.mark.parametrize('ring_size, delay', [(1 << 14, 0), (256, 0.002)], ids=['fast', 'lapped'])
+def test_concurrent_readers(ring_size, delay):
+    """독자 3개가 쓰기와 동시에 읽어도 찢어진 읽기/순서 오류가 없고 놓친 틱은 모두 dropped로 보고"""
+    messages, reader_count = 20_000, 3
+    bus = MarketDataBus(bus_name(), max_tickers=len(TICKERS), ring_size=ring_size, candle_capacity=16)
+    try:
+        for ticker in TICKERS:
+            bus.slot(ticker)
+        start, done, results = mp.Barrier(reader_count + 1), mp.Event(), mp.Queue()
+        readers = [
+            mp.Process(target=consume, args=(bus.name, i, start, done, results, delay, 64 if delay else 4096))
+            for i in range(reader_count)
+        ]
+        for reader in readers:
+            reader.start()
+        start.wait()
+        publish(bus, 1, messages, candle_every=50)
+        done.set()
+        outcomes = [results.get(timeout=90) for _ in readers]
+        for reader in readers:
+            reader.join(timeout=30)
+    finally:
+        bus.close()
+
+    for reader_id, received, dropped, torn, out_of_order, gaps, last in outcomes:
+        assert torn == 0, f"독자 {reader_id} 찢어진 읽기"
+        assert out_of_order == 0, f"독자 {reader_id} 순서 오류"
+        assert last == messages, f"독자 {reader_id}가 마지막 틱을 읽지 못함"
+        assert gaps == dropped, f"독자 {reader_id} 건너뛴 틱 {gaps}개, 보고 {dropped}개"
+        assert received + dropped == messages
+        if delay:
+            assert dropped > 0, "느린 독자가 추월당하지 않음 (링 버퍼 크기 확인)"
+
+def test_lapped_reader_reports_dropped():
+    """링 버퍼 크기 이상 뒤처진 독자는 남아 있는 가장 오래된 틱부터 읽고 놓친 수를 보고"""
+    ring_size = 64
+    bus = MarketDataBus(bus_name(), max_tickers=len(TICKERS), ring_size=ring_size, candle_capacity=4)
+    reader = MarketDataReader(bus.name)
+    try:
+        publish(bus, 1, 10)
+        slots, values = reader.poll_arrays()
+        assert values[:, 0].tolist() == list(range(1, 11)) and reader.dropped == 0
+
+        publish(bus, 11, 10 + 3 * ring_size)
+        slots, values = reader.poll_arrays()
+        last, torn, out_of_order, gaps = check_ticks(values, 10)
+        assert (last, torn, out_of_order) == (10 + 3 * ring_size, 0, 0)
+        assert len(slots) == ring_size and reader.dropped == gaps == 2 * ring_size
+    finally:
+        reader.close()
+        bus.close()
+
+def test_reader_skips_slot_being_written():
+    """쓰는 중(seqlock 홀수)인 최신 틱 슬롯은 값을 돌려주지 않음"""
+    bus = MarketDataBus(bus_name(), max_tickers=len(TICKERS), ring_size=64, candle_capacity=4)
+    reader = MarketDataReader(bus.name)
+    try:
+        publish(bus, 1, len(TICKERS))
+        ticker = TICKERS[1]
+        assert reader.latest(ticker)['trade_price'] == 1
+        slot = bus.slots[ticker]
+        bus.tick_seq[slot] += 1  # 쓰기 시작 상태로 멈춤
+        bus.ticks[slot, 0] = -1
+        assert reader.latest(ticker) is None
+    finally:
+        reader.close()
+        bus.close()
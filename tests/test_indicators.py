@@ -0,0 +1,71 @@
+"""
+NumPy 지표 커널과 pandas 구현 결과 비교 (NaN 워밍업 구간 위치 포함)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from data_analyzer import indicators
+
+# 워밍업 구간보다 짧은 배열, 실매매 캔들 수, 긴 백테스트 배열
+ROWS = (10, 30, 200, 20_000)
+
+def make_close(rows, seed=0):
+    """랜덤워크 종가"""
+    rng = np.random.default_rng(seed)
+    return 50_000_000 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+
+def pandas_rsi(close, period=14):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+def pandas_macd(close, fast=12, slow=26, signal=9):
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    return line, line.ewm(span=signal, adjust=False).mean()
+
+def pandas_bollinger(close, window=20, num_std=2):
+    middle = close.rolling(window=window).mean()
+    band = close.rolling(window=window).std() * num_std
+    return middle, middle + band, middle - band
+
+# (이름, pandas 함수, numpy 함수), 여러 배열을 반환하는 지표는 튜플 순서대로 비교
+CASES = [
+    ('sma', lambda s: s.rolling(window=20).mean(), lambda c: indicators.sma(c, 20)),
+    ('rolling_std', lambda s: s.rolling(window=20).std(), lambda c: indicators.rolling_std(c, 20)),
+    ('ema', lambda s: s.ewm(span=12, adjust=False).mean(), lambda c: indicators.ema(c, 12)),
+    ('rsi', pandas_rsi, indicators.rsi),
+    ('macd', pandas_macd, indicators.macd),
+    ('bollinger', pandas_bollinger, indicators.bollinger),
+    ('fill_nan', lambda s: s.rolling(window=20).mean().bfill().ffill(),
+     lambda c: indicators.fill_nan(indicators.sma(c, 20))),
+]
+
+def assert_parity(expected, actual):
+    """NaN 위치는 정확히, 값은 긴 배열의 pandas 누적 오차를 감안해 비교"""
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    assert actual.shape == expected.shape
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize('rows', ROWS)
+@pytest.mark.parametrize('name, pandas_func, numpy_func', CASES, ids=[case[0] for case in CASES])
+def test_matches_pandas(name, pandas_func, numpy_func, rows):
+    close = make_close(rows)
+    expected = pandas_func(pd.Series(close))
+    actual = numpy_func(close)
+    if not isinstance(expected, tuple):
+        expected, actual = (expected,), (actual,)
+    assert len(actual) == len(expected)
+    for e, a in zip(expected, actual):
+        assert_parity(e, a)
+
+@pytest.mark.parametrize('window', (2, 5, 20))
+def test_warm_up_region(window):
+    """이동 지표는 앞쪽 window-1개만 NaN (pandas rolling과 동일)"""
+    close = make_close(50)
+    for values in (indicators.sma(close, window), indicators.rolling_std(close, window),
+                   *indicators.bollinger(close, window)):
+        assert np.isnan(values[:window - 1]).all()
+        assert not np.isnan(values[window - 1:]).any()
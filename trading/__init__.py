@@ -1,3 +1,4 @@
 from .auto_trade import AutoTrade
+from .sharded import RiskCoordinator
 
-__all__ = ['AutoTrade']
\ No newline at end of file
+__all__ = ['AutoTrade', 'RiskCoordinator']
\ No newline at end of file
@@ -4,34 +4,83 @@ import logging
 import time
 import pyupbit
 import traceback
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from collections import deque
 from collections import defaultdict
 
 from config import (
     TICKERS, STOP_LOSS, UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY,
-    CASH_USAGE_RATIO, MAX_COINS_AT_ONCE, REAL_TRADING,
-    START_CASH, MIN_TRADING_AMOUNT,
-    REPORT_CHECK_INTERVAL, DATA_UPDATE_INTERVAL, STATUS_INTERVAL
+    CASH_USAGE_RATIO, MAX_COINS_AT_ONCE, MAX_CORRELATION, CORRELATION_HALFLIFE, CORRELATION_MIN_PERIODS,
+    REAL_TRADING,
+    START_CASH, MIN_TRADING_AMOUNT, TRADING_FEE_RATE,
+    REPORT_CHECK_INTERVAL, DATA_UPDATE_INTERVAL, STATUS_INTERVAL, MARK_INTERVAL,
+    WARMUP_WORKERS, STRATEGIES, MARKET_DATA_BUS, FEED_RECORD_DIR,
+    METRICS_PORT, METRICS_FILE, METRICS_INTERVAL, SNAPSHOT_PATH, SNAPSHOT_INTERVAL, SNAPSHOT_MAX_AGE,
+    TIMEFRAME_BARS, ORDERBOOK_STREAM, ORDERBOOK_LEVELS, ORDERBOOK_DEPTH,
+    TRADE_STREAM, TRADE_WINDOW, TRADE_BUFFER, PROFILE_BUCKETS, PROFILE_BUCKET_BPS, get_top_tickers
 )
 from services.api_service import verify_api_keys
 from services.notification_service import NotificationService
-from services.performance_service import PerformanceMonitor, PerformanceAnalyzer
+from services.performance_service import (
+    PerformanceAnalyzer, MetricsExporter, performance_monitor, instrument_rest_api
+)
 from utils.message_queue import MessageQueue
 from utils.decorators import retry_on_failure, send_error_alert
-from data_analyzer.analyzer import DataAnalyzer  # 올바른 경로로 수정
+from utils.log import LogLimiter, log_event, stop_logging
+from data_analyzer.analyzer import DataAnalyzer, OHLCV_INDEX  # 올바른 경로로 수정
+from data_analyzer.strategies import build_strategies, collect_required_timeframes, collect_required_streams
+from data_analyzer.timeframes import timeframe_minutes
+from data_analyzer.correlation import ReturnCorrelation
+from market_data.bus import MarketDataReader
+from market_data.recorder import FeedRecorder
+from market_data.orderbook import OrderBook
+from market_data.trades import TradeFlow
+from market_data.stream import WebSocketStream
+from trading.snapshot import SNAPSHOT_VERSION, SnapshotStore, merge_candles
+
+# 분석용 캔들 수 (워밍업 조회, 데이터 갱신 후 유지하는 최근 캔들 수)
+CANDLE_COUNT = 200
+
+def send_scheduled_reports(performance_analyzer, notification=None):
+    """리포트 시간(오전 9시, 오후 6시)이면 일일 리포트 생성/전송 (월요일 오전에는 주간 리포트도)"""
+    try:
+        if not performance_analyzer.check_daily_report_time():
+            return
+        report = performance_analyzer.generate_daily_report()
+        logging.info(f"일일 리포트 생성:\n{report}")
+        
+        if notification:
+            notification.send_message('reports', f"📊 일일 거래 리포트\n{report}")
+        
+        # 월요일 오전에는 지난 7일 리포트도 생성 (거래 기록 저널에서 조회)
+        now = datetime.now()
+        if now.weekday() == 0 and now.hour < 12:
+            weekly = performance_analyzer.generate_weekly_report()
+            logging.info(f"주간 리포트 생성:\n{weekly}")
+            if notification:
+                notification.send_message('reports', f"📊 주간 거래 리포트\n{weekly}")
+        
+    except Exception as e:
+        logging.error(f"리포트 생성 중 오류: {str(e)}")
+        if notification:
+            notification.send_error_alert(f"리포트 생성 실패: {str(e)}")
 
 class AutoTrade:
-    def __init__(self, start_cash=1_000_000):
+    def __init__(self, start_cash=1_000_000, tickers=None, real_trading=REAL_TRADING):
         """
         자동매매 클래스 초기화
         :param start_cash: 시작 자금 (기본값: 100만원)
+        :param tickers: 거래 대상 종목 (기본값: config.TICKERS)
+        :param real_trading: 실제 거래 여부 (기본값: config.REAL_TRADING, 기록 재생은 항상 False)
         """
         self.start_cash = start_cash  # 시작 자금 저장
         self.current_cash = start_cash  # 현재 보유 현금
         
         # 거래 모드 설정
-        self.real_trading = REAL_TRADING
+        self.real_trading = real_trading
         if self.real_trading:
             self.upbit = pyupbit.Upbit(UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY)
             self.current_cash = float(self.upbit.get_balance("KRW"))
@@ -41,23 +90,80 @@ class AutoTrade:
             logging.info(f"테스트 모드 시작 (시작 자금: {self.start_cash:,}원)")
         
         # 기본 설정
-        self.tickers = TICKERS
+        self.tickers = list(tickers or TICKERS)
         self.min_trading_amount = MIN_TRADING_AMOUNT
         self.max_per_coin = start_cash * CASH_USAGE_RATIO  # 코인당 최대 투자금액
         self.stop_loss = STOP_LOSS
         self.profit_taking_ratio = 0.05  # 이익 실현 비율 (10%)
         
+        # 전략 초기화 (모든 전략이 같은 피드와 분석기 상태를 공유)
+        self.strategies = build_strategies(STRATEGIES)
+        self.strategy_map = {strategy.name: strategy for strategy in self.strategies}
+        self.strategy_cash = {  # 전략별 배분 자금 잔액
+            strategy.name: start_cash * strategy.allocation for strategy in self.strategies
+        }
+        self.position_owner = {}  # 종목 -> 보유 포지션을 연 전략 이름
+        
         # 상태 변수 초기화
         self.buy_yn = {ticker: False for ticker in self.tickers}
         self.buy_price = {ticker: 0 for ticker in self.tickers}
         self.analyzers = {}
         self.price_cache = defaultdict(list)
-        self.last_status_time = time.time()
-        self.last_data_update = time.time()
+        self.clock = time.time  # 주기 작업 기준 시각 (기록 재생 시 기록된 수신 시각으로 교체)
+        self.last_status_time = self.clock()
+        self.last_data_update = self.clock()
+        self.last_mark_time = self.clock()
         
         # 데이터 분석기 초기화
         for ticker in self.tickers:
-            self.analyzers[ticker] = DataAnalyzer(ticker)  # DataAnalyzer 사용
+            self.analyzers[ticker] = DataAnalyzer(ticker, strategies=self.strategies)
+        
+        # 첫 워밍업 조회 캔들 수 (상위 시간 프레임을 쓰는 전략이 있으면 완성 봉 TIMEFRAME_BARS개 분량의 1분봉)
+        timeframes = collect_required_timeframes(self.strategies)
+        self.warmup_candle_count = max(
+            [CANDLE_COUNT] + [timeframe_minutes(name) * TIMEFRAME_BARS for name in timeframes]
+        )
+        
+        # 보조 웹소켓 구독 (종류 -> 메시지 처리 함수, 실시간은 구독 스레드가 호출하고 재생은 기록 순서대로 호출)
+        streams = collect_required_streams(self.strategies)
+        self.orderbook = None
+        if ORDERBOOK_STREAM or 'orderbook' in streams:
+            self.orderbook = OrderBook(self.tickers, ORDERBOOK_LEVELS, ORDERBOOK_DEPTH)
+            for analyzer in self.analyzers.values():
+                analyzer.orderbook = self.orderbook
+        self.trade_flow = None
+        if TRADE_STREAM or 'trade' in streams:
+            self.trade_flow = TradeFlow(
+                self.tickers, TRADE_WINDOW, TRADE_BUFFER, PROFILE_BUCKETS, PROFILE_BUCKET_BPS
+            )
+            for analyzer in self.analyzers.values():
+                analyzer.trades = self.trade_flow
+        self.stream_handlers = {}
+        if self.orderbook is not None:
+            self.stream_handlers['orderbook'] = self.orderbook.update
+        if self.trade_flow is not None:
+            self.stream_handlers['trade'] = self.trade_flow.update
+        self.streams = []
+        
+        # 종목 간 1분 수익률 상관계수 (보유 종목과 함께 움직이는 종목의 신규 매수 보류)
+        self.correlation = self.create_correlation() if MAX_CORRELATION else None
+        
+        # 워밍업 상태 ('loading', 'ready', 'failed')
+        self.warmup_status = {}
+        self.warmup_in_flight = set()  # 캔들 조회가 끝나지 않은 종목 (중복 조회 방지)
+        self.warmup_lock = threading.Lock()
+        self.warmup_executor = ThreadPoolExecutor(
+            max_workers=WARMUP_WORKERS, thread_name_prefix="warmup"
+        )
+        
+        # 공유 메모리 시세 버스 (설정 시 웹소켓/캔들 조회 대신 버스에서 읽음)
+        self.candle_reader = None
+        if MARKET_DATA_BUS:
+            try:
+                self.candle_reader = MarketDataReader(MARKET_DATA_BUS)
+                logging.info(f"시세 버스 연결: {MARKET_DATA_BUS}")
+            except Exception as e:
+                logging.warning(f"시세 버스 연결 실패, 거래소에 직접 연결합니다: {str(e)}")
             
         # 알림 서비스 초기화
         try:
@@ -67,9 +173,30 @@ class AutoTrade:
             logging.warning(f"알림 서비스 초기화 실패: {str(e)}")
             self.notification = None
             
+        # 신호마다 반복되는 경고(매수 불가 등)는 종목별로 LOG_THROTTLE_INTERVAL초에 한 번만 기록
+        self.log_limiter = LogLimiter()
+        
         # PerformanceAnalyzer 추가
-        self.performance_analyzer = PerformanceAnalyzer(self.tickers)
-        self.last_report_check = time.time()
+        self.performance_analyzer = self.create_performance_analyzer()
+        self.last_report_check = self.clock()
+        
+        # 시세 피드 기록 (설정 시 수신한 원본 메시지와 캔들 조회 결과를 파일로 저장)
+        self.recorder = FeedRecorder(FEED_RECORD_DIR) if FEED_RECORD_DIR else None
+        
+        # 단계별 지연/큐 깊이 계측 (start()에서 설정된 경우 Prometheus 형식으로 내보냄)
+        self.performance_monitor = performance_monitor
+        instrument_rest_api(self.performance_monitor)
+        self.performance_monitor.set_gauge('feed_queue_depth', self.feed_queue_depth)
+        self.performance_monitor.set_gauge('warmup_queue_depth', self.warmup_queue_depth)
+        if self.recorder:
+            self.performance_monitor.set_gauge('recorder_queue_depth', self.recorder.chunks.qsize)
+        for kind in self.stream_handlers:
+            self.performance_monitor.set_gauge(
+                f'{kind}_messages', lambda kind=kind: sum(s.messages for s in self.streams if s.kind == kind)
+            )
+        self.metrics_port = METRICS_PORT
+        self.metrics_file = METRICS_FILE
+        self.metrics_exporter = None
         
         # 잔고 관리 변수 추가
         self.coin_balance = {ticker: 0 for ticker in self.tickers}  # 각 코인별 보 수량
@@ -81,25 +208,39 @@ class AutoTrade:
             f"- 코인당 최대 투자: {self.max_per_coin:,}원\n"
             f"- 최소 거래금액: {self.min_trading_amount:,}원\n"
             f"- 손절라인: {self.stop_loss*100}%\n"
+            f"- 전략: {', '.join(f'{s.name}({s.allocation:.0%})' for s in self.strategies)}\n"
             f"- 거래 대상: {', '.join(self.tickers)}"
         )
         
         self.running = False
         self.wm = None
         
-        # 캔들 분석기 초기화
-        self.candle_analyzers = {
-            ticker: DataAnalyzer(ticker) for ticker in self.tickers
-        }
-        
         self.averaging_down_used = {}  # 물타기 사용 여부 추적
         for ticker in self.tickers:
             self.averaging_down_used[ticker] = False
+        
+        # 재시작용 상태 스냅숏 (있으면 포지션과 캔들/지표를 복원해 바로 매매 시작)
+        self.candle_fetched_at = {}  # 종목 -> 보유 캔들을 조회한 시각 (데이터 갱신 시 이후 캔들만 조회)
+        self.restored_tickers = []
+        self.snapshot_store = self.create_snapshot_store()
+        self.last_snapshot_time = self.clock()
+        if self.snapshot_store:
+            self.restore_snapshot()
     
     def stop(self):
-        """트레이딩 중지"""
+        """트레이딩 중지 (상태 스냅숏, 저장 대기 중인 기록과 로그를 모두 쓴 뒤 프로세스 종료)"""
         try:
             self.running = False
+            if self.snapshot_store:
+                self.save_snapshot(wait=True)
+            self.warmup_executor.shutdown(wait=False, cancel_futures=True)
+            for stream in self.streams:
+                stream.stop()
+            if self.recorder:
+                self.recorder.close()
+            self.performance_analyzer.close()  # 저장 대기 중인 거래 기록
+            if self.metrics_exporter:
+                self.metrics_exporter.stop()
             if self.wm:
                 try:
                     self.wm.terminate()
@@ -119,97 +260,57 @@ class AutoTrade:
         except Exception as e:
             logging.error(f"트레이딩 중지 중 오류 발생: {str(e)}")
         finally:
-            # 프로그램 강제 종료
+            # 프로그램 강제 종료 (atexit가 실행되지 않으므로 큐에 남은 로그를 먼저 기록)
             import os
+            stop_logging()
             os._exit(0)
     
     @send_error_alert
     def start(self):
         """자동매매 시작"""
         self.running = True
-        
+        if self.metrics_port or self.metrics_file:
+            self.metrics_exporter = MetricsExporter(
+                self.performance_monitor, port=self.metrics_port, path=self.metrics_file,
+                interval=METRICS_INTERVAL
+            ).start()
+        if self.recorder:
+            self.recorder.record_session({
+                'tickers': self.tickers, 'strategies': STRATEGIES, 'start_cash': self.start_cash
+            })
+        self.start_streams()
+
         while self.running:
             try:
                 if self.wm is not None:
                     self.wm.terminate()
-                self.wm = pyupbit.WebSocketManager("ticker", self.tickers)
+                self.wm = self.create_feed()
                 
-                # 초기 데이터 가져오기
-                for ticker in self.tickers:
-                    self.analyzers[ticker].fetch_data()
-                    self.analyzers[ticker].calculate_indicators()
+                # 초기 데이터 가져오기 (준비된 종목부터 매매 시작)
+                pending = [
+                    ticker for ticker in self.tickers
+                    if self.warmup_status.get(ticker) not in ('loading', 'ready')
+                ]
+                if pending:
+                    self.warm_up(pending)
+                # 스냅숏에서 복원한 종목은 매매를 계속하면서 이후 캔들만 조회
+                if self.restored_tickers:
+                    self.warm_up(self.restored_tickers, refresh=True)
+                    self.restored_tickers = []
                 
                 while self.running:
                     data = self.wm.get()
-                    if data is None:
+                    if data is None or data == 'ConnectionClosedError':  # pyupbit는 연결이 끊기면 문자열을 넣음
+                        self.performance_monitor.log_websocket_disconnect()
                         raise Exception("WebSocket 연결 끊김")
+                    received = time.perf_counter()
                     
-                    current_time = time.time()
-                    
-                    # 리포트 시간 체크 (30초마다)
-                    if current_time - self.last_report_check > REPORT_CHECK_INTERVAL:
-                        try:
-                            if self.performance_analyzer.check_daily_report_time():
-                                report = self.performance_analyzer.generate_daily_report()
-                                logging.info(f"일일 리포트 생성:\n{report}")
-                                
-                                if self.notification:
-                                    self.notification.send_message('reports', f"📊 일일 거래 리포트\n{report}")
-                                
-                                # 7일 이상 된 데이터 정리
-                                self.performance_analyzer.clear_old_data()
-                                
-                        except Exception as e:
-                            logging.error(f"리포트 생성 중 오류: {str(e)}")
-                            if self.notification:
-                                self.notification.send_error_alert(f"리포트 생성 실패: {str(e)}")
-                        
-                        self.last_report_check = current_time
+                    # 원본 메시지 기록 (버퍼에 추가만 하고 압축/저장은 별도 스레드)
+                    if self.recorder:
+                        self.recorder.record(data)
                     
-                    # 주기적 데이터 업데이트
-                    if current_time - self.last_data_update > DATA_UPDATE_INTERVAL:
-                        for ticker in self.tickers:
-                            try:
-                                self.analyzers[ticker].fetch_data()
-                                self.analyzers[ticker].calculate_indicators()
-                            except Exception as e:
-                                logging.error(f"{ticker} 데이터 업데이트 실패: {str(e)}")
-                        self.last_data_update = current_time
-                        logging.info("지표 데이터 업데이트 완료")
-                    
-                    # WebSocket 데이터 처리
-                    ticker = data.get('code')
-                    current_price = float(data.get('trade_price', 0))
-                    
-                    if not ticker or current_price <= 0:
-                        continue
-                        
-                    # 현재가 캐시 업데이트
-                    self.price_cache[ticker].append(current_price)
-                    
-                    # 상태 체크 (5분 간격)
-                    if current_time - self.last_status_time > STATUS_INTERVAL:
-                        self.log_status()
-                        self.last_status_time = current_time
-                    
-                    # 매매 신호 확인
-                    if ticker in self.analyzers:
-                        analysis = self.analyzers[ticker].analyze()
-                        
-                        # 매수 신호 (보유하지 않은 경우만)
-                        if analysis['action'] == "BUY" and not self.buy_yn[ticker]:
-                            self.buy_coin(ticker, current_price, 
-                                        reason=analysis['reason'],
-                                        target_price=analysis['target_price'])
-                        
-                        # 매도 신호 (보유 중인 경우만)
-                        elif analysis['action'] == "SELL" and self.buy_yn[ticker]:
-                            logging.info(
-                                f"[{ticker}] SELL 신호 발생\n"
-                                f"이유: {analysis['reason']}\n"
-                                f"현재가: {current_price:,} → 목표가: {analysis.get('target_price', '없음')}"
-                            )
-                            self.sell_coin(ticker, current_price)
+                    self.handle_feed_message(data)
+                    self.performance_monitor.observe('feed_to_decision', time.perf_counter() - received)
                 
             except Exception as e:
                 logging.error(f"메인 루프 에러 발생: {str(e)}")
@@ -219,6 +320,399 @@ class AutoTrade:
                 if self.running:
                     time.sleep(1)
 
+    def start_streams(self):
+        """보조 웹소켓 구독 시작 (ticker 구독과 별도 프로세스/스레드, 수신 메시지도 피드 기록에 포함)"""
+        for kind, handler in self.stream_handlers.items():
+            self.streams.append(WebSocketStream(kind, self.tickers, handler, self.recorder).start())
+            logging.info(f"{kind} 구독 시작: {len(self.tickers)}개 종목")
+
+    def handle_feed_message(self, data):
+        """실시간 시세 메시지 하나 처리 (주기 작업 확인 후 매매 신호 확인)"""
+        # 기록 재생 시 함께 기록된 호가/체결 등 보조 구독 메시지
+        handler = self.stream_handlers.get(data.get('type'))
+        if handler is not None:
+            handler(data)
+            return
+        
+        current_time = self.clock()
+        
+        # 리포트 시간 체크 (30초마다)
+        if current_time - self.last_report_check > REPORT_CHECK_INTERVAL:
+            send_scheduled_reports(self.performance_analyzer, self.notification)
+            self.last_report_check = current_time
+            
+            # 성능 모니터링 리포트 (1시간 간격)
+            if self.performance_monitor.should_report():
+                logging.info(self.performance_monitor.generate_report())
+        
+        # 주기적 데이터 업데이트 (백그라운드에서 병렬 조회)
+        if current_time - self.last_data_update > DATA_UPDATE_INTERVAL:
+            self.warm_up(self.tickers, refresh=True)
+            self.last_data_update = current_time
+        
+        # WebSocket 데이터 처리
+        ticker = data.get('code')
+        current_price = float(data.get('trade_price', 0))
+        
+        if not ticker or current_price <= 0 or ticker not in self.analyzers:
+            return
+        
+        # 시세 지연 (거래소 메시지 시각 ms -> 처리 시각)
+        exchange_time = data.get('timestamp')
+        if exchange_time:
+            self.performance_monitor.record_feed_lag(ticker, current_time - exchange_time / 1000)
+            
+        # 현재가 캐시 업데이트
+        self.price_cache[ticker].append(current_price)
+        
+        # 상관계수 갱신 (거래소 시각 기준 1분 구간이 바뀔 때만 전체 종목 공분산 갱신)
+        if self.correlation is not None and exchange_time:
+            self.correlation.observe(ticker, current_price, exchange_time)
+        
+        # 보유 종목 평가 가격 기록 (1분 간격)
+        if current_time - self.last_mark_time > MARK_INTERVAL:
+            self.record_marks()
+            self.last_mark_time = current_time
+        
+        # 상태 스냅숏 (1분 간격, 파일 쓰기는 백그라운드)
+        if self.snapshot_store and current_time - self.last_snapshot_time > SNAPSHOT_INTERVAL:
+            self.save_snapshot()
+        
+        # 상태 체크 (5분 간격)
+        if current_time - self.last_status_time > STATUS_INTERVAL:
+            self.log_status()
+            self.last_status_time = current_time
+        
+        # 매매 신호 확인 (워밍업 완료 종목만)
+        if self.is_ready(ticker):
+            self.run_strategies(ticker, current_price)
+
+    def record_marks(self):
+        """보유 종목의 마지막 현재가를 거래 기록 저널에 기록 (리포트의 평가금액 곡선용)"""
+        self.performance_analyzer.record_marks({
+            ticker: self.price_cache[ticker][-1]
+            for ticker in self.tickers if self.buy_yn.get(ticker) and self.price_cache[ticker]
+        })
+
+    def run_strategies(self, ticker, current_price):
+        """공유 분석기 상태로 전략별 신호를 확인하고 매매"""
+        analyzer = self.analyzers[ticker]
+        for strategy in self.strategies:
+            # 거래소 잔고는 종목당 하나이므로 보유 포지션은 포지션을 연 전략만 관리
+            owner = self.position_owner.get(ticker)
+            if owner and owner != strategy.name:
+                continue
+            
+            started = time.perf_counter()
+            analysis = strategy.analyze(analyzer)
+            self.performance_monitor.observe('analyze', time.perf_counter() - started, strategy=strategy.name)
+            
+            # 매수 신호 (보유하지 않은 경우만)
+            if analysis['action'] == "BUY" and not self.buy_yn[ticker]:
+                self.buy_coin(ticker, current_price, 
+                            reason=analysis['reason'],
+                            target_price=analysis['target_price'],
+                            strategy=strategy)
+            
+            # 매도 신호 (보유 중인 경우만)
+            elif analysis['action'] == "SELL" and self.buy_yn[ticker]:
+                log_event(
+                    logging.INFO, "매도 신호", ticker=ticker, strategy=strategy.name,
+                    reason=analysis['reason'], price=current_price, target=analysis.get('target_price')
+                )
+                self.sell_coin(ticker, current_price, reason=analysis['reason'])
+
+    def warm_up(self, tickers, refresh=False):
+        """
+        분석기 병렬 워밍업 (백그라운드 실행)
+        :param tickers: 워밍업할 종목 목록
+        :param refresh: True면 기존 준비 상태를 유지한 채 데이터만 갱신
+
+        이전 조회가 아직 끝나지 않은 종목은 건너뛴다. 조회 요청이 실행기 큐에 쌓이지 않고,
+        한 종목의 캔들을 두 수집 스레드가 순서가 뒤바뀐 채 반영하지 않는다.
+        """
+        futures = {}
+        with self.warmup_lock:
+            in_flight = 0
+            for ticker in tickers:
+                if ticker not in self.analyzers:
+                    continue
+                if ticker in self.warmup_in_flight:
+                    in_flight += 1
+                    continue
+                if not refresh:
+                    self.warmup_status[ticker] = 'loading'
+                requested = self.clock()
+                future = self.warmup_executor.submit(self.fetch_candles, ticker, self.candle_delta_count(ticker))
+                futures[future] = (ticker, requested)
+                self.warmup_in_flight.add(ticker)
+        
+        if in_flight:
+            logging.info(f"이전 조회가 끝나지 않아 {'데이터 갱신' if refresh else '워밍업'} 생략: {in_flight}개 종목")
+        if not futures:
+            return
+        
+        logging.info(f"{'데이터 갱신' if refresh else '워밍업'} 시작: {len(futures)}개 종목")
+        threading.Thread(
+            target=self._collect_warm_up,
+            args=(futures, refresh),
+            name="warmup-collector",
+            daemon=True
+        ).start()
+
+    def create_feed(self):
+        """실시간 시세 피드 생성 (시세 버스가 연결되어 있으면 버스 구독)"""
+        if self.candle_reader is not None:
+            return MarketDataReader(MARKET_DATA_BUS)
+        return pyupbit.WebSocketManager("ticker", self.tickers)
+
+    def create_correlation(self):
+        """종목 간 수익률 상관계수 (MAX_CORRELATION 설정 시)"""
+        return ReturnCorrelation(self.tickers, CORRELATION_HALFLIFE, CORRELATION_MIN_PERIODS)
+
+    def create_performance_analyzer(self):
+        """거래 기록/리포트용 분석기 (거래 기록 저널 파일 사용)"""
+        return PerformanceAnalyzer(self.tickers, start_cash=self.start_cash)
+
+    def create_snapshot_store(self):
+        """재시작용 상태 스냅숏 저장소 (config.SNAPSHOT_PATH가 None이면 사용 안 함)"""
+        return SnapshotStore(SNAPSHOT_PATH) if SNAPSHOT_PATH else None
+
+    # 스냅숏에 저장하는 종목별 매매 상태
+    SNAPSHOT_TICKER_STATE = (
+        'buy_yn', 'buy_price', 'coin_balance', 'coin_avg_price', 'total_profit', 'averaging_down_used'
+    )
+
+    def save_snapshot(self, wait=False):
+        """
+        매매 상태와 캔들/지표 스냅숏 저장 (상태 복사와 배열 참조만 모으고 쓰기는 백그라운드)
+        :param wait: True면 파일 교체까지 대기 (종료 시)
+        """
+        self.last_snapshot_time = self.clock()
+        state = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': self.clock(),
+            'real_trading': self.real_trading,
+            'tickers': list(self.tickers),
+            'current_cash': self.current_cash,
+            'strategy_cash': dict(self.strategy_cash),
+            'position_owner': dict(self.position_owner),
+            'last_signal_time': {strategy.name: dict(strategy.last_signal_time) for strategy in self.strategies},
+            'last_price': {
+                ticker: self.price_cache[ticker][-1] for ticker, held in self.buy_yn.items()
+                if held and self.price_cache[ticker]
+            },
+            'candle_fetched_at': dict(self.candle_fetched_at),
+            **{name: dict(getattr(self, name)) for name in self.SNAPSHOT_TICKER_STATE}
+        }
+        # 캔들/피처 배열은 교체만 되고 제자리에서 수정되지 않으므로 참조만 넘김
+        analyzers = {}
+        for ticker, analyzer in list(self.analyzers.items()):
+            if not self.is_ready(ticker) or analyzer.empty:
+                continue
+            analyzers[ticker] = (analyzer.timestamps, analyzer.ohlcv, dict(analyzer.features))
+            # 상위 시간 프레임 봉은 1분봉 보유 구간보다 길게 유지되므로 따로 저장 ("종목|시간 프레임", 복사본)
+            for name, (series, _) in list(analyzer.timeframes.items()):
+                analyzers[f"{ticker}|{name}"] = (*series.arrays(), {})
+        self.snapshot_store.save(state, analyzers, wait=wait)
+
+    def restore_snapshot(self):
+        """
+        스냅숏에서 매매 상태와 캔들/지표 복원
+        - 포지션/전략 잔액/신호 쿨다운은 항상 복원 (실거래 여부가 다르면 제외)
+        - 캔들/지표는 SNAPSHOT_MAX_AGE초 이내인 경우만 복원하고 바로 매매 가능 상태로 전환
+        """
+        started = time.perf_counter()
+        loaded = self.snapshot_store.load()
+        if loaded is None:
+            return
+        state, analyzers = loaded
+        age = self.clock() - state['saved_at']
+
+        if state['real_trading'] == self.real_trading:
+            for name in self.SNAPSHOT_TICKER_STATE:
+                getattr(self, name).update(state[name])
+            held = [ticker for ticker, value in state['buy_yn'].items() if value]
+            # 감시 대상에서 빠진 보유 종목도 시세 구독/워밍업/보유 수 계산에 포함해야 익절/손절이 동작함
+            unwatched = [ticker for ticker in held if ticker not in self.analyzers]
+            if unwatched:
+                logging.warning(f"감시 대상이 아닌 보유 종목을 감시 대상에 추가: {', '.join(unwatched)}")
+                for ticker in unwatched:
+                    self.tickers.append(ticker)
+                    self.create_analyzer(ticker)
+            for ticker, price in state['last_price'].items():
+                self.price_cache[ticker].append(price)
+            self.position_owner.update(state['position_owner'])
+            for name, cash in state['strategy_cash'].items():
+                if name in self.strategy_cash:
+                    self.strategy_cash[name] = cash
+            for strategy in self.strategies:
+                strategy.last_signal_time.update(state['last_signal_time'].get(strategy.name, {}))
+            if not self.real_trading:  # 실거래 현금은 거래소 잔고 기준
+                self.current_cash = state['current_cash']
+        else:
+            held = []
+            logging.warning("스냅숏과 실거래 여부가 달라 매매 상태는 복원하지 않습니다")
+
+        restored = []
+        if age <= SNAPSHOT_MAX_AGE:
+            for ticker, (timestamps, ohlcv, features) in analyzers.items():
+                analyzer = self.analyzers.get(ticker)  # 상위 시간 프레임 항목("종목|시간 프레임")도 여기서 제외
+                if analyzer is None:
+                    continue
+                analyzer.load_candles(timestamps, ohlcv)
+                if all(key in features for key in analyzer.required_features if key[0] not in OHLCV_INDEX):
+                    analyzer.features = {
+                        key: np.asarray(values, dtype=analyzer.indicator_dtype) for key, values in features.items()
+                    }
+                else:  # 전략 설정이 바뀌어 필요한 피처가 없으면 다시 계산
+                    analyzer.calculate_indicators()
+                for name in analyzer.timeframes:
+                    frame = analyzers.get(f"{ticker}|{name}")
+                    if frame is not None:
+                        analyzer.restore_timeframe(name, frame[0], frame[1])
+                self.candle_fetched_at[ticker] = state['candle_fetched_at'].get(ticker, state['saved_at'])
+                restored.append(ticker)
+            with self.warmup_lock:
+                for ticker in restored:
+                    self.warmup_status[ticker] = 'ready'
+        self.restored_tickers = restored
+
+        logging.info(
+            f"스냅숏 복원 ({(time.perf_counter() - started) * 1000:.0f}ms, {age:.0f}초 전 저장)\n"
+            f"- 보유 종목: {', '.join(held) if held else '없음'}\n"
+            f"- 캔들/지표 복원: {len(restored)}개 종목"
+            + ("" if age <= SNAPSHOT_MAX_AGE else " (스냅숏이 오래되어 새로 워밍업)")
+        )
+
+    def create_analyzer(self, ticker):
+        """감시 종목 분석기 추가 (호가/체결 구독 상태 연결)"""
+        analyzer = self.analyzers[ticker] = DataAnalyzer(ticker, strategies=self.strategies)
+        analyzer.orderbook = self.orderbook
+        analyzer.trades = self.trade_flow
+        return analyzer
+
+    def feed_queue_depth(self):
+        """웹소켓 프로세스가 받아 두고 아직 처리하지 못한 메시지 수"""
+        queue = getattr(self.wm, '_WebSocketManager__q', None)  # pyupbit 내부 multiprocessing.Queue
+        if queue is None:
+            return 0
+        try:
+            return queue.qsize()
+        except NotImplementedError:  # macOS는 qsize 미지원
+            return 0
+
+    def warmup_queue_depth(self):
+        """캔들 조회를 요청했지만 아직 반영하지 못한 종목 수 (요청 시 추가, 수집 스레드가 반영 후 제거)"""
+        return len(self.warmup_in_flight)
+
+    def candle_delta_count(self, ticker):
+        """보유 캔들 이후로 조회할 캔들 수 (조회 시점의 진행 중 캔들을 다시 받도록 여유를 둠)"""
+        fetched_at = self.candle_fetched_at.get(ticker)
+        analyzer = self.analyzers.get(ticker)
+        if fetched_at is None or analyzer is None or analyzer.empty:
+            return self.warmup_candle_count
+        return min(CANDLE_COUNT, int((self.clock() - fetched_at) // 60) + 2)
+
+    def fetch_candles(self, ticker, count=CANDLE_COUNT):
+        """분석용 캔들 조회 (시세 버스에 캔들이 충분하면 거래소 조회 생략)"""
+        if self.candle_reader is not None:
+            candles = self.candle_reader.candles(ticker, count)
+            if candles is not None and len(candles[0]) >= count:
+                return candles
+        return self.analyzers[ticker].fetch_data(count=count, store=False)
+
+    def _collect_warm_up(self, futures, refresh):
+        """조회가 끝난 종목부터 지표 계산 후 준비 상태로 전환"""
+        started = time.time()
+        completed = 0
+        failed = []
+        
+        for future in as_completed(futures):
+            ticker, requested = futures[future]
+            completed += 1
+            try:
+                candles = future.result()
+                analyzer = self.analyzers.get(ticker)
+                if analyzer is None:  # 워밍업 중 감시 대상에서 제외된 종목
+                    continue
+                if candles is None:
+                    raise Exception("캔들 데이터 없음")
+                if not analyzer.empty:  # 이후 캔들만 조회한 경우 보유 캔들 뒤에 이어 붙임
+                    candles = merge_candles((analyzer.timestamps, analyzer.ohlcv), candles, CANDLE_COUNT)
+                self.candle_fetched_at[ticker] = requested
+                if self.recorder:
+                    self.recorder.record_candles(ticker, candles)
+                self.load_analyzer_candles(analyzer, candles)
+                with self.warmup_lock:
+                    self.warmup_status[ticker] = 'ready'
+                if not refresh:
+                    logging.info(f"워밍업 완료 ({completed}/{len(futures)}): {ticker}")
+            except Exception as e:
+                failed.append(ticker)
+                with self.warmup_lock:
+                    if not refresh or self.warmup_status.get(ticker) != 'ready':
+                        self.warmup_status[ticker] = 'failed'
+                logging.error(f"{ticker} 데이터 {'갱신' if refresh else '워밍업'} 실패: {str(e)}")
+            finally:
+                with self.warmup_lock:
+                    self.warmup_in_flight.discard(ticker)
+        
+        self.seed_correlation()
+        
+        elapsed = time.time() - started
+        logging.info(
+            f"{'데이터 갱신' if refresh else '워밍업'} 종료 ({elapsed:.1f}초)\n"
+            f"- 준비 완료: {len(futures) - len(failed)}개\n"
+            f"- 실패: {', '.join(failed) if failed else '없음'}"
+        )
+
+    def load_analyzer_candles(self, analyzer, candles):
+        """
+        조회한 캔들로 분석기 갱신
+        상위 시간 프레임용으로 더 조회한 1분봉(첫 워밍업)은 상위 봉에만 반영하고 지표는 최근 CANDLE_COUNT개로 계산
+        """
+        if len(candles[0]) > CANDLE_COUNT:
+            analyzer.extend_timeframes(candles)
+            candles = (candles[0][-CANDLE_COUNT:], np.ascontiguousarray(candles[1][:, -CANDLE_COUNT:]))
+        analyzer.calculate_indicators(candles)
+
+    def seed_correlation(self):
+        """실시간으로 반영한 수익률이 부족한 종목이 있으면 보유 1분봉으로 상관계수 초기값 채우기"""
+        if self.correlation is None or self.correlation.ready:
+            return
+        candles = {}
+        for ticker, analyzer in list(self.analyzers.items()):
+            timestamps, ohlcv = analyzer.timestamps, analyzer.ohlcv
+            if len(timestamps) and len(timestamps) == ohlcv.shape[1]:
+                candles[ticker] = (timestamps, ohlcv[OHLCV_INDEX['close']])
+        self.correlation.seed(candles, CANDLE_COUNT)
+
+    def correlated_holding(self, ticker):
+        """
+        ticker와 상관계수가 MAX_CORRELATION 이상인 보유 종목
+        :return: (보유 종목, 상관계수), 없거나 상관계수를 아직 모르면 None
+        """
+        if self.correlation is None:
+            return None
+        holdings = [held for held, bought in self.buy_yn.items() if bought and held != ticker]
+        if not holdings:
+            return None
+        correlations = self.correlation.correlation(ticker, holdings)
+        if not correlations:
+            return None
+        held, value = max(correlations.items(), key=lambda item: item[1])
+        return (held, value) if value >= MAX_CORRELATION else None
+
+    def is_ready(self, ticker):
+        """워밍업 완료 여부"""
+        return self.warmup_status.get(ticker) == 'ready'
+
+    def get_warmup_status(self):
+        """종목별 워밍업 상태 반환"""
+        with self.warmup_lock:
+            return dict(self.warmup_status)
+
     def get_balance(self, currency="KRW"):
         """잔액 조회"""
         try:
@@ -238,50 +732,70 @@ class AutoTrade:
             return 0
 
     @send_error_alert
-    def buy_coin(self, ticker, current_price, reason=None, target_price=None, amount=None):
-        """코인 매수"""
+    def buy_coin(self, ticker, current_price, reason=None, target_price=None, amount=None, strategy=None):
+        """
+        코인 매수
+        :param strategy: 매수 신호를 낸 전략 (기본값: 보유 포지션의 전략 또는 첫 번째 전략)
+        """
         try:
+            if strategy is None:
+                strategy = self.strategy_map.get(self.position_owner.get(ticker), self.strategies[0])
+            
             # 이미 보유 중인 경우 물타기만 허용
-            if self.buy_yn[ticker]:
-                if not amount:  # 일반 매수인 경우
-                    logging.warning(f"{ticker} 이미 보유 중")
-                    return False
-            else:
-                # 새로운 코인 매수 시 실질적 보유 코인 수 체크
-                current_holdings = self.get_significant_holdings_count()
-                if current_holdings >= MAX_COINS_AT_ONCE:
-                    logging.warning(f"최대 보유 코인 수({MAX_COINS_AT_ONCE}개) 도달, 매수 불가")
-                    return False
+            if self.buy_yn[ticker] and not amount:  # 일반 매수인 경우
+                self.log_limiter.log(logging.WARNING, ('holding', ticker), "%s 이미 보유 중", ticker)
+                return False
             
-            # 매수 금액 결정
-            if amount:  # 물타기용 지정 금액
-                buy_amount = amount
-            else:  # 일반 매수
-                balance = self.get_balance("KRW")
-                buy_amount = min(self.max_per_coin, balance)
+            # 시세가 늦게 도착하는 중이면 신규 진입 보류 (오래된 가격으로 매수하지 않음)
+            feed_lag = self.performance_monitor.feed_lag
+            if not self.buy_yn[ticker] and not feed_lag.entry_allowed(ticker):
+                self.log_limiter.log(
+                    logging.WARNING, ('feed_lag', ticker), "%s 시세 지연으로 신규 매수 보류", ticker,
+                    lag=round(feed_lag.latest[ticker], 3), max_lag=feed_lag.max_lag
+                )
+                return False
             
-            if buy_amount < MIN_TRADING_AMOUNT:
-                logging.warning(f"잔액 부족 - 현재 잔액: {balance:,}원")
+            # 보유 종목과 함께 움직이는 종목은 신규 매수 보류 (분산 효과 없음)
+            correlated = None if self.buy_yn[ticker] else self.correlated_holding(ticker)
+            if correlated:
+                self.log_limiter.log(
+                    logging.WARNING, ('correlation', ticker), "%s 보유 종목과 상관관계가 높아 신규 매수 보류", ticker,
+                    holding=correlated[0], correlation=round(correlated[1], 3), max_correlation=MAX_CORRELATION
+                )
+                return False
+            
+            # 매수 가능 여부 확인 및 매수 금액 결정
+            buy_amount = self.reserve_buy(ticker, strategy, amount)
+            if buy_amount is None:
                 return False
             
             # 매수 수량 계산
             quantity = buy_amount / current_price
             
             success = False
-            if self.real_trading:
-                response = self.upbit.buy_market_order(ticker, buy_amount)
-                if not response:
-                    logging.error(f"{ticker} 매수 주문 실패")
-                    return False
-                # 실제 체결된 수량 확인
-                actual_quantity = float(self.upbit.get_balance(ticker))
-                actual_price = buy_amount / actual_quantity if actual_quantity > 0 else current_price
-                success = actual_quantity > 0
-            else:
-                self.current_cash -= buy_amount
-                actual_quantity = quantity
-                actual_price = current_price
-                success = True
+            fee = 0.0
+            try:
+                if self.real_trading:
+                    with self.performance_monitor.timer('order', side='buy'):
+                        response = self.upbit.buy_market_order(ticker, buy_amount)
+                    if not response:
+                        logging.error(f"{ticker} 매수 주문 실패")
+                        return False
+                    # 실제 체결된 수량 확인
+                    actual_quantity = float(self.upbit.get_balance(ticker))
+                    actual_price = buy_amount / actual_quantity if actual_quantity > 0 else current_price
+                    success = actual_quantity > 0
+                    fee = self.order_fee(response, buy_amount)
+                else:
+                    # 거래소와 같이 수수료는 매수 금액과 별도로 현금에서 차감 (거래 기록/평가금액 곡선과 일치)
+                    fee = self.order_fee(None, buy_amount)
+                    self.current_cash -= buy_amount + fee
+                    actual_quantity = quantity
+                    actual_price = current_price
+                    success = True
+            finally:
+                # 체결 실패 시 예약한 금액은 되돌림 (수수료는 전략 배분 자금에서 함께 차감)
+                self.settle_buy(ticker, strategy, buy_amount, buy_amount + fee if success else 0)
             
             if success:
                 # 보유 정보 업데이트
@@ -289,6 +803,7 @@ class AutoTrade:
                 self.coin_avg_price[ticker] = actual_price
                 self.buy_yn[ticker] = True
                 self.buy_price[ticker] = actual_price
+                self.position_owner[ticker] = strategy.name
                 
                 # 매수 성공 메시지
                 message = (
@@ -297,6 +812,7 @@ class AutoTrade:
                     f"매수금액: {buy_amount:,}원\n"
                     f"매수수량: {actual_quantity:.8f}\n"
                     f"매수이유: {reason}\n"
+                    f"전략: {strategy.name}\n"
                     f"잔액: {self.get_balance('KRW'):,}원"
                 )
                 
@@ -310,9 +826,13 @@ class AutoTrade:
                     'price': actual_price,
                     'amount': buy_amount,
                     'quantity': actual_quantity,
-                    'reason': reason
+                    'fee': fee,
+                    'reason': reason,
+                    'strategy': strategy.name
                 }
                 self.performance_analyzer.add_trade(ticker, trade_info)
+                if self.snapshot_store:  # 체결 직후 포지션 저장
+                    self.save_snapshot()
                 
                 return True
             
@@ -325,8 +845,68 @@ class AutoTrade:
                 self.notification.send_error_alert(error_msg)
             return False
 
+    def reserve_buy(self, ticker, strategy, amount=None):
+        """
+        매수 가능 여부(최대 보유 코인 수, 잔액, 코인당 투자 한도) 확인 후 매수 금액 결정
+        :param amount: 물타기용 지정 금액
+        :return: 매수 금액, 매수 불가 시 None
+        """
+        if not self.buy_yn[ticker]:
+            # 새로운 코인 매수 시 실질적 보유 코인 수 체크
+            current_holdings = self.get_significant_holdings_count()
+            if current_holdings >= MAX_COINS_AT_ONCE:
+                self.log_limiter.log(
+                    logging.WARNING, ('max_coins', ticker), "최대 보유 코인 수(%d개) 도달, 매수 불가",
+                    MAX_COINS_AT_ONCE, ticker=ticker
+                )
+                return None
+        
+        balance = self.get_balance("KRW")
+        if amount:  # 물타기용 지정 금액
+            buy_amount = amount
+        else:  # 일반 매수 (전략 배분 자금 한도 내)
+            max_per_coin = self.max_per_coin * strategy.allocation
+            # 수수료는 매수 금액과 별도로 빠지므로 잔액/배분 자금에서 수수료만큼 남겨 둠
+            buy_amount = min(max_per_coin, min(balance, self.strategy_cash[strategy.name]) / (1 + TRADING_FEE_RATE))
+        
+        if buy_amount < MIN_TRADING_AMOUNT:
+            self.log_limiter.log(
+                logging.WARNING, ('balance', ticker), "잔액 부족", ticker=ticker, balance=balance, amount=buy_amount
+            )
+            return None
+        return buy_amount
+
+    def settle_buy(self, ticker, strategy, reserved, spent):
+        """
+        매수 결과 반영
+        :param reserved: reserve_buy로 정한 금액
+        :param spent: 실제 매수 금액 (실패 시 0)
+        """
+        self.strategy_cash[strategy.name] -= spent
+
+    def settle_sell(self, ticker, owner, sell_amount):
+        """매도 금액을 포지션을 연 전략의 배분 자금으로 반환"""
+        if owner in self.strategy_cash:
+            self.strategy_cash[owner] += sell_amount
+
+    def order_fee(self, response, amount):
+        """
+        주문 수수료 (원)
+        실거래는 주문 응답의 paid_fee(체결 수수료), 없으면 reserved_fee(예약 수수료)를 쓰고,
+        응답에 수수료가 없거나 테스트 모드(response=None)면 거래 금액 x TRADING_FEE_RATE로 계산한다.
+        """
+        if isinstance(response, dict):
+            for key in ('paid_fee', 'reserved_fee'):
+                try:
+                    fee = float(response.get(key) or 0)
+                except (TypeError, ValueError):
+                    continue
+                if fee > 0:
+                    return fee
+        return amount * TRADING_FEE_RATE
+
     @send_error_alert
-    def sell_coin(self, ticker, current_price, stop_loss_triggered=False):
+    def sell_coin(self, ticker, current_price, stop_loss_triggered=False, reason=None):
         """코인 매도"""
         try:
             if not self.buy_yn[ticker]:
@@ -340,15 +920,19 @@ class AutoTrade:
             
             success = False
             if self.real_trading:
-                response = self.upbit.sell_market_order(ticker, quantity)
+                with self.performance_monitor.timer('order', side='sell'):
+                    response = self.upbit.sell_market_order(ticker, quantity)
                 if not response:
                     logging.error(f"{ticker} 매도 주문 실패")
                     return False
-                sell_amount = float(response['price'])
+                # 시장가 매도 응답에는 체결 금액(price)이 없으므로 현재가로 추정
+                sell_amount = float(response.get('price') or quantity * current_price)
+                fee = self.order_fee(response, sell_amount)
                 success = True
             else:
                 sell_amount = quantity * current_price
-                self.current_cash += sell_amount
+                fee = self.order_fee(None, sell_amount)
+                self.current_cash += sell_amount - fee
                 success = True
             
             if success:
@@ -366,6 +950,7 @@ class AutoTrade:
                     f"매도금액: {sell_amount:,}원\n"
                     f"수익률: {profit_rate:.2f}%\n"
                     f"수익금: {profit_amount:,}원\n"
+                    f"매도이유: {reason}\n"
                     f"잔액: {self.get_balance('KRW'):,}원"
                 )
                 
@@ -376,6 +961,10 @@ class AutoTrade:
                 # 누적 수익 업데이트
                 self.total_profit[ticker] += profit_amount
                 
+                # 수수료를 뺀 매도 금액을 포지션을 연 전략의 배분 자금으로 반환
+                owner = self.position_owner.pop(ticker, None)
+                self.settle_sell(ticker, owner, sell_amount - fee)
+                
                 # 보유 정보 초기화
                 self.coin_balance[ticker] = 0
                 self.coin_avg_price[ticker] = 0
@@ -388,11 +977,16 @@ class AutoTrade:
                     'price': current_price,
                     'amount': sell_amount,
                     'quantity': quantity,
+                    'fee': fee,
                     'profit': profit_rate,
                     'profit_amount': profit_amount,
-                    'stop_loss': stop_loss_triggered
+                    'stop_loss': stop_loss_triggered,
+                    'reason': reason,
+                    'strategy': owner
                 }
                 self.performance_analyzer.add_trade(ticker, trade_info)
+                if self.snapshot_store:  # 체결 직후 포지션 저장
+                    self.save_snapshot()
                 
                 # 매도 성공 시 물타기 사용 여부 초기화
                 self.averaging_down_used[ticker] = False
@@ -418,8 +1012,7 @@ class AutoTrade:
                 current_price = self.price_cache[ticker][-1]
                 
                 # 현재 전략 상태 확인
-                analysis_result = self.analyzers[ticker].analyze(-1)
-                strategy_status = analysis_result['strategy_status']
+                strategy_status = self.analyzers[ticker].get_strategy_status(-1)
                 
                 status_message = self.notification.format_status_message(
                     ticker,
@@ -462,9 +1055,8 @@ class AutoTrade:
                 quantity = self.get_balance(ticker)
                 current_value = quantity * current_price
                 
-                # 지표 분석 가져오기
-                analysis = self.analyzers[ticker].analyze()
-                strategy_status = analysis['strategy_status']
+                # 지표 상태 가져오기 (신호 쿨다운에 영향 없음)
+                strategy_status = self.analyzers[ticker].get_strategy_status()
                 
                 # 지표 정보 추가
                 indicators.append(
@@ -507,6 +1099,12 @@ class AutoTrade:
                 f"- 총 수익률: {total_profit_rate:.2f}%\n"
             )
             
+            # 전략별 배분 자금 (전략이 여러 개일 때만)
+            if len(self.strategies) > 1:
+                status_msg += f"\n🧠 전략별 잔여 배분금:\n" + "\n".join(
+                    f"- {name}: {cash:,.0f}원" for name, cash in self.strategy_cash.items()
+                ) + "\n"
+            
             if holdings:
                 status_msg += f"\n📈 보유 코인:\n" + "\n".join(holdings)
             else:
@@ -530,11 +1128,13 @@ class AutoTrade:
         try:
             new_tickers = get_top_tickers(10)
             MIN_PROFIT_TO_SELL = 0.01  # 매도 최소 수익률 1%
+            added_tickers = []
             
             # 새로운 종목 추가
             for ticker in new_tickers:
                 if ticker not in self.analyzers:
-                    self.analyzers[ticker] = DataAnalyzer(ticker)
+                    self.create_analyzer(ticker)
+                    added_tickers.append(ticker)
                     self.buy_yn[ticker] = False
                     self.buy_price[ticker] = 0
                     self.coin_balance[ticker] = 0
@@ -542,6 +1142,10 @@ class AutoTrade:
                     self.total_profit[ticker] = 0
                     logging.info(f"새로운 감시 종목 추가: {ticker}")
             
+            # 새 종목은 병렬 워밍업 (기존 종목 매매는 계속 진행)
+            if added_tickers:
+                self.warm_up(added_tickers)
+            
             # 제외된 종목 처리
             for ticker in list(self.analyzers.keys()):
                 if ticker not in new_tickers:
@@ -567,9 +1171,14 @@ class AutoTrade:
                         del self.coin_balance[ticker]
                         del self.coin_avg_price[ticker]
                         del self.total_profit[ticker]
+                        with self.warmup_lock:
+                            self.warmup_status.pop(ticker, None)
                         logging.info(f"감시 종목 제외: {ticker}")
             
-            self.tickers = new_tickers
+            # 감시 제외 후에도 보유 중인 종목은 익절/손절을 위해 계속 구독
+            self.tickers = list(dict.fromkeys(list(new_tickers) + list(self.analyzers)))
+            for stream in self.streams:
+                stream.set_tickers(self.tickers)
             logging.info(f"감시 종목 업데이트 완료: {', '.join(self.tickers)}")
             
         except Exception as e:
@@ -637,25 +1246,15 @@ class AutoTrade:
                     self.sell_coin(ticker, current_price, stop_loss_triggered=True)
                     return
             
-            # 보유 중이 아닐 때만 매수 신호 체크
+            # 보유 중이 아닐 때는 최대 보유 코인 수 먼저 확인
             if not self.buy_yn[ticker]:
                 # 실질적 보유 코인 수 체크
                 current_holdings = self.get_significant_holdings_count()
                 if current_holdings >= MAX_COINS_AT_ONCE:
                     return
                 
-                # 매수 신호 분석
-                analysis = self.analyzers[ticker].analyze()
-                if analysis['action'] == 'BUY':
-                    self.buy_coin(ticker, current_price, 
-                                reason=analysis['reason'],
-                                target_price=analysis['target_price'])
-            
-            # 보유 중인 경우 매도 신호 체크
-            elif self.buy_yn[ticker]:
-                analysis = self.analyzers[ticker].analyze()
-                if analysis['action'] == 'SELL':
-                    self.sell_coin(ticker, current_price, reason=analysis['reason'])
+            # 전략별 매수/매도 신호 체크
+            self.run_strategies(ticker, current_price)
                 
         except Exception as e:
             error_msg = f"시장 데이터 처리 중 오류 발생: {str(e)}"
@@ -0,0 +1,167 @@
+"""
+기록된 시세 피드 재생
+
+market_data.recorder로 기록한 세션을 실제 매매 루프(AutoTrade.handle_feed_message)에 그대로 흘려
+라이브 연결 없이 같은 상황을 재현한다. 항상 테스트 모드로 실행하며 알림은 보내지 않는다.
+- 전략 쿨다운과 주기 작업은 기록된 수신 시각 기준이라 배속과 무관하게 같은 거래가 나온다.
+- 캔들은 거래소에서 다시 조회하지 않고 기록된 캔들 스냅샷을 같은 시점에 적용한다.
+- 거래 목록을 JSON으로 저장해 두고 --expect로 비교하면 회귀 테스트가 된다.
+
+실행:
+python -m trading.replay recordings/ --speed 0 --trades-out trades.json
+python -m trading.replay recordings/ --speed 0 --expect trades.json
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+
+from config import START_CASH, STRATEGIES
+from services.performance_service import PerformanceAnalyzer
+from services.trade_journal import TradeJournal
+from trading.auto_trade import AutoTrade
+from market_data.recorder import FeedReplayer, decode_candles
+from utils.log import setup_logging
+
+class ReplayPerformanceAnalyzer(PerformanceAnalyzer):
+    """재생 중 발생한 거래를 순서대로 보관 (실거래 저널 대신 메모리 저널에 기록)"""
+
+    def __init__(self, tickers, clock, start_cash=None):
+        super().__init__(tickers, journal=TradeJournal(':memory:'), clock=clock, start_cash=start_cash)
+        self.trades = []
+
+    def add_trade(self, ticker, trade_info):
+        super().add_trade(ticker, trade_info)
+        self.trades.append({'time': self.clock(), 'ticker': ticker, **trade_info})
+
+class ReplayAutoTrade(AutoTrade):
+    """기록된 피드로 구동되는 AutoTrade (테스트 모드, 알림/기록/시세 버스 없음)"""
+
+    def __init__(self, replayer, start_cash=None, tickers=None):
+        """
+        :param start_cash: 시작 자금 (기본값: 기록된 세션 값, 없으면 config.START_CASH)
+        :param tickers: 거래 대상 종목 (기본값: 기록된 세션 종목)
+        """
+        self.replayer = replayer
+        session = replayer.session() or {}
+        if session.get('strategies') not in (None, json.loads(json.dumps(STRATEGIES))):
+            logging.warning("기록 당시와 현재 전략 설정이 다릅니다 (현재 설정으로 재생)")
+        super().__init__(
+            start_cash=start_cash or session.get('start_cash', START_CASH),
+            tickers=tickers or session.get('tickers'),
+            real_trading=False
+        )
+        self.notification = None
+        self.candle_reader = None
+        if self.recorder:  # 재생 중인 피드를 다시 기록하지 않음
+            self.recorder.close()
+            self.recorder = None
+
+        # 주기 작업과 전략 쿨다운을 기록된 수신 시각 기준으로 판단
+        self.clock = replayer.now
+        for strategy in self.strategies:
+            strategy.clock = replayer.now
+
+    def create_snapshot_store(self):
+        """재생은 실행 중인 봇의 스냅숏을 읽거나 덮어쓰지 않음"""
+        return None
+
+    def create_performance_analyzer(self):
+        return ReplayPerformanceAnalyzer(self.tickers, self.replayer.now, self.start_cash)
+
+    def warm_up(self, tickers, refresh=False):
+        """거래소 조회 대신 기록된 캔들 스냅샷을 사용하므로 아무것도 하지 않음"""
+
+    def apply_candles(self, ticker, candles):
+        analyzer = self.analyzers.get(ticker)
+        if analyzer is None:
+            return
+        self.load_analyzer_candles(analyzer, candles)
+        with self.warmup_lock:
+            self.warmup_status[ticker] = 'ready'
+        self.seed_correlation()
+
+    def run(self):
+        """
+        기록 끝까지 재생
+        :return: {'messages', 'elapsed', 'rate', 'trades'}
+        """
+        self.running = True
+        messages = 0
+        started = time.perf_counter()
+        first = True
+
+        for kind, payload in self.replayer:
+            if not self.running:
+                break
+            if first:  # 주기 작업 기준 시각을 기록 시작 시각으로 맞춤
+                self.last_status_time = self.last_data_update = self.last_report_check = self.last_mark_time = self.clock()
+                first = False
+            if kind == 'm':
+                self.handle_feed_message(payload)
+                messages += 1
+            elif kind == 'c':
+                self.apply_candles(*decode_candles(payload))
+
+        self.running = False
+        self.warmup_executor.shutdown(wait=False)
+        elapsed = time.perf_counter() - started
+        return {
+            'messages': messages,
+            'elapsed': elapsed,
+            'rate': messages / elapsed if elapsed > 0 else 0.0,
+            'trades': self.performance_analyzer.trades
+        }
+
+def compare_trades(expected, actual):
+    """기대 거래 목록과 비교 -> 차이 설명 목록 (같으면 빈 목록)"""
+    differences = []
+    if len(expected) != len(actual):
+        differences.append(f"거래 수: 기대 {len(expected)}회, 실제 {len(actual)}회")
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            changed = sorted(key for key in set(want) | set(got) if want.get(key) != got.get(key))
+            differences.append(
+                f"{index}번째 거래 ({want.get('ticker')} {want.get('type')}): "
+                + ", ".join(f"{key} {want.get(key)} -> {got.get(key)}" for key in changed)
+            )
+    return differences
+
+def main():
+    parser = argparse.ArgumentParser(description="기록된 시세 피드 재생")
+    parser.add_argument('paths', nargs='+', help="기록 파일 또는 디렉터리")
+    parser.add_argument('--speed', type=float, default=0, help="재생 배속 (1: 실시간, 0: 최대 속도)")
+    parser.add_argument('--cash', type=float, help="시작 자금 (기본값: 기록된 세션 값)")
+    parser.add_argument('--tickers', help="쉼표로 구분한 종목 코드 (기본값: 기록된 세션 종목)")
+    parser.add_argument('--trades-out', help="재생 중 발생한 거래를 저장할 JSON 파일")
+    parser.add_argument('--expect', help="기대 거래 JSON 파일 (다르면 종료 코드 1)")
+    args = parser.parse_args()
+    setup_logging()
+
+    replayer = FeedReplayer(args.paths, speed=args.speed)
+    trader = ReplayAutoTrade(
+        replayer,
+        start_cash=args.cash,
+        tickers=args.tickers.split(',') if args.tickers else None
+    )
+    result = trader.run()
+    print(
+        f"재생 완료: 메시지 {result['messages']:,}개, {result['elapsed']:.2f}초 "
+        f"({result['rate']:,.0f}개/초), 거래 {len(result['trades'])}회"
+    )
+
+    if args.trades_out:
+        with open(args.trades_out, 'w') as f:
+            json.dump(result['trades'], f, indent=2, ensure_ascii=False)
+
+    if args.expect:
+        with open(args.expect) as f:
+            differences = compare_trades(json.load(f), result['trades'])
+        if differences:
+            print("기대 거래와 다름:\n" + "\n".join(f"- {line}" for line in differences[:20]))
+            sys.exit(1)
+        print("기대 거래와 일치")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+종목 샤드 분산 실행
+
+감시 종목을 여러 워커 프로세스(샤드)에 나눠, 각 샤드가 자기 종목의 웹소켓 피드/분석기/매매 판단을 맡는다.
+최대 보유 코인 수, 현금, 코인당 투자 한도처럼 모든 종목에 걸친 제약은 부모 프로세스의
+RiskCoordinator가 관리하고, 샤드는 매수 직전에 Pipe로 매수 승인을 요청한다.
+
+메시지 (샤드 -> 코디네이터, 모든 요청은 응답을 받음)
+- ('buy', 종목, 전략, 배분 비율, 지정 금액)   -> ('grant', 매수 금액, ...) / ('deny', 사유, ...)
+- ('bought', 종목, 전략, 예약 금액, 사용 금액) -> ('ok', None, ...)
+- ('sold', 종목, 전략, 매도 금액)              -> ('ok', None, ...)
+- ('trade', 종목, 거래 정보, 체결 시각)         -> ('ok', None, ...)
+- ('marks', {종목: 현재가}, 시각)              -> ('ok', None, ...)
+- ('closes', 1분 구간, {종목: 종가})            -> ('ok', 상관계수 준비 여부, ...)
+- ('seed', {종목: (timestamps, 종가 배열)})     -> ('ok', 상관계수 준비 여부, ...)
+응답 끝의 두 값은 코디네이터 기준 현재 현금과 전략별 배분 잔액이다.
+
+거래 기록 저널과 일일/주간 리포트는 코디네이터 하나만 소유한다. 샤드는 체결 기록과 보유 종목 현재가를
+Pipe로 보내기만 하므로 같은 저널 파일을 여러 프로세스가 열거나 샤드마다 부분 리포트를 보내지 않는다.
+
+보유 종목과의 상관관계 확인(MAX_CORRELATION)도 다른 샤드의 보유 종목과 비교해야 하므로 코디네이터가 한다.
+샤드는 1분 구간이 바뀔 때 자기 종목의 직전 구간 종가를, 워밍업 후에는 조회한 1분봉 종가를 보내고
+코디네이터가 전체 종목의 ReturnCorrelation을 유지해 매수 승인 시 확인한다.
+"""
+import os
+import time
+import signal
+import logging
+import threading
+import multiprocessing as mp
+from multiprocessing.connection import wait
+import pyupbit
+
+from config import (
+    TICKERS, CASH_USAGE_RATIO, MAX_COINS_AT_ONCE, MIN_TRADING_AMOUNT, TRADING_FEE_RATE, REAL_TRADING,
+    MAX_CORRELATION, CORRELATION_HALFLIFE, CORRELATION_MIN_PERIODS,
+    UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY, STATUS_INTERVAL, REPORT_CHECK_INTERVAL, STRATEGIES,
+    SHARD_WORKERS, SHARD_ALL_MARKETS, PROFILE_DIR, PROFILE_INTERVAL, CONTROL_SOCKET
+)
+from trading.auto_trade import AutoTrade, CANDLE_COUNT, send_scheduled_reports
+from data_analyzer.correlation import ReturnCorrelation
+from services.performance_service import PerformanceAnalyzer
+from data_analyzer.strategies import build_strategies
+from utils.rate_limiter import quotation_limiter
+from utils.profiler import ProfilerControl
+
+class ShardTradeForwarder:
+    """샤드의 PerformanceAnalyzer 대신 거래/현재가 기록을 코디네이터로 보냄 (저널과 리포트 없음)"""
+
+    def __init__(self, trader):
+        self.trader = trader
+
+    def add_trade(self, ticker, trade_info):
+        self.trader.request('trade', ticker, trade_info, self.trader.clock())
+
+    def record_marks(self, prices):
+        if prices:
+            self.trader.request('marks', prices, self.trader.clock())
+
+    def check_daily_report_time(self):
+        """리포트는 코디네이터가 생성"""
+        return False
+
+    def close(self):
+        pass
+
+class ShardCorrelationForwarder:
+    """샤드의 ReturnCorrelation 대신 1분 구간 종가와 초기값용 1분봉을 코디네이터로 보냄"""
+
+    def __init__(self, trader):
+        self.trader = trader
+        self.minute = None  # 진행 중인 1분 구간 (거래소 시각 ms // 60000)
+        self.prices = {}  # 종목 -> 마지막 가격
+        self.ready = False  # 코디네이터 상관계수가 모든 종목 초기값을 채웠는지 (응답마다 갱신)
+
+    def observe(self, ticker, price, timestamp):
+        """실시간 가격 하나 반영 (1분 구간이 바뀔 때만 직전 구간 종가를 한 번에 전송)"""
+        minute = int(timestamp // 60_000)
+        if self.minute is not None and minute > self.minute and self.prices:
+            _, self.ready = self.trader.request('closes', self.minute, dict(self.prices))
+        if self.minute is None or minute > self.minute:
+            self.minute = minute
+        self.prices[ticker] = price
+
+    def seed(self, candles, bars=None):
+        _, self.ready = self.trader.request('seed', {
+            ticker: (timestamps[-bars:] if bars else timestamps, close[-bars:] if bars else close)
+            for ticker, (timestamps, close) in candles.items()
+        })
+
+class ShardAutoTrade(AutoTrade):
+    """종목 일부만 매매하고 전역 제약은 코디네이터에 위임하는 AutoTrade"""
+
+    def __init__(self, conn, shard_id, tickers, start_cash):
+        super().__init__(start_cash=start_cash, tickers=tickers)
+        self.conn = conn
+        self.shard_id = shard_id
+        self.conn_lock = threading.Lock()
+        self.shared_cash = start_cash  # 코디네이터 기준 현금 (응답마다 갱신)
+        # 메트릭은 샤드마다 따로 내보냄 (포트 + 1 + 샤드 번호, 파일 이름 뒤에 샤드 번호)
+        if self.metrics_port:
+            self.metrics_port += 1 + shard_id
+        if self.metrics_file:
+            root, ext = os.path.splitext(self.metrics_file)
+            self.metrics_file = f"{root}-shard{shard_id}{ext}"
+
+    def create_performance_analyzer(self):
+        """거래 기록 저널과 리포트는 코디네이터가 소유하므로 샤드는 기록을 전달만 함"""
+        return ShardTradeForwarder(self)
+
+    def create_correlation(self):
+        """상관계수는 전체 종목을 보는 코디네이터가 유지하므로 샤드는 가격을 전달만 함"""
+        return ShardCorrelationForwarder(self)
+
+    def correlated_holding(self, ticker):
+        """다른 샤드 보유 종목까지 비교해야 하므로 매수 승인 요청 시 코디네이터가 확인"""
+        return None
+
+    def create_snapshot_store(self):
+        """샤드의 포지션/잔액은 코디네이터 상태와 함께 복원해야 하므로 샤드는 스냅숏을 사용하지 않음"""
+        return None
+
+    def request(self, *message):
+        """코디네이터에 요청하고 응답 대기 (종목 상태와 전략 잔액 동기화)"""
+        with self.conn_lock:
+            self.conn.send(message)
+            status, payload, cash, strategy_cash = self.conn.recv()
+        self.shared_cash = cash
+        self.strategy_cash.update(strategy_cash)
+        return status, payload
+
+    def reserve_buy(self, ticker, strategy, amount=None):
+        status, payload = self.request('buy', ticker, strategy.name, strategy.allocation, amount)
+        if status != 'grant':
+            logging.warning(f"{ticker} 매수 불가 (코디네이터): {payload}")
+            return None
+        return payload
+
+    def settle_buy(self, ticker, strategy, reserved, spent):
+        self.request('bought', ticker, strategy.name, reserved, spent)
+
+    def settle_sell(self, ticker, owner, sell_amount):
+        self.request('sold', ticker, owner, sell_amount)
+
+    def get_balance(self, currency="KRW"):
+        if currency == "KRW" and not self.real_trading:
+            return self.shared_cash
+        return super().get_balance(currency)
+
+def run_shard(shard_id, tickers, start_cash, conn, shard_count):
+    """샤드 프로세스 진입점"""
+    # 종료는 코디네이터가 SIGTERM으로 처리 (터미널의 Ctrl+C는 부모만 처리)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # 시세 API 제한은 IP 기준이므로 샤드들이 나눠 사용
+    quotation_limiter.interval *= shard_count
+
+    trader = ShardAutoTrade(conn, shard_id, tickers, start_cash)
+    signal.signal(signal.SIGTERM, lambda signum, frame: trader.stop())
+    # 샤드별 프로파일링 (kill -USR1 <샤드 pid> 또는 샤드 제어 소켓)
+    ProfilerControl(
+        PROFILE_DIR, PROFILE_INTERVAL,
+        socket_path=f"{CONTROL_SOCKET}.shard{shard_id}" if CONTROL_SOCKET else None,
+        prefix=f"shard{shard_id}"
+    ).install()
+    logging.info(f"샤드 {shard_id} 시작: {', '.join(tickers)}")
+    trader.start()
+
+class RiskCoordinator:
+    """샤드 프로세스를 띄우고 전역 매수 한도를 관리 (AutoTrade와 같은 start/stop 인터페이스)"""
+
+    def __init__(self, start_cash=1_000_000, workers=SHARD_WORKERS, tickers=None):
+        """
+        :param workers: 샤드 프로세스 수
+        :param tickers: 감시 종목 (기본값: SHARD_ALL_MARKETS에 따라 전체 원화 마켓 또는 TICKERS)
+        """
+        self.start_cash = start_cash
+        self.workers = max(1, workers)
+        self.tickers = list(tickers or self.select_tickers())
+        self.max_per_coin = start_cash * CASH_USAGE_RATIO
+
+        if REAL_TRADING:
+            upbit = pyupbit.Upbit(UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY)
+            self.cash = float(upbit.get_balance("KRW"))
+        else:
+            self.cash = start_cash
+
+        strategies = build_strategies(STRATEGIES)
+        self.strategy_cash = {strategy.name: start_cash * strategy.allocation for strategy in strategies}
+        self.positions = {}  # 종목 -> {'strategy', 'cost'} (체결 전 예약 포함)
+
+        self.shards = {}  # 연결 -> (샤드 번호, 프로세스, 종목 목록)
+        self.running = False
+        self.last_status_time = time.time()
+
+        # 전체 종목 상관계수 (샤드가 보낸 1분 구간 종가로 갱신, 매수 승인 시 보유 종목과 비교)
+        self.correlation = None
+        self.seed_candles = {}  # 종목 -> 샤드가 보낸 초기값용 (timestamps, 종가 배열)
+        if MAX_CORRELATION:
+            self.correlation = ReturnCorrelation(self.tickers, CORRELATION_HALFLIFE, CORRELATION_MIN_PERIODS)
+
+        # 전체 샤드의 거래 기록 저널과 일일/주간 리포트
+        self.performance_analyzer = PerformanceAnalyzer(self.tickers, start_cash=start_cash)
+        self.last_report_check = time.time()
+        try:
+            from services.notification_service import NotificationService
+            self.notification = NotificationService()
+        except Exception as e:
+            logging.warning(f"알림 서비스 초기화 실패: {str(e)}")
+            self.notification = None
+
+    @staticmethod
+    def select_tickers():
+        if SHARD_ALL_MARKETS:
+            return pyupbit.get_tickers(fiat="KRW")
+        return TICKERS
+
+    def start(self):
+        """샤드 실행 후 승인 요청 처리 루프"""
+        self.running = True
+        groups = [self.tickers[i::self.workers] for i in range(self.workers)]
+        groups = [group for group in groups if group]
+
+        for shard_id, tickers in enumerate(groups):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(
+                target=run_shard,
+                args=(shard_id, tickers, self.start_cash, child_conn, len(groups)),
+                name=f"shard-{shard_id}"
+            )
+            process.start()
+            child_conn.close()
+            self.shards[parent_conn] = (shard_id, process, tickers)
+
+        logging.info(
+            f"분산 실행 시작: 샤드 {len(groups)}개, 종목 {len(self.tickers)}개\n"
+            f"- 최대 보유 코인 수: {MAX_COINS_AT_ONCE}개\n"
+            f"- 코인당 최대 투자: {self.max_per_coin:,}원"
+        )
+
+        try:
+            while self.running and self.shards:
+                for conn in wait(list(self.shards), timeout=1.0):
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError):
+                        self.remove_shard(conn)
+                        continue
+                    conn.send(self.handle(message))
+
+                if time.time() - self.last_status_time > STATUS_INTERVAL:
+                    self.log_status()
+                    self.last_status_time = time.time()
+
+                if time.time() - self.last_report_check > REPORT_CHECK_INTERVAL:
+                    send_scheduled_reports(self.performance_analyzer, self.notification)
+                    self.last_report_check = time.time()
+        finally:
+            self.running = False
+            self.terminate_shards()
+            for conn, (shard_id, process, _) in list(self.shards.items()):
+                process.join(timeout=5)
+                conn.close()
+            self.shards.clear()
+            self.performance_analyzer.close()  # 저장 대기 중인 거래 기록
+            logging.info("분산 실행 중지")
+
+    def handle(self, message):
+        """샤드 요청 처리 -> (상태, 값, 현금, 전략별 잔액)"""
+        kind = message[0]
+        if kind == 'buy':
+            status, payload = self.grant_buy(*message[1:])
+        elif kind == 'bought':
+            status, payload = self.confirm_buy(*message[1:])
+        elif kind == 'sold':
+            status, payload = self.confirm_sell(*message[1:])
+        elif kind == 'trade':
+            self.performance_analyzer.add_trade(*message[1:])
+            status, payload = 'ok', None
+        elif kind == 'marks':
+            self.performance_analyzer.record_marks(*message[1:])
+            status, payload = 'ok', None
+        elif kind == 'closes':
+            status, payload = self.observe_closes(*message[1:])
+        elif kind == 'seed':
+            status, payload = self.seed_correlation(*message[1:])
+        else:
+            status, payload = 'deny', f"알 수 없는 요청: {kind}"
+        return status, payload, self.cash, self.strategy_cash
+
+    def grant_buy(self, ticker, strategy, allocation, amount):
+        """AutoTrade.reserve_buy와 같은 기준을 전체 샤드에 적용해 매수 금액 예약"""
+        if ticker in self.positions:
+            if not amount:
+                return 'deny', "이미 보유 중"
+            buy_amount = min(amount, self.cash / (1 + TRADING_FEE_RATE))  # 물타기
+        else:
+            if len(self.positions) >= MAX_COINS_AT_ONCE:
+                return 'deny', f"최대 보유 코인 수({MAX_COINS_AT_ONCE}개) 도달"
+            correlated = self.correlated_holding(ticker)
+            if correlated:
+                return 'deny', f"보유 종목 {correlated[0]}과 상관관계가 높음 ({correlated[1]:.2f})"
+            # 수수료는 체결 후 confirm_buy에서 함께 차감되므로 수수료만큼 남겨 둠
+            buy_amount = min(
+                self.max_per_coin * allocation,
+                min(self.cash, self.strategy_cash.get(strategy, 0)) / (1 + TRADING_FEE_RATE)
+            )
+
+        if buy_amount < MIN_TRADING_AMOUNT:
+            return 'deny', f"잔액 부족 - 현재 잔액: {self.cash:,}원"
+
+        # 체결 결과가 올 때까지 금액과 보유 슬롯을 예약
+        self.cash -= buy_amount
+        self.strategy_cash[strategy] = self.strategy_cash.get(strategy, 0) - buy_amount
+        self.positions.setdefault(ticker, {'strategy': strategy, 'cost': 0})
+        return 'grant', buy_amount
+
+    def correlated_holding(self, ticker):
+        """
+        ticker와 상관계수가 MAX_CORRELATION 이상인 보유 종목 (모든 샤드, 체결 대기 중인 예약 포함)
+        :return: (보유 종목, 상관계수), 없거나 상관계수를 아직 모르면 None
+        """
+        if self.correlation is None or not self.positions:
+            return None
+        correlations = self.correlation.correlation(ticker, list(self.positions))
+        if not correlations:
+            return None
+        held, value = max(correlations.items(), key=lambda item: item[1])
+        return (held, value) if value >= MAX_CORRELATION else None
+
+    def observe_closes(self, minute, closes):
+        """샤드의 1분 구간 종가 반영 (모든 샤드의 같은 구간 종가가 모인 뒤 다음 구간 종가에서 공분산 갱신)"""
+        if self.correlation is None:
+            return 'ok', True
+        timestamp = minute * 60_000
+        for ticker, price in closes.items():
+            self.correlation.observe(ticker, price, timestamp)
+        return 'ok', self.correlation.ready
+
+    def seed_correlation(self, candles):
+        """
+        샤드가 보낸 1분봉 종가를 모아 상관계수 초기값 채우기
+        매수 승인과 같은 루프에서 실행되므로 수익률이 부족한 종목의 공분산 행만 채운다
+        (이미 채운 종목끼리는 다시 계산하지 않음, ReturnCorrelation.seed 참고)
+        """
+        if self.correlation is None:
+            return 'ok', True
+        self.seed_candles.update(candles)
+        if not self.correlation.ready:
+            self.correlation.seed(self.seed_candles, CANDLE_COUNT)
+        return 'ok', self.correlation.ready
+
+    def confirm_buy(self, ticker, strategy, reserved, spent):
+        """매수 체결 결과 반영 (사용하지 않은 예약 금액 반환, 수수료로 spent가 예약 금액보다 크면 차액을 추가 차감)"""
+        refund = reserved - spent
+        self.cash += refund
+        self.strategy_cash[strategy] = self.strategy_cash.get(strategy, 0) + refund
+
+        position = self.positions.get(ticker)
+        if position is not None:
+            position['cost'] += spent
+            if position['cost'] <= 0:  # 신규 매수 실패
+                del self.positions[ticker]
+        return 'ok', None
+
+    def confirm_sell(self, ticker, owner, sell_amount):
+        self.cash += sell_amount
+        if owner in self.strategy_cash:
+            self.strategy_cash[owner] += sell_amount
+        self.positions.pop(ticker, None)
+        return 'ok', None
+
+    def remove_shard(self, conn):
+        shard_id, process, tickers = self.shards.pop(conn)
+        conn.close()
+        if self.running:
+            logging.error(f"샤드 {shard_id} 종료됨 (종목: {', '.join(tickers)})")
+
+    def log_status(self):
+        held = ', '.join(
+            f"{ticker}({position['cost']:,.0f}원)" for ticker, position in self.positions.items()
+        ) or "없음"
+        logging.info(
+            f"리스크 코디네이터 상태\n"
+            f"- 현금: {self.cash:,.0f}원\n"
+            f"- 보유 코인: {held}\n"
+            f"- 실행 중인 샤드: {len(self.shards)}개"
+        )
+
+    def terminate_shards(self):
+        for shard_id, process, _ in list(self.shards.values()):
+            if process.is_alive():
+                process.terminate()
+
+    def stop(self):
+        """
+        트레이딩 중지 (시그널 핸들러에서 호출 가능)
+        샤드에 종료 신호만 보내고, 연결 정리는 start() 루프가 끝나면서 처리한다.
+        """
+        self.running = False
+        self.terminate_shards()
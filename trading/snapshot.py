@@ -0,0 +1,173 @@
+"""
+AutoTrade 재시작용 상태 스냅숏
+
+보유 포지션/전략 잔액/신호 쿨다운 같은 매매 상태와 종목별 캔들/지표 배열을 파일 하나(비압축 npz)에 저장합니다.
+매매 스레드는 상태 dict와 배열 참조만 모으고(배열은 교체만 되고 수정되지 않음), 배열 연결과 파일 쓰기는
+백그라운드 스레드가 처리합니다. 임시 파일에 쓴 뒤 fsync + os.replace로 바꾸므로 중간에 종료되어도
+이전 스냅숏이 남습니다.
+
+파일 구성 (zip, 압축 없음)
+- state.json: 매매 상태 + 배열 배치 정보 (종목 목록, 피처 키)
+- timestamps.npy / ohlcv.npy: 모든 종목 캔들을 이어 붙인 배열 (offsets.npy로 종목 구간 구분)
+- feature-<번호>.npy: 피처 키별로 이어 붙인 지표 배열 (feature_present.npy: 종목 x 피처 보유 여부)
+"""
+import os
+import io
+import json
+import time
+import zipfile
+import logging
+import threading
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+def merge_candles(candles, delta, count):
+    """
+    보유 캔들 뒤에 새로 조회한 캔들을 이어 붙임 (겹치는 시각은 새 캔들로 교체, 최근 count개 유지)
+    :param candles: 기존 (timestamps, ohlcv)
+    :param delta: 새로 조회한 (timestamps, ohlcv)
+    """
+    timestamps, ohlcv = candles
+    new_timestamps, new_ohlcv = delta
+    if not len(timestamps) or not len(new_timestamps):
+        return delta if len(new_timestamps) else candles
+    keep = np.searchsorted(timestamps, new_timestamps[0])
+    timestamps = np.concatenate((timestamps[:keep], new_timestamps))[-count:]
+    ohlcv = np.ascontiguousarray(np.concatenate((ohlcv[:, :keep], new_ohlcv), axis=1)[:, -count:])
+    return timestamps, ohlcv
+
+def _feature_key(value):
+    """JSON 목록 -> 피처 키 튜플 (중첩 키 포함)"""
+    return tuple(_feature_key(item) for item in value) if isinstance(value, list) else value
+
+def _write_array(archive, name, array):
+    with archive.open(name, 'w', force_zip64=True) as f:
+        np.lib.format.write_array(f, np.asanyarray(array), allow_pickle=False)
+
+def write_snapshot(path, state, analyzers):
+    """
+    스냅숏 파일 쓰기 (임시 파일 -> fsync -> 교체)
+    :param state: JSON으로 저장할 매매 상태
+    :param analyzers: {ticker: (timestamps, ohlcv, {피처 키: 배열})}
+    """
+    tickers = list(analyzers)
+    feature_keys = sorted({key for _, _, features in analyzers.values() for key in features}, key=repr)
+    lengths = [len(analyzers[ticker][0]) for ticker in tickers]
+    offsets = np.zeros(len(tickers) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    present = np.array(
+        [[key in analyzers[ticker][2] for key in feature_keys] for ticker in tickers], dtype=bool
+    ).reshape(len(tickers), len(feature_keys))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp = f"{path}.tmp"
+    with open(temp, 'wb') as f:
+        with zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_STORED) as archive:
+            layout = {'tickers': tickers, 'feature_keys': feature_keys}  # 튜플은 JSON 목록으로 저장
+            archive.writestr('state.json', json.dumps({**state, 'layout': layout}, ensure_ascii=False))
+            _write_array(archive, 'offsets.npy', offsets)
+            _write_array(archive, 'feature_present.npy', present)
+            if tickers:
+                _write_array(archive, 'timestamps.npy', np.concatenate(
+                    [analyzers[ticker][0].astype('datetime64[ns]').view(np.int64) for ticker in tickers]
+                ))
+                _write_array(archive, 'ohlcv.npy', np.concatenate(
+                    [analyzers[ticker][1] for ticker in tickers], axis=1
+                ))
+            for i, key in enumerate(feature_keys):
+                # 피처가 없는 종목 구간은 NaN으로 채움 (feature_present로 구분)
+                _write_array(archive, f"feature-{i}.npy", np.concatenate([
+                    analyzers[ticker][2][key] if present[t, i] else np.full(lengths[t], np.nan)
+                    for t, ticker in enumerate(tickers)
+                ]))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+
+def read_snapshot(path):
+    """
+    스냅숏 파일 읽기
+    :return: (매매 상태, {ticker: (timestamps, ohlcv, {피처 키: 배열})}), 파일이 없으면 None
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        with data.zip.open('state.json') as f:
+            state = json.load(io.TextIOWrapper(f, encoding='utf-8'))
+        if state.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅숏 버전: {state.get('version')}")
+        layout = state.pop('layout')
+        tickers = layout['tickers']
+        feature_keys = [_feature_key(key) for key in layout['feature_keys']]
+        offsets = data['offsets.npy']
+        present = data['feature_present.npy']
+        timestamps = data['timestamps.npy'].view('datetime64[ns]') if tickers else None
+        ohlcv = data['ohlcv.npy'] if tickers else None
+        features = [data[f"feature-{i}.npy"] for i in range(len(feature_keys))]
+
+    analyzers = {}
+    for t, ticker in enumerate(tickers):
+        start, end = offsets[t], offsets[t + 1]
+        analyzers[ticker] = (
+            timestamps[start:end].copy(),
+            np.ascontiguousarray(ohlcv[:, start:end]),
+            {key: features[i][start:end].copy() for i, key in enumerate(feature_keys) if present[t, i]}
+        )
+    return state, analyzers
+
+class SnapshotStore:
+    """스냅숏 저장소 (쓰기는 백그라운드 스레드 하나가 가장 최근 요청만 처리)"""
+
+    def __init__(self, path):
+        """
+        :param path: 스냅숏 파일 경로
+        """
+        self.path = path
+        self.condition = threading.Condition()
+        self.pending = None  # 아직 쓰지 않은 가장 최근 (상태, 배열)
+        self.writing = False
+        self.saved = 0
+        self.writer = threading.Thread(target=self._write_loop, name="snapshot-writer", daemon=True)
+        self.writer.start()
+
+    def load(self):
+        """저장된 스냅숏 (없거나 읽을 수 없으면 None)"""
+        try:
+            return read_snapshot(self.path)
+        except Exception as e:
+            logging.error(f"스냅숏 읽기 실패 ({self.path}): {str(e)}")
+            return None
+
+    def save(self, state, analyzers, wait=False):
+        """
+        스냅숏 저장 요청 (이전 요청이 아직 대기 중이면 이번 요청으로 교체)
+        :param wait: True면 파일 교체까지 대기 (종료 시)
+        """
+        with self.condition:
+            self.pending = (state, analyzers)
+            self.condition.notify_all()
+            if wait:
+                self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout=30)
+
+    def _write_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None)
+                (state, analyzers), self.pending = self.pending, None
+                self.writing = True
+            started = time.perf_counter()
+            try:
+                write_snapshot(self.path, state, analyzers)
+                self.saved += 1
+                logging.debug(
+                    f"스냅숏 저장: 종목 {len(analyzers)}개, {(time.perf_counter() - started) * 1000:.1f}ms"
+                )
+            except Exception as e:
+                logging.error(f"스냅숏 저장 실패 ({self.path}): {str(e)}")
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
@@ -1,4 +1,6 @@
 from .message_queue import MessageQueue
 from .decorators import retry_on_failure
+from .rate_limiter import RateLimiter
+from .profiler import ProfilerControl
 
-__all__ = ['MessageQueue', 'retry_on_failure']
\ No newline at end of file
+__all__ = ['MessageQueue', 'retry_on_failure', 'RateLimiter', 'ProfilerControl']
\ No newline at end of file
@@ -2,9 +2,16 @@ import time
 import logging
 import traceback
 from functools import wraps
-from services.notification_service import NotificationService
 
-notification_service = NotificationService()
+_notification_service = None
+
+def get_notification_service():
+    """에러 알림용 NotificationService (services <-> utils 순환 import 방지를 위해 지연 생성)"""
+    global _notification_service
+    if _notification_service is None:
+        from services.notification_service import NotificationService
+        _notification_service = NotificationService()
+    return _notification_service
 
 def send_error_alert(func):
     @wraps(func)
@@ -18,7 +25,7 @@ def send_error_alert(func):
                 f"상세:\n{traceback.format_exc()}"
             )
             logging.error(error_msg)
-            notification_service.send_error_alert(error_msg)
+            get_notification_service().send_error_alert(error_msg)
             raise
     return wrapper
 
@@ -38,7 +45,7 @@ def retry_on_failure(max_attempts=3, delay=1):
                             f"상세:\n{traceback.format_exc()}"
                         )
                         logging.error(error_msg)
-                        notification_service.send_error_alert(error_msg)
+                        get_notification_service().send_error_alert(error_msg)
                         raise
                     logging.warning(f"{func.__name__} 실패, 재시도 중... ({attempt + 1}/{max_attempts})")
                     time.sleep(delay)
@@ -0,0 +1,205 @@
+"""
+비동기 구조화 로깅
+
+매매 스레드는 로그 레코드를 큐에 넣기만 하고, 문자열 포맷과 파일/콘솔 쓰기는 리스너 스레드가 처리합니다.
+
+    setup_logging()                                   # 진입점에서 한 번 (config의 LOG_* 설정 사용)
+    log_event(logging.INFO, "매수 완료", ticker=ticker, price=price)
+    # -> 2024-01-01 09:00:00,123 [INFO] 매수 완료 ticker=KRW-BTC price=50000000
+
+    limiter = LogLimiter(60)                          # 같은 키는 60초에 한 번만 기록
+    limiter.log(logging.WARNING, ticker, "%s 이미 보유 중", ticker)
+
+- 메시지 인자(%s)와 필드는 리스너 스레드에서 문자열로 바뀜 (불변 값이 아니면 큐에 넣기 전에 변환)
+- 파일은 LOG_MAX_BYTES마다 교체 (LOG_BACKUP_COUNT개 보관)
+- fork된 자식 프로세스(샤드, 백테스트 워커)는 자체 리스너로 같은 파일에 쓰고 파일 교체는 부모가 담당
+"""
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import multiprocessing.util
+from config import LOG_FILE, LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_THROTTLE_INTERVAL
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+# 큐에 그대로 넣어도 되는 값 (나중에 바뀌지 않음)
+IMMUTABLE_TYPES = (str, int, float, bool, type(None), bytes)
+
+def _format_value(value):
+    """필드 값 -> 한 줄 문자열 (공백/줄바꿈/따옴표가 있으면 JSON 문자열로 감쌈)"""
+    if isinstance(value, float):
+        return f"{value:.10g}"
+    text = str(value)
+    if not text or any(ch in text for ch in ' \t\n\r"='):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+class StructuredFormatter(logging.Formatter):
+    """메시지 뒤에 key=value 필드를 붙이는 포매터"""
+
+    def formatMessage(self, record):
+        text = super().formatMessage(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += " " + " ".join(f"{key}={_format_value(value)}" for key, value in fields.items())
+        return text
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    포맷하지 않고 레코드를 큐에 넣는 핸들러
+    (기본 QueueHandler.prepare는 호출한 스레드에서 메시지를 포맷함)
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, IMMUTABLE_TYPES) for arg in args)):
+            # 리스너가 포맷하기 전에 바뀔 수 있는 인자는 지금 문자열로 만듦
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+class _Pipeline:
+    """큐 핸들러와 리스너 스레드 (프로세스마다 하나)"""
+
+    def __init__(self, level, path, max_bytes, backup_count, console, rotate=True):
+        self.settings = (level, path, max_bytes, backup_count, console)
+        self.pid = os.getpid()
+        formatter = StructuredFormatter(LOG_FORMAT)
+        handlers = []
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if rotate and max_bytes:
+                handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+                )
+            else:
+                # 다른 프로세스가 파일을 교체하면 다시 엶
+                handler = logging.handlers.WatchedFileHandler(path, encoding='utf-8')
+            handlers.append(handler)
+        if console:
+            handlers.append(logging.StreamHandler(sys.stderr))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        self.handlers = handlers
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = DeferredQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+
+    def start(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            if not isinstance(handler, DeferredQueueHandler):
+                handler.close()
+        root.addHandler(self.queue_handler)
+        root.setLevel(self.settings[0])
+        self.listener.start()
+
+    def stop(self):
+        """큐에 남은 레코드를 모두 쓰고 리스너 종료"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+_pipeline = None
+
+def setup_logging(level=LOG_LEVEL, path=LOG_FILE, max_bytes=LOG_MAX_BYTES,
+                  backup_count=LOG_BACKUP_COUNT, console=True):
+    """
+    루트 로거를 비동기 파이프라인으로 설정 (이미 설정되어 있으면 무시)
+    :param level: 로그 레벨 (이름 또는 숫자)
+    :param path: 로그 파일 경로 (None이면 콘솔만)
+    :param max_bytes: 파일 교체 크기 (0이면 교체 안 함)
+    :param backup_count: 보관할 이전 파일 수
+    :param console: True면 표준 에러에도 출력
+    """
+    global _pipeline
+    if _pipeline is not None:
+        return
+    _pipeline = _Pipeline(level, path, max_bytes, backup_count, console)
+    _pipeline.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """
+    남은 로그를 모두 기록하고 파이프라인 종료 (os._exit 전에 호출)
+    종료 후 기록되는 로그는 logging 기본 동작(경고 이상만 표준 에러)을 따름
+    """
+    global _pipeline
+    pipeline, _pipeline = _pipeline, None
+    if pipeline is None or pipeline.pid != os.getpid():
+        return
+    logging.getLogger().removeHandler(pipeline.queue_handler)
+    pipeline.stop()
+
+def _after_fork_in_child():
+    """fork된 자식은 리스너 스레드가 없으므로 새 파이프라인을 시작 (파일 교체는 부모만)"""
+    global _pipeline
+    if _pipeline is None:
+        return
+    level, path, max_bytes, backup_count, console = _pipeline.settings
+    _pipeline = _Pipeline(level, path, max_bytes, backup_count, console, rotate=False)
+    _pipeline.start()
+    # multiprocessing 자식은 atexit 없이 종료되므로 종료 처리기로 남은 로그를 기록
+    multiprocessing.util.register_after_fork(
+        _pipeline, lambda pipeline: multiprocessing.util.Finalize(pipeline, stop_logging, exitpriority=-100)
+    )
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+def log_event(level, message, *args, stacklevel=2, **fields):
+    """
+    구조화 로그 기록 (레벨이 꺼져 있으면 아무것도 만들지 않음)
+    :param message: 메시지 (%s 인자는 리스너 스레드에서 포맷)
+    :param fields: 메시지 뒤에 key=value로 붙일 값
+    """
+    root = logging.getLogger()
+    if not root.isEnabledFor(level):
+        return
+    for key, value in fields.items():
+        if not isinstance(value, IMMUTABLE_TYPES):
+            fields[key] = str(value)
+    root.log(level, message, *args, extra={'fields': fields}, stacklevel=stacklevel)
+
+class LogLimiter:
+    """
+    같은 키의 로그를 interval초에 한 번만 기록 (반복되는 경고가 로그를 채우지 않도록)
+    생략한 횟수는 다음 기록에 suppressed 필드로 붙음
+    """
+
+    def __init__(self, interval=LOG_THROTTLE_INTERVAL, clock=None):
+        """
+        :param interval: 같은 키를 다시 기록하기까지의 최소 간격 (초)
+        :param clock: 시각 함수 (기본값: time.monotonic)
+        """
+        self.interval = interval
+        self.clock = clock or time.monotonic
+        self.next_allowed = {}
+        self.suppressed = {}
+
+    def log(self, level, key, message, *args, **fields):
+        """
+        :param key: 제한 단위 (예: 종목 코드, (메시지 종류, 종목) 튜플)
+        :return: 기록했으면 True
+        """
+        if not logging.getLogger().isEnabledFor(level):
+            return False
+        now = self.clock()
+        if now < self.next_allowed.get(key, float('-inf')):
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+        self.next_allowed[key] = now + self.interval
+        skipped = self.suppressed.pop(key, 0)
+        if skipped:
+            fields['suppressed'] = skipped
+        log_event(level, message, *args, stacklevel=3, **fields)
+        return True
@@ -0,0 +1,339 @@
+"""
+실행 중인 봇 프로파일링 (재시작 없이 시그널 또는 로컬 제어 소켓으로 켜고 끔)
+
+- CPU: 별도 스레드가 일정 간격으로 대상 스레드(기본값: 매매 루프가 도는 메인 스레드)의 호출 스택을 샘플링
+  매매 루프에는 계측 코드가 없으며, 비용은 샘플링 스레드가 GIL을 잡는 시간뿐이다.
+  결과: cpu-*.collapsed (flamegraph.pl / speedscope용 접힌 스택), cpu-*.txt (함수별 자체/누적 비율)
+- 메모리: tracemalloc 스냅샷의 할당 위치 상위 목록과 직전 스냅샷 대비 증가분 (mem-*.txt)
+
+시그널
+- SIGUSR1: CPU 프로파일 시작/중지 (중지 시 파일 저장)
+- SIGUSR2: 메모리 스냅샷 (처음 받으면 tracemalloc 추적 시작)
+
+제어 소켓 (config.CONTROL_SOCKET 설정 시, 한 줄 명령 -> 한 줄 이상 응답)
+python -m utils.profiler auto_trade.sock cpu start [간격ms] [all]
+python -m utils.profiler auto_trade.sock cpu run 30      # 30초 프로파일 후 자동 저장
+python -m utils.profiler auto_trade.sock cpu stop
+python -m utils.profiler auto_trade.sock mem start|snapshot|stop
+python -m utils.profiler auto_trade.sock status
+"""
+import os
+import sys
+import time
+import signal
+import socket
+import logging
+import argparse
+import threading
+import tracemalloc
+
+def _timestamp():
+    """파일 이름용 시각 (같은 초에 여러 번 저장해도 겹치지 않도록 밀리초 포함)"""
+    now = time.time()
+    return time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+
+def _short_path(filename):
+    """스택 표시용 경로 (프로젝트 파일은 상대 경로, 나머지는 파일 이름만)"""
+    root = os.getcwd() + os.sep
+    if filename.startswith(root):
+        return filename[len(root):]
+    return os.path.basename(filename)
+
+class SamplingProfiler:
+    """스레드 호출 스택 샘플링 CPU 프로파일러"""
+
+    def __init__(self, interval=0.005, thread_id=None):
+        """
+        :param interval: 샘플링 간격 (초)
+        :param thread_id: 샘플링할 스레드 (None이면 샘플링 스레드를 뺀 모든 스레드)
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = {}  # 스택(안쪽 프레임부터 (파일, 줄, 함수) 튜플) -> 샘플 수
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self.started = time.time()
+        self.thread = threading.Thread(target=self._run, name="cpu-profiler", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        current_frames = sys._current_frames
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in current_frames().items():
+                if thread_id == own or (self.thread_id is not None and thread_id != self.thread_id):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                key = tuple(stack)
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+        self.elapsed = time.time() - self.started
+        return self
+
+    def collapsed(self):
+        """접힌 스택 형식 줄 목록 ('바깥;...;안쪽 샘플수')"""
+        lines = []
+        for stack, count in self.stacks.items():
+            names = [f"{name} ({_short_path(filename)}:{line})" for filename, line, name in reversed(stack)]
+            lines.append(f"{';'.join(names)} {count}")
+        return sorted(lines)
+
+    def summary(self, top=30):
+        """함수별 자체(가장 안쪽 프레임)/누적(스택에 포함) 샘플 비율 요약"""
+        total = sum(self.stacks.values())
+        own, cumulative = {}, {}
+        for stack, count in self.stacks.items():
+            own[stack[0]] = own.get(stack[0], 0) + count
+            for function in set(stack):
+                cumulative[function] = cumulative.get(function, 0) + count
+
+        def table(counts):
+            rows = sorted(counts.items(), key=lambda item: -item[1])[:top]
+            return "\n".join(
+                f"{count / total:7.1%} {count:>8,}  {name} ({_short_path(filename)}:{line})"
+                for (filename, line, name), count in rows
+            )
+
+        return (
+            f"샘플: {self.samples:,}회 ({self.elapsed:.1f}초, 간격 {self.interval * 1000:.1f}ms), 스택 {total:,}개\n\n"
+            f"[자체 시간 상위 {top}]\n{table(own) if total else '없음'}\n\n"
+            f"[누적 시간 상위 {top}]\n{table(cumulative) if total else '없음'}\n"
+        )
+
+    def write(self, directory, prefix="cpu"):
+        """결과 파일 저장 -> (접힌 스택 경로, 요약 경로)"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{prefix}-{_timestamp()}")
+        with open(f"{base}.collapsed", 'w') as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(f"{base}.txt", 'w') as f:
+            f.write(self.summary())
+        return f"{base}.collapsed", f"{base}.txt"
+
+class MemoryTracer:
+    """tracemalloc 스냅샷 (할당 위치 상위 목록 + 직전 스냅샷 대비 증가분)"""
+
+    def __init__(self, frames=1):
+        """:param frames: 할당 위치마다 보관할 스택 깊이 (깊을수록 추적 비용 증가)"""
+        self.frames = frames
+        self.previous = None
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.previous = None
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.previous = None
+
+    def snapshot(self, directory, prefix="mem", top=30):
+        """스냅샷 저장 -> 파일 경로"""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        stats = snapshot.statistics('lineno')
+        lines = [
+            f"추적 중인 메모리: {current / 1e6:,.1f}MB (최대 {peak / 1e6:,.1f}MB), 할당 위치 {len(stats):,}곳",
+            "",
+            f"[할당 위치 상위 {top}]",
+        ]
+        lines += [f"{stat.size / 1e6:10.3f}MB {stat.count:>10,}개  {stat.traceback}" for stat in stats[:top]]
+        if self.previous is not None:
+            lines += ["", f"[직전 스냅샷 대비 증가 상위 {top}]"]
+            lines += [
+                f"{stat.size_diff / 1e6:+10.3f}MB {stat.count_diff:>+10,}개  {stat.traceback}"
+                for stat in snapshot.compare_to(self.previous, 'lineno')[:top]
+            ]
+        self.previous = snapshot
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{prefix}-{_timestamp()}.txt")
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+class ProfilerControl:
+    """시그널/제어 소켓으로 CPU 프로파일과 메모리 스냅샷을 제어"""
+
+    def __init__(self, directory="profiles", interval=0.005, socket_path=None, prefix=None):
+        """
+        :param directory: 결과 파일 저장 디렉터리
+        :param interval: 기본 CPU 샘플링 간격 (초)
+        :param socket_path: 제어 소켓 경로 (None이면 소켓 사용 안 함)
+        :param prefix: 결과 파일 이름 앞에 붙일 이름 (샤드 구분용)
+        """
+        self.directory = directory
+        self.interval = interval
+        self.socket_path = socket_path
+        self.prefix = f"{prefix}-" if prefix else ""
+        self.target_thread = threading.main_thread().ident  # 매매 루프는 메인 스레드에서 실행
+        self.profiler = None
+        self.memory = MemoryTracer()
+        self.lock = threading.Lock()
+        self.server = None
+
+    def install(self):
+        """SIGUSR1/SIGUSR2 핸들러 등록, 제어 소켓 시작 (메인 스레드에서 호출)"""
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.handle_signal)
+            signal.signal(signal.SIGUSR2, self.handle_signal)
+        if self.socket_path:
+            self.start_socket()
+        return self
+
+    def handle_signal(self, signum, frame):
+        """시그널 핸들러 (매매 루프를 막지 않도록 실제 작업은 별도 스레드에서)"""
+        action = self.toggle_cpu if signum == signal.SIGUSR1 else self.snapshot_memory
+        threading.Thread(target=lambda: logging.info(action()), name="profiler-signal", daemon=True).start()
+
+    def start_cpu(self, interval=None, all_threads=False, duration=None):
+        with self.lock:
+            if self.profiler and self.profiler.running:
+                return "CPU 프로파일이 이미 실행 중입니다"
+            self.profiler = SamplingProfiler(
+                interval=interval or self.interval,
+                thread_id=None if all_threads else self.target_thread
+            ).start()
+        if duration:
+            threading.Timer(duration, lambda: logging.info(self.stop_cpu())).start()
+        return (f"CPU 프로파일 시작 (간격 {self.profiler.interval * 1000:.1f}ms, "
+                f"{'모든 스레드' if all_threads else '매매 루프 스레드'}"
+                f"{f', {duration:g}초 후 저장' if duration else ''})")
+
+    def stop_cpu(self):
+        with self.lock:
+            profiler = self.profiler
+            if profiler is None or not profiler.running:
+                return "실행 중인 CPU 프로파일이 없습니다"
+            profiler.stop()
+        collapsed, summary = profiler.write(self.directory, f"{self.prefix}cpu")
+        return f"CPU 프로파일 저장 ({profiler.samples:,}회 샘플): {collapsed}, {summary}"
+
+    def toggle_cpu(self):
+        if self.profiler and self.profiler.running:
+            return self.stop_cpu()
+        return self.start_cpu()
+
+    def snapshot_memory(self):
+        """메모리 스냅샷 (추적 중이 아니면 추적만 시작)"""
+        with self.lock:
+            if not self.memory.tracing:
+                self.memory.start()
+                return "tracemalloc 추적 시작 (다음 스냅샷부터 할당 위치 기록)"
+            path = self.memory.snapshot(self.directory, f"{self.prefix}mem")
+        return f"메모리 스냅샷 저장: {path}"
+
+    def status(self):
+        cpu = (f"실행 중 ({self.profiler.samples:,}회 샘플)"
+               if self.profiler and self.profiler.running else "중지")
+        memory = "중지"
+        if self.memory.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            memory = f"추적 중 ({current / 1e6:,.1f}MB, 최대 {peak / 1e6:,.1f}MB)"
+        return f"CPU 프로파일: {cpu}\ntracemalloc: {memory}\n저장 위치: {os.path.abspath(self.directory)}"
+
+    def execute(self, command):
+        """제어 명령 한 줄 실행 -> 응답 문자열"""
+        words = command.split()
+        try:
+            if words[:2] == ['cpu', 'start']:
+                interval = float(words[2]) / 1000 if len(words) > 2 and words[2] != 'all' else None
+                return self.start_cpu(interval, all_threads='all' in words[2:])
+            if words[:2] == ['cpu', 'run'] and len(words) > 2:
+                return self.start_cpu(all_threads='all' in words[3:], duration=float(words[2]))
+            if words == ['cpu', 'stop']:
+                return self.stop_cpu()
+            if words == ['mem', 'start']:
+                with self.lock:
+                    self.memory.start()
+                return "tracemalloc 추적 시작"
+            if words == ['mem', 'snapshot']:
+                return self.snapshot_memory()
+            if words == ['mem', 'stop']:
+                with self.lock:
+                    self.memory.stop()
+                return "tracemalloc 추적 중지"
+            if words == ['status']:
+                return self.status()
+        except ValueError as e:
+            return f"잘못된 값: {str(e)}"
+        return "명령: cpu start [간격ms] [all] | cpu run 초 [all] | cpu stop | mem start|snapshot|stop | status"
+
+    def start_socket(self):
+        """로컬 제어 소켓 시작 (유닉스 도메인 소켓, 소유자만 접근 가능)"""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행이 남긴 소켓 파일
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self.server.listen(4)
+        threading.Thread(target=self._serve, name="profiler-control", daemon=True).start()
+        logging.info(f"프로파일 제어 소켓: {self.socket_path}")
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:  # close()로 종료
+                return
+            with conn:
+                try:
+                    command = conn.makefile('r').readline().strip()
+                    conn.sendall((self.execute(command) + "\n").encode('utf-8'))
+                except Exception as e:
+                    logging.error(f"프로파일 제어 명령 처리 실패: {str(e)}")
+
+    def close(self):
+        """실행 중인 프로파일을 저장하고 제어 소켓 정리"""
+        if self.profiler and self.profiler.running:
+            logging.info(self.stop_cpu())
+        if self.server:
+            self.server.close()
+            self.server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+def send_command(socket_path, command, timeout=30):
+    """제어 소켓에 명령 전송 -> 응답 문자열"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall((command + "\n").encode('utf-8'))
+        return client.makefile('r').read().strip()
+
+def main():
+    parser = argparse.ArgumentParser(description="실행 중인 봇 프로파일 제어")
+    parser.add_argument('socket', help="제어 소켓 경로 (config.CONTROL_SOCKET)")
+    parser.add_argument('command', nargs='+', help="cpu start|run|stop, mem start|snapshot|stop, status")
+    args = parser.parse_args()
+    print(send_command(args.socket, ' '.join(args.command)))
+
+if __name__ == "__main__":
+    main()
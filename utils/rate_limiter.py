@@ -0,0 +1,26 @@
+import time
+import threading
+from config import QUOTATION_RATE_LIMIT
+
+class RateLimiter:
+    def __init__(self, calls_per_second):
+        """
+        초당 호출 횟수 제한 (여러 스레드에서 공유 가능)
+        :param calls_per_second: 초당 최대 호출 횟수
+        """
+        self.interval = 1.0 / calls_per_second
+        self.lock = threading.Lock()
+        self.next_call_time = time.monotonic()
+
+    def acquire(self):
+        """호출 가능 시점까지 대기"""
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_call_time - now
+            self.next_call_time = max(self.next_call_time, now) + self.interval
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+# 시세 조회 API 공용 제한기 (업비트 시세 API는 IP 기준으로 제한)
+quotation_limiter = RateLimiter(QUOTATION_RATE_LIMIT)